@@ -0,0 +1,173 @@
+"""
+HealthTech Solutions — Motor de disponibilidad de citas (M03)
+Agenda de un médico en un día = intervalos [hora_inicio, hora_fin) de sus
+citas que ocupan horario, fusionados y ordenados (minutos desde 00:00).
+
+  - Solapamiento: bisect sobre los fines → O(log n) por consulta
+    (CitaCreateSerializer.validate; antes solo detectaba la misma hora_inicio).
+  - Huecos libres: recorrido lineal de los espacios entre intervalos dentro
+    de la jornada (CITAS_JORNADA_INICIO–FIN), alineados a CITAS_PASO_MIN.
+  - Carga: una consulta por rango (médicos × fechas) para todos los días que
+    no están en cache, usando IDX_CIT_MEDICO (HOSPITAL_ID, MEDICO_ID, FECHA_CITA).
+  - Cache por médico-día en el cache compartido entre workers (Redis o
+    DatabaseCache; manage.py check --deploy lo exige, core.E001), invalidado
+    tras el commit al crear, editar, cancelar, completar o desactivar una
+    cita: la invalidación de un worker la ven todos.
+  - CITAS_AGENDA_TTL (30 s) acota lo que aún puede quedar viejo: un worker
+    que leyó el día antes del commit y lo guarda después de la invalidación.
+    La validación de conflictos no usa el cache: relee el día del médico
+    (una consulta), así que un hueco viejo del cache no produce un doble
+    agendamiento.
+  - Comprobar e insertar no es atómico por sí solo: CitaCreateSerializer
+    crea/edita dentro de transaction.atomic() tras bloquear la fila del
+    médico (bloquear_medico, SELECT ... FOR UPDATE) y vuelve a comprobar el
+    solapamiento con el bloqueo tomado; dos reservas simultáneas del mismo
+    médico se serializan y la segunda ve la primera.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.appointments.models import ESTADOS_OCUPAN_HORARIO, Cita
+
+CACHE_PREFIX = 'citas:agenda:'
+
+
+def minutos(hora: time) -> int:
+    return hora.hour * 60 + hora.minute
+
+
+def _hora(minutos: int) -> str:
+    return f'{minutos // 60:02d}:{minutos % 60:02d}'
+
+
+def _clave(hospital_id, medico_id, fecha: date) -> str:
+    return f'{CACHE_PREFIX}{hospital_id}:{medico_id}:{fecha.isoformat()}'
+
+
+# ============================================================
+# Agenda de un médico-día
+# ============================================================
+class AgendaDia:
+    """Intervalos ocupados (fusionados) de un médico en una fecha."""
+
+    __slots__ = ('inicios', 'fines')
+
+    def __init__(self, intervalos):
+        self.inicios, self.fines = [], []
+        for inicio, fin in sorted(intervalos):
+            if self.fines and inicio <= self.fines[-1]:
+                self.fines[-1] = max(self.fines[-1], fin)     # Solapado o contiguo: fusionar
+            else:
+                self.inicios.append(inicio)
+                self.fines.append(fin)
+
+    def solapa(self, inicio: int, fin: int) -> bool:
+        """¿[inicio, fin) se cruza con algún intervalo ocupado? O(log n)."""
+        i = bisect_right(self.fines, inicio)                  # Primer intervalo que termina después de inicio
+        return i < len(self.inicios) and self.inicios[i] < fin
+
+    def libres(self, duracion: int, desde: int, hasta: int, paso: int) -> list[tuple[int, int]]:
+        """Horarios [inicio, inicio + duracion) libres entre `desde` y `hasta`, alineados a `paso`."""
+        horarios, cursor = [], desde
+        for inicio, fin in [*zip(self.inicios, self.fines), (hasta, hasta)]:
+            hueco_fin = min(inicio, hasta)
+            slot = -(-cursor // paso) * paso                  # Redondeo hacia arriba al paso
+            while slot + duracion <= hueco_fin:
+                horarios.append((slot, slot + duracion))
+                slot += paso
+            cursor = max(cursor, fin)
+            if cursor >= hasta:
+                break
+        return horarios
+
+
+# ============================================================
+# Carga (cache + una consulta por rango)
+# ============================================================
+def _consultar(hospital_id, medico_ids, fecha_desde: date, fecha_hasta: date, excluir=None) -> dict:
+    """{(medico_id, fecha): [(inicio, fin), …]} con una sola consulta de rango."""
+    qs = (
+        Cita.objects.sin_tenant().del_hospital(hospital_id).activos()
+        .filter(medico_id__in=medico_ids, fecha_cita__range=(fecha_desde, fecha_hasta),
+                estado__in=ESTADOS_OCUPAN_HORARIO)
+    )
+    if excluir is not None:
+        qs = qs.exclude(pk=excluir)
+    intervalos = defaultdict(list)
+    for medico_id, fecha, inicio, fin in qs.values_list('medico_id', 'fecha_cita', 'hora_inicio', 'hora_fin'):
+        intervalos[(medico_id, fecha)].append((minutos(inicio), minutos(fin)))
+    return intervalos
+
+
+def agendas(hospital_id: int, medico_ids, fecha_desde: date, fecha_hasta: date) -> dict:
+    """{(medico_id, fecha): AgendaDia} para médicos × fechas; los faltantes en cache se leen juntos."""
+    fechas = [fecha_desde + timedelta(days=d) for d in range((fecha_hasta - fecha_desde).days + 1)]
+    claves = {(m, f): _clave(hospital_id, m, f) for m in medico_ids for f in fechas}
+    en_cache = cache.get_many(claves.values())
+    faltantes = [par for par, clave in claves.items() if clave not in en_cache]
+
+    intervalos = {par: en_cache[clave] for par, clave in claves.items() if clave in en_cache}
+    if faltantes:
+        leidos = _consultar(hospital_id, {m for m, _ in faltantes},
+                            min(f for _, f in faltantes), max(f for _, f in faltantes))
+        nuevos = {par: leidos.get(par, []) for par in faltantes}
+        cache.set_many({claves[par]: v for par, v in nuevos.items()}, settings.CITAS_AGENDA_TTL)
+        intervalos.update(nuevos)
+    return {par: AgendaDia(v) for par, v in intervalos.items()}
+
+
+def agenda_vigente(hospital_id: int, medico_id: int, fecha: date, excluir=None) -> AgendaDia:
+    """Agenda leída de la BD (sin cache) para validar conflictos; `excluir` = cita en edición."""
+    return AgendaDia(_consultar(hospital_id, [medico_id], fecha, fecha, excluir).get((medico_id, fecha), []))
+
+
+def bloquear_medico(medico_id: int) -> None:
+    """
+    Bloquea la fila del médico hasta el commit (SELECT ... FOR UPDATE):
+    serializa comprobar-e-insertar de sus citas. Llamar dentro de transaction.atomic().
+    """
+    medico = Cita._meta.get_field('medico').related_model
+    list(medico._base_manager.select_for_update().filter(pk=medico_id).values_list('pk', flat=True))
+
+
+def invalidar(cita: Cita, *dias) -> None:
+    """Descarta del cache, tras el commit, el día de la cita (y `dias` extra: (medico_id, fecha))."""
+    claves = [_clave(cita.hospital_id, cita.medico_id, cita.fecha_cita)]
+    claves += [_clave(cita.hospital_id, m, f) for m, f in dias]
+    transaction.on_commit(lambda: cache.delete_many(claves))
+
+
+# ============================================================
+# Búsqueda de horarios libres
+# ============================================================
+def horarios_libres(hospital_id: int, medico_ids, fecha_desde: date, fecha_hasta: date,
+                    duracion: int, ahora: datetime | None = None) -> list[dict]:
+    """Horarios libres de `duracion` minutos por médico y día (sin horarios ya pasados)."""
+    jornada_inicio = minutos(time.fromisoformat(settings.CITAS_JORNADA_INICIO))
+    jornada_fin    = minutos(time.fromisoformat(settings.CITAS_JORNADA_FIN))
+    paso           = settings.CITAS_PASO_MIN
+    ahora          = ahora or timezone.localtime()
+
+    resultados = []
+    for (medico_id, fecha), agenda in sorted(agendas(hospital_id, medico_ids, fecha_desde, fecha_hasta).items(),
+                                             key=lambda item: (item[0][1], item[0][0])):
+        desde = jornada_inicio
+        if fecha == ahora.date():
+            desde = max(desde, ahora.hour * 60 + ahora.minute + 1)
+        elif fecha < ahora.date():
+            continue
+        horarios = agenda.libres(duracion, desde, jornada_fin, paso)
+        if horarios:
+            resultados.append({
+                'medico':   medico_id,
+                'fecha':    fecha,
+                'horarios': [{'hora_inicio': _hora(i), 'hora_fin': _hora(f)} for i, f in horarios],
+            })
+    return resultados
@@ -14,6 +14,8 @@ Convenciones Oracle 19c:
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 # ============================================================
 # Catálogos / choices
@@ -47,6 +49,8 @@ ESTADOS_CANCELABLES = ('PROGRAMADA', 'CONFIRMADA', 'EN_PROGRESO')
 ESTADOS_CONFIRMABLES = ('PROGRAMADA',)
 # Estados desde los que se puede completar
 ESTADOS_COMPLETABLES = ('CONFIRMADA', 'EN_PROGRESO')
+# Estados que ocupan el horario del médico (agenda / disponibilidad)
+ESTADOS_OCUPAN_HORARIO = ('PROGRAMADA', 'CONFIRMADA', 'EN_PROGRESO', 'COMPLETADA')
 
 
 # ============================================================
@@ -117,6 +121,8 @@ class Cita(models.Model):
     )
     updated_at         = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table      = 'CIT_CITAS'
         verbose_name  = 'Cita'
@@ -3,15 +3,18 @@ HealthTech Solutions — Serializers: Módulo Citas (M03)
 HIPAA: data_minimization activo.
   - CitaListSerializer:   sin notas clínicas completas
   - CitaDetailSerializer: ficha completa (solo con JWT válido + permisos)
-  - CitaCreateSerializer: validación de horario y conflictos
+  - CitaCreateSerializer: validación de horario y solapamientos (apps.appointments.disponibilidad)
 """
 
 from datetime import date, datetime
+from django.db import transaction
 from rest_framework import serializers
 
+from apps.appointments import disponibilidad
 from apps.appointments.models import (
     Cita, ESTADOS_CANCELABLES, ESTADOS_CONFIRMABLES, ESTADOS_COMPLETABLES,
 )
+from apps.core.serializers import NombreUsuarioField
 
 
 # ============================================================
@@ -22,7 +25,7 @@ from apps.appointments.models import (
 class CitaListSerializer(serializers.ModelSerializer):
     paciente_nombre     = serializers.SerializerMethodField()
     paciente_expediente = serializers.SerializerMethodField()
-    medico_nombre       = serializers.SerializerMethodField()
+    medico_nombre       = NombreUsuarioField('medico', vacio='')
     tipo_cita_display   = serializers.CharField(source='get_tipo_cita_display',  read_only=True)
     estado_display      = serializers.CharField(source='get_estado_display',     read_only=True)
     prioridad_display   = serializers.CharField(source='get_prioridad_display',  read_only=True)
@@ -52,9 +55,6 @@ class CitaListSerializer(serializers.ModelSerializer):
     def get_paciente_expediente(self, obj) -> str:
         return obj.paciente.no_expediente if obj.paciente_id else ''
 
-    def get_medico_nombre(self, obj) -> str:
-        return obj.medico.get_short_name() if obj.medico_id else ''
-
     def get_hora_inicio_fmt(self, obj) -> str:
         return obj.hora_inicio.strftime('%H:%M') if obj.hora_inicio else ''
 
@@ -66,7 +66,7 @@ class CitaListSerializer(serializers.ModelSerializer):
 # CITA — Ficha completa
 # ============================================================
 class CitaDetailSerializer(CitaListSerializer):
-    cancelada_por_nombre = serializers.SerializerMethodField()
+    cancelada_por_nombre = NombreUsuarioField('cancelada_por')
 
     class Meta(CitaListSerializer.Meta):
         fields = CitaListSerializer.Meta.fields + [
@@ -77,9 +77,6 @@ class CitaDetailSerializer(CitaListSerializer):
             'created_at', 'updated_at',
         ]
 
-    def get_cancelada_por_nombre(self, obj) -> str | None:
-        return obj.cancelada_por.get_short_name() if obj.cancelada_por_id else None
-
 
 # ============================================================
 # CITA — Creación / Edición
@@ -104,8 +101,6 @@ class CitaCreateSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         hora_inicio = attrs.get('hora_inicio')
         hora_fin    = attrs.get('hora_fin')
-        fecha_cita  = attrs.get('fecha_cita')
-        medico      = attrs.get('medico')
         hospital_id = self.context['request'].user.hospital_id
 
         # Validar que hora_fin > hora_inicio
@@ -120,42 +115,56 @@ class CitaCreateSerializer(serializers.ModelSerializer):
             dt_fin    = datetime.combine(date.today(), hora_fin)
             attrs['duracion_min'] = int((dt_fin - dt_inicio).seconds / 60)
 
-        # Verificar conflicto de horario del médico (doble-booking)
-        if medico and fecha_cita and hora_inicio:
-            qs = Cita.objects.filter(
-                hospital_id=hospital_id,
-                medico=medico,
-                fecha_cita=fecha_cita,
-                hora_inicio=hora_inicio,
-                activo=True,
-            )
-            # En edición, excluir la cita actual
-            instance = self.instance
-            if instance:
-                qs = qs.exclude(pk=instance.pk)
-
-            if qs.exists():
-                raise serializers.ValidationError({
-                    'hora_inicio': (
-                        f'El médico ya tiene una cita programada el '
-                        f'{fecha_cita} a las {hora_inicio.strftime("%H:%M")}.'
-                    )
-                })
-
+        # Verificar solapamiento con otras citas del médico (doble-booking).
+        # Aviso temprano; la comprobación definitiva se repite en create/update
+        # con la fila del médico bloqueada.
+        self._verificar_solapamiento(hospital_id, attrs)
         return attrs
 
+    def _verificar_solapamiento(self, hospital_id, attrs):
+        # En edición parcial se completa con los valores actuales de la cita.
+        instance    = self.instance
+        medico      = attrs.get('medico') or (instance.medico if instance else None)
+        fecha_cita  = attrs.get('fecha_cita') or (instance.fecha_cita if instance else None)
+        hora_inicio = attrs.get('hora_inicio') or (instance.hora_inicio if instance else None)
+        hora_fin    = attrs.get('hora_fin') or (instance.hora_fin if instance else None)
+        if not (medico and fecha_cita and hora_inicio and hora_fin):
+            return
+        agenda = disponibilidad.agenda_vigente(
+            hospital_id, medico.pk, fecha_cita, excluir=instance.pk if instance else None,
+        )
+        if agenda.solapa(disponibilidad.minutos(hora_inicio), disponibilidad.minutos(hora_fin)):
+            raise serializers.ValidationError({
+                'hora_inicio': (
+                    f'El médico ya tiene una cita el {fecha_cita} que se cruza con el horario '
+                    f'{hora_inicio.strftime("%H:%M")}–{hora_fin.strftime("%H:%M")}.'
+                )
+            })
+
+    def _reservar(self, hospital_id, validated_data):
+        """Con la transacción abierta: bloquea al médico y revalida el horario."""
+        medico = validated_data.get('medico') or (self.instance.medico if self.instance else None)
+        if medico is not None:
+            disponibilidad.bloquear_medico(medico.pk)
+        self._verificar_solapamiento(hospital_id, validated_data)
+
     def create(self, validated_data):
         request = self.context['request']
-        return Cita.objects.create(
-            hospital_id=request.user.hospital_id,
-            created_by=request.user,
-            updated_by=request.user,
-            **validated_data,
-        )
+        with transaction.atomic():
+            self._reservar(request.user.hospital_id, validated_data)
+            return Cita.objects.create(
+                hospital_id=request.user.hospital_id,
+                created_by=request.user,
+                updated_by=request.user,
+                **validated_data,
+            )
 
     def update(self, instance, validated_data):
-        validated_data['updated_by'] = self.context['request'].user
-        return super().update(instance, validated_data)
+        request = self.context['request']
+        validated_data['updated_by'] = request.user
+        with transaction.atomic():
+            self._reservar(request.user.hospital_id, validated_data)
+            return super().update(instance, validated_data)
 
 
 # ============================================================
@@ -0,0 +1,120 @@
+"""
+HealthTech Solutions — Tests: Motor de disponibilidad de citas (apps/appointments/disponibilidad.py)
+Cobertura:
+  - AgendaDia: fusión de intervalos, solapamiento y huecos alineados al paso
+  - CitaCreateSerializer rechaza citas que se cruzan (no solo la misma hora_inicio); dos reservas
+    que validaron a la vez: la segunda se revalida con el médico bloqueado y se rechaza
+  - GET disponibilidad/: varios médicos, cache por médico-día e invalidación al cancelar
+"""
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from apps.appointments import disponibilidad
+from apps.appointments.disponibilidad import AgendaDia
+from apps.appointments.models import Cita
+from apps.appointments.serializers import CitaCreateSerializer
+from apps.patients.models import Paciente
+from apps.security.models import Usuario
+
+URL     = '/api/v1/appointments/'
+MANANA  = datetime.date.today() + datetime.timedelta(days=1)
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpio(settings):
+    settings.CITAS_JORNADA_INICIO, settings.CITAS_JORNADA_FIN, settings.CITAS_PASO_MIN = '08:00', '10:00', 30
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+@pytest.fixture
+def paciente(hospital):
+    return Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-D1', primer_nombre='Ana', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento='0000000000003', fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+def _cita(cliente, paciente, medico, inicio, fin):
+    return cliente.post(URL, {
+        'paciente': paciente.pk, 'medico': medico.pk, 'fecha_cita': str(MANANA),
+        'hora_inicio': inicio, 'hora_fin': fin, 'tipo_cita': 'CONSULTA', 'motivo': 'Control',
+    }, format='json')
+
+
+def test_agenda_dia():
+    agenda = AgendaDia([(540, 570), (480, 510), (500, 530)])       # 09:00-09:30, 08:00-08:50 fusionado
+    assert (agenda.inicios, agenda.fines) == ([480, 540], [530, 570])
+    assert agenda.solapa(520, 545) and agenda.solapa(485, 490)
+    assert not agenda.solapa(530, 540) and not agenda.solapa(570, 600)
+    assert agenda.libres(30, 480, 630, 15) == [(570, 600), (585, 615), (600, 630)]
+    assert agenda.libres(10, 480, 630, 15) == [(570, 580), (585, 595), (600, 610), (615, 625)]   # 08:50 no está alineado
+
+
+def test_rechaza_citas_solapadas(cliente, paciente, usuario_medico):
+    assert _cita(cliente, paciente, usuario_medico, '08:00', '09:00').status_code == 201
+    r = _cita(cliente, paciente, usuario_medico, '08:30', '09:30')
+    assert r.status_code == 400 and 'hora_inicio' in r.json()
+    assert _cita(cliente, paciente, usuario_medico, '09:00', '09:30').status_code == 201
+
+
+def test_reservas_simultaneas_se_serializan(paciente, usuario_medico, monkeypatch):
+    bloqueos = []
+    original = disponibilidad.bloquear_medico
+    monkeypatch.setattr(disponibilidad, 'bloquear_medico', lambda m: bloqueos.append(m) or original(m))
+    contexto = {'request': SimpleNamespace(user=usuario_medico)}
+
+    def _serializer(inicio, fin):
+        return CitaCreateSerializer(data={
+            'paciente': paciente.pk, 'medico': usuario_medico.pk, 'fecha_cita': str(MANANA),
+            'hora_inicio': inicio, 'hora_fin': fin, 'tipo_cita': 'CONSULTA', 'motivo': 'Control',
+        }, context=contexto)
+
+    primera, segunda = _serializer('08:00', '09:00'), _serializer('08:30', '09:30')
+    assert primera.is_valid() and segunda.is_valid()                # Ambas validan antes de insertar
+    primera.save()
+    with pytest.raises(ValidationError):
+        segunda.save()                                                # Revalidada con el médico bloqueado
+    assert Cita.objects.filter(medico=usuario_medico).count() == 1
+    assert bloqueos == [usuario_medico.pk, usuario_medico.pk]
+
+
+def test_disponibilidad_varios_medicos(cliente, paciente, usuario_medico, django_capture_on_commit_callbacks):
+    otro = Usuario.objects.create_user(
+        username='dra.otra', email='dra.otra@healthtech.gt', password='TestPass2026!',
+        hospital_id=usuario_medico.hospital_id, rol=usuario_medico.rol,
+        primer_nombre='Lucía', primer_apellido='Ramos', tipo_personal='MEDICO',
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        cita = _cita(cliente, paciente, usuario_medico, '08:30', '09:30').json()
+
+    params = {'medico': f'{usuario_medico.pk},{otro.pk}', 'fecha_desde': str(MANANA), 'duracion': 30}
+    datos = cliente.get(f'{URL}disponibilidad/', params).json()
+    horarios = {r['medico']: [h['hora_inicio'] for h in r['horarios']] for r in datos['resultados']}
+    assert horarios == {usuario_medico.pk: ['08:00', '09:30'], otro.pk: ['08:00', '08:30', '09:00', '09:30']}
+
+    # Segunda búsqueda: agendas desde cache (solo la consulta de médicos)
+    with CaptureQueriesContext(connection) as consultas:
+        cliente.get(f'{URL}disponibilidad/', params)
+    assert not [q for q in consultas if 'CIT_CITAS' in q['sql']]
+
+    # Cancelar libera el horario (invalidación tras el commit)
+    with django_capture_on_commit_callbacks(execute=True):
+        cliente.post(f'{URL}{cita["cit_id"]}/cancelar/', {'motivo_cancelacion': 'Paciente reprograma'}, format='json')
+    datos = cliente.get(f'{URL}disponibilidad/', {**params, 'medico': usuario_medico.pk}).json()
+    assert len(datos['resultados'][0]['horarios']) == 4
+
+    assert cliente.get(f'{URL}disponibilidad/', {'duracion': 2}).status_code == 400
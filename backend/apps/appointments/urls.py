@@ -10,6 +10,9 @@ Acciones de máquina de estados:
   POST  /api/v1/appointments/{id}/confirmar/
   POST  /api/v1/appointments/{id}/cancelar/
   POST  /api/v1/appointments/{id}/completar/
+
+Disponibilidad:
+  GET   /api/v1/appointments/disponibilidad/?medico=&fecha_desde=&fecha_hasta=&duracion=
 """
 
 from django.urls import path, include
@@ -1,7 +1,7 @@
 """
 HealthTech Solutions — Views: Módulo Citas (M03)
 HIPAA: Auditoría PHI_ACCESS en TODOS los accesos a citas.
-VPD:   En DEV se filtra manualmente por hospital_id del usuario autenticado.
+VPD:   En DEV filtra TenantManager (hospital del request, apps.core.managers).
        En PROD Oracle VPD aplica el filtro a nivel de sesión de BD.
 
 Máquina de estados de la cita:
@@ -10,17 +10,19 @@ Máquina de estados de la cita:
   PROGRAMADA|CONFIRMADA|EN_PROGRESO → cancelar() → CANCELADA
 """
 
-import logging
-from datetime import date, timezone as dt_timezone
+from datetime import date, timedelta, timezone as dt_timezone
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.audit import audit_phi_for
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
+from apps.appointments import disponibilidad
 from apps.appointments.models import (
     Cita,
     ESTADOS_CANCELABLES, ESTADOS_CONFIRMABLES, ESTADOS_COMPLETABLES,
@@ -29,37 +31,13 @@ from apps.appointments.serializers import (
     CitaListSerializer, CitaDetailSerializer, CitaCreateSerializer,
     CitaCancelarSerializer, CitaCompletarSerializer,
 )
-from apps.security.models import AuditoriaAcceso
-
-logger = logging.getLogger('healthtech.audit')
 
 
 # ============================================================
 # Helpers internos
 # ============================================================
-def _get_ip(request) -> str:
-    x_fwd = request.META.get('HTTP_X_FORWARDED_FOR')
-    return x_fwd.split(',')[0].strip() if x_fwd else request.META.get('REMOTE_ADDR', '0.0.0.0')
-
-
-def _audit_phi(request, accion: str, cit_id: str, descripcion: str = '') -> None:
-    """Registra evento PHI_ACCESS en SEC_AUDITORIA_ACCESOS. Cumplimiento HIPAA."""
-    try:
-        AuditoriaAcceso.objects.create(
-            hospital_id=request.user.hospital_id,
-            usuario=request.user,
-            tipo_evento='PHI_ACCESS',
-            modulo='appointments',
-            accion=accion,
-            tabla_afectada='CIT_CITAS',
-            registro_id=cit_id,
-            ip_origen=_get_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
-            descripcion=descripcion or f'{accion} cita #{cit_id}',
-            exitoso=True,
-        )
-    except Exception as exc:
-        logger.warning('Fallo al registrar auditoría PHI (citas): %s', exc)
+# Auditoría HIPAA: pipeline asíncrono por lotes (apps.core.audit)
+_audit_phi = audit_phi_for('appointments', 'CIT_CITAS', 'cita')
 
 
 # ============================================================
@@ -80,6 +58,7 @@ class CitaViewSet(viewsets.ModelViewSet):
     POST   /api/v1/appointments/{id}/confirmar/   PROGRAMADA → CONFIRMADA
     POST   /api/v1/appointments/{id}/cancelar/    → CANCELADA (requiere motivo)
     POST   /api/v1/appointments/{id}/completar/   → COMPLETADA (notas opcionales)
+    GET    /api/v1/appointments/disponibilidad/   Horarios libres de uno o varios médicos
     """
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     filter_backends    = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -95,13 +74,8 @@ class CitaViewSet(viewsets.ModelViewSet):
     ordering           = ['fecha_cita', 'hora_inicio']
 
     def get_queryset(self):
-        qs   = Cita.objects.select_related('paciente', 'medico', 'cancelada_por').filter(activo=True)
-        user = self.request.user
-
-        # VPD manual en DEV
-        if not settings.VPD_ENABLED:
-            if getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-                qs = qs.filter(hospital_id=user.hospital_id)
+        # Filtro de hospital: TenantManager
+        qs = Cita.objects.activos().select_related('paciente', 'medico', 'cancelada_por')
 
         # Filtro por rango de fechas (query params opcionales)
         fecha_desde = self.request.query_params.get('fecha_desde')
@@ -145,6 +119,7 @@ class CitaViewSet(viewsets.ModelViewSet):
         serializer = CitaCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         cita = serializer.save()
+        disponibilidad.invalidar(cita)
         _audit_phi(
             request, 'create', str(cita.cit_id),
             f'Cita creada: {cita.paciente} el {cita.fecha_cita} a las {cita.hora_inicio}'
@@ -162,7 +137,9 @@ class CitaViewSet(viewsets.ModelViewSet):
             instance, data=request.data, partial=partial, context={'request': request}
         )
         serializer.is_valid(raise_exception=True)
+        dia_anterior = (instance.medico_id, instance.fecha_cita)
         cita = serializer.save()
+        disponibilidad.invalidar(cita, dia_anterior)
         _audit_phi(
             request, 'edit', str(cita.cit_id),
             f'Cita actualizada: {cita.paciente} el {cita.fecha_cita}'
@@ -175,6 +152,7 @@ class CitaViewSet(viewsets.ModelViewSet):
         cita.activo    = False
         cita.updated_by = request.user
         cita.save(update_fields=['activo', 'updated_by', 'updated_at'])
+        disponibilidad.invalidar(cita)
         _audit_phi(
             request, 'delete', str(cita.cit_id),
             f'Cita desactivada (soft-delete): #{cita.cit_id}'
@@ -184,6 +162,49 @@ class CitaViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
+    # ── Disponibilidad (motor de agendas) ───────────────────
+    @action(detail=False, methods=['get'], url_path='disponibilidad')
+    def disponibilidad(self, request):
+        """
+        GET /api/v1/appointments/disponibilidad/?medico=3,7&fecha_desde=&fecha_hasta=&duracion=30
+        Horarios libres por médico y día. Sin `medico`: todos los médicos
+        activos del hospital. fecha_desde = hoy y fecha_hasta = fecha_desde
+        por defecto (rango máximo CITAS_DISPONIBILIDAD_DIAS_MAX).
+        """
+        params = request.query_params
+        try:
+            fecha_desde = date.fromisoformat(params['fecha_desde']) if params.get('fecha_desde') else date.today()
+            fecha_hasta = date.fromisoformat(params['fecha_hasta']) if params.get('fecha_hasta') else fecha_desde
+            duracion    = int(params.get('duracion', 30))
+            medico_ids  = sorted({int(m) for valor in params.getlist('medico') for m in valor.split(',') if m})
+        except ValueError:
+            return Response({'detail': 'Parámetros inválidos (fechas ISO, duracion y medico numéricos).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not 5 <= duracion <= 480:
+            return Response({'detail': 'duracion debe estar entre 5 y 480 minutos.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if fecha_hasta < fecha_desde or fecha_hasta - fecha_desde >= timedelta(days=settings.CITAS_DISPONIBILIDAD_DIAS_MAX):
+            return Response({'detail': f'Rango de fechas inválido (máximo {settings.CITAS_DISPONIBILIDAD_DIAS_MAX} días).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Solo médicos activos del hospital (los ids ajenos se ignoran)
+        hospital_id = request.user.hospital_id
+        medicos = get_user_model().objects.filter(hospital_id=hospital_id, tipo_personal='MEDICO', activo=True)
+        if medico_ids:
+            medicos = medicos.filter(pk__in=medico_ids)
+        nombres = {pk: f'{nombre} {apellido}'
+                   for pk, nombre, apellido in medicos.values_list('pk', 'primer_nombre', 'primer_apellido')}
+
+        resultados = disponibilidad.horarios_libres(hospital_id, nombres, fecha_desde, fecha_hasta, duracion)
+        for fila in resultados:
+            fila['medico_nombre'] = nombres[fila['medico']]
+        return Response({
+            'fecha_desde': fecha_desde,
+            'fecha_hasta': fecha_hasta,
+            'duracion':    duracion,
+            'resultados':  resultados,
+        })
+
     # ============================================================
     # Acciones de máquina de estados
     # ============================================================
@@ -243,6 +264,7 @@ class CitaViewSet(viewsets.ModelViewSet):
             'cancelada_por', 'cancelada_en',
             'updated_by', 'updated_at',
         ])
+        disponibilidad.invalidar(cita)
 
         _audit_phi(
             request, 'edit', str(cita.cit_id),
@@ -281,6 +303,7 @@ class CitaViewSet(viewsets.ModelViewSet):
             update_fields.append('notas_medico')
 
         cita.save(update_fields=update_fields)
+        disponibilidad.invalidar(cita)
 
         _audit_phi(
             request, 'edit', str(cita.cit_id),
@@ -0,0 +1,407 @@
+"""
+HealthTech Solutions — Pipeline de auditoría HIPAA (SEC_AUDITORIA_ACCESOS)
+
+Sustituye el INSERT síncrono por request (_audit_phi en cada módulo) por:
+  1. Cola en memoria acotada (AUDIT_QUEUE_MAXSIZE) donde las vistas encolan.
+  2. Hilo de vaciado (daemon) que inserta lotes con executemany (array binds
+     en oracledb) al alcanzar AUDIT_BATCH_SIZE o cada AUDIT_FLUSH_INTERVAL s.
+  3. Spool local JSONL (AUDIT_SPOOL_DIR): cada evento se escribe (y fsync)
+     en un segmento antes de encolarse. El segmento solo se borra cuando su
+     lote quedó confirmado en Oracle — si la BD está lenta/caída, el worker
+     muere o el host se cae, los segmentos huérfanos se re-insertan en el
+     siguiente ciclo de cualquier worker (protegidos con flock para evitar
+     doble inserción). Las filas ilegibles o que Oracle rechaza con la BD
+     disponible pasan a AUDIT_SPOOL_DIR/cuarentena/ y no bloquean el resto.
+  4. Métricas: profundidad de cola, latencia de flush, lotes fallidos
+     (expuestas en /api/v1/health/ → 'audit').
+
+En tests (AUDIT_ASYNC = False) la escritura es síncrona en el mismo request.
+"""
+
+import atexit
+import fcntl
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger('healthtech.audit')
+
+
+# ============================================================
+# Helpers de request
+# ============================================================
+def get_client_ip(request) -> str:
+    """IP real del cliente (primer hop de X-Forwarded-For detrás del LB)."""
+    x_fwd = request.META.get('HTTP_X_FORWARDED_FOR')
+    return x_fwd.split(',')[0].strip() if x_fwd else request.META.get('REMOTE_ADDR', '0.0.0.0')
+
+
+# ============================================================
+# Escritor por lotes
+# ============================================================
+class AuditWriter:
+    """
+    Escritor asíncrono de SEC_AUDITORIA_ACCESOS, uno por proceso.
+    El hilo de vaciado se arranca de forma perezosa en el primer evento
+    (después del fork de gunicorn) y se re-crea si cambia el PID.
+    """
+
+    SEGMENT_SUFFIX = '.jsonl'
+    QUARANTINE_DIR = 'cuarentena'
+
+    def __init__(self):
+        self._lock      = threading.Lock()
+        self._wakeup    = threading.Event()
+        self._pid       = None
+        self._thread    = None
+        self._queue     = None
+        self._segment   = None    # (path, file) del segmento activo
+        self._pending   = 0       # eventos en el segmento activo
+        self._overflow  = False   # la cola se llenó: leer el segmento desde disco
+        self._stats     = {
+            'encolados':        0,
+            'insertados':       0,
+            'desbordados':      0,
+            'lotes':            0,
+            'lotes_fallidos':   0,
+            'en_cuarentena':    0,
+            'ultimo_flush_ms':  None,
+            'max_flush_ms':     0.0,
+            'ultimo_error':     '',
+        }
+
+    # --------------------------------------------------------
+    # Configuración
+    # --------------------------------------------------------
+    @property
+    def async_enabled(self) -> bool:
+        return getattr(settings, 'AUDIT_ASYNC', True)
+
+    @property
+    def batch_size(self) -> int:
+        return getattr(settings, 'AUDIT_BATCH_SIZE', 200)
+
+    @property
+    def flush_interval(self) -> float:
+        return getattr(settings, 'AUDIT_FLUSH_INTERVAL', 2.0)
+
+    @property
+    def spool_dir(self) -> Path:
+        return Path(getattr(settings, 'AUDIT_SPOOL_DIR', settings.BASE_DIR / 'logs' / 'audit_spool'))
+
+    # --------------------------------------------------------
+    # API pública
+    # --------------------------------------------------------
+    def submit(self, row: dict) -> None:
+        """Registra un evento. Nunca lanza excepción hacia la vista."""
+        row.setdefault('created_at', timezone.now())
+        if not self.async_enabled:
+            self._insert_rows([row])
+            return
+
+        self._ensure_started()
+        with self._lock:
+            self._write_segment(row)
+            self._pending += 1
+            self._stats['encolados'] += 1
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                # El evento ya está en disco; el flusher leerá el segmento.
+                self._overflow = True
+                self._stats['desbordados'] += 1
+            if self._pending >= self.batch_size:
+                self._wakeup.set()
+
+    def flush(self) -> None:
+        """Rota el segmento activo e inserta su lote (también reintenta huérfanos)."""
+        with self._lock:
+            segment, pending, overflow = self._segment, self._pending, self._overflow
+            self._segment, self._pending, self._overflow = None, 0, False
+            rows = self._drain_queue()
+
+        if segment is not None:
+            path, fh = segment
+            fh.flush()
+            if pending == 0:
+                self._discard_segment(path, fh)
+            else:
+                invalidas = []
+                if overflow:
+                    rows, invalidas = self._read_segment(path)
+                if self._insert_rows(rows):
+                    self._quarantine(path, invalidas)
+                    self._discard_segment(path, fh)
+                else:
+                    # Se libera el lock: el segmento queda para reintento.
+                    fh.close()
+
+        self.replay_spool()
+
+    def replay_spool(self) -> int:
+        """Re-inserta segmentos huérfanos (workers caídos o lotes fallidos)."""
+        directory = self.spool_dir
+        if not directory.exists():
+            return 0
+        replayed = 0
+        for path in sorted(directory.glob(f'*{self.SEGMENT_SUFFIX}')):
+            try:
+                fh = open(path, 'a+', encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                fh.close()       # Segmento activo de otro proceso
+                continue
+            rows, invalidas = self._read_segment(path)
+            if rows and not self._insert_rows(rows):
+                if not self._db_available():
+                    fh.close()
+                    break        # BD no disponible: reintentar en el próximo ciclo
+                # La BD responde: el lote trae filas que Oracle rechaza.
+                # Se insertan una a una y las rechazadas van a cuarentena.
+                aceptadas, rechazadas = [], []
+                for row in rows:
+                    (aceptadas if self._insert_rows([row]) else rechazadas).append(row)
+                invalidas += [self._serialize(row) for row in rechazadas]
+                rows = aceptadas
+            self._quarantine(path, invalidas)
+            self._discard_segment(path, fh)
+            replayed += len(rows)
+        if replayed:
+            logger.info('Auditoría: %s eventos re-insertados desde spool.', replayed)
+        return replayed
+
+    def metrics(self) -> dict:
+        directory = self.spool_dir
+        segments = len(list(directory.glob(f'*{self.SEGMENT_SUFFIX}'))) if directory.exists() else 0
+        with self._lock:
+            return {
+                'modo':              'async' if self.async_enabled else 'sync',
+                'cola_profundidad':  self._queue.qsize() if self._queue else 0,
+                'pendientes':        self._pending,
+                'segmentos_spool':   segments,
+                **self._stats,
+            }
+
+    # --------------------------------------------------------
+    # Hilo de vaciado
+    # --------------------------------------------------------
+    def _ensure_started(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == pid and self._thread is not None:
+                return
+            # Proceso nuevo (o fork): estado limpio — el segmento heredado
+            # pertenece al padre y lo recupera replay_spool().
+            self._pid      = pid
+            self._queue    = queue.Queue(maxsize=getattr(settings, 'AUDIT_QUEUE_MAXSIZE', 10000))
+            self._segment  = None
+            self._pending  = 0
+            self._overflow = False
+            self._wakeup   = threading.Event()
+            self._thread   = threading.Thread(
+                target=self._run, name='healthtech-audit-flusher', daemon=True,
+            )
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as exc:     # El hilo nunca debe morir
+                logger.error('Auditoría: error en flusher: %s', exc)
+            finally:
+                close_old_connections()
+
+    def _drain_queue(self) -> list:
+        rows = []
+        if self._queue is None:
+            return rows
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    # --------------------------------------------------------
+    # Spool (segmentos JSONL protegidos con flock)
+    # --------------------------------------------------------
+    def _write_segment(self, row: dict) -> None:
+        if self._segment is None:
+            directory = self.spool_dir
+            directory.mkdir(parents=True, exist_ok=True)
+            name = f'{os.getpid()}-{uuid.uuid4().hex}'
+            tmp  = directory / f'{name}.tmp'
+            fh   = open(tmp, 'a', encoding='utf-8')
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            # Renombrar con el lock tomado: replay_spool() nunca ve el
+            # segmento sin dueño.
+            path = directory / f'{name}{self.SEGMENT_SUFFIX}'
+            os.replace(tmp, path)
+            self._fsync_dir(directory)
+            self._segment = (path, fh)
+        path, fh = self._segment
+        fh.write(self._serialize(row))
+        fh.flush()
+        os.fsync(fh.fileno())    # Sobrevive a la caída del host, no solo del proceso
+
+    @staticmethod
+    def _serialize(row: dict) -> str:
+        data = dict(row)
+        data['created_at'] = data['created_at'].isoformat()
+        return json.dumps(data, ensure_ascii=False) + '\n'
+
+    @staticmethod
+    def _read_segment(path: Path) -> tuple[list, list]:
+        """(filas, líneas ilegibles) del segmento."""
+        rows, invalidas = [], []
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                try:
+                    data = json.loads(line)
+                    data['created_at'] = parse_datetime(data['created_at'])
+                    if data['created_at'] is None:
+                        raise ValueError('created_at vacío')
+                except (ValueError, TypeError, KeyError):
+                    invalidas.append(line if line.endswith('\n') else line + '\n')
+                    continue     # Línea truncada por caída del proceso o corrupta
+                rows.append(data)
+        return rows, invalidas
+
+    def _quarantine(self, path: Path, lineas: list) -> None:
+        """Aparta líneas que no se pueden insertar: quedan para revisión manual, no se reintentan."""
+        if not lineas:
+            return
+        directory = self.spool_dir / self.QUARANTINE_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / path.name, 'a', encoding='utf-8') as fh:
+            fh.writelines(lineas)
+            fh.flush()
+            os.fsync(fh.fileno())
+        with self._lock:
+            self._stats['en_cuarentena'] += len(lineas)
+        logger.error('Auditoría: %s eventos de %s movidos a cuarentena.', len(lineas), path.name)
+
+    @staticmethod
+    def _fsync_dir(directory: Path) -> None:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _db_available() -> bool:
+        try:
+            connection.ensure_connection()
+            return connection.is_usable()
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard_segment(path: Path, fh) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        fh.close()
+
+    # --------------------------------------------------------
+    # Inserción por lotes (executemany → array binds en Oracle)
+    # --------------------------------------------------------
+    def _insert_rows(self, rows: list) -> bool:
+        from apps.security.models import AuditoriaAcceso
+
+        if not rows:
+            return True
+        started = time.monotonic()
+        fields  = [f for f in AuditoriaAcceso._meta.concrete_fields if not f.primary_key]
+        columns = ', '.join(connection.ops.quote_name(f.column) for f in fields)
+        marks   = ', '.join(['%s'] * len(fields))
+        sql     = (
+            f'INSERT INTO {connection.ops.quote_name(AuditoriaAcceso._meta.db_table)} '
+            f'({columns}) VALUES ({marks})'
+        )
+        params = [
+            [
+                f.get_db_prep_save(row.get(f.attname, f.get_default()), connection)
+                for f in fields
+            ]
+            for row in rows
+        ]
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for i in range(0, len(params), self.batch_size):
+                        cursor.executemany(sql, params[i:i + self.batch_size])
+        except Exception as exc:
+            with self._lock:
+                self._stats['lotes_fallidos'] += 1
+                self._stats['ultimo_error']    = str(exc)[:200]
+            logger.warning('Fallo al registrar auditoría PHI (%s eventos): %s', len(rows), exc)
+            return False
+
+        elapsed = (time.monotonic() - started) * 1000
+        with self._lock:
+            self._stats['insertados']      += len(rows)
+            self._stats['lotes']           += 1
+            self._stats['ultimo_flush_ms']  = round(elapsed, 2)
+            self._stats['max_flush_ms']     = round(max(self._stats['max_flush_ms'], elapsed), 2)
+        return True
+
+
+audit_writer = AuditWriter()
+
+
+# ============================================================
+# Helper único para las vistas
+# ============================================================
+def audit_phi(request, accion: str, registro_id, descripcion: str = '', *,
+              modulo: str, tabla_afectada: str, entidad: str = 'registro') -> None:
+    """
+    Registra un evento PHI_ACCESS en SEC_AUDITORIA_ACCESOS (best-effort).
+    Las vistas lo enlazan con functools.partial (ver audit_phi_for) para
+    conservar la firma _audit_phi(request, accion, id, descripcion).
+    """
+    try:
+        user = request.user
+        audit_writer.submit({
+            'hospital_id':    getattr(user, 'hospital_id', None),
+            'usuario_id':     user.pk,
+            'tipo_evento':    'PHI_ACCESS',
+            'modulo':         modulo,
+            'accion':         accion,
+            'tabla_afectada': tabla_afectada,
+            'registro_id':    str(registro_id),
+            'ip_origen':      get_client_ip(request),
+            'user_agent':     request.META.get('HTTP_USER_AGENT', '')[:500],
+            'descripcion':    (descripcion or f'{accion} {entidad} #{registro_id}')[:1000],
+            'exitoso':        True,
+        })
+    except Exception as exc:
+        logger.warning('Fallo al registrar auditoría PHI (%s): %s', modulo, exc)
+
+
+def audit_phi_for(modulo: str, tabla_afectada: str, entidad: str = 'registro'):
+    """Devuelve el _audit_phi de un módulo: audit_phi con modulo/tabla fijos."""
+    return partial(audit_phi, modulo=modulo, tabla_afectada=tabla_afectada, entidad=entidad)
@@ -0,0 +1,391 @@
+"""
+HealthTech Solutions — Benchmark de endpoints
+Catálogo de escenarios (list / detail / acciones de máquina de estados de
+las once apps) y runner que mide, por escenario:
+
+  - consultas SQL por request (máximo observado, caché fría)
+  - latencia p50 / p95 en ms
+
+El resultado se guarda como baseline JSON y se compara contra él con
+presupuestos configurables; cualquier N+1 o scan nuevo se refleja en
+consultas o en latencia antes de llegar al RAC.
+
+Usado por: manage.py bench_endpoints (dataset de apps.core.datasets).
+"""
+
+import datetime
+import json
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.appointments.models import Cita
+from apps.core.serializers import invalidar_nombres_usuario
+from apps.emergency.models import Emergencia
+from apps.hospitalization.models import Cama, Encamamiento
+from apps.laboratory.models import OrdenLab
+from apps.nursing.models import NotaEnfermeria, SignoVital
+from apps.pacs.models import EstudioImagen
+from apps.patients.models import Paciente
+from apps.pharmacy.models import Dispensacion, Medicamento
+from apps.security.models import AuditoriaAcceso, Usuario
+from apps.surgery.models import Cirugia
+from apps.warehouse.models import Movimiento, Producto
+
+
+# ============================================================
+# Escenario
+# ============================================================
+@dataclass(frozen=True)
+class Escenario:
+    """
+    Un endpoint a medir.
+
+    url:     ruta; '{pk}' se sustituye por un registro de `origen`.
+    origen:  callable(hospital_id) → queryset de candidatos para '{pk}'.
+    consume: la acción cambia el estado del registro; cada iteración usa
+             un registro distinto (reservado, no se comparte entre escenarios).
+    payload: dict o callable(hospital_id) → dict para POST.
+    """
+    nombre:  str
+    url:     str
+    metodo:  str = 'get'
+    origen:  Callable | None = None
+    payload: dict | Callable | None = None
+    consume: bool = False
+    rol:     str = 'ADMIN_HOSPITAL'
+    estado:  int = 200
+
+
+def _detalle(nombre, url, origen, **kwargs):
+    return Escenario(nombre, url, origen=origen, **kwargs)
+
+
+def _accion(nombre, url, origen, payload=None, **kwargs):
+    return Escenario(nombre, url, metodo='post', origen=origen, payload=payload or {}, **kwargs)
+
+
+def _medico(h):
+    return {'medico_id': Usuario.objects.filter(hospital_id=h, tipo_personal='MEDICO', activo=True)
+                                       .order_by('pk').values_list('pk', flat=True).first()}
+
+
+# ============================================================
+# Catálogo — orden de ejecución (las acciones destructivas al final)
+# ============================================================
+def _estado(modelo, *estados):
+    return lambda h: modelo.objects.filter(hospital_id=h, estado__in=estados)
+
+
+def _todos(modelo):
+    return lambda h: modelo.objects.filter(hospital_id=h)
+
+
+def _movimiento(h):
+    return {'producto': Producto.objects.filter(hospital_id=h).order_by('pk').values_list('pk', flat=True).first(),
+            'tipo_movimiento': 'ENTRADA', 'cantidad': 5}
+
+
+def _recepcion(h):
+    # Recepción de proveedor: 200 líneas sobre 50 productos
+    productos = list(Producto.objects.filter(hospital_id=h).order_by('pk').values_list('pk', flat=True)[:50])
+    return {'referencia': 'FAC-BENCH', 'movimientos': [
+        {'producto': productos[i % len(productos)], 'tipo_movimiento': 'ENTRADA', 'cantidad': 10}
+        for i in range(200)
+    ]}
+
+
+ESCENARIOS = [
+    # --- security ---
+    Escenario('security.usuarios.list',      '/api/v1/auth/usuarios/'),
+    _detalle('security.usuarios.detail',     '/api/v1/auth/usuarios/{pk}/', _todos(Usuario)),
+    Escenario('security.auditoria.list',     '/api/v1/auth/auditoria/', rol='SUPER_ADMIN'),
+    _detalle('security.auditoria.detail',    '/api/v1/auth/auditoria/{pk}/', _todos(AuditoriaAcceso),
+             rol='SUPER_ADMIN'),
+    Escenario('security.auditoria.reporte',  '/api/v1/auth/auditoria/reporte/?tipo_evento=EXPORT',
+              rol='SUPER_ADMIN'),
+    # --- patients ---
+    Escenario('patients.list',               '/api/v1/patients/'),
+    Escenario('patients.search',             '/api/v1/patients/?search=garcia'),
+    _detalle('patients.detail',              '/api/v1/patients/{pk}/', _todos(Paciente)),
+    _detalle('patients.alergias',            '/api/v1/patients/{pk}/alergias/', _todos(Paciente)),
+    _detalle('patients.contactos',           '/api/v1/patients/{pk}/contactos/', _todos(Paciente)),
+    _detalle('patients.historial',           '/api/v1/patients/{pk}/historial/', _todos(Paciente)),
+    _detalle('patients.timeline',            '/api/v1/patients/{pk}/timeline/', _todos(Paciente)),
+    # --- appointments ---
+    Escenario('appointments.list',           '/api/v1/appointments/'),
+    Escenario('appointments.list.estado',    '/api/v1/appointments/?estado=PROGRAMADA'),
+    Escenario('appointments.disponibilidad', '/api/v1/appointments/disponibilidad/?duracion=30'),
+    _detalle('appointments.detail',          '/api/v1/appointments/{pk}/', _todos(Cita)),
+    _accion('appointments.confirmar',        '/api/v1/appointments/{pk}/confirmar/',
+            _estado(Cita, 'PROGRAMADA'), consume=True),
+    _accion('appointments.completar',        '/api/v1/appointments/{pk}/completar/',
+            _estado(Cita, 'CONFIRMADA', 'EN_PROGRESO'), consume=True),
+    _accion('appointments.cancelar',         '/api/v1/appointments/{pk}/cancelar/',
+            _estado(Cita, 'PROGRAMADA', 'CONFIRMADA'),
+            {'motivo_cancelacion': 'Paciente reprograma la cita'}, consume=True),
+    # --- emergency ---
+    Escenario('emergency.list',              '/api/v1/emergency/'),
+    Escenario('emergency.list.activas',      '/api/v1/emergency/?estado=ESPERA'),
+    Escenario('emergency.tablero',           '/api/v1/emergency/tablero/'),
+    _detalle('emergency.detail',             '/api/v1/emergency/{pk}/', _todos(Emergencia)),
+    _accion('emergency.atender',             '/api/v1/emergency/{pk}/atender/',
+            _estado(Emergencia, 'ESPERA'), _medico, consume=True),
+    _accion('emergency.observacion',         '/api/v1/emergency/{pk}/observacion/',
+            _estado(Emergencia, 'EN_ATENCION'), consume=True),
+    _accion('emergency.alta',                '/api/v1/emergency/{pk}/alta/',
+            _estado(Emergencia, 'EN_ATENCION', 'OBSERVACION'),
+            {'tipo_alta': 'MEDICA', 'diagnostico': 'Gastroenteritis aguda'}, consume=True),
+    # --- hospitalization ---
+    Escenario('hospitalization.camas.list',  '/api/v1/hospitalization/camas/'),
+    Escenario('hospitalization.camas.censo', '/api/v1/hospitalization/camas/censo/'),
+    Escenario('hospitalization.camas.mejor', '/api/v1/hospitalization/camas/mejor/?tipo_cama=UCI&oxigeno=1'),
+    _detalle('hospitalization.camas.detail', '/api/v1/hospitalization/camas/{pk}/', _todos(Cama)),
+    Escenario('hospitalization.list',        '/api/v1/hospitalization/'),
+    _detalle('hospitalization.detail',       '/api/v1/hospitalization/{pk}/', _todos(Encamamiento)),
+    _accion('hospitalization.evolucion',     '/api/v1/hospitalization/{pk}/evolucion/',
+            _estado(Encamamiento, 'INGRESADO', 'EN_TRATAMIENTO'), {'evolucion': 'Evoluciona favorablemente'}),
+    _accion('hospitalization.tratamiento',   '/api/v1/hospitalization/{pk}/tratamiento/',
+            _estado(Encamamiento, 'INGRESADO'), consume=True),
+    _accion('hospitalization.egreso',        '/api/v1/hospitalization/{pk}/egreso/',
+            _estado(Encamamiento, 'EN_TRATAMIENTO'),
+            {'tipo_egreso': 'ALTA_MEDICA', 'diagnostico_egreso': 'Neumonía resuelta'}, consume=True),
+    # --- surgery ---
+    Escenario('surgery.list',                '/api/v1/surgery/'),
+    Escenario('surgery.tablero',             '/api/v1/surgery/tablero/'),
+    Escenario('surgery.utilizacion',         '/api/v1/surgery/utilizacion/'),
+    _detalle('surgery.detail',               '/api/v1/surgery/{pk}/', _todos(Cirugia)),
+    _accion('surgery.iniciar',               '/api/v1/surgery/{pk}/iniciar/',
+            _estado(Cirugia, 'PROGRAMADA'), consume=True),
+    _accion('surgery.completar',             '/api/v1/surgery/{pk}/completar/',
+            _estado(Cirugia, 'EN_CURSO'),
+            {'hallazgos': 'Apéndice inflamado', 'diagnostico_postop': 'Apendicitis aguda'}, consume=True),
+    _accion('surgery.suspender',             '/api/v1/surgery/{pk}/suspender/',
+            _estado(Cirugia, 'EN_CURSO'), {'motivo': 'Inestabilidad hemodinámica'}, consume=True),
+    _accion('surgery.cancelar',              '/api/v1/surgery/{pk}/cancelar/',
+            _estado(Cirugia, 'PROGRAMADA'), {'motivo': 'Paciente no apto'}, consume=True),
+    # --- laboratory ---
+    Escenario('laboratory.list',             '/api/v1/laboratory/'),
+    _detalle('laboratory.detail',            '/api/v1/laboratory/{pk}/', _estado(OrdenLab, 'COMPLETADA')),
+    _detalle('laboratory.tendencia',         '/api/v1/laboratory/tendencia/?paciente={pk}&examen=Creatinina',
+             lambda h: Paciente.objects.filter(hospital_id=h, resultados_lab__codigo_examen='CREATININA')),
+    _accion('laboratory.procesar',           '/api/v1/laboratory/{pk}/procesar/',
+            _estado(OrdenLab, 'PENDIENTE'), consume=True),
+    _accion('laboratory.completar',          '/api/v1/laboratory/{pk}/completar/',
+            _estado(OrdenLab, 'EN_PROCESO'),
+            {'resultados': [{'nombre_examen': 'Hemoglobina', 'valor': '13.5', 'unidad': 'g/dL'},
+                            {'nombre_examen': 'Glucosa', 'valor': '98', 'unidad': 'mg/dL'}]},
+            consume=True),
+    _accion('laboratory.cancelar',           '/api/v1/laboratory/{pk}/cancelar/',
+            _estado(OrdenLab, 'PENDIENTE', 'EN_PROCESO'), {'motivo': 'Muestra hemolizada'}, consume=True),
+    # --- pharmacy ---
+    Escenario('pharmacy.medicamentos.list',  '/api/v1/pharmacy/medicamentos/'),
+    _detalle('pharmacy.medicamentos.detail', '/api/v1/pharmacy/medicamentos/{pk}/', _todos(Medicamento)),
+    _accion('pharmacy.medicamentos.reponer', '/api/v1/pharmacy/medicamentos/{pk}/reponer/',
+            _todos(Medicamento), {'cantidad': 10}),
+    Escenario('pharmacy.dispensaciones.list', '/api/v1/pharmacy/dispensaciones/'),
+    _detalle('pharmacy.dispensaciones.detail', '/api/v1/pharmacy/dispensaciones/{pk}/', _todos(Dispensacion)),
+    _accion('pharmacy.dispensar',            '/api/v1/pharmacy/dispensaciones/{pk}/dispensar/',
+            _estado(Dispensacion, 'PENDIENTE'), consume=True),
+    _accion('pharmacy.cancelar',             '/api/v1/pharmacy/dispensaciones/{pk}/cancelar/',
+            _estado(Dispensacion, 'PENDIENTE'), {'motivo_cancelacion': 'Cambio de tratamiento'},
+            consume=True),
+    # --- warehouse ---
+    Escenario('warehouse.productos.list',    '/api/v1/warehouse/productos/'),
+    _detalle('warehouse.productos.detail',   '/api/v1/warehouse/productos/{pk}/', _todos(Producto)),
+    Escenario('warehouse.existencias.hoy',   '/api/v1/warehouse/productos/existencias/'),
+    Escenario('warehouse.existencias.historico',
+              f'/api/v1/warehouse/productos/existencias/?fecha={datetime.date.today() - datetime.timedelta(days=45)}'),
+    _detalle('warehouse.productos.kardex',   '/api/v1/warehouse/productos/{pk}/kardex/', _todos(Producto)),
+    Escenario('warehouse.alertas',           '/api/v1/warehouse/alertas/?todos=1'),
+    Escenario('warehouse.movimientos.list',  '/api/v1/warehouse/movimientos/'),
+    Escenario('warehouse.movimientos.create', '/api/v1/warehouse/movimientos/', metodo='post',
+              payload=_movimiento, estado=201),
+    Escenario('warehouse.movimientos.lote',  '/api/v1/warehouse/movimientos/lote/', metodo='post',
+              payload=_recepcion),
+    _detalle('warehouse.movimientos.detail', '/api/v1/warehouse/movimientos/{pk}/', _todos(Movimiento)),
+    # --- nursing ---
+    Escenario('nursing.signos.list',         '/api/v1/nursing/signos-vitales/'),
+    _detalle('nursing.signos.serie',         '/api/v1/nursing/signos-vitales/serie/?encamamiento={pk}',
+             _estado(Encamamiento, 'INGRESADO', 'EN_TRATAMIENTO')),
+    Escenario('nursing.signos.deterioro',    '/api/v1/nursing/signos-vitales/deterioro/'),
+    _detalle('nursing.signos.detail',        '/api/v1/nursing/signos-vitales/{pk}/', _todos(SignoVital)),
+    Escenario('nursing.notas.list',          '/api/v1/nursing/notas/'),
+    _detalle('nursing.notas.detail',         '/api/v1/nursing/notas/{pk}/', _todos(NotaEnfermeria)),
+    # --- pacs ---
+    Escenario('pacs.estudios.list',          '/api/v1/imaging/estudios/'),
+    _detalle('pacs.estudios.detail',         '/api/v1/imaging/estudios/{pk}/', _todos(EstudioImagen)),
+    _accion('pacs.iniciar',                  '/api/v1/imaging/estudios/{pk}/iniciar/',
+            _estado(EstudioImagen, 'SOLICITADO'), consume=True),
+    _accion('pacs.informe',                  '/api/v1/imaging/estudios/{pk}/informe/',
+            _estado(EstudioImagen, 'EN_PROCESO'), {'informe': 'Sin hallazgos patológicos.'}, consume=True),
+    _accion('pacs.cancelar',                 '/api/v1/imaging/estudios/{pk}/cancelar/',
+            _estado(EstudioImagen, 'SOLICITADO'), {'motivo_cancelacion': 'Paciente no se presentó'},
+            consume=True),
+    # --- security (acciones) ---
+    _accion('security.usuarios.desbloquear', '/api/v1/auth/usuarios/{pk}/desbloquear/',
+            lambda h: Usuario.objects.filter(hospital_id=h, tipo_personal='ENFERMERO')),
+    _accion('security.usuarios.desactivar',  '/api/v1/auth/usuarios/{pk}/desactivar/',
+            lambda h: Usuario.objects.filter(hospital_id=h, tipo_personal='ENFERMERO', activo=True),
+            consume=True),
+]
+
+
+# ============================================================
+# Runner
+# ============================================================
+@dataclass
+class Resultado:
+    consultas: int
+    p50_ms:    float
+    p95_ms:    float
+    muestras:  list = field(default_factory=list, repr=False)
+
+    def a_dict(self) -> dict:
+        return {'consultas': self.consultas, 'p50_ms': self.p50_ms, 'p95_ms': self.p95_ms}
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil por rango más cercano (estable con pocas muestras)."""
+    ordenados = sorted(valores)
+    return ordenados[max(0, min(len(ordenados) - 1, round(p * len(ordenados)) - 1))]
+
+
+class BenchRunner:
+    """
+    Ejecuta escenarios contra un hospital ya cargado. Cada request se hace
+    con caché fría (cache.clear() + LRU de nombres) para que el conteo de
+    consultas sea determinista y refleje el peor caso.
+    """
+
+    def __init__(self, hospital_id: int, iteraciones: int = 20, calentamiento: int = 2):
+        self.h             = hospital_id
+        self.iteraciones   = iteraciones
+        self.calentamiento = calentamiento
+        self.reservados    = set()
+        self.clientes      = {}
+
+    def _cliente(self, rol: str) -> APIClient:
+        if rol not in self.clientes:
+            usuario = Usuario.objects.filter(hospital_id=self.h, rol__codigo=rol).order_by('pk').first()
+            if usuario is None:
+                raise LookupError(f'No hay usuario con rol {rol} en el hospital {self.h}.')
+            cliente = APIClient()
+            cliente.force_authenticate(user=usuario)
+            self.clientes[rol] = cliente
+        return self.clientes[rol]
+
+    def _reservar(self, esc: Escenario, n: int) -> list:
+        # Reserva por modelo: dos escenarios que consumen la misma tabla no comparten filas
+        modelo = esc.origen(self.h).model
+        qs = esc.origen(self.h).order_by('pk').values_list('pk', flat=True)
+        if not esc.consume:
+            pk = qs.first()
+            return [pk] * n if pk is not None else []
+        usados = [pk for m, pk in self.reservados if m is modelo]
+        pks = list(qs.exclude(pk__in=usados)[:n])
+        self.reservados.update((modelo, pk) for pk in pks)
+        return pks
+
+    def medir(self, esc: Escenario) -> Resultado:
+        total  = self.calentamiento + self.iteraciones
+        pks    = self._reservar(esc, total) if esc.origen else [None] * total
+        if len(pks) < total:
+            raise LookupError(
+                f'{esc.nombre}: {len(pks)} registros disponibles, se requieren {total} '
+                f'(aumentar --escala o reducir --iteraciones).'
+            )
+        cliente = self._cliente(esc.rol)
+        payload = esc.payload(self.h) if callable(esc.payload) else esc.payload
+
+        consultas, tiempos = 0, []
+        for i, pk in enumerate(pks):
+            url = esc.url.format(pk=pk)
+            cache.clear()
+            invalidar_nombres_usuario()
+            with CaptureQueriesContext(connection) as ctx:
+                inicio = time.perf_counter()
+                if esc.metodo == 'get':
+                    resp = cliente.get(url)
+                else:
+                    resp = cliente.post(url, payload, format='json')
+                if getattr(resp, 'streaming', False):
+                    b''.join(resp.streaming_content)
+                duracion = (time.perf_counter() - inicio) * 1000
+            if resp.status_code != esc.estado:
+                raise AssertionError(
+                    f'{esc.nombre}: {esc.metodo.upper()} {url} → {resp.status_code} '
+                    f'(esperado {esc.estado}): {getattr(resp, "data", "")}'
+                )
+            if i >= self.calentamiento:
+                tiempos.append(duracion)
+                consultas = max(consultas, len(ctx.captured_queries))
+
+        return Resultado(
+            consultas=consultas,
+            p50_ms=round(statistics.median(tiempos), 2),
+            p95_ms=round(percentil(tiempos, 0.95), 2),
+            muestras=tiempos,
+        )
+
+    def correr(self, escenarios=None, al_medir=None) -> dict:
+        resultados = {}
+        for esc in escenarios or ESCENARIOS:
+            resultados[esc.nombre] = self.medir(esc)
+            if al_medir:
+                al_medir(esc, resultados[esc.nombre])
+        return resultados
+
+
+# ============================================================
+# Baseline y presupuestos
+# ============================================================
+def guardar_baseline(ruta, resultados: dict, meta: dict) -> None:
+    datos = {
+        'meta':       meta,
+        'escenarios': {nombre: r.a_dict() for nombre, r in sorted(resultados.items())},
+    }
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def cargar_baseline(ruta) -> dict:
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comparar(resultados: dict, baseline: dict, presupuesto_consultas: int = 0,
+             presupuesto_latencia: float = 0.25, piso_ms: float = 2.0) -> list[str]:
+    """
+    Regresiones respecto al baseline:
+      - consultas > baseline + presupuesto_consultas
+      - p50 o p95 > baseline × (1 + presupuesto_latencia) y además
+        más de `piso_ms` por encima (ruido de timers en endpoints sub-ms).
+    Escenarios nuevos (sin baseline) no fallan.
+    """
+    regresiones = []
+    base = baseline.get('escenarios', {})
+    for nombre, r in sorted(resultados.items()):
+        previo = base.get(nombre)
+        if previo is None:
+            continue
+        limite = previo['consultas'] + presupuesto_consultas
+        if r.consultas > limite:
+            regresiones.append(
+                f'{nombre}: {r.consultas} consultas (baseline {previo["consultas"]}, límite {limite})'
+            )
+        for metrica in ('p50_ms', 'p95_ms'):
+            actual, antes = getattr(r, metrica), previo[metrica]
+            if actual > antes * (1 + presupuesto_latencia) and actual - antes > piso_ms:
+                regresiones.append(
+                    f'{nombre}: {metrica} {actual:.2f} ms (baseline {antes:.2f} ms, '
+                    f'+{(actual / antes - 1) * 100 if antes else 0:.0f}%)'
+                )
+    return regresiones
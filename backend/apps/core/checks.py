@@ -0,0 +1,27 @@
+"""
+HealthTech Solutions — System checks (manage.py check --deploy)
+core.E001: la caché 'default' debe ser compartida entre procesos. Los
+workers de gunicorn invalidan estado cacheado (principal de autenticación,
+etc.) desde el proceso que escribe; con una caché por proceso el resto de
+workers seguiría sirviendo la copia vieja.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+CACHES_POR_PROCESO = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+}
+
+
+@register(Tags.caches, deploy=True)
+def cache_compartida(app_configs, **kwargs):
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in CACHES_POR_PROCESO:
+        return []
+    return [Error(
+        f"La caché 'default' ({backend.rsplit('.', 1)[-1]}) no se comparte entre workers.",
+        hint='Definir REDIS_URL o usar DatabaseCache sobre APP_CACHE (config/settings/prod.py).',
+        id='core.E001',
+    )]
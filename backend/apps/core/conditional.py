@@ -0,0 +1,105 @@
+"""
+HealthTech Solutions — GET condicional (ETag / Last-Modified)
+Los frontends refrescan una y otra vez la misma ficha o el mismo catálogo;
+cada GET volvía a serializar el objeto completo (la ficha del paciente con
+alergias y contactos anidados) aunque nada hubiera cambiado.
+
+  - Detalle: el validador sale de (pk, UPDATED_AT) del objeto ya cargado
+    por get_object(); la vista puede sumar partes (p. ej. MAX(UPDATED_AT) y
+    conteo de los hijos anidados) con validadores_detalle().
+  - Lista (catálogos): COUNT + MAX(UPDATED_AT) del queryset filtrado en una
+    sola consulta, más los parámetros de la URL (página, búsqueda, orden).
+    StandardPagination reutiliza ese COUNT: el 200 no suma consultas.
+    Solo ETag, sin Last-Modified: con resolución de un segundo y sin el
+    conteo, If-Modified-Since daría un 304 viejo tras dos cambios en el
+    mismo segundo o tras un borrado físico (MAX(UPDATED_AT) no se mueve).
+  - El ETag (débil) es un hash de esas partes, el modelo, la acción y el
+    (hospital, rol) del usuario. If-None-Match (y en el detalle
+    If-Modified-Since) se resuelven con django.utils.cache: 304 sin
+    serializar ni paginar.
+  - La auditoría PHI del detalle (auditar_detalle) corre antes de decidir
+    el 304: el acceso a la ficha queda registrado igual.
+
+Todo cambio de estas filas debe tocar UPDATED_AT: save() lo hace por
+auto_now; los .update() con F() lo asignan explícitamente.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def calcular_etag(*partes) -> str:
+    """ETag débil a partir de las partes que determinan la representación."""
+    digest = hashlib.sha1('|'.join(str(p) for p in partes).encode()).hexdigest()[:24]
+    return f'W/"{digest}"'
+
+
+def no_modificado(request, etag: str, ultima=None):
+    """HttpResponseNotModified si los validadores del cliente siguen vigentes; si no, None."""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    last_modified = int(ultima.timestamp()) if ultima else None
+    respuesta = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if respuesta is not None:
+        con_validadores(respuesta, etag, ultima)
+    return respuesta
+
+
+def con_validadores(respuesta, etag: str, ultima=None):
+    respuesta['ETag'] = etag
+    if ultima:
+        respuesta['Last-Modified'] = http_date(ultima.timestamp())
+    return respuesta
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified para ViewSets de DRF.
+      retrieve: siempre (validadores_detalle)
+      list:     con etag_lista = True (catálogos; validadores_lista)
+    """
+    etag_lista = False
+
+    def auditar_detalle(self, instance) -> None:
+        """Auditoría del GET de detalle; se ejecuta también cuando se responde 304."""
+
+    def validadores_detalle(self, instance) -> tuple[tuple, object]:
+        """(partes del ETag, última modificación) del objeto."""
+        return (instance.pk, instance.updated_at), instance.updated_at
+
+    def validadores_lista(self, queryset) -> tuple:
+        """Partes del ETag de la lista: (conteo, última modificación)."""
+        agregado = queryset.order_by().aggregate(n=Count('pk'), ultima=Max('updated_at'))
+        self.conteo_lista = agregado['n']             # Lo reutiliza StandardPagination
+        return agregado['n'], agregado['ultima']
+
+    def _etag(self, modelo, partes: tuple) -> str:
+        user = self.request.user
+        return calcular_etag(
+            modelo._meta.label, self.action, getattr(user, 'hospital_id', None), getattr(user, 'rol_codigo', ''),
+            sorted(self.request.query_params.lists()), *partes,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        self.auditar_detalle(instance)
+        partes, ultima = self.validadores_detalle(instance)
+        etag = self._etag(type(instance), partes)
+        respuesta = no_modificado(request, etag, ultima)
+        if respuesta is not None:
+            return respuesta
+        return con_validadores(Response(self.get_serializer(instance).data), etag, ultima)
+
+    def list(self, request, *args, **kwargs):
+        if not self.etag_lista:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = self._etag(queryset.model, self.validadores_lista(queryset))
+        respuesta = no_modificado(request, etag)       # Sin Last-Modified: solo el ETag incluye el conteo
+        if respuesta is not None:
+            return respuesta
+        return con_validadores(super().list(request, *args, **kwargs), etag)
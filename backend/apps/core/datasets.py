@@ -0,0 +1,950 @@
+"""
+HealthTech Solutions — Generador de datasets sintéticos de alto volumen
+Carga masiva de hospitales completos con datos referencialmente consistentes
+y distribuciones de estado realistas:
+
+    usuarios → pacientes (+ alergias, contactos, historial, índice de búsqueda)
+             → camas → citas → emergencias → encamamientos (desde emergencia o cita)
+             → cirugías → órdenes de laboratorio (+ resultados) → medicamentos
+             → dispensaciones → productos → movimientos (kardex coherente)
+             → signos vitales → notas de enfermería → estudios de imagen → auditoría
+
+Pensado para millones de filas (1M pacientes, 20M signos vitales):
+  - Claves pre-asignadas: antes de cargar se reservan rangos de PK disjuntos
+    por hospital (MAX(pk) + volúmenes) para las entidades referenciadas; los
+    hijos calculan sus FK sin leer la BD ni retener objetos en memoria.
+    Las tablas hoja usan la IDENTITY/secuencia de la BD.
+  - Filas en streaming: generadores de dicts → executemany por lotes (array
+    DML en oracledb), un commit por lote. Mismo contrato que bulk_create
+    (defaults de campo, auto_now) sin su costo por campo y por fila.
+  - Un proceso por hospital (generar_dataset(procesos=N)) cuando la BD lo permite.
+  - Al terminar, IDENTITY y secuencias Oracle se resincronizan con MAX(pk).
+
+Determinista por semilla: la misma semilla y volúmenes producen el mismo
+dataset, requisito del benchmark de endpoints (apps.core.bench).
+No pasa por save() ni por señales.
+"""
+
+import itertools
+import random
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, models, transaction
+from django.utils import timezone
+
+from apps.appointments.models import Cita
+from apps.emergency.models import Emergencia
+from apps.hospitalization.models import Cama, Encamamiento
+from apps.laboratory.models import OrdenLab, ResultadoLab
+from apps.laboratory.resultados import codigo_examen, codigo_unidad
+from apps.nursing.models import NotaEnfermeria, SignoVital
+from apps.pacs.models import EstudioImagen
+from apps.patients.models import (
+    Alergia, ContactoEmergencia, HistorialClinico, Paciente, PacienteTermino,
+)
+from apps.patients.search import terminos_paciente
+from apps.pharmacy.models import Dispensacion, Medicamento
+from apps.security.models import AuditoriaAcceso, Hospital, Rol, Usuario
+from apps.surgery.models import Cirugia
+from apps.warehouse.existencias import fin_del_dia
+from apps.warehouse import reposicion
+from apps.warehouse.models import CorteStock, Movimiento, Producto, PuntoReorden
+
+
+# ============================================================
+# Volúmenes por hospital (escala 1.0)
+# ============================================================
+VOLUMENES_BASE = {
+    'medicos':          20,
+    'enfermeros':       30,
+    'pacientes':        8_000,
+    'alergias':         1_200,
+    'contactos':        2_000,
+    'historial':        2_000,
+    'camas':            150,
+    'citas':            8_000,
+    'emergencias':      3_000,
+    'encamamientos':    600,
+    'cirugias':         1_500,
+    'ordenes_lab':      3_000,
+    'medicamentos':     150,
+    'dispensaciones':   3_000,
+    'productos':        150,
+    'movimientos':      3_000,
+    'signos_vitales':   20_000,
+    'notas':            3_000,
+    'estudios':         1_500,
+    'auditoria':        10_000,
+}
+
+# Fracción de registros "en curso" (hoy/ayer): bandejas de trabajo de cada módulo
+FRACCION_EN_CURSO = 0.08
+
+# Agenda de citas: 365 días atrás + 60 adelante, 20 turnos de 30 min (07:00–16:30)
+DIAS_AGENDA = 426
+TURNOS_DIA  = 20
+
+# Usuarios fijos por hospital: (prefijo username, rol, tipo_personal, cantidad)
+USUARIOS_FIJOS = [
+    ('admin',   'ADMIN_HOSPITAL', 'ADMINISTRATIVO', 1),
+    ('auditor', 'AUDITOR',        'AUDITOR',        1),
+    ('lab',     'LABORATORISTA',  'LABORATORISTA',  4),
+    ('farm',    'FARMACEUTICO',   'FARMACEUTICO',   4),
+]
+
+PASSWORD_DATASET = 'HealthTech#Dataset2026'
+
+ROLES = [
+    ('SUPER_ADMIN',    'Super Administrador',        1),
+    ('ADMIN_HOSPITAL', 'Administrador de Hospital',  2),
+    ('MEDICO',         'Médico',                     3),
+    ('ENFERMERO',      'Enfermero(a)',               3),
+    ('LABORATORISTA',  'Laboratorista',              4),
+    ('FARMACEUTICO',   'Farmacéutico',               4),
+    ('AUDITOR',        'Auditor',                    4),
+]
+
+NOMBRES_M  = ['José', 'Juan', 'Carlos', 'Luis', 'Miguel', 'Jorge', 'Mario', 'Pedro',
+              'Fernando', 'Ricardo', 'Óscar', 'Edgar', 'Byron', 'Diego', 'Andrés']
+NOMBRES_F  = ['María', 'Ana', 'Rosa', 'Carmen', 'Lucía', 'Gabriela', 'Sofía', 'Andrea',
+              'Mónica', 'Claudia', 'Patricia', 'Elena', 'Wendy', 'Karla', 'Silvia']
+APELLIDOS  = ['García', 'López', 'Pérez', 'González', 'Rodríguez', 'Hernández', 'Martínez',
+              'Morales', 'Castillo', 'Ramírez', 'Cifuentes', 'Ajú', 'Xol', 'Tzul', 'Chávez',
+              'Méndez', 'Juárez', 'Orellana', 'Barrios', 'Estrada', 'Monzón', 'Cux']
+MUNICIPIOS = [('Guatemala', 'Guatemala'), ('Mixco', 'Guatemala'), ('Villa Nueva', 'Guatemala'),
+              ('Quetzaltenango', 'Quetzaltenango'), ('Cobán', 'Alta Verapaz'),
+              ('Escuintla', 'Escuintla'), ('Antigua Guatemala', 'Sacatepéquez')]
+MOTIVOS    = ['Dolor abdominal', 'Cefalea intensa', 'Fiebre persistente', 'Dolor torácico',
+              'Disnea', 'Trauma en extremidad', 'Control de hipertensión', 'Control prenatal',
+              'Control de diabetes', 'Infección urinaria', 'Crisis asmática']
+DIAGNOSTICOS = [('K35.8', 'Apendicitis aguda'), ('J18.9', 'Neumonía'), ('I10', 'Hipertensión esencial'),
+                ('E11.9', 'Diabetes mellitus tipo 2'), ('N39.0', 'Infección de vías urinarias'),
+                ('S52.5', 'Fractura de radio distal'), ('J45.9', 'Asma'), ('A09', 'Gastroenteritis')]
+EXAMENES   = [('Hemoglobina', 'g/dL', 12.0, 17.5), ('Glucosa', 'mg/dL', 70, 110),
+              ('Creatinina', 'mg/dL', 0.6, 1.3), ('Leucocitos', '10^3/uL', 4.5, 11.0),
+              ('Potasio', 'mEq/L', 3.5, 5.1), ('Sodio', 'mEq/L', 135, 145)]
+CIRUGIAS   = [('Apendicectomía', 'Cirugía General'), ('Colecistectomía', 'Cirugía General'),
+              ('Cesárea', 'Ginecología'), ('Osteosíntesis de radio', 'Traumatología'),
+              ('Herniorrafia inguinal', 'Cirugía General'), ('Artroscopia de rodilla', 'Traumatología')]
+MEDICAMENTOS = [('Paracetamol', '500 mg', 'ANALGESICO'), ('Amoxicilina', '500 mg', 'ANTIBIOTICO'),
+                ('Losartán', '50 mg', 'ANTIHIPERTENSIVO'), ('Metformina', '850 mg', 'ANTIDIABETICO'),
+                ('Ibuprofeno', '400 mg', 'ANTIINFLAMATORIO'), ('Salbutamol', '100 mcg', 'RESPIRATORIO'),
+                ('Ceftriaxona', '1 g', 'ANTIBIOTICO'), ('Omeprazol', '20 mg', 'OTRO')]
+PRODUCTOS  = [('Guantes de nitrilo', 'MATERIAL_MEDICO', 'caja'), ('Jeringa 5 ml', 'MATERIAL_MEDICO', 'unidad'),
+              ('Gasa estéril', 'MATERIAL_MEDICO', 'paquete'), ('Sutura 3-0', 'INSUMO_QUIRURGICO', 'unidad'),
+              ('Bata quirúrgica', 'INSUMO_QUIRURGICO', 'unidad'), ('Alcohol 70%', 'LIMPIEZA', 'galón'),
+              ('Papel bond', 'OFICINA', 'resma')]
+
+# Entidades referenciadas por otras: PK pre-asignada (reservar_claves)
+MODELOS_CON_CLAVE = {
+    'usuarios':      Usuario,
+    'pacientes':     Paciente,
+    'camas':         Cama,
+    'citas':         Cita,
+    'emergencias':   Emergencia,
+    'encamamientos': Encamamiento,
+    'ordenes_lab':   OrdenLab,
+    'medicamentos':  Medicamento,
+    'productos':     Producto,
+}
+
+# Todas las tablas cargadas (resincronización de IDENTITY/secuencias)
+MODELOS_CARGADOS = [
+    Usuario, Paciente, PacienteTermino, Alergia, ContactoEmergencia, HistorialClinico,
+    Cama, Cita, Emergencia, Encamamiento, Cirugia, OrdenLab, ResultadoLab,
+    Medicamento, Dispensacion, Producto, Movimiento, CorteStock, PuntoReorden, SignoVital, NotaEnfermeria,
+    EstudioImagen, AuditoriaAcceso,
+]
+
+
+def escalar(escala: float, volumenes: dict | None = None) -> dict:
+    """Volúmenes por hospital multiplicados por `escala` (mínimo 1 por entidad)."""
+    base = volumenes or VOLUMENES_BASE
+    return {k: max(1, round(v * escala)) for k, v in base.items()}
+
+
+def normalizar(volumenes: dict) -> dict:
+    """
+    Completa las entidades no indicadas con VOLUMENES_BASE y sube los médicos
+    hasta que la agenda tenga al menos el doble de turnos que citas pedidas.
+    Agrega 'usuarios' (total de cuentas del hospital).
+    """
+    vol = {**VOLUMENES_BASE, **volumenes}
+    vol['medicos']  = max(vol['medicos'], -(-2 * vol['citas'] // (DIAS_AGENDA * TURNOS_DIA)))
+    vol['usuarios'] = vol['medicos'] + vol['enfermeros'] + sum(n for *_, n in USUARIOS_FIJOS)
+    return vol
+
+
+def preparar_roles() -> dict:
+    """Roles base del sistema (idempotente). Devuelve {codigo: Rol}."""
+    roles = {}
+    for codigo, nombre, nivel in ROLES:
+        roles[codigo], _ = Rol.objects.get_or_create(
+            codigo=codigo, defaults={'nombre': nombre, 'nivel': nivel, 'es_sistema': True},
+        )
+    return roles
+
+
+def preparar_hospital(numero: int) -> Hospital:
+    hospital, _ = Hospital.objects.get_or_create(
+        codigo=f'HOSP-{numero:03d}',
+        defaults={
+            'nombre':       f'Hospital Sintético {numero}',
+            'nombre_corto': f'HS{numero}',
+            'nit':          f'{numero:07d}-K',
+        },
+    )
+    return hospital
+
+
+# ============================================================
+# Claves pre-asignadas
+# ============================================================
+def reservar_claves(planes: dict) -> dict:
+    """
+    planes: {hospital_id: volúmenes normalizados}.
+    Devuelve {hospital_id: {entidad: primera_pk}} con rangos disjuntos a partir
+    de MAX(pk) + 1. Sin otras escrituras concurrentes en esas tablas.
+    """
+    claves = {h: {} for h in planes}
+    for entidad, modelo in MODELOS_CON_CLAVE.items():
+        siguiente = (modelo._base_manager.aggregate(m=models.Max('pk'))['m'] or 0) + 1
+        for h, vol in planes.items():
+            claves[h][entidad] = siguiente
+            siguiente += vol[entidad]
+    return claves
+
+
+def resincronizar_claves(modelos=MODELOS_CARGADOS) -> None:
+    """
+    Oracle: lleva las IDENTITY (START WITH LIMIT VALUE) y las secuencias de
+    DEFAULT SEQ_*.NEXTVAL por encima de MAX(pk) tras insertar claves explícitas.
+    SQLite (AUTOINCREMENT) ya continúa desde el máximo.
+    """
+    if connection.vendor != 'oracle':
+        return
+    with connection.cursor() as cursor:
+        for modelo in modelos:
+            tabla, columna = modelo._meta.db_table, modelo._meta.pk.column
+            cursor.execute(
+                'SELECT COUNT(*) FROM USER_TAB_IDENTITY_COLS WHERE TABLE_NAME = %s AND COLUMN_NAME = %s',
+                [tabla, columna],
+            )
+            if cursor.fetchone()[0]:
+                cursor.execute(f'ALTER TABLE {tabla} MODIFY {columna} '
+                               f'GENERATED BY DEFAULT ON NULL AS IDENTITY (START WITH LIMIT VALUE)')
+                continue
+            cursor.execute(
+                'SELECT DATA_DEFAULT FROM USER_TAB_COLUMNS WHERE TABLE_NAME = %s AND COLUMN_NAME = %s',
+                [tabla, columna],
+            )
+            fila = cursor.fetchone()
+            secuencia = re.search(r'"?(\w+)"?\s*\.\s*"?NEXTVAL', (fila and fila[0]) or '', re.IGNORECASE)
+            if secuencia:
+                cursor.execute(f'SELECT NVL(MAX({columna}), 0) + 1 FROM {tabla}')
+                cursor.execute(f'ALTER SEQUENCE {secuencia.group(1)} RESTART START WITH {cursor.fetchone()[0]}')
+
+
+# ============================================================
+# Inserción por lotes
+# ============================================================
+class CargaMasiva:
+    """
+    INSERT por lotes (executemany) de dicts {attname: valor}.
+    Campos ausentes → default del campo, como Model(); auto_now/auto_now_add
+    ausentes → `ahora`. Fechas y horas pasan por los adaptadores del backend.
+    con_pk=False omite la PK (la asigna la IDENTITY/secuencia).
+    """
+
+    def __init__(self, modelo, ahora: datetime, lote: int, con_pk: bool = True):
+        ops    = connection.ops
+        campos = [f for f in modelo._meta.concrete_fields if con_pk or not f.primary_key]
+        self.lote    = lote
+        self.nombres = [f.attname for f in campos]
+        self.sql     = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            ops.quote_name(modelo._meta.db_table),
+            ', '.join(ops.quote_name(f.column) for f in campos),
+            ', '.join(['%s'] * len(campos)),
+        )
+        self.defaults = {
+            f.attname: ahora if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)
+            else f.get_default()
+            for f in campos
+        }
+        adaptadores = [
+            (models.DateTimeField, ops.adapt_datetimefield_value),     # Antes que DateField (subclase)
+            (models.DateField,     ops.adapt_datefield_value),
+            (models.TimeField,     ops.adapt_timefield_value),
+        ]
+        self.adaptar = [next((a for tipo, a in adaptadores if isinstance(f, tipo)), None) for f in campos]
+
+    def _tupla(self, fila: dict) -> tuple:
+        return tuple(
+            a(v) if a and v is not None else v
+            for a, v in zip(self.adaptar, (fila.get(n, self.defaults[n]) for n in self.nombres))
+        )
+
+    def insertar(self, filas, tras_lote=None) -> int:
+        """Inserta y confirma lote a lote; `tras_lote()` corre tras cada commit (tablas hijas)."""
+        total, filas = 0, iter(filas)
+        while lote := [self._tupla(f) for f in itertools.islice(filas, self.lote)]:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(self.sql, lote)
+            total += len(lote)
+            if tras_lote:
+                tras_lote()
+        return total
+
+
+class Indice:
+    """
+    (pk, paciente, fecha) de los registros generados de una entidad, para que
+    los hijos enlacen con un padre del mismo paciente y fecha compatible.
+    Arrays compactos (~24 bytes por registro), ordenados por fecha al consultar.
+    """
+
+    def __init__(self):
+        self.pks       = array('q')
+        self.pacientes = array('q')
+        self.fechas    = array('l')
+        self._orden    = None
+
+    def __len__(self):
+        return len(self.pks)
+
+    def agregar(self, pk: int, paciente: int, fecha: date) -> None:
+        self.pks.append(pk)
+        self.pacientes.append(paciente)
+        self.fechas.append(fecha.toordinal())
+
+    def cercano(self, rnd: random.Random, fecha: date, dias: int) -> tuple[int, int] | None:
+        """(pk, paciente) de un registro con fecha en [fecha - dias, fecha], o None."""
+        if self._orden is None:
+            self._orden  = sorted(range(len(self)), key=self.fechas.__getitem__)
+            self._claves = array('l', (self.fechas[i] for i in self._orden))
+        d = fecha.toordinal()
+        desde, hasta = bisect_left(self._claves, d - dias), bisect_right(self._claves, d)
+        if desde >= hasta:
+            return None
+        i = self._orden[rnd.randrange(desde, hasta)]
+        return self.pks[i], self.pacientes[i]
+
+
+# ============================================================
+# Generador por hospital
+# ============================================================
+class GeneradorDataset:
+    """
+    Genera el dataset de UN hospital. Instanciar uno por hospital; la semilla
+    efectiva combina `semilla` y hospital_id para que cada hospital difiera.
+    `claves`: {entidad: primera_pk} de reservar_claves(); si se omite se
+    reservan aquí (carga de un solo hospital a la vez).
+    """
+
+    def __init__(self, hospital: Hospital, volumenes: dict, semilla: int = 2026,
+                 lote: int = 5_000, indexar_busqueda: bool = True, hoy: date | None = None,
+                 claves: dict | None = None):
+        self.hospital    = hospital
+        self.h           = hospital.hospital_id
+        self.vol         = normalizar(volumenes)
+        self.rnd         = random.Random(semilla * 1_000 + self.h)
+        self.lote        = lote
+        self.indexar     = indexar_busqueda
+        self.hoy         = hoy or timezone.localdate()
+        self.ahora       = timezone.now()
+        self.claves      = claves or reservar_claves({self.h: self.vol})[self.h]
+        self.conteos     = {}
+
+    # ---------- utilidades ----------
+    def _insertar(self, modelo, filas, con_pk: bool = True, tras_lote=None) -> int:
+        n = CargaMasiva(modelo, self.ahora, self.lote, con_pk).insertar(filas, tras_lote)
+        self.conteos[modelo._meta.db_table] = self.conteos.get(modelo._meta.db_table, 0) + n
+        return n
+
+    def _claves(self, entidad: str) -> range:
+        return range(self.claves[entidad], self.claves[entidad] + self.vol[entidad])
+
+    def _paciente(self) -> int:
+        return self.claves['pacientes'] + self.rnd.randrange(self.vol['pacientes'])
+
+    def _fecha(self, dias_atras: int, dias_adelante: int = 0) -> date:
+        return self.hoy + timedelta(days=self.rnd.randint(-dias_atras, dias_adelante))
+
+    def _hora(self, desde: int = 0, hasta: int = 23) -> time:
+        return time(self.rnd.randint(desde, hasta), self.rnd.choice((0, 15, 30, 45)))
+
+    def _momento(self, fecha: date, hora: time) -> datetime:
+        return timezone.make_aware(datetime.combine(fecha, hora))
+
+    @staticmethod
+    def _fines_de_mes(desde: date, hasta: date) -> list[tuple[date, datetime]]:
+        """[(último día de cada mes cerrado en [desde, hasta), su límite exclusivo)]."""
+        fechas, actual = [], date(desde.year, desde.month, 1)
+        while True:
+            siguiente = date(actual.year + actual.month // 12, actual.month % 12 + 1, 1)
+            fin = siguiente - timedelta(days=1)
+            if fin >= hasta:
+                return fechas
+            if fin >= desde:
+                fechas.append((fin, fin_del_dia(fin)))
+            actual = siguiente
+
+    def _en_curso(self) -> bool:
+        return self.rnd.random() < FRACCION_EN_CURSO
+
+    def _pesos(self, opciones: dict):
+        return self.rnd.choices(list(opciones), weights=list(opciones.values()))[0]
+
+    def _nombre(self, sexo: str) -> tuple[str, str, str]:
+        nombres = NOMBRES_M if sexo == 'M' else NOMBRES_F
+        return self.rnd.choice(nombres), self.rnd.choice(APELLIDOS), self.rnd.choice(APELLIDOS)
+
+    def _origen(self, fecha: date, opciones: dict, sin_origen: int) -> dict:
+        """
+        Enlace clínico de un registro hijo: {campo_fk: pk, 'paciente_id': pk}
+        con el paciente del padre. opciones: {campo_fk: (Indice, ventana_días, peso)};
+        sin padre elegido o sin padre en la ventana → solo un paciente al azar.
+        """
+        campo = self._pesos({**{c: p for c, (_, _, p) in opciones.items()}, None: sin_origen})
+        if campo:
+            indice, ventana, _ = opciones[campo]
+            padre = indice.cercano(self.rnd, fecha, ventana)
+            if padre:
+                return {campo: padre[0], 'paciente_id': padre[1]}
+        return {'paciente_id': self._paciente()}
+
+    def _origenes_clinicos(self) -> dict:
+        return {'cita_id':         (self.idx_citas, 0, 40),
+                'emergencia_id':   (self.idx_emergencias, 1, 30),
+                'encamamiento_id': (self.idx_encamamientos, 10, 20)}
+
+    # ---------- orquestación ----------
+    def generar(self, roles: dict) -> dict:
+        """Genera todas las entidades del hospital; cada lote se confirma por separado."""
+        self._usuarios(roles)
+        for paso in (
+            self._pacientes, self._camas, self._citas, self._emergencias, self._encamamientos,
+            self._cirugias, self._laboratorio, self._farmacia, self._bodega, self._reposicion, self._enfermeria,
+            self._imagenes, self._auditoria,
+        ):
+            paso()
+        return self.conteos
+
+    # ---------- seguridad ----------
+    def _usuarios(self, roles: dict) -> None:
+        password  = make_password(PASSWORD_DATASET)
+        plantilla = USUARIOS_FIJOS + [('med', 'MEDICO',    'MEDICO',    self.vol['medicos']),
+                                      ('enf', 'ENFERMERO', 'ENFERMERO', self.vol['enfermeros'])]
+        pks, por_tipo, filas = iter(self._claves('usuarios')), {}, []
+        for prefijo, rol, tipo, n in plantilla:
+            for i in range(1, n + 1):
+                nombre, apellido, _ = self._nombre(self.rnd.choice('MF'))
+                username = f'h{self.h}.{prefijo}{i}'
+                pk = next(pks)
+                por_tipo.setdefault(tipo, []).append(pk)
+                filas.append({
+                    'usr_id': pk, 'hospital_id': self.h, 'rol_id': roles[rol].pk, 'username': username,
+                    'email': f'{username}@dataset.healthtech.gt', 'password': password,
+                    'primer_nombre': nombre, 'primer_apellido': apellido, 'tipo_personal': tipo,
+                    'especialidad': self.rnd.choice(CIRUGIAS)[1] if tipo == 'MEDICO' else '',
+                })
+        self._insertar(Usuario, filas)
+        self.admin          = por_tipo['ADMINISTRATIVO'][0]
+        self.medicos        = por_tipo['MEDICO']
+        self.enfermeros     = por_tipo['ENFERMERO']
+        self.laboratoristas = por_tipo['LABORATORISTA']
+        self.farmaceuticos  = por_tipo['FARMACEUTICO']
+        self.usuarios       = list(self._claves('usuarios'))
+
+    # ---------- pacientes ----------
+    def _pacientes(self) -> None:
+        pendientes = []                  # Pacientes del lote en curso, para el índice de búsqueda
+
+        def filas():
+            for i, pk in enumerate(self._claves('pacientes'), start=1):
+                sexo = self.rnd.choice('MF')
+                nombre, apellido1, apellido2 = self._nombre(sexo)
+                municipio, departamento = self.rnd.choice(MUNICIPIOS)
+                alta = self._momento(self._fecha(1_500), self._hora(7, 18))
+                fila = {
+                    'pac_id': pk, 'hospital_id': self.h, 'no_expediente': f'EXP-{self.h:03d}-{i:07d}',
+                    'primer_nombre': nombre, 'primer_apellido': apellido1, 'segundo_apellido': apellido2,
+                    'tipo_documento': 'DPI', 'no_documento': f'{self.h:03d}{i:010d}',
+                    'fecha_nacimiento': self._fecha(365 * 90, -30), 'sexo': sexo,
+                    'estado_civil': self.rnd.choice(['SOLTERO', 'CASADO', 'UNION_LIBRE', 'DIVORCIADO', 'VIUDO']),
+                    'municipio': municipio, 'departamento': departamento,
+                    'telefono_principal': f'5{self.rnd.randint(0, 9_999_999):07d}',
+                    'tipo_paciente': self._pesos({'GENERAL': 60, 'IGSS': 25, 'PRIVADO': 10, 'SEGURO': 5}),
+                    'grupo_sanguineo': self.rnd.choice(['A', 'B', 'AB', 'O']), 'factor_rh': self.rnd.choice('+-'),
+                    'medico_id': self.rnd.choice(self.medicos), 'activo': self.rnd.random() > 0.01,
+                    'created_by_id': self.admin, 'created_at': alta, 'updated_at': alta,
+                }
+                if self.indexar:
+                    pendientes.append(fila)
+                yield fila
+
+        def indexar():
+            self._insertar(PacienteTermino, (
+                {'hospital_id': self.h, 'paciente_id': p.pk, 'tipo': tipo, 'termino': termino[:100], 'peso': peso}
+                for p in (Paciente(**fila) for fila in pendientes)
+                for tipo, termino, peso in terminos_paciente(p)
+            ), con_pk=False)
+            pendientes.clear()
+
+        self._insertar(Paciente, filas(), tras_lote=indexar)
+
+        self._insertar(Alergia, ({
+            'hospital_id': self.h, 'paciente_id': self._paciente(),
+            'tipo_alergia': self._pesos({'MEDICAMENTO': 60, 'ALIMENTO': 25, 'AMBIENTAL': 10, 'LATEX': 5}),
+            'agente': self.rnd.choice(['Penicilina', 'Sulfas', 'Maní', 'Mariscos', 'Polen', 'Látex']),
+            'severidad': self._pesos({'LEVE': 40, 'MODERADA': 40, 'SEVERA': 15, 'ANAFILACTICA': 5}),
+            'created_by_id': self.admin,
+        } for _ in range(self.vol['alergias'])), con_pk=False)
+        self._insertar(ContactoEmergencia, ({
+            'hospital_id': self.h, 'paciente_id': self._paciente(),
+            'nombre_completo': ' '.join(self._nombre(self.rnd.choice('MF'))),
+            'parentesco': self.rnd.choice(['Madre', 'Padre', 'Cónyuge', 'Hijo(a)', 'Hermano(a)']),
+            'telefono': f'4{self.rnd.randint(0, 9_999_999):07d}',
+        } for _ in range(self.vol['contactos'])), con_pk=False)
+        self._insertar(HistorialClinico, ({
+            'hospital_id': self.h, 'paciente_id': self._paciente(),
+            'tipo_entrada': self._pesos({'CONSULTA': 50, 'LABORATORIO': 20, 'HOSPITALIZACION': 10,
+                                         'CIRUGIA': 10, 'VACUNA': 10}),
+            'titulo': self.rnd.choice(DIAGNOSTICOS)[1], 'fecha_evento': self._fecha(1_500),
+            'medico_id': self.rnd.choice(self.medicos), 'created_by_id': self.admin,
+        } for _ in range(self.vol['historial'])), con_pk=False)
+
+    # ---------- hospitalización: camas ----------
+    def _camas(self) -> None:
+        # Las primeras `ocupadas` camas reciben los encamamientos activos; las últimas, mantenimiento
+        self.ocupadas = min(self.vol['camas'], self.vol['encamamientos'], max(1, round(self.vol['camas'] * 0.65)))
+        mantenimiento = self.vol['camas'] - max(1, self.vol['camas'] // 30)
+        tipos = {'GENERAL': 55, 'UCI': 8, 'PEDIATRICA': 12, 'MATERNIDAD': 10,
+                 'CIRUGIA': 8, 'AISLAMIENTO': 3, 'OBSERVACION': 4}
+        self._insertar(Cama, ({
+            'cama_id': pk, 'hospital_id': self.h, 'numero_cama': f'{1 + i // 30}{i % 30 + 1:02d}',
+            'piso': 1 + i // 30, 'sala': f'Sala {1 + i // 10}', 'tipo_cama': self._pesos(tipos),
+            'estado': 'OCUPADA' if i < self.ocupadas else 'MANTENIMIENTO' if i >= mantenimiento else 'DISPONIBLE',
+            'tiene_oxigeno': self.rnd.random() < 0.6, 'tiene_monitor': self.rnd.random() < 0.3,
+        } for i, pk in enumerate(self._claves('camas'))))
+
+    # ---------- citas ----------
+    def _citas(self) -> None:
+        self.idx_citas = Indice()        # Solo citas atendidas o por atender (originan hijos)
+        turnos = {}                      # (médico, día) → turnos ya asignados
+
+        def filas():
+            for pk in self._claves('citas'):
+                while True:
+                    medico = self.rnd.choice(self.medicos)
+                    fecha  = self.hoy if self._en_curso() else self._fecha(365, 60)
+                    turno  = turnos.get((medico, fecha), 0)
+                    if turno < TURNOS_DIA:
+                        break
+                turnos[medico, fecha] = turno + 1
+                inicio = datetime.combine(fecha, time(7)) + timedelta(minutes=30 * turno)
+                if fecha < self.hoy:
+                    estado = self._pesos({'COMPLETADA': 75, 'CANCELADA': 12, 'NO_ASISTIO': 13})
+                elif fecha == self.hoy:
+                    estado = self._pesos({'PROGRAMADA': 35, 'CONFIRMADA': 35, 'EN_PROGRESO': 15, 'COMPLETADA': 15})
+                else:
+                    estado = self._pesos({'PROGRAMADA': 70, 'CONFIRMADA': 25, 'CANCELADA': 5})
+                paciente = self._paciente()
+                if estado not in ('CANCELADA', 'NO_ASISTIO'):
+                    self.idx_citas.agregar(pk, paciente, fecha)
+                yield {
+                    'cit_id': pk, 'hospital_id': self.h, 'paciente_id': paciente, 'medico_id': medico,
+                    'fecha_cita': fecha, 'hora_inicio': inicio.time(),
+                    'hora_fin': (inicio + timedelta(minutes=30)).time(),
+                    'tipo_cita': self._pesos({'CONSULTA': 50, 'SEGUIMIENTO': 30, 'CHEQUEO': 10,
+                                              'PROCEDIMIENTO': 7, 'URGENCIA': 3}),
+                    'motivo': self.rnd.choice(MOTIVOS), 'estado': estado,
+                    'motivo_cancelacion': 'Paciente reprograma' if estado == 'CANCELADA' else '',
+                    'created_by_id': self.admin,
+                }
+
+        self._insertar(Cita, filas())
+
+    # ---------- emergencias ----------
+    def _emergencias(self) -> None:
+        self.idx_emergencias = Indice()
+
+        def filas():
+            for pk in self._claves('emergencias'):
+                en_curso = self._en_curso()
+                fecha    = self._fecha(1) if en_curso else self._fecha(365, -2)
+                estado   = (self._pesos({'ESPERA': 40, 'EN_ATENCION': 40, 'OBSERVACION': 20}) if en_curso
+                            else self._pesos({'ALTA': 93, 'TRANSFERIDO': 6, 'FALLECIDO': 1}))
+                cie10, diagnostico = self.rnd.choice(DIAGNOSTICOS)
+                cerrada  = estado in ('ALTA', 'TRANSFERIDO', 'FALLECIDO')
+                paciente = self._paciente()
+                self.idx_emergencias.agregar(pk, paciente, fecha)
+                yield {
+                    'emg_id': pk, 'hospital_id': self.h, 'paciente_id': paciente,
+                    'medico_id': None if estado == 'ESPERA' else self.rnd.choice(self.medicos),
+                    'enfermero_id': self.rnd.choice(self.enfermeros),
+                    'fecha_ingreso': fecha, 'hora_ingreso': self._hora(), 'motivo_consulta': self.rnd.choice(MOTIVOS),
+                    'nivel_triaje': self._pesos({'ROJO': 5, 'NARANJA': 15, 'AMARILLO': 35, 'VERDE': 35, 'AZUL': 10}),
+                    'presion_sistolica': self.rnd.randint(90, 170), 'presion_diastolica': self.rnd.randint(55, 105),
+                    'frecuencia_cardiaca': self.rnd.randint(55, 130), 'frecuencia_resp': self.rnd.randint(12, 28),
+                    'temperatura': round(self.rnd.uniform(36.0, 39.8), 1), 'saturacion_o2': self.rnd.randint(86, 100),
+                    'estado': estado,
+                    'diagnostico': diagnostico if cerrada else '', 'cie10_codigo': cie10 if cerrada else '',
+                    'tipo_alta': {'ALTA': 'MEDICA', 'TRANSFERIDO': 'TRANSFERENCIA',
+                                  'FALLECIDO': 'FALLECIMIENTO'}.get(estado, ''),
+                    'fecha_alta': fecha + timedelta(days=self.rnd.randint(0, 1)) if cerrada else None,
+                    'hora_alta': self._hora() if cerrada else None,
+                    'created_by_id': self.admin,
+                }
+
+        self._insertar(Emergencia, filas())
+
+    # ---------- encamamientos ----------
+    def _encamamientos(self) -> None:
+        # Los primeros `ocupadas` quedan activos en las camas OCUPADA; el resto, egresados
+        self.idx_encamamientos = Indice()
+        self.estancias = array('l')      # Días de estancia por encamamiento (0 = activo)
+        primera_cama   = self.claves['camas']
+
+        def filas():
+            for i, pk in enumerate(self._claves('encamamientos')):
+                activo  = i < self.ocupadas
+                ingreso = self._fecha(20) if activo else self._fecha(365, -25)
+                dias    = self.rnd.randint(1, 20)
+                # Ingreso desde emergencia (0–1 días antes) o desde consulta (0–2 días antes)
+                origen  = self._origen(ingreso, {'emergencia_id': (self.idx_emergencias, 1, 40),
+                                                 'cita_id':       (self.idx_citas, 2, 30)}, sin_origen=30)
+                cie10, diagnostico = self.rnd.choice(DIAGNOSTICOS)
+                estado = (self._pesos({'INGRESADO': 35, 'EN_TRATAMIENTO': 65}) if activo
+                          else self._pesos({'EGRESADO': 94, 'TRASLADADO': 4, 'FALLECIDO': 2}))
+                self.idx_encamamientos.agregar(pk, origen['paciente_id'], ingreso)
+                self.estancias.append(0 if activo else dias)
+                yield {
+                    'enc_id': pk, 'hospital_id': self.h, **origen,
+                    'cama_id': primera_cama + (i if activo else self.rnd.randrange(self.vol['camas'])),
+                    'medico_id': self.rnd.choice(self.medicos), 'enfermero_id': self.rnd.choice(self.enfermeros),
+                    'fecha_ingreso': ingreso, 'hora_ingreso': self._hora(), 'motivo_ingreso': self.rnd.choice(MOTIVOS),
+                    'diagnostico_ingreso': diagnostico, 'cie10_ingreso': cie10, 'estado': estado,
+                    'tipo_egreso': '' if activo else {'EGRESADO': 'ALTA_MEDICA', 'TRASLADADO': 'TRASLADO',
+                                                      'FALLECIDO': 'FALLECIMIENTO'}[estado],
+                    'fecha_egreso': None if activo else ingreso + timedelta(days=dias),
+                    'hora_egreso': None if activo else self._hora(8, 16),
+                    'diagnostico_egreso': '' if activo else diagnostico,
+                    'dias_estancia': None if activo else dias,
+                    'created_by_id': self.admin,
+                }
+
+        self._insertar(Encamamiento, filas())
+
+    # ---------- cirugías ----------
+    def _cirugias(self) -> None:
+        def filas():
+            for _ in range(self.vol['cirugias']):
+                en_curso = self._en_curso()
+                fecha = self.hoy if en_curso else self._fecha(365, 45)
+                if en_curso:
+                    estado = self._pesos({'PROGRAMADA': 50, 'EN_CURSO': 50})
+                elif fecha < self.hoy:
+                    estado = self._pesos({'COMPLETADA': 88, 'SUSPENDIDA': 4, 'CANCELADA': 8})
+                else:
+                    estado = self._pesos({'PROGRAMADA': 95, 'CANCELADA': 5})
+                tipo, especialidad = self.rnd.choice(CIRUGIAS)
+                cie10, diagnostico = self.rnd.choice(DIAGNOSTICOS)
+                inicio   = self._hora(7, 16)
+                iniciada = estado in ('EN_CURSO', 'COMPLETADA')
+                yield {
+                    'hospital_id': self.h,
+                    **self._origen(fecha, {'encamamiento_id': (self.idx_encamamientos, 10, 40),
+                                           'emergencia_id':   (self.idx_emergencias, 1, 15)}, sin_origen=45),
+                    'cirujano_id': self.rnd.choice(self.medicos), 'anestesiologo_id': self.rnd.choice(self.medicos),
+                    'enfermero_inst_id': self.rnd.choice(self.enfermeros),
+                    'enfermero_circ_id': self.rnd.choice(self.enfermeros),
+                    'fecha_programada': fecha, 'hora_ini_prog': inicio,
+                    'duracion_est_min': self.rnd.choice((45, 60, 90, 120)),
+                    'quirofano': f'Q{self.rnd.randint(1, 6)}', 'tipo_cirugia': tipo, 'especialidad': especialidad,
+                    'prioridad': self._pesos({'ELECTIVA': 80, 'URGENTE': 15, 'EMERGENCIA': 5}),
+                    'cie10_pre': cie10, 'diagnostico_preop': diagnostico, 'estado': estado,
+                    'fecha_inicio_real': fecha if iniciada else None,
+                    'hora_inicio_real': inicio if iniciada else None,
+                    'hallazgos': 'Sin hallazgos relevantes' if estado == 'COMPLETADA' else '',
+                    'diagnostico_postop': diagnostico if estado == 'COMPLETADA' else '',
+                    'motivo_cancelacion': 'Reprogramada por quirófano' if estado in ('CANCELADA', 'SUSPENDIDA') else '',
+                    'created_by_id': self.admin,
+                }
+
+        self._insertar(Cirugia, filas(), con_pk=False)
+
+    # ---------- laboratorio ----------
+    def _laboratorio(self) -> None:
+        completadas = []                 # (orden, exámenes) del lote en curso
+
+        def filas():
+            for pk in self._claves('ordenes_lab'):
+                en_curso = self._en_curso()
+                fecha = self._fecha(1) if en_curso else self._fecha(365, -2)
+                estado = (self._pesos({'PENDIENTE': 50, 'EN_PROCESO': 50}) if en_curso
+                          else self._pesos({'COMPLETADA': 95, 'CANCELADA': 5}))
+                examenes = self.rnd.sample(EXAMENES, self.rnd.randint(1, 3))
+                fila = {
+                    'lab_id': pk, 'hospital_id': self.h, **self._origen(fecha, self._origenes_clinicos(), 10),
+                    'medico_solic_id': self.rnd.choice(self.medicos),
+                    'laboratorista_id': None if estado == 'PENDIENTE' else self.rnd.choice(self.laboratoristas),
+                    'fecha_solicitud': fecha, 'hora_solicitud': self._hora(),
+                    'prioridad': self._pesos({'NORMAL': 80, 'URGENTE': 15, 'EMERGENCIA': 5}),
+                    'grupo_examen': 'Química' if len(examenes) > 1 else 'Hematología',
+                    'examenes_solicitados': ', '.join(e[0] for e in examenes), 'estado': estado,
+                    'fecha_resultado': fecha if estado == 'COMPLETADA' else None,
+                    'motivo_cancelacion': 'Muestra hemolizada' if estado == 'CANCELADA' else '',
+                    'created_by_id': self.admin,
+                }
+                if estado == 'COMPLETADA':
+                    completadas.append((pk, examenes, fila['paciente_id'], self._momento(fecha, fila['hora_solicitud'])))
+                yield fila
+
+        def resultados():
+            for orden, examenes, paciente, momento in completadas:
+                for nombre, unidad, minimo, maximo in examenes:
+                    valor = round(self.rnd.uniform(minimo * 0.7, maximo * 1.3), 1)
+                    yield {
+                        'orden_id': orden, 'hospital_id': self.h, 'nombre_examen': nombre, 'valor': str(valor),
+                        'unidad': unidad, 'rango_min': str(minimo), 'rango_max': str(maximo),
+                        'estado_resultado': 'ALTO' if valor > maximo else 'BAJO' if valor < minimo else 'NORMAL',
+                        'codigo_examen': codigo_examen(nombre), 'valor_num': valor, 'unidad_codigo': codigo_unidad(unidad),
+                        'rango_min_num': minimo, 'rango_max_num': maximo,
+                        'paciente_id': paciente, 'fecha_resultado': momento,
+                        'created_by_id': self.rnd.choice(self.laboratoristas),
+                    }
+            completadas.clear()
+
+        self._insertar(OrdenLab, filas(), tras_lote=lambda: self._insertar(ResultadoLab, resultados(), con_pk=False))
+
+    # ---------- farmacia ----------
+    def _farmacia(self) -> None:
+        self._insertar(Medicamento, ({
+            'med_id': pk, 'hospital_id': self.h, 'nombre_generico': f'{nombre} {i // len(MEDICAMENTOS) + 1}',
+            'concentracion': concentracion, 'categoria': categoria,
+            'stock_actual': self.rnd.randint(200, 5_000), 'stock_minimo': 100,
+            'precio_unitario': round(self.rnd.uniform(0.5, 80), 2), 'created_by_id': self.admin,
+        } for i, pk in enumerate(self._claves('medicamentos'))
+            for nombre, concentracion, categoria in [MEDICAMENTOS[i % len(MEDICAMENTOS)]]))
+
+        def filas():
+            for _ in range(self.vol['dispensaciones']):
+                en_curso = self._en_curso()
+                estado = 'PENDIENTE' if en_curso else self._pesos({'DISPENSADA': 93, 'CANCELADA': 7})
+                fecha  = self._fecha(1) if en_curso else self._fecha(365, -2)
+                yield {
+                    'hospital_id': self.h, **self._origen(fecha, self._origenes_clinicos(), 10),
+                    'medicamento_id': self.claves['medicamentos'] + self.rnd.randrange(self.vol['medicamentos']),
+                    'medico_prescribe_id': self.rnd.choice(self.medicos),
+                    'dispensado_por_id': self.rnd.choice(self.farmaceuticos) if estado == 'DISPENSADA' else None,
+                    'cantidad': self.rnd.randint(1, 30), 'dosis': '1 tableta', 'frecuencia': 'Cada 8 horas',
+                    'duracion_dias': self.rnd.choice((3, 5, 7, 10)), 'estado': estado, 'fecha_prescripcion': fecha,
+                    'fecha_dispensacion': fecha if estado == 'DISPENSADA' else None,
+                    'motivo_cancelacion': 'Cambio de tratamiento' if estado == 'CANCELADA' else '',
+                    'created_by_id': self.admin,
+                }
+
+        self._insertar(Dispensacion, filas(), con_pk=False)
+
+    # ---------- bodega ----------
+    def _bodega(self) -> None:
+        productos = self._claves('productos')
+        desde   = self.ahora - timedelta(days=365)
+        precios = {pk: Decimal(str(round(self.rnd.uniform(1, 250), 2))) for pk in productos}
+        self._insertar(Producto, ({
+            'pro_id': pk, 'hospital_id': self.h, 'codigo': f'PRD-{self.h:03d}-{i + 1:05d}',
+            'nombre': f'{nombre} {i // len(PRODUCTOS) + 1}', 'categoria': categoria, 'unidad_medida': unidad,
+            'stock_minimo': 50, 'stock_maximo': 5_000,
+            'precio_unitario': precios[pk], 'created_by_id': self.admin, 'created_at': desde,
+        } for i, pk in enumerate(productos) for nombre, categoria, unidad in [PRODUCTOS[i % len(PRODUCTOS)]]))
+
+        # Kardex coherente: anterior/posterior encadenados por producto, timestamps crecientes
+        saldo = dict.fromkeys(productos, 0)
+        paso  = timedelta(days=365) / self.vol['movimientos']
+        # Cortes de fin de mes (BOD_CORTES_STOCK), como los dejaría cortar_stock cada noche
+        cortes, cierres = [], self._fines_de_mes(timezone.localdate(desde), self.hoy)
+
+        def filas():
+            for i in range(self.vol['movimientos']):
+                momento = desde + paso * i
+                while cierres and momento >= cierres[0][1]:
+                    fecha, _ = cierres.pop(0)
+                    cortes.extend((fecha, pk, stock) for pk, stock in saldo.items())
+                producto = self.rnd.choice(productos)
+                anterior = saldo[producto]
+                if anterior < 100 or self.rnd.random() < 0.3:
+                    tipo, cantidad = 'ENTRADA', self.rnd.randint(100, 1_000)
+                else:
+                    tipo = self._pesos({'SALIDA': 90, 'AJUSTE_NEGATIVO': 5, 'BAJA': 5})
+                    cantidad = self.rnd.randint(1, min(anterior, 80))
+                saldo[producto] = posterior = anterior + cantidad if tipo == 'ENTRADA' else anterior - cantidad
+                yield {
+                    'hospital_id': self.h, 'producto_id': producto, 'tipo_movimiento': tipo, 'cantidad': cantidad,
+                    'cantidad_anterior': anterior, 'cantidad_posterior': posterior,
+                    'motivo': 'Compra' if tipo == 'ENTRADA' else 'Consumo de servicio',
+                    'departamento': '' if tipo == 'ENTRADA' else self.rnd.choice(['Emergencia', 'Encamamiento', 'Quirófano']),
+                    'created_by_id': self.admin, 'created_at': momento,
+                }
+
+        self._insertar(Movimiento, filas(), con_pk=False)
+        self._insertar(CorteStock, ({
+            'hospital_id': self.h, 'producto_id': pk, 'fecha': fecha, 'stock': stock,
+            'precio_unitario': precios[pk], 'valor': stock * precios[pk],
+        } for fecha, pk, stock in cortes), con_pk=False)
+
+        qn = connection.ops.quote_name
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE {qn(Producto._meta.db_table)} SET {qn(Producto._meta.get_field("stock_actual").column)} = %s '
+                f'WHERE {qn(Producto._meta.pk.column)} = %s',
+                [(stock, pk) for pk, stock in saldo.items()],
+            )
+
+    def _reposicion(self) -> None:
+        # Lo que dejaría calcular_reposicion esa noche (consumo de bodega y farmacia ya cargado)
+        n = reposicion.calcular([self.h], hoy=self.hoy)[self.h]
+        self.conteos[PuntoReorden._meta.db_table] = n
+
+    # ---------- enfermería ----------
+    def _enfermeria(self) -> None:
+        idx = self.idx_encamamientos
+
+        def momento(i: int, k: int) -> datetime:
+            # Activos: cada 4 h hacia atrás desde ahora; egresados: ciclo de 4 h dentro de su estancia
+            estancia = self.estancias[i]
+            if not estancia:
+                return self.ahora - timedelta(hours=4 * k, minutes=self.rnd.randint(0, 59))
+            ingreso = self._momento(date.fromordinal(idx.fechas[i]), time(8))
+            return ingreso + timedelta(hours=(4 * k) % (24 * estancia), minutes=self.rnd.randint(0, 59))
+
+        def signos():
+            for j in range(self.vol['signos_vitales']):
+                i = j % len(idx)
+                yield {
+                    'hospital_id': self.h, 'paciente_id': idx.pacientes[i], 'encamamiento_id': idx.pks[i],
+                    'temperatura': round(self.rnd.gauss(36.9, 0.6), 1),
+                    'presion_sistolica': int(self.rnd.gauss(122, 15)), 'presion_diastolica': int(self.rnd.gauss(78, 10)),
+                    'frecuencia_cardiaca': int(self.rnd.gauss(82, 14)),
+                    'frecuencia_respiratoria': int(self.rnd.gauss(17, 3)),
+                    'saturacion_o2': min(100, int(self.rnd.gauss(96, 2.5))),
+                    'created_by_id': self.rnd.choice(self.enfermeros), 'created_at': momento(i, j // len(idx)),
+                }
+
+        def notas():
+            for _ in range(self.vol['notas']):
+                i = self.rnd.randrange(self.ocupadas)                  # Encamamientos activos
+                yield {
+                    'hospital_id': self.h, 'paciente_id': idx.pacientes[i], 'encamamiento_id': idx.pks[i],
+                    'tipo_nota': self._pesos({'EVOLUCION': 60, 'MEDICAMENTO': 20, 'PROCEDIMIENTO': 15, 'INCIDENTE': 5}),
+                    'contenido': 'Paciente estable, tolera dieta, sin signos de alarma.',
+                    'created_by_id': self.rnd.choice(self.enfermeros),
+                    'created_at': self.ahora - timedelta(hours=self.rnd.randint(0, 24 * 20)),
+                }
+
+        self._insertar(SignoVital, signos(), con_pk=False)
+        self._insertar(NotaEnfermeria, notas(), con_pk=False)
+
+    # ---------- imágenes ----------
+    def _imagenes(self) -> None:
+        def filas():
+            for _ in range(self.vol['estudios']):
+                en_curso = self._en_curso()
+                estado = (self._pesos({'SOLICITADO': 50, 'EN_PROCESO': 50}) if en_curso
+                          else self._pesos({'COMPLETADO': 94, 'CANCELADO': 6}))
+                fecha = self._fecha(1) if en_curso else self._fecha(365, -2)
+                yield {
+                    'hospital_id': self.h, **self._origen(fecha, self._origenes_clinicos(), 10),
+                    'medico_sol_id': self.rnd.choice(self.medicos),
+                    'radiologo_id': self.rnd.choice(self.medicos) if estado == 'COMPLETADO' else None,
+                    'modalidad': self._pesos({'XRAY': 50, 'ULTRASONIDO': 25, 'CT': 15, 'MRI': 7, 'MAMMOGRAFIA': 3}),
+                    'region_anatomica': self.rnd.choice(['TORAX', 'ABDOMEN', 'CRANEO', 'EXTREMIDADES', 'COLUMNA']),
+                    'descripcion_clinica': self.rnd.choice(MOTIVOS), 'estado': estado, 'fecha_solicitud': fecha,
+                    'fecha_realizacion': fecha if estado in ('EN_PROCESO', 'COMPLETADO') else None,
+                    'fecha_informe': fecha if estado == 'COMPLETADO' else None,
+                    'informe': 'Estudio sin alteraciones significativas.' if estado == 'COMPLETADO' else '',
+                    'num_imagenes': self.rnd.randint(1, 300) if estado == 'COMPLETADO' else 0,
+                    'motivo_cancelacion': 'Paciente no se presentó' if estado == 'CANCELADO' else '',
+                    'created_by_id': self.admin,
+                }
+
+        self._insertar(EstudioImagen, filas(), con_pk=False)
+
+    # ---------- auditoría ----------
+    def _auditoria(self) -> None:
+        eventos = {'PHI_ACCESS': 70, 'LOGIN_OK': 12, 'PHI_MODIFY': 10, 'LOGOUT': 4,
+                   'LOGIN_FAIL': 2, 'TOKEN_REFRESH': 1, 'EXPORT': 1}
+        modulos = ['pacientes', 'citas', 'emergencias', 'laboratorio', 'farmacia', 'encamamiento']
+        self._insertar(AuditoriaAcceso, ({
+            'hospital_id': self.h, 'usuario_id': self.rnd.choice(self.usuarios), 'tipo_evento': evento,
+            'modulo': self.rnd.choice(modulos) if evento.startswith('PHI') else 'auth',
+            'accion': 'GET' if evento == 'PHI_ACCESS' else 'POST',
+            'ip_origen': f'10.{self.h % 256}.{self.rnd.randint(0, 255)}.{self.rnd.randint(1, 254)}',
+            'exitoso': evento != 'LOGIN_FAIL', 'duracion_ms': self.rnd.randint(5, 400),
+            'created_at': self.ahora - timedelta(minutes=self.rnd.randint(0, 60 * 24 * 90)),
+        } for evento in (self._pesos(eventos) for _ in range(self.vol['auditoria']))), con_pk=False)
+
+
+# ============================================================
+# Carga multi-hospital (opcionalmente un proceso por hospital)
+# ============================================================
+def _iniciar_worker():
+    # Proceso hijo: no reutilizar conexiones ni pools heredados del padre
+    from config.oracle.pool import close_all_pools
+    connections.close_all()
+    close_all_pools()
+
+
+def _generar_hospital(hospital_id: int, volumenes: dict, semilla: int, lote: int,
+                      indexar: bool, claves: dict) -> tuple[int, dict]:
+    from config.oracle.vpd import set_current_hospital_id
+    set_current_hospital_id(hospital_id)            # Contexto VPD de las inserciones
+    try:
+        hospital = Hospital.objects.get(pk=hospital_id)
+        roles    = {r.codigo: r for r in Rol.objects.all()}
+        conteos  = GeneradorDataset(
+            hospital, volumenes, semilla=semilla, lote=lote, indexar_busqueda=indexar, claves=claves,
+        ).generar(roles)
+    finally:
+        set_current_hospital_id(None)
+    return hospital_id, conteos
+
+
+def generar_dataset(volumenes: dict, semilla: int = 2026, lote: int = 5_000, procesos: int = 1,
+                    indexar: set | None = None, al_terminar=None) -> dict:
+    """
+    Carga varios hospitales ya creados. volumenes: {hospital_id: volúmenes}.
+    indexar: hospitales con índice de búsqueda (None = todos).
+    procesos > 1 → un worker por hospital; SQLite siempre carga en serie.
+    al_terminar(hospital_id, conteos) se invoca al completar cada hospital.
+    Devuelve {hospital_id: {tabla: filas}}.
+    """
+    preparar_roles()
+    planes = {h: normalizar(vol) for h, vol in volumenes.items()}
+    claves = reservar_claves(planes)
+    tareas = [(h, planes[h], semilla, lote, indexar is None or h in indexar, claves[h]) for h in planes]
+
+    resultados = {}
+    if procesos > 1 and len(tareas) > 1 and connection.vendor != 'sqlite':
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_worker) as pool:
+            for futuro in as_completed([pool.submit(_generar_hospital, *t) for t in tareas]):
+                h, conteos = futuro.result()
+                resultados[h] = conteos
+                if al_terminar:
+                    al_terminar(h, conteos)
+    else:
+        for tarea in tareas:
+            h, conteos = _generar_hospital(*tarea)
+            resultados[h] = conteos
+            if al_terminar:
+                al_terminar(h, conteos)
+
+    resincronizar_claves()
+    return resultados
@@ -0,0 +1,156 @@
+"""
+manage.py bench_endpoints
+=========================
+Benchmark de todos los endpoints list / detail / acciones de estado de las
+once apps (catálogo en apps.core.bench) sobre un dataset multi-hospital
+sintético (apps.core.datasets) cargado en una BD SQLite en memoria.
+
+Por escenario registra consultas SQL por request y latencia p50/p95, y los
+compara con el baseline JSON versionado. Falla (exit 1) si algún escenario
+supera el presupuesto de consultas o de latencia.
+
+Solo con settings de test (SQLite): crea y destruye su propia BD, nunca
+toca datos reales.
+
+Uso:
+    python manage.py bench_endpoints --settings=config.settings.test
+    python manage.py bench_endpoints --settings=config.settings.test --actualizar
+    python manage.py bench_endpoints --settings=config.settings.test --solo emergency. --solo patients.
+    python manage.py bench_endpoints --settings=config.settings.test --presupuesto-latencia 0.5
+"""
+
+import time
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from apps.core.bench import (
+    ESCENARIOS, BenchRunner, Resultado, cargar_baseline, comparar, guardar_baseline,
+)
+from apps.core.datasets import GeneradorDataset, escalar, preparar_hospital, preparar_roles
+from apps.security.models import Usuario
+
+
+class Command(BaseCommand):
+    help = 'Benchmark de endpoints: consultas SQL y latencia p50/p95 contra el baseline JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escala', type=float, default=1.0,
+                            help='Multiplicador de volúmenes por hospital (default 1.0 ≈ 8.000 pacientes).')
+        parser.add_argument('--hospitales', type=int, default=3, help='Hospitales a generar (default 3).')
+        parser.add_argument('--semilla', type=int, default=2026, help='Semilla del dataset (default 2026).')
+        parser.add_argument('--iteraciones', type=int, default=20, help='Requests medidos por escenario.')
+        parser.add_argument('--calentamiento', type=int, default=2, help='Requests previos no medidos.')
+        parser.add_argument('--solo', action='append', default=[],
+                            help='Prefijo de escenario a ejecutar (repetible), p. ej. "emergency.".')
+        parser.add_argument('--baseline', default=settings.BENCH_BASELINE, help='Ruta del baseline JSON.')
+        parser.add_argument('--actualizar', action='store_true',
+                            help='Reescribe el baseline con los resultados de esta corrida.')
+        parser.add_argument('--presupuesto-consultas', type=int, default=settings.BENCH_PRESUPUESTO_CONSULTAS,
+                            help='Consultas extra toleradas por request.')
+        parser.add_argument('--presupuesto-latencia', type=float, default=settings.BENCH_PRESUPUESTO_LATENCIA,
+                            help='Aumento relativo tolerado de p50/p95 (0.25 = +25%%).')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('bench_endpoints solo corre con settings de test (SQLite): --settings=config.settings.test')
+
+        escenarios = [e for e in ESCENARIOS if not options['solo']
+                      or any(e.nombre.startswith(p) for p in options['solo'])]
+        if not escenarios:
+            raise CommandError(f'Ningún escenario coincide con {options["solo"]}.')
+
+        meta = {
+            'escala':        options['escala'],
+            'hospitales':    options['hospitales'],
+            'semilla':       options['semilla'],
+            'iteraciones':   options['iteraciones'],
+            'calentamiento': options['calentamiento'],
+            'django':        django.get_version(),
+        }
+        ruta = Path(options['baseline'])
+        baseline = None
+        if not options['actualizar']:
+            if not ruta.exists():
+                raise CommandError(f'No existe el baseline {ruta}; generarlo con --actualizar.')
+            baseline = cargar_baseline(ruta)
+            distintos = {k: (v, meta[k]) for k, v in baseline.get('meta', {}).items()
+                         if k in ('escala', 'hospitales', 'semilla') and meta[k] != v}
+            if distintos:
+                raise CommandError(f'Dataset distinto al del baseline (baseline, actual): {distintos}')
+
+        setup_test_environment()                         # ALLOWED_HOSTS += testserver (APIClient)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            hospital_id = self._cargar(options)
+            resultados  = self._medir(hospital_id, escenarios, options, baseline)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['actualizar']:
+            if options['solo'] and ruta.exists():       # Actualización parcial: conservar el resto
+                previos = cargar_baseline(ruta)['escenarios']
+                for nombre, r in previos.items():
+                    resultados.setdefault(nombre, Resultado(**r))
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            guardar_baseline(ruta, resultados, meta)
+            self.stdout.write(self.style.SUCCESS(f'\nBaseline actualizado: {ruta} ({len(resultados)} escenarios).'))
+            return
+
+        regresiones = comparar(
+            resultados, baseline,
+            presupuesto_consultas=options['presupuesto_consultas'],
+            presupuesto_latencia=options['presupuesto_latencia'],
+        )
+        if regresiones:
+            for r in regresiones:
+                self.stderr.write(f'  ✗ {r}')
+            raise CommandError(f'{len(regresiones)} regresiones respecto a {ruta}.')
+        self.stdout.write(self.style.SUCCESS(f'\nOK — {len(resultados)} escenarios dentro del presupuesto.'))
+
+    # --------------------------------------------------------
+    def _cargar(self, options) -> int:
+        volumenes = escalar(options['escala'])
+        roles = preparar_roles()
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'\n=== bench_endpoints: {options["hospitales"]} hospitales × escala {options["escala"]} ===\n'
+        ))
+        inicio = time.monotonic()
+        hospitales = []
+        for n in range(1, options['hospitales'] + 1):
+            hospital = preparar_hospital(n)
+            conteos = GeneradorDataset(
+                hospital, volumenes, semilla=options['semilla'],
+                indexar_busqueda=(n == 1),               # Solo el hospital medido usa la búsqueda
+            ).generar(roles)
+            hospitales.append(hospital)
+            self.stdout.write(f'  {hospital.codigo}: {sum(conteos.values()):,} filas')
+        self.stdout.write(f'  Dataset cargado en {time.monotonic() - inicio:.1f}s\n')
+
+        hospital = hospitales[0]
+        Usuario.objects.create_user(
+            username='bench.superadmin', email='bench.superadmin@dataset.healthtech.gt', password=None,
+            hospital_id=hospital.hospital_id, rol=roles['SUPER_ADMIN'], primer_nombre='Bench',
+            primer_apellido='SuperAdmin', tipo_personal='ADMINISTRATIVO',
+        )
+        return hospital.hospital_id
+
+    def _medir(self, hospital_id, escenarios, options, baseline) -> dict:
+        previos = (baseline or {}).get('escenarios', {})
+        self.stdout.write(f'  {"escenario":<36} {"consultas":>9} {"p50 ms":>9} {"p95 ms":>9}   baseline')
+
+        def reportar(esc, r):
+            b = previos.get(esc.nombre)
+            ref = f'{b["consultas"]:>3} / {b["p50_ms"]:.2f} / {b["p95_ms"]:.2f}' if b else 'nuevo'
+            self.stdout.write(f'  {esc.nombre:<36} {r.consultas:>9} {r.p50_ms:>9.2f} {r.p95_ms:>9.2f}   {ref}')
+
+        runner = BenchRunner(hospital_id, options['iteraciones'], options['calentamiento'])
+        try:
+            return runner.correr(escenarios, al_medir=reportar)
+        except (LookupError, AssertionError) as exc:
+            raise CommandError(str(exc))
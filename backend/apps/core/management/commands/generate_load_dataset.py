@@ -0,0 +1,106 @@
+"""
+manage.py generate_load_dataset
+===============================
+Carga masiva de hospitales sintéticos para pruebas de carga y de planes de
+ejecución (apps.core.datasets): volúmenes objetivo por entidad y por hospital,
+datos referencialmente consistentes (pacientes → citas → emergencias →
+encamamientos → laboratorio / dispensaciones / signos vitales), inserción
+por lotes con claves pre-asignadas y, opcionalmente, un proceso por hospital.
+
+A diferencia de seed_all_data (datos demo, una fila por INSERT), apunta a
+millones de filas: 1M pacientes y 20M signos vitales en minutos.
+
+Crea hospitales nuevos HOSP-NNN; falla si alguno ya tiene pacientes.
+
+Uso:
+    python manage.py generate_load_dataset --hospitales 3 --escala 10
+    python manage.py generate_load_dataset --volumen pacientes=1000000 --volumen signos_vitales=20000000
+    python manage.py generate_load_dataset --hospitales 4 --procesos 4 --volumen 2:citas=500000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.datasets import VOLUMENES_BASE, escalar, generar_dataset, preparar_hospital
+from apps.patients.models import Paciente
+
+
+class Command(BaseCommand):
+    help = 'Genera hospitales sintéticos de alto volumen con datos referencialmente consistentes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hospitales', type=int, default=1, help='Hospitales a generar (default 1).')
+        parser.add_argument('--primer-hospital', type=int, default=1,
+                            help='Número del primer hospital HOSP-NNN (default 1).')
+        parser.add_argument('--escala', type=float, default=1.0,
+                            help='Multiplicador de VOLUMENES_BASE (default 1.0 ≈ 8.000 pacientes por hospital).')
+        parser.add_argument('--volumen', action='append', default=[], metavar='[H:]ENTIDAD=N',
+                            help='Volumen de una entidad para todos los hospitales o solo el H-ésimo '
+                                 '(repetible), p. ej. "signos_vitales=20000000" o "2:pacientes=50000".')
+        parser.add_argument('--semilla', type=int, default=2026, help='Semilla del dataset (default 2026).')
+        parser.add_argument('--lote', type=int, default=5_000, help='Filas por INSERT/commit (default 5000).')
+        parser.add_argument('--procesos', type=int, default=1,
+                            help='Procesos en paralelo, uno por hospital (SQLite: siempre 1).')
+        parser.add_argument('--sin-indice', action='store_true',
+                            help='No poblar el índice de búsqueda de pacientes (PAC_BUSQUEDA_TERMINOS).')
+
+    def handle(self, *args, **options):
+        n, primero = options['hospitales'], options['primer_hospital']
+        if n < 1 or primero < 1:
+            raise CommandError('--hospitales y --primer-hospital deben ser ≥ 1.')
+
+        base = escalar(options['escala'])
+        por_hospital = {i: dict(base) for i in range(1, n + 1)}
+        for valor in options['volumen']:
+            destino, entidad, cantidad = self._parsear_volumen(valor, n)
+            for i in destino or por_hospital:
+                por_hospital[i][entidad] = cantidad
+
+        hospitales = [preparar_hospital(primero + i - 1) for i in range(1, n + 1)]
+        con_datos = [h.codigo for h in hospitales
+                     if Paciente.objects.sin_tenant().filter(hospital_id=h.hospital_id).exists()]
+        if con_datos:
+            raise CommandError(f'Hospitales con datos previos: {", ".join(con_datos)}. Usar --primer-hospital.')
+
+        volumenes = {h.hospital_id: por_hospital[i] for i, h in enumerate(hospitales, start=1)}
+        codigos   = {h.hospital_id: h.codigo for h in hospitales}
+        total_pedido = sum(sum(v.values()) for v in volumenes.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'\n=== generate_load_dataset: {n} hospitales, ~{total_pedido:,} registros, '
+            f'{options["procesos"]} proceso(s) ===\n'
+        ))
+
+        inicio = time.monotonic()
+
+        def reportar(hospital_id, conteos):
+            filas = sum(conteos.values())
+            self.stdout.write(f'  {codigos[hospital_id]}: {filas:,} filas ({time.monotonic() - inicio:.1f}s)')
+            for tabla, cantidad in sorted(conteos.items(), key=lambda t: -t[1])[:5]:
+                self.stdout.write(f'      {tabla:<28} {cantidad:>12,}')
+
+        resultados = generar_dataset(
+            volumenes, semilla=options['semilla'], lote=options['lote'], procesos=options['procesos'],
+            indexar=set() if options['sin_indice'] else None, al_terminar=reportar,
+        )
+
+        segundos = time.monotonic() - inicio
+        filas = sum(sum(c.values()) for c in resultados.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ {filas:,} filas en {segundos:.1f}s ({filas / max(segundos, 1e-6):,.0f} filas/s).'
+        ))
+
+    @staticmethod
+    def _parsear_volumen(valor: str, hospitales: int) -> tuple[list, str, int]:
+        """'[H:]entidad=N' → ([H] o [] para todos, entidad, N)."""
+        try:
+            destino, _, asignacion = valor.rpartition(':')
+            entidad, cantidad = asignacion.split('=')
+            destino, cantidad = ([int(destino)] if destino else []), int(cantidad.replace('_', ''))
+        except ValueError:
+            raise CommandError(f'--volumen inválido "{valor}": formato [H:]entidad=N.')
+        if entidad not in VOLUMENES_BASE:
+            raise CommandError(f'Entidad desconocida "{entidad}". Válidas: {", ".join(VOLUMENES_BASE)}.')
+        if cantidad < 1 or any(not 1 <= h <= hospitales for h in destino):
+            raise CommandError(f'--volumen fuera de rango: "{valor}".')
+        return destino, entidad, cantidad
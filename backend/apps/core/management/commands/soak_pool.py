@@ -0,0 +1,85 @@
+"""
+manage.py soak_pool
+===================
+Prueba de carga del pool oracledb usado por el ORM (config.oracle.backend).
+Simula N hilos × M "requests": cada request abre la conexión Django, ejecuta
+una consulta y la cierra (como request_finished con CONN_MAX_AGE = 0).
+
+Verifica que las sesiones se REUTILIZAN: el número de sesiones físicas
+abiertas debe quedar acotado por el max del pool, muy por debajo del total
+de requests. Falla (exit 1) si hay churn o errores de liberación.
+
+Uso:
+    python manage.py soak_pool
+    python manage.py soak_pool --hilos 16 --requests 500 --alias reports
+"""
+
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from config.oracle.pool import get_pool, pool_stats
+
+
+class Command(BaseCommand):
+    help = 'Prueba de carga: verifica que el ORM reutiliza sesiones del pool oracledb.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=8, help='Hilos concurrentes (default 8).')
+        parser.add_argument('--requests', type=int, default=200, help='Requests por hilo (default 200).')
+        parser.add_argument('--alias', default='default', help="Alias de BD: 'default' | 'reports'.")
+
+    def handle(self, *args, **options):
+        alias    = options['alias']
+        hilos    = options['hilos']
+        requests = options['requests']
+
+        if connections[alias].settings_dict['ENGINE'] != 'config.oracle.backend':
+            raise CommandError(f"El alias '{alias}' no usa ENGINE config.oracle.backend.")
+
+        errores = []
+
+        def _worker():
+            conn = connections[alias]
+            for _ in range(requests):
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute('SELECT 1 FROM DUAL')
+                        cursor.fetchone()
+                except Exception as exc:
+                    errores.append(str(exc))
+                finally:
+                    conn.close()          # Devuelve la sesión al pool
+            connections.close_all()
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'\n=== soak_pool: {hilos} hilos × {requests} requests — alias {alias} ===\n'
+        ))
+        inicio = time.monotonic()
+        threads = [threading.Thread(target=_worker) for _ in range(hilos)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracion = time.monotonic() - inicio
+
+        pool  = get_pool(alias, connections[alias].settings_dict)
+        stats = next(
+            (v for k, v in pool_stats().items() if k.split('@')[0] == alias), {}
+        )
+        total = hilos * requests
+        self.stdout.write(f'  Requests:            {total} en {duracion:.1f}s ({total / duracion:.0f} req/s)')
+        self.stdout.write(f'  Sesiones abiertas:   {pool.opened} (max pool {pool.max})')
+        self.stdout.write(f'  Adquisiciones:       {stats.get("adquisiciones")}')
+        self.stdout.write(f'  Espera promedio/max: {stats.get("espera_promedio_ms")} / {stats.get("espera_max_ms")} ms')
+        self.stdout.write(f'  Errores:             {len(errores)}')
+
+        if errores or stats.get('errores_liberacion'):
+            raise CommandError(f'Errores durante la prueba: {errores[:3]}')
+        if pool.opened > pool.max or pool.opened >= total:
+            raise CommandError('Churn de conexiones: las sesiones no se reutilizan.')
+        self.stdout.write(self.style.SUCCESS(
+            f'\n  OK — {total} requests servidos con {pool.opened} sesiones físicas.\n'
+        ))
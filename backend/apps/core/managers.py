@@ -0,0 +1,87 @@
+"""
+HealthTech Solutions — Managers multi-tenant
+TenantManager / TenantQuerySet: filtro por hospital en un único punto.
+
+En DEV (VPD_ENABLED=False) cada get_queryset repetía:
+    if not settings.VPD_ENABLED and user.rol_codigo != 'SUPER_ADMIN':
+        qs = qs.filter(hospital_id=user.hospital_id)
+Ahora Model.objects ya sale filtrado por el hospital del request en curso,
+tomado del thread local que llena config.oracle.vpd (mismo contexto que
+Oracle VPD usa en PROD):
+
+  - VPD_ENABLED=True       → sin filtro: Oracle agrega el predicado
+  - SUPER_ADMIN            → sin filtro: acceso cross-hospital
+  - Fuera de un request    → sin filtro (comandos, shell, señales de carga)
+  - Usuario sin hospital   → queryset vacío
+
+El filtro se fija al construir el queryset (no al evaluarlo), de modo que
+un StreamingHttpResponse conserva el hospital aunque el middleware ya haya
+limpiado el thread local.
+
+Uso:
+    Paciente.objects.activos().select_related('medico')
+    → WHERE HOSPITAL_ID = :h AND ACTIVO = 1 …   (índices (HOSPITAL_ID, ACTIVO, …))
+    Paciente.objects.sin_tenant()               → sin filtro de hospital
+"""
+
+from django.conf import settings
+from django.db import models
+
+from config.oracle.vpd import get_current_tenant
+
+ROL_CROSS_HOSPITAL = 'SUPER_ADMIN'
+
+
+def tenant_hospital_id() -> int | None:
+    """
+    hospital_id por el que se debe filtrar en este contexto, o None si no
+    corresponde filtrar (VPD activo, SUPER_ADMIN o fuera de un request).
+    """
+    if settings.VPD_ENABLED:
+        return None
+    contexto = get_current_tenant()
+    if contexto is None or contexto[1] == ROL_CROSS_HOSPITAL:
+        return None
+    return contexto[0]
+
+
+class TenantQuerySet(models.QuerySet):
+    """QuerySet de modelos con columnas HOSPITAL_ID (+ ACTIVO para borrado lógico)."""
+
+    def del_tenant(self):
+        """Aplica el filtro de hospital del request en curso (ver módulo)."""
+        if settings.VPD_ENABLED:
+            return self
+        contexto = get_current_tenant()
+        if contexto is None:
+            return self
+        hospital_id, rol = contexto
+        if rol == ROL_CROSS_HOSPITAL:
+            return self
+        if not hospital_id:
+            return self.none()
+        return self.filter(hospital_id=hospital_id)
+
+    def del_hospital(self, hospital_id: int):
+        """Filtro explícito por hospital (tareas fuera de request)."""
+        return self.filter(hospital_id=hospital_id)
+
+    def activos(self):
+        """Excluye registros con borrado lógico (ACTIVO = 0)."""
+        return self.filter(activo=True)
+
+
+class TenantManager(models.Manager.from_queryset(TenantQuerySet)):
+    """
+    Manager por defecto de los modelos clínicos: todo queryset construido
+    desde Model.objects sale filtrado por el hospital del request.
+    Los accesos por FK (paciente.medico, movimiento.producto) usan el
+    _base_manager de Django y no se ven afectados.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().del_tenant()
+
+    def sin_tenant(self):
+        """Queryset sin filtro de hospital — solo para procesos cross-hospital."""
+        return super().get_queryset()
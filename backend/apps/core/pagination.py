@@ -1,9 +1,42 @@
 """
-HealthTech Solutions — Paginación estándar
+HealthTech Solutions — Paginación estándar + paginación keyset (cursor)
+
+StandardPagination: número de página (COUNT(*) + OFFSET). Adecuada para
+catálogos pequeños.
+
+KeysetPagination: cursor opaco sobre (created_at, pk) en orden descendente.
+Cada página es un range scan sobre el índice (HOSPITAL_ID, CREATED_AT, PK)
+sin OFFSET — el costo no crece con la profundidad de la página.
+  - Opt-in por viewset:  pagination_class = KeysetPagination
+  - Opt-in por request:  ?cursor= en cualquier endpoint con StandardPagination
+                         cuyo modelo tenga created_at
+  - Conteo (?conteo=):   cache    → COUNT exacto cacheado KEYSET_COUNT_TTL s (default)
+                         estimado → cardinalidad del optimizador Oracle (EXPLAIN PLAN)
+                         ninguno  → sin conteo
 """
 
-from rest_framework.pagination import PageNumberPagination
+import base64
+import hashlib
+import json
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _paginador_con_conteo(object_list, per_page, *args, conteo: int, **kwargs):
+    paginador = DjangoPaginator(object_list, per_page, *args, **kwargs)
+    paginador.count = conteo            # cached_property: no vuelve a ejecutar COUNT(*)
+    return paginador
 
 
 class StandardPagination(PageNumberPagination):
@@ -11,7 +44,22 @@ class StandardPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 200
 
+    def paginate_queryset(self, queryset, request, view=None):
+        # ?cursor= → keyset para este request (si el modelo lo permite)
+        self.keyset = None
+        if KeysetPagination.cursor_query_param in request.query_params \
+                and KeysetPagination.supports(queryset):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        # COUNT ya calculado con los validadores del ETag (apps.core.conditional)
+        conteo = getattr(view, 'conteo_lista', None)
+        if conteo is not None:
+            self.django_paginator_class = partial(_paginador_con_conteo, conteo=conteo)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
+        if getattr(self, 'keyset', None) is not None:
+            return self.keyset.get_paginated_response(data)
         return Response({
             'count': self.page.paginator.count,
             'total_pages': self.page.paginator.num_pages,
@@ -20,3 +68,189 @@ class StandardPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data,
         })
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación keyset sobre (created_at, pk) descendente con cursores opacos.
+
+    Respuesta: { count, count_estimado, next, previous, results }
+    Compatibilidad: sin ?cursor=, un ?page= (pantallas existentes) o un
+    ?ordering= distinto de -created_at se responde con StandardPagination.
+    """
+    page_size             = 25
+    page_size_query_param = 'page_size'
+    max_page_size         = 200
+    cursor_query_param    = 'cursor'
+    count_query_param     = 'conteo'
+    keyset_fields         = ('created_at', 'pk')
+
+    CONTEO_MODOS = ('cache', 'estimado', 'ninguno')
+
+    @classmethod
+    def supports(cls, queryset) -> bool:
+        return any(f.name == cls.keyset_fields[0] for f in queryset.model._meta.concrete_fields)
+
+    # --------------------------------------------------------
+    # Paginación
+    # --------------------------------------------------------
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        params = request.query_params
+
+        campo, _ = self.keyset_fields
+
+        self.legacy = None
+        ordering = params.get('ordering')
+        if self.cursor_query_param not in params and (
+            'page' in params or (ordering and ordering != f'-{campo}')
+        ):
+            self.legacy = StandardPagination()
+            return self.legacy.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.count, self.count_estimado = self._get_count(queryset, params)
+
+        cursor   = self.decode_cursor(params.get(self.cursor_query_param))
+        reverse  = bool(cursor and cursor['r'])
+
+        if reverse:
+            qs = queryset.order_by(campo, 'pk')
+        else:
+            qs = queryset.order_by(f'-{campo}', '-pk')
+
+        if cursor:
+            valor, pk = cursor['v'], cursor['k']
+            if reverse:
+                qs = qs.filter(Q(**{f'{campo}__gt': valor}) | Q(**{campo: valor, 'pk__gt': pk}))
+            else:
+                qs = qs.filter(Q(**{f'{campo}__lt': valor}) | Q(**{campo: valor, 'pk__lt': pk}))
+
+        rows = list(qs[:self.page_size + 1])
+        hay_mas = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page_rows = rows
+        if reverse:
+            self.has_next     = True
+            self.has_previous = hay_mas
+        else:
+            self.has_next     = hay_mas
+            self.has_previous = cursor is not None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_paginated_response(self, data):
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'count_estimado': self.count_estimado,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count':          {'type': 'integer', 'nullable': True},
+                'count_estimado': {'type': 'boolean'},
+                'next':           {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous':       {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results':        schema,
+            },
+        }
+
+    # --------------------------------------------------------
+    # Cursores opacos: base64(JSON {v: created_at, k: pk, r: reverse})
+    # --------------------------------------------------------
+    def get_next_link(self):
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._link(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self._link(self.page_rows[0], reverse=True)
+
+    def _link(self, row, reverse: bool) -> str:
+        campo, _ = self.keyset_fields
+        valor = getattr(row, campo)
+        payload = json.dumps({
+            'v': valor.isoformat() if hasattr(valor, 'isoformat') else valor,
+            'k': row.pk,
+            'r': int(reverse),
+        }, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, token: str | None) -> dict | None:
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            data   = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            valor  = parse_datetime(data['v']) if isinstance(data['v'], str) else data['v']
+            if valor is None:
+                raise ValueError
+            return {'v': valor, 'k': int(data['k']), 'r': bool(data.get('r'))}
+        except (ValueError, KeyError, TypeError, json.JSONDecodeError):
+            raise NotFound('Cursor de paginación inválido.')
+
+    # --------------------------------------------------------
+    # Conteo opcional
+    # --------------------------------------------------------
+    def _get_count(self, queryset, params) -> tuple[int | None, bool]:
+        modo = params.get(self.count_query_param, 'cache')
+        if modo not in self.CONTEO_MODOS or modo == 'ninguno':
+            return None, False
+        if modo == 'estimado' and connections[queryset.db].vendor == 'oracle':
+            estimado = self._estimated_count(queryset)
+            if estimado is not None:
+                return estimado, True
+        return self._cached_count(queryset), False
+
+    @staticmethod
+    def _cached_count(queryset) -> int:
+        sql, params = queryset.order_by().query.sql_with_params()
+        key = 'healthtech:keyset_count:' + hashlib.sha1(
+            f'{queryset.db}|{sql}|{params}'.encode()
+        ).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.order_by().count()
+            cache.set(key, count, getattr(settings, 'KEYSET_COUNT_TTL', 60))
+        return count
+
+    @staticmethod
+    def _estimated_count(queryset) -> int | None:
+        """Cardinalidad estimada por el optimizador (estadísticas de la tabla)."""
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        statement_id = uuid.uuid4().hex[:30]
+        try:
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(
+                    f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}", params,
+                )
+                cursor.execute(
+                    'SELECT CARDINALITY FROM PLAN_TABLE WHERE STATEMENT_ID = %s AND ID = 0',
+                    [statement_id],
+                )
+                row = cursor.fetchone()
+                cursor.execute('DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = %s', [statement_id])
+            return int(row[0]) if row and row[0] is not None else None
+        except Exception:
+            return None
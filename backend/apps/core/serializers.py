@@ -2,11 +2,146 @@
 HealthTech Solutions — Serializers base
 Asegura que campos de auditoría sean de solo lectura
 y que PHI no se filtre al frontend.
+
+NombreUsuarioField: nombre para mostrar de un FK a SEC_USUARIOS sin cargar
+el usuario fila por fila. Los ids de toda la página se resuelven con una
+sola consulta values() o desde un LRU de proceso (USUARIO_NOMBRE_CACHE_*).
 """
 
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
 from rest_framework import serializers
 
 
+# ============================================================
+# Cache de nombres de usuario (LRU por proceso)
+# ============================================================
+CAMPOS_NOMBRE = ('primer_nombre', 'segundo_nombre', 'primer_apellido', 'segundo_apellido', 'username')
+
+_nombres: OrderedDict = OrderedDict()     # usr_id → (expira, datos)
+_nombres_lock = threading.Lock()
+
+
+def nombres_usuario(usr_ids) -> dict:
+    """
+    {usr_id: {primer_nombre, …, username}} para los ids dados.
+    Los que no están en el LRU (o expiraron) se leen con una sola consulta.
+    """
+    ids   = {u for u in usr_ids if u is not None}
+    ahora = time.monotonic()
+    encontrados = {}
+    with _nombres_lock:
+        for usr_id in ids:
+            entrada = _nombres.get(usr_id)
+            if entrada and entrada[0] > ahora:
+                _nombres.move_to_end(usr_id)
+                encontrados[usr_id] = entrada[1]
+
+    faltantes = ids - encontrados.keys()
+    if faltantes:
+        filas = (
+            get_user_model()._base_manager
+            .filter(pk__in=faltantes)
+            .values('pk', *CAMPOS_NOMBRE)
+        )
+        nuevos = {fila.pop('pk'): fila for fila in filas}
+        encontrados.update(nuevos)
+
+        expira = ahora + getattr(settings, 'USUARIO_NOMBRE_CACHE_TTL', 300)
+        limite = getattr(settings, 'USUARIO_NOMBRE_CACHE_SIZE', 5000)
+        with _nombres_lock:
+            for usr_id, datos in nuevos.items():
+                _nombres[usr_id] = (expira, datos)
+                _nombres.move_to_end(usr_id)
+            while len(_nombres) > limite:
+                _nombres.popitem(last=False)
+    return encontrados
+
+
+def invalidar_nombres_usuario(*usr_ids) -> None:
+    """Elimina nombres del LRU (signals.py de security); sin ids lo vacía."""
+    with _nombres_lock:
+        if not usr_ids:
+            _nombres.clear()
+        for usr_id in usr_ids:
+            _nombres.pop(usr_id, None)
+
+
+class NombreUsuarioField(serializers.Field):
+    """
+    Nombre para mostrar de un FK a Usuario (solo lectura).
+
+        responsable = NombreUsuarioField('created_by', vacio='Sistema', usar_username=True)
+
+    formato:       'corto' (primer nombre + primer apellido) o 'completo'.
+    prefijo:       antepuesto al nombre (ej. 'Dr. ').
+    vacio:         valor cuando el FK es NULL.
+    usar_username: si el nombre queda vacío, devuelve el username.
+
+    En un ListSerializer, la primera fila reúne los ids de todos los
+    NombreUsuarioField de la página y los resuelve de una vez. Si el FK ya
+    viene cargado (select_related), se usa sin consultar.
+    """
+
+    def __init__(self, fk, formato='corto', prefijo='', vacio=None, usar_username=False, **kwargs):
+        kwargs['source']    = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.fk            = fk
+        self.attname       = f'{fk}_id'
+        self.formato       = formato
+        self.prefijo       = prefijo
+        self.vacio         = vacio
+        self.usar_username = usar_username
+
+    def _cargado(self, obj) -> bool:
+        return obj._meta.get_field(self.fk).is_cached(obj)
+
+    def _nombres_pagina(self) -> dict:
+        """Ids de la página (todas las filas y campos) → datos de nombre, una vez por serializer raíz."""
+        root    = self.root
+        nombres = getattr(root, '_nombres_usuario', None)
+        if nombres is None:
+            ids = set()
+            if (isinstance(root, serializers.ListSerializer) and self.parent is root.child
+                    and isinstance(root.instance, (list, tuple, QuerySet))):
+                campos = [f for f in self.parent.fields.values() if isinstance(f, NombreUsuarioField)]
+                for obj in root.instance:
+                    ids.update(getattr(obj, f.attname) for f in campos if not f._cargado(obj))
+            nombres = root._nombres_usuario = nombres_usuario(ids)
+        return nombres
+
+    def _formatear(self, datos: dict) -> str:
+        if self.formato == 'completo':
+            partes = (datos['primer_nombre'], datos['segundo_nombre'],
+                      datos['primer_apellido'], datos['segundo_apellido'])
+            nombre = ' '.join(p for p in partes if p).strip()
+        else:
+            nombre = f"{datos['primer_nombre'] or ''} {datos['primer_apellido'] or ''}".strip()
+        if not nombre and self.usar_username:
+            nombre = datos['username']
+        return f'{self.prefijo}{nombre}'
+
+    def to_representation(self, obj):
+        usr_id = getattr(obj, self.attname)
+        if usr_id is None:
+            return self.vacio
+        if self._cargado(obj):
+            usuario = getattr(obj, self.fk)
+            return self._formatear({c: getattr(usuario, c) for c in CAMPOS_NOMBRE})
+
+        nombres = self._nombres_pagina()
+        if usr_id not in nombres:
+            nombres.update(nombres_usuario([usr_id]))
+        datos = nombres.get(usr_id)
+        return self._formatear(datos) if datos else self.vacio
+
+
 class AuditModelSerializer(serializers.ModelSerializer):
     """
     Serializer base para modelos con AuditModel.
@@ -15,8 +150,8 @@ class AuditModelSerializer(serializers.ModelSerializer):
     - is_active: no se expone directamente
     """
 
-    created_by_name = serializers.SerializerMethodField(read_only=True)
-    updated_by_name = serializers.SerializerMethodField(read_only=True)
+    created_by_name = NombreUsuarioField('created_by', formato='completo')
+    updated_by_name = NombreUsuarioField('updated_by', formato='completo')
 
     class Meta:
         # Las subclases deben definir model y fields
@@ -28,16 +163,6 @@ class AuditModelSerializer(serializers.ModelSerializer):
         # hospital_id NUNCA en fields del response — VPD ya filtra en BD
         exclude_from_response = ('hospital_id', 'is_active')
 
-    def get_created_by_name(self, obj) -> str | None:
-        if obj.created_by:
-            return obj.created_by.get_full_name()
-        return None
-
-    def get_updated_by_name(self, obj) -> str | None:
-        if obj.updated_by:
-            return obj.updated_by.get_full_name()
-        return None
-
     def create(self, validated_data):
         """Inyecta hospital_id y created_by desde el request."""
         request = self.context.get('request')
@@ -0,0 +1,146 @@
+"""
+HealthTech Solutions — Tests: Pipeline de auditoría HIPAA (apps.core.audit)
+Cobertura:
+  - Modo síncrono (tests/scripts): fila inmediata en SEC_AUDITORIA_ACCESOS
+  - Modo asíncrono: el evento queda en spool hasta el flush por lotes
+  - Fallo de BD: el segmento se conserva y se re-inserta después
+  - Segmentos huérfanos (worker caído) se recuperan con replay_spool()
+  - Filas ilegibles o rechazadas van a cuarentena sin bloquear los demás segmentos
+  - Firma _audit_phi(request, accion, id, descripcion) de las vistas
+"""
+import json
+
+import pytest
+from django.test import RequestFactory
+
+from apps.core.audit import AuditWriter, audit_phi_for
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def phi_request(usuario_medico):
+    request = RequestFactory().get('/api/v1/patients/1/', HTTP_X_FORWARDED_FOR='10.1.1.5, 10.0.0.1')
+    request.user = usuario_medico
+    return request
+
+
+@pytest.fixture
+def async_writer(settings, tmp_path, monkeypatch):
+    """Writer asíncrono sin hilo de vaciado: el test controla el flush."""
+    settings.AUDIT_ASYNC      = True
+    settings.AUDIT_SPOOL_DIR  = str(tmp_path)
+    settings.AUDIT_BATCH_SIZE = 50
+    monkeypatch.setattr(AuditWriter, '_run', lambda self: None)
+    return AuditWriter()
+
+
+def _evento(usuario, **extra):
+    row = {
+        'hospital_id': usuario.hospital_id,
+        'usuario_id':  usuario.pk,
+        'tipo_evento': 'PHI_ACCESS',
+        'modulo':      'patients',
+        'accion':      'READ_DETAIL',
+        'registro_id': '1',
+        'ip_origen':   '10.1.1.5',
+    }
+    row.update(extra)
+    return row
+
+
+class TestAuditoriaSincrona:
+
+    def test_audit_phi_conserva_firma_y_campos(self, phi_request):
+        from apps.security.models import AuditoriaAcceso
+        _audit_phi = audit_phi_for('patients', 'PAC_PACIENTES', 'paciente')
+
+        _audit_phi(phi_request, 'READ_DETAIL', 7)
+
+        aud = AuditoriaAcceso.objects.get()
+        assert aud.tabla_afectada == 'PAC_PACIENTES'
+        assert aud.registro_id == '7'
+        assert aud.ip_origen == '10.1.1.5'
+        assert aud.descripcion == 'READ_DETAIL paciente #7'
+        assert aud.usuario_id == phi_request.user.pk
+
+
+class TestAuditoriaAsincrona:
+
+    def test_eventos_en_spool_hasta_flush(self, async_writer, usuario_medico, tmp_path):
+        from apps.security.models import AuditoriaAcceso
+
+        for i in range(3):
+            async_writer.submit(_evento(usuario_medico, registro_id=str(i)))
+
+        assert AuditoriaAcceso.objects.count() == 0
+        assert async_writer.metrics()['cola_profundidad'] == 3
+        assert len(list(tmp_path.glob('*.jsonl'))) == 1
+
+        async_writer.flush()
+
+        assert AuditoriaAcceso.objects.count() == 3
+        assert list(tmp_path.glob('*.jsonl')) == []
+        metricas = async_writer.metrics()
+        assert metricas['cola_profundidad'] == 0
+        assert metricas['insertados'] == 3
+        assert metricas['ultimo_flush_ms'] is not None
+
+    def test_fallo_bd_conserva_segmento(self, async_writer, usuario_medico, tmp_path, monkeypatch):
+        from apps.security.models import AuditoriaAcceso
+
+        async_writer.submit(_evento(usuario_medico))
+        monkeypatch.setattr(AuditWriter, '_insert_rows', lambda self, rows: False)
+        monkeypatch.setattr(AuditWriter, '_db_available', staticmethod(lambda: False))
+        async_writer.flush()
+
+        assert AuditoriaAcceso.objects.count() == 0
+        assert len(list(tmp_path.glob('*.jsonl'))) == 1
+
+        monkeypatch.undo()
+        assert async_writer.replay_spool() == 1
+        assert AuditoriaAcceso.objects.count() == 1
+        assert list(tmp_path.glob('*.jsonl')) == []
+
+    def test_replay_segmento_huerfano(self, async_writer, usuario_medico, tmp_path):
+        from apps.security.models import AuditoriaAcceso
+
+        row = _evento(usuario_medico, created_at='2026-03-01T10:00:00+00:00')
+        (tmp_path / '999-huerfano.jsonl').write_text(
+            json.dumps(row) + '\n{"truncado": ',      # última línea incompleta
+            encoding='utf-8',
+        )
+
+        assert async_writer.replay_spool() == 1
+        aud = AuditoriaAcceso.objects.get()
+        assert aud.created_at.year == 2026 and aud.created_at.month == 3
+        assert (tmp_path / 'cuarentena' / '999-huerfano.jsonl').read_text(encoding='utf-8') == '{"truncado": \n'
+
+    def test_fila_rechazada_no_bloquea_el_spool(self, async_writer, usuario_medico, tmp_path, monkeypatch):
+        from apps.security.models import AuditoriaAcceso
+
+        insertar = AuditWriter._insert_rows
+
+        def _rechaza_veneno(self, rows):
+            if any(row['registro_id'] == 'veneno' for row in rows):
+                return False             # Oracle rechaza la fila con la BD disponible
+            return insertar(self, rows)
+
+        monkeypatch.setattr(AuditWriter, '_insert_rows', _rechaza_veneno)
+        creado = '2026-03-01T10:00:00+00:00'
+        (tmp_path / '1-primero.jsonl').write_text(
+            json.dumps(_evento(usuario_medico, registro_id='veneno', created_at=creado)) + '\n'
+            + json.dumps(_evento(usuario_medico, registro_id='1', created_at=creado)) + '\n',
+            encoding='utf-8',
+        )
+        (tmp_path / '2-segundo.jsonl').write_text(
+            json.dumps(_evento(usuario_medico, registro_id='2', created_at=creado)) + '\n', encoding='utf-8',
+        )
+
+        assert async_writer.replay_spool() == 2
+        assert sorted(AuditoriaAcceso.objects.values_list('registro_id', flat=True)) == ['1', '2']
+        assert list(tmp_path.glob('*.jsonl')) == []
+        apartada = (tmp_path / 'cuarentena' / '1-primero.jsonl').read_text(encoding='utf-8')
+        assert json.loads(apartada)['registro_id'] == 'veneno'
+        assert async_writer.metrics()['en_cuarentena'] == 1
@@ -0,0 +1,58 @@
+"""
+HealthTech Solutions — Tests: Benchmark de endpoints (apps/core/bench.py)
+Cobertura:
+  - Todos los escenarios del catálogo responden lo esperado sobre el dataset
+    sintético (el catálogo no se desactualiza respecto a las URLs/estados)
+  - Dataset: kardex de bodega coherente con el stock del producto
+  - comparar(): presupuesto de consultas y de latencia (con piso en ms)
+"""
+import pytest
+
+from apps.core.bench import ESCENARIOS, BenchRunner, Resultado, comparar
+from apps.core.datasets import GeneradorDataset, escalar, preparar_hospital, preparar_roles
+from apps.security.models import Usuario
+from apps.warehouse.models import Movimiento, Producto
+
+
+@pytest.fixture
+def dataset(db):
+    roles    = preparar_roles()
+    hospital = preparar_hospital(1)
+    GeneradorDataset(hospital, escalar(0.1), semilla=7).generar(roles)
+    Usuario.objects.create_user(
+        username='bench.superadmin', email='sa@healthtech.gt', password=None,
+        hospital_id=hospital.hospital_id, rol=roles['SUPER_ADMIN'],
+        primer_nombre='Bench', primer_apellido='SuperAdmin', tipo_personal='ADMINISTRATIVO',
+    )
+    return hospital
+
+
+def test_catalogo_completo_sobre_dataset(dataset):
+    resultados = BenchRunner(dataset.hospital_id, iteraciones=1, calentamiento=0).correr()
+    assert set(resultados) == {e.nombre for e in ESCENARIOS}
+    assert all(r.consultas > 0 for r in resultados.values())
+
+
+def test_kardex_coherente(dataset):
+    producto = Producto.objects.filter(hospital_id=dataset.hospital_id).order_by('pk').first()
+    movimientos = list(Movimiento.objects.filter(producto=producto).order_by('created_at', 'pk'))
+    saldo = 0
+    for m in movimientos:
+        assert m.cantidad_anterior == saldo
+        saldo = m.cantidad_posterior
+    assert producto.stock_actual == saldo
+
+
+def test_comparar_presupuestos():
+    baseline = {'escenarios': {
+        'a': {'consultas': 3, 'p50_ms': 10.0, 'p95_ms': 20.0},
+        'b': {'consultas': 2, 'p50_ms': 1.0,  'p95_ms': 1.5},
+    }}
+    ok = {'a': Resultado(3, 12.0, 24.0), 'b': Resultado(2, 2.5, 3.0), 'nuevo': Resultado(9, 99.0, 99.0)}
+    assert comparar(ok, baseline) == []
+
+    malo = {'a': Resultado(4, 10.0, 30.0), 'b': Resultado(2, 1.0, 1.5)}
+    regresiones = comparar(malo, baseline)
+    assert len(regresiones) == 2
+    assert any('consultas' in r for r in regresiones) and any('p95_ms' in r for r in regresiones)
+    assert comparar(malo, baseline, presupuesto_consultas=1, presupuesto_latencia=1.0) == []
@@ -0,0 +1,15 @@
+"""
+HealthTech Solutions — Tests: System checks (apps/core/checks.py)
+Cobertura:
+  - core.E001: caché por proceso (LocMemCache) rechazada en check --deploy; Redis / BD aceptadas
+"""
+from apps.core.checks import cache_compartida
+
+
+def test_cache_por_proceso_rechazada(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    assert [e.id for e in cache_compartida(None)] == ['core.E001']
+
+    for backend in ('django.core.cache.backends.redis.RedisCache', 'django.core.cache.backends.db.DatabaseCache'):
+        settings.CACHES = {'default': {'BACKEND': backend, 'LOCATION': 'APP_CACHE'}}
+        assert cache_compartida(None) == []
@@ -0,0 +1,108 @@
+"""
+HealthTech Solutions — Tests: GET condicional (apps/core/conditional.py)
+Cobertura:
+  - Ficha del paciente: 304 con If-None-Match sin serializar, auditoría PHI también en 304,
+    ETag nuevo al cambiar alergias anidadas
+  - Catálogos (medicamentos): ETag por COUNT + MAX(UPDATED_AT) y parámetros; reponer lo invalida;
+    sin Last-Modified: If-Modified-Since solo no da 304 tras un borrado físico
+  - Camas: cambio de estado y baja lógica invalidan lista y detalle; If-Modified-Since
+"""
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from apps.hospitalization import asignacion
+from apps.hospitalization.models import Cama
+from apps.patients.models import Paciente
+from apps.pharmacy.models import Medicamento
+from apps.security.models import AuditoriaAcceso
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+def test_ficha_paciente_304_audita(cliente, hospital):
+    paciente = Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-E1', primer_nombre='Ana', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento='0000000000031', fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+    url = f'/api/v1/patients/{paciente.pk}/'
+    AuditoriaAcceso.objects.all().delete()
+
+    with CaptureQueriesContext(connection) as completo:
+        r = cliente.get(url)
+    assert r.status_code == 200 and r['ETag'].startswith('W/"') and r['Last-Modified']
+    etag = r['ETag']
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = cliente.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 304 and not r.content and r['ETag'] == etag
+    assert len(ctx.captured_queries) < len(completo.captured_queries)                  # Sin serializar anidados
+    assert AuditoriaAcceso.objects.filter(tipo_evento='PHI_ACCESS').count() == 2       # El 304 también audita
+
+    r = cliente.post(f'{url}alergias/', {'tipo_alergia': 'MEDICAMENTO', 'agente': 'Penicilina'}, format='json')
+    assert r.status_code == 201                                                       # Renueva UPDATED_AT del paciente
+    r = cliente.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200 and r['ETag'] != etag
+    assert [a['agente'] for a in r.json()['alergias']] == ['Penicilina']
+
+
+def test_catalogo_medicamentos(cliente, hospital):
+    med = Medicamento.objects.create(hospital_id=hospital.pk, nombre_generico='Amoxicilina', stock_actual=10)
+    Medicamento.objects.create(hospital_id=hospital.pk, nombre_generico='Ibuprofeno')
+    url = '/api/v1/pharmacy/medicamentos/'
+
+    r = cliente.get(url)
+    etag = r['ETag']
+    assert not r.has_header('Last-Modified')
+    with CaptureQueriesContext(connection) as ctx:
+        r = cliente.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 304
+    assert sum('FAR_MEDICAMENTOS' in q['sql'] for q in ctx.captured_queries) == 1      # Solo COUNT + MAX
+    with CaptureQueriesContext(connection) as ctx:
+        datos = cliente.get(url, {'page_size': 1}).json()
+    assert datos['count'] == 2 and datos['next']                                       # Mismo COUNT, sin repetirlo
+    assert sum('FAR_MEDICAMENTOS' in q['sql'] for q in ctx.captured_queries) == 2
+    assert cliente.get(url, {'search': 'amox'}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    r = cliente.post(f'{url}{med.pk}/reponer/', {'cantidad': 5}, format='json')
+    assert r.status_code == 200
+    r = cliente.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200 and r['ETag'] != etag
+
+    Medicamento.objects.filter(nombre_generico='Ibuprofeno').delete()            # MAX(UPDATED_AT) no cambia
+    ahora = http_date(datetime.datetime.now().timestamp() + 60)
+    assert cliente.get(url, HTTP_IF_MODIFIED_SINCE=ahora).json()['count'] == 1
+
+    detalle = cliente.get(f'{url}{med.pk}/')
+    assert cliente.get(f'{url}{med.pk}/', HTTP_IF_NONE_MATCH=detalle['ETag']).status_code == 304
+
+
+def test_camas_estado_y_baja(cliente, hospital):
+    cama = Cama.objects.create(hospital_id=hospital.pk, numero_cama='C-1', tipo_cama='GENERAL')
+    Cama.objects.create(hospital_id=hospital.pk, numero_cama='C-2', tipo_cama='GENERAL')
+    url = '/api/v1/hospitalization/camas/'
+
+    lista, detalle = cliente.get(url), cliente.get(f'{url}{cama.pk}/')
+    assert asignacion.ocupar(cama)
+    assert cliente.get(url, HTTP_IF_NONE_MATCH=lista['ETag']).status_code == 200
+    r = cliente.get(f'{url}{cama.pk}/', HTTP_IF_NONE_MATCH=detalle['ETag'])
+    assert r.status_code == 200 and r.json()['estado'] == 'OCUPADA'
+
+    # Sin If-None-Match, If-Modified-Since decide
+    ultima = r['Last-Modified']
+    assert cliente.get(f'{url}{cama.pk}/', HTTP_IF_MODIFIED_SINCE=ultima).status_code == 304
+    anterior = http_date(datetime.datetime(2020, 1, 1).timestamp())
+    assert cliente.get(f'{url}{cama.pk}/', HTTP_IF_MODIFIED_SINCE=anterior).status_code == 200
+
+    lista = cliente.get(url)
+    Cama.objects.filter(numero_cama='C-2').update(activo=False)       # Sale de la lista: cambia el conteo
+    assert cliente.get(url, HTTP_IF_NONE_MATCH=lista['ETag']).status_code == 200
@@ -0,0 +1,70 @@
+"""
+HealthTech Solutions — Tests: Generador de datasets de carga (apps/core/datasets.py)
+Cobertura:
+  - generar_dataset: rangos de PK pre-asignados disjuntos entre hospitales
+  - Consistencia referencial: hijos enlazados al paciente de su padre clínico
+  - generate_load_dataset: volúmenes por hospital y validación de --volumen
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import F
+
+from apps.core.datasets import escalar, generar_dataset, preparar_hospital
+from apps.emergency.models import Emergencia
+from apps.hospitalization.models import Encamamiento
+from apps.laboratory.models import OrdenLab
+from apps.nursing.models import SignoVital
+from apps.patients.models import Paciente
+
+
+@pytest.fixture
+def dos_hospitales(db):
+    hospitales = [preparar_hospital(1), preparar_hospital(2)]
+    volumenes = {h.hospital_id: escalar(0.02) for h in hospitales}
+    generar_dataset(volumenes, semilla=3, lote=97, indexar={hospitales[0].hospital_id})
+    return hospitales
+
+
+def test_claves_disjuntas_por_hospital(dos_hospitales):
+    h1, h2 = (h.hospital_id for h in dos_hospitales)
+    for modelo in (Paciente, Emergencia, Encamamiento):
+        pks = {h: set(modelo._base_manager.filter(hospital_id=h).values_list('pk', flat=True)) for h in (h1, h2)}
+        assert pks[h1] and pks[h2]
+        assert max(pks[h1]) < min(pks[h2])
+        assert len(pks[h1]) == max(pks[h1]) - min(pks[h1]) + 1            # Rango contiguo
+
+
+def test_hijos_enlazados_al_paciente_del_padre(dos_hospitales):
+    encamamientos = Encamamiento._base_manager.all()
+    assert not encamamientos.filter(emergencia__isnull=False).exclude(paciente_id=F('emergencia__paciente_id'))
+    assert not encamamientos.filter(cita__isnull=False).exclude(paciente_id=F('cita__paciente_id'))
+    assert encamamientos.filter(emergencia__isnull=False).exists()
+
+    ordenes = OrdenLab._base_manager.all()
+    for padre in ('cita', 'emergencia', 'encamamiento'):
+        assert not ordenes.filter(**{f'{padre}__isnull': False}).exclude(paciente_id=F(f'{padre}__paciente_id'))
+        assert ordenes.filter(**{f'{padre}__hospital_id': F('hospital_id')}).exists()
+
+    signos = SignoVital._base_manager.all()
+    assert signos.exists()
+    assert not signos.exclude(paciente_id=F('encamamiento__paciente_id'))
+    assert not signos.exclude(hospital_id=F('encamamiento__hospital_id'))
+
+
+def test_comando_volumenes_por_hospital(db):
+    call_command('generate_load_dataset', '--hospitales', '2', '--escala', '0.01', '--sin-indice',
+                 '--volumen', 'pacientes=40', '--volumen', '2:pacientes=25', stdout=StringIO())
+
+    def conteo(numero):
+        return Paciente._base_manager.filter(hospital_id=preparar_hospital(numero).pk).count()
+
+    assert (conteo(1), conteo(2)) == (40, 25)
+
+    with pytest.raises(CommandError, match='datos previos'):
+        call_command('generate_load_dataset', '--escala', '0.01')
+    with pytest.raises(CommandError, match='Entidad desconocida'):
+        call_command('generate_load_dataset', '--primer-hospital', '3', '--volumen', 'camillas=3')
+    with pytest.raises(CommandError, match='fuera de rango'):
+        call_command('generate_load_dataset', '--primer-hospital', '3', '--volumen', '5:citas=3')
@@ -0,0 +1,80 @@
+"""
+HealthTech Solutions — Tests: TenantManager (apps/core/managers.py)
+Cobertura:
+  - Filtro automático por el hospital del request (thread local de vpd.py)
+  - SUPER_ADMIN y procesos fuera de request → sin filtro
+  - Usuario sin hospital → queryset vacío
+  - El filtro se fija al construir el queryset (respuestas streaming)
+  - Composición con activos() (borrado lógico)
+"""
+import datetime
+
+import pytest
+
+from apps.patients.models import Paciente
+from config.oracle.vpd import set_current_request
+
+
+pytestmark = pytest.mark.django_db
+
+
+class _Request:
+    def __init__(self, user):
+        self.user = user
+
+
+@pytest.fixture
+def contexto():
+    """Simula el request en curso que registra OracleVPDMiddleware."""
+    def _usar(user):
+        set_current_request(_Request(user))
+    yield _usar
+    set_current_request(None)
+
+
+@pytest.fixture
+def pacientes(hospital):
+    def crear(hospital_id, sufijo, activo=True):
+        return Paciente.objects.create(
+            hospital_id=hospital_id, primer_nombre='Ana', primer_apellido=f'Prueba{sufijo}',
+            tipo_documento='DPI', no_documento=f'100000000{sufijo}',
+            fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+            tipo_paciente='GENERAL', no_expediente=f'EXP-{sufijo}', activo=activo,
+        )
+    return [
+        crear(hospital.hospital_id, 1),
+        crear(hospital.hospital_id, 2, activo=False),
+        crear(hospital.hospital_id + 1, 3),
+    ]
+
+
+def _expedientes(qs):
+    return sorted(qs.values_list('no_expediente', flat=True))
+
+
+def test_filtra_por_hospital_del_request(contexto, pacientes, usuario_medico):
+    contexto(usuario_medico)
+    assert _expedientes(Paciente.objects.all()) == ['EXP-1', 'EXP-2']
+    assert _expedientes(Paciente.objects.activos()) == ['EXP-1']
+    assert _expedientes(Paciente.objects.sin_tenant()) == ['EXP-1', 'EXP-2', 'EXP-3']
+
+
+def test_super_admin_y_fuera_de_request_sin_filtro(contexto, pacientes, usuario_medico, rol_super_admin):
+    assert Paciente.objects.count() == 3
+
+    usuario_medico.rol = rol_super_admin
+    contexto(usuario_medico)
+    assert Paciente.objects.count() == 3
+
+
+def test_usuario_sin_hospital_no_ve_nada(contexto, pacientes, usuario_medico):
+    usuario_medico.hospital_id = None
+    contexto(usuario_medico)
+    assert not Paciente.objects.exists()
+
+
+def test_filtro_fijado_al_construir_queryset(contexto, pacientes, usuario_medico):
+    contexto(usuario_medico)
+    qs = Paciente.objects.activos()
+    set_current_request(None)           # El middleware limpió antes del streaming
+    assert _expedientes(qs) == ['EXP-1']
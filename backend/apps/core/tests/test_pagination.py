@@ -0,0 +1,93 @@
+"""
+HealthTech Solutions — Tests: Paginación keyset (apps.core.pagination)
+Cobertura:
+  - Recorrido completo next → previous sin duplicados ni huecos,
+    incluyendo filas con el mismo created_at (desempate por pk)
+  - Conteo cacheado / desactivado (?conteo=)
+  - Cursor manipulado → 404
+  - Compatibilidad: ?page= responde con StandardPagination
+  - Opt-in por request (?cursor=) desde StandardPagination
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.pagination import KeysetPagination, StandardPagination
+from apps.security.models import AuditoriaAcceso
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def auditorias(hospital):
+    """7 eventos; los 3 primeros comparten created_at."""
+    cache.clear()
+    base = timezone.now()
+    rows = []
+    for i in range(7):
+        aud = AuditoriaAcceso.objects.create(
+            hospital_id=hospital.pk, tipo_evento='PHI_ACCESS',
+            ip_origen='10.0.0.1', registro_id=str(i),
+        )
+        rows.append(aud)
+    for i, aud in enumerate(rows):
+        aud.created_at = base - timedelta(minutes=max(i, 2))
+    AuditoriaAcceso.objects.bulk_update(rows, ['created_at'])
+    return AuditoriaAcceso.objects.order_by('-created_at', '-pk')
+
+
+def _request(url):
+    return Request(APIRequestFactory().get(url))
+
+
+def _page(url, paginator_class=KeysetPagination):
+    paginator = paginator_class()
+    rows = paginator.paginate_queryset(AuditoriaAcceso.objects.all(), _request(url))
+    data = paginator.get_paginated_response([r.pk for r in rows]).data
+    return data
+
+
+class TestKeysetPagination:
+
+    def test_recorrido_next_y_previous(self, auditorias):
+        esperado = [a.pk for a in auditorias]
+
+        p1 = _page('/api/v1/auth/auditoria/?page_size=3')
+        p2 = _page(p1['next'])
+        p3 = _page(p2['next'])
+        assert p1['results'] + p2['results'] + p3['results'] == esperado
+        assert p1['previous'] is None
+        assert p3['next'] is None
+
+        atras = _page(p3['previous'])
+        assert atras['results'] == p2['results']
+        assert _page(atras['previous'])['results'] == p1['results']
+
+    def test_conteo_cacheado_y_desactivado(self, auditorias):
+        assert _page('/?page_size=2')['count'] == 7
+        AuditoriaAcceso.objects.filter(pk=auditorias[0].pk).delete()
+        assert _page('/?page_size=2')['count'] == 7          # Servido desde cache
+        sin_conteo = _page('/?page_size=2&conteo=ninguno')
+        assert sin_conteo['count'] is None
+        assert sin_conteo['count_estimado'] is False
+
+    def test_cursor_invalido(self, auditorias):
+        with pytest.raises(NotFound):
+            _page('/?cursor=no-es-un-cursor')
+
+    def test_page_usa_paginacion_por_numero(self, auditorias):
+        data = _page('/?page=2&page_size=5')
+        assert data['current_page'] == 2
+        assert len(data['results']) == 2
+
+    def test_standard_pagination_opt_in_por_cursor(self, auditorias):
+        data = _page('/?cursor=&page_size=4', StandardPagination)
+        assert 'current_page' not in data
+        assert data['results'] == [a.pk for a in auditorias[:4]]
+        assert 'cursor=' in data['next']
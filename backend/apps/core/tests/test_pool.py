@@ -0,0 +1,147 @@
+"""
+HealthTech Solutions — Tests: Pool oracledb del ORM (config/oracle/pool.py)
+Cobertura (pool simulado, sin Oracle):
+  - Sesiones reutilizadas entre requests (acquire/release) en lugar de recreadas
+  - NLS solo una vez por sesión física
+  - Session tags: mismo tenant → sin callback; tenant distinto → callback con CLEAR_CONTEXT
+  - Estadísticas de adquisiciones y espera
+La prueba de carga real contra Oracle es: python manage.py soak_pool
+"""
+import pytest
+
+from config.oracle import pool as pool_mod
+
+
+class _ConexionFalsa:
+    def __init__(self, sentencias):
+        self.tag = None
+        self.sentencias = sentencias
+
+    def cursor(self):
+        conn = self
+
+        class _Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, *args):
+                conn.sentencias.append(sql)
+
+            def callproc(self, nombre, params=None):
+                conn.sentencias.append(nombre)
+        return _Cursor()
+
+
+class _PoolFalso:
+    """Emula ConnectionPool: reutiliza sesiones libres priorizando el tag pedido."""
+
+    def __init__(self, session_callback=None, min=1, max=5, **kwargs):
+        self.session_callback = session_callback
+        self.min, self.max = min, max
+        self.sesiones, self.libres, self.sentencias = [], [], []
+
+    @property
+    def opened(self):
+        return len(self.sesiones)
+
+    @property
+    def busy(self):
+        return len(self.sesiones) - len(self.libres)
+
+    def acquire(self, tag=None):
+        conn = next((c for c in self.libres if c.tag == tag), None)
+        if conn is None and self.libres:
+            conn = self.libres[0]
+        if conn is None:
+            conn = _ConexionFalsa(self.sentencias)
+            self.sesiones.append(conn)
+        else:
+            self.libres.remove(conn)
+        if conn.tag != tag and self.session_callback:
+            self.session_callback(conn, tag)
+        return conn
+
+    def release(self, conn):
+        self.libres.append(conn)
+
+
+@pytest.fixture
+def pool_falso(monkeypatch, settings):
+    creados = []
+
+    def _create_pool(**kwargs):
+        creados.append(_PoolFalso(**kwargs))
+        return creados[-1]
+
+    monkeypatch.setattr(pool_mod.oracledb, 'create_pool', _create_pool)
+    settings.ORACLE_ENV = 'dev'
+    pool_mod.close_all_pools()
+    yield creados
+    pool_mod._pools.clear()
+    pool_mod._stats.clear()
+
+
+DB = {'USER': 'soak', 'PASSWORD': 'x', 'NAME': 'localhost:1521/xepdb1', 'HOST': '', 'PORT': ''}
+
+
+def test_sesion_reutilizada_entre_requests(pool_falso, settings):
+    settings.VPD_ENABLED = False
+    for _ in range(50):
+        conn = pool_mod.acquire('default', DB)
+        pool_mod.release('default', conn, DB)
+
+    pool = pool_falso[0]
+    assert len(pool_falso) == 1
+    assert pool.opened == 1
+    # NLS (2 ALTER SESSION) solo en la primera adquisición
+    assert len(pool.sentencias) == 2
+
+    stats = pool_mod.pool_stats()['default@soak']
+    assert stats['adquisiciones'] == 50
+    assert stats['liberaciones'] == 50
+    assert stats['ocupadas'] == 0
+
+
+def test_tags_evitan_cambio_de_contexto(pool_falso, settings):
+    from config.oracle.vpd import (
+        get_vpd_stats, reset_vpd_stats, set_current_hospital_id, set_current_user_rol,
+    )
+    settings.VPD_ENABLED = True
+    reset_vpd_stats()
+    set_current_user_rol('MEDICO')
+    try:
+        for hospital_id in [1, 1, 1, 2, 2, 1]:
+            set_current_hospital_id(hospital_id)
+            conn = pool_mod.acquire('default', DB)
+            assert conn.tag == f'HOSPITAL_ID={hospital_id};USER_ROL=MEDICO'
+            pool_mod.release('default', conn, DB)
+    finally:
+        set_current_hospital_id(None)
+        set_current_user_rol(None)
+
+    assert get_vpd_stats()['realizados'] == 3
+    assert get_vpd_stats()['evitados'] == 3
+
+
+def test_contexto_parcial_no_hereda_hospital(pool_falso, settings):
+    from config.oracle.vpd import set_current_hospital_id, set_current_user_rol
+    settings.VPD_ENABLED = True
+    set_current_user_rol('MEDICO')
+    try:
+        set_current_hospital_id(5)
+        conn = pool_mod.acquire('default', DB)
+        pool_mod.release('default', conn, DB)
+        del pool_falso[0].sentencias[:]
+
+        set_current_hospital_id(None)
+        otra = pool_mod.acquire('default', DB)             # La única sesión libre: la del hospital 5
+        pool_mod.release('default', otra, DB)
+    finally:
+        set_current_hospital_id(None)
+        set_current_user_rol(None)
+
+    assert otra is conn and otra.tag == 'HOSPITAL_ID=;USER_ROL=MEDICO'
+    assert pool_falso[0].sentencias == ['HEALTHTECH_PKG.CLEAR_CONTEXT', 'HEALTHTECH_PKG.SET_USER_ROL']
@@ -0,0 +1,161 @@
+"""
+HealthTech Solutions — Tests: Consultas por página en endpoints de listado
+Regresión N+1: el número de consultas de un GET de listado no depende de
+cuántas filas (ni cuántos usuarios distintos) trae la página.
+Los nombres de usuario (NombreUsuarioField) se resuelven en una consulta
+por página, o ninguna si ya están en el LRU de proceso.
+"""
+import datetime
+import itertools
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.appointments.models import Cita
+from apps.core.serializers import NombreUsuarioField, invalidar_nombres_usuario
+from apps.emergency.models import Emergencia
+from apps.hospitalization.models import Cama, Encamamiento
+from apps.laboratory.models import OrdenLab
+from apps.nursing.models import NotaEnfermeria, SignoVital
+from apps.pacs.models import EstudioImagen
+from apps.patients.models import Paciente
+from apps.pharmacy.models import Dispensacion, Medicamento
+from apps.security.models import AuditoriaAcceso, Usuario
+from apps.surgery.models import Cirugia
+from apps.warehouse.models import Movimiento, Producto
+
+
+pytestmark = pytest.mark.django_db
+
+HOY  = datetime.date(2026, 3, 4)
+HORA = datetime.time(8, 0)
+_seq = itertools.count(1)
+
+
+# ============================================================
+# Fábricas: una fila por llamada, cada una con un usuario distinto
+# ============================================================
+def _usuario(h, rol):
+    n = next(_seq)
+    return Usuario.objects.create_user(
+        username=f'u{n}', email=f'u{n}@healthtech.gt', password='x',
+        hospital_id=h, rol=rol, primer_nombre=f'Nombre{n}',
+        primer_apellido=f'Apellido{n}', tipo_personal='MEDICO',
+    )
+
+
+def _paciente(h, u):
+    n = next(_seq)
+    return Paciente.objects.create(
+        hospital_id=h, no_expediente=f'EXP-{n}', primer_nombre='Ana',
+        primer_apellido=f'Prueba{n}', tipo_documento='DPI', no_documento=f'{n:013d}',
+        fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F', medico=u,
+    )
+
+
+def _medicamento(h):
+    return Medicamento.objects.create(hospital_id=h, nombre_generico=f'Med {next(_seq)}')
+
+
+def _producto(h):
+    return Producto.objects.create(hospital_id=h, nombre=f'Producto {next(_seq)}')
+
+
+def _cama(h):
+    return Cama.objects.create(hospital_id=h, numero_cama=f'C-{next(_seq)}', tipo_cama='GENERAL')
+
+
+FABRICAS = {
+    '/api/v1/patients/': _paciente,
+    '/api/v1/appointments/': lambda h, u: Cita.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), medico=u, fecha_cita=HOY,
+        hora_inicio=HORA, hora_fin=datetime.time(9, 0), tipo_cita='CONSULTA', motivo='Control',
+    ),
+    '/api/v1/emergency/': lambda h, u: Emergencia.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), medico=u, enfermero=u,
+        fecha_ingreso=HOY, hora_ingreso=HORA, motivo_consulta='Dolor', nivel_triaje='AMARILLO',
+    ),
+    '/api/v1/hospitalization/camas/': lambda h, u: _cama(h),
+    '/api/v1/hospitalization/': lambda h, u: Encamamiento.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), cama=_cama(h), medico=u, enfermero=u,
+        fecha_ingreso=HOY, hora_ingreso=HORA, motivo_ingreso='Observación',
+    ),
+    '/api/v1/surgery/': lambda h, u: Cirugia.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), cirujano=u, anestesiologo=u,
+        fecha_programada=HOY, hora_ini_prog=HORA, quirofano='Q1', tipo_cirugia='Apendicectomía',
+    ),
+    '/api/v1/laboratory/': lambda h, u: OrdenLab.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), medico_solic=u, laboratorista=u,
+        fecha_solicitud=HOY, hora_solicitud=HORA, examenes_solicitados='Hematología',
+    ),
+    '/api/v1/pharmacy/medicamentos/': lambda h, u: _medicamento(h),
+    '/api/v1/pharmacy/dispensaciones/': lambda h, u: Dispensacion.objects.create(
+        hospital_id=h, medicamento=_medicamento(h), paciente=_paciente(h, u), cantidad=1,
+        fecha_prescripcion=HOY, medico_prescribe=u, dispensado_por=u,
+    ),
+    '/api/v1/warehouse/productos/': lambda h, u: _producto(h),
+    '/api/v1/warehouse/movimientos/': lambda h, u: Movimiento.objects.create(
+        hospital_id=h, producto=_producto(h), tipo_movimiento='ENTRADA', cantidad=1,
+        cantidad_anterior=0, cantidad_posterior=1, created_by=u,
+    ),
+    '/api/v1/nursing/signos-vitales/': lambda h, u: SignoVital.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), created_by=u,
+    ),
+    '/api/v1/nursing/notas/': lambda h, u: NotaEnfermeria.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), contenido='Paciente estable', created_by=u,
+    ),
+    '/api/v1/imaging/estudios/': lambda h, u: EstudioImagen.objects.create(
+        hospital_id=h, paciente=_paciente(h, u), medico_sol=u, tecnico=u, radiologo=u,
+        modalidad='CT', descripcion_clinica='Control', fecha_solicitud=HOY,
+    ),
+    '/api/v1/auth/usuarios/': lambda h, u: u,
+    '/api/v1/auth/auditoria/': lambda h, u: AuditoriaAcceso.objects.create(
+        hospital_id=h, usuario=u, tipo_evento='LOGIN_OK', ip_origen='127.0.0.1',
+    ),
+}
+
+
+def _consultas(client, url) -> int:
+    cache.clear()                      # Conteo de KeysetPagination y principal
+    invalidar_nombres_usuario()
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.get(url)
+    assert resp.status_code == 200, (url, resp.status_code)
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize('url', list(FABRICAS))
+def test_consultas_constantes_por_pagina(url, api_client, usuario_admin, hospital, rol_medico, rol_super_admin):
+    crear = FABRICAS[url]
+    h     = hospital.hospital_id
+    if url == '/api/v1/auth/auditoria/':          # IsAuditor
+        usuario_admin.rol = rol_super_admin
+    api_client.force_authenticate(user=usuario_admin)
+
+    for _ in range(2):
+        crear(h, _usuario(h, rol_medico))
+    pocas = _consultas(api_client, url)
+
+    for _ in range(8):
+        crear(h, _usuario(h, rol_medico))
+    muchas = _consultas(api_client, url)
+
+    assert muchas == pocas, f'{url}: {pocas} consultas con 2 filas, {muchas} con 10 (N+1)'
+
+
+def test_nombres_desde_lru_sin_consultas(hospital, rol_medico):
+    u   = _usuario(hospital.hospital_id, rol_medico)
+    mov = Movimiento(hospital_id=hospital.hospital_id, created_by_id=u.pk)
+    invalidar_nombres_usuario()
+
+    # Dos serializaciones independientes: la segunda sale del LRU de proceso
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(2):
+            campo = NombreUsuarioField('created_by', vacio='Sistema')
+            assert campo.to_representation(mov) == f'{u.primer_nombre} {u.primer_apellido}'
+    assert len(ctx.captured_queries) == 1
+
+    mov.created_by_id = None
+    assert campo.to_representation(mov) == 'Sistema'
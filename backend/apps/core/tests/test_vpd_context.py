@@ -0,0 +1,107 @@
+"""
+HealthTech Solutions — Tests: Contexto VPD por conexión (config/oracle/vpd.py)
+Cobertura:
+  - HEALTHTECH_PKG solo se invoca cuando (hospital_id, rol) cambia
+  - Reconexión (connection_created) obliga a re-establecer el contexto
+  - Contadores realizados/evitados con carga mixta de tenants
+  - Session tags del pool oracledb: el tag sigue al contexto aplicado
+  - CLEAR_CONTEXT antes de cada cambio: (5, MEDICO) → (None, MEDICO) no conserva el hospital
+"""
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from config.oracle.vpd import (
+    OracleVPDMiddleware, get_vpd_stats, parse_session_tag,
+    reset_vpd_stats, session_tag,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+class _CursorFalso:
+    def __init__(self, llamadas):
+        self.llamadas = llamadas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def callproc(self, nombre, params=None):
+        self.llamadas.append((nombre, params[0] if params else None))
+
+
+@pytest.fixture
+def llamadas(monkeypatch):
+    registro = []
+    monkeypatch.setattr(connection, 'cursor', lambda: _CursorFalso(registro))
+    connection.vpd_context = None
+    reset_vpd_stats()
+    yield registro
+    connection.vpd_context = None
+
+
+def test_solo_cambia_contexto_cuando_difiere(llamadas):
+    middleware = OracleVPDMiddleware(lambda r: None)
+    carga = [(1, 'MEDICO')] * 5 + [(2, 'MEDICO')] * 3 + [(1, 'MEDICO')] * 2
+
+    for hospital_id, rol in carga:
+        middleware._set_oracle_context(hospital_id, rol)
+
+    # 3 cambios de tenant × 3 callproc (CLEAR_CONTEXT + SET_HOSPITAL + SET_USER_ROL)
+    assert len(llamadas) == 9
+    assert get_vpd_stats() == {'realizados': 3, 'evitados': 7, 'tasa_evitados': 0.7}
+
+
+def test_reconexion_reinicia_contexto(llamadas):
+    middleware = OracleVPDMiddleware(lambda r: None)
+    middleware._set_oracle_context(1, 'MEDICO')
+    # Sesión Oracle nueva (CONN_MAX_AGE vencido, failover RAC...)
+    connection_created.send(sender=connection.__class__, connection=connection)
+    middleware._set_oracle_context(1, 'MEDICO')
+
+    assert len(llamadas) == 6
+
+
+def test_session_tag_ida_y_vuelta():
+    assert session_tag(3, 'MEDICO') == 'HOSPITAL_ID=3;USER_ROL=MEDICO'
+    assert parse_session_tag(session_tag(3, 'MEDICO')) == (3, 'MEDICO')
+    assert parse_session_tag(session_tag(None, 'SUPER_ADMIN')) == (None, 'SUPER_ADMIN')
+
+
+def test_tag_de_sesion_sigue_al_contexto(llamadas, monkeypatch):
+    class _SesionPool:
+        tag = session_tag(1, 'MEDICO')
+
+    sesion = _SesionPool()
+    monkeypatch.setattr(connection, 'connection', sesion)
+    middleware = OracleVPDMiddleware(lambda r: None)
+
+    middleware._set_oracle_context(2, 'ENFERMERA')
+    assert sesion.tag == session_tag(2, 'ENFERMERA')     # Vuelve al pool con su contexto real
+
+    def _falla(self, nombre, params=None):
+        raise RuntimeError('ORA-03113')
+
+    monkeypatch.setattr(_CursorFalso, 'callproc', _falla)
+    with pytest.raises(RuntimeError):
+        middleware._set_oracle_context(3, 'MEDICO')
+    assert sesion.tag == ''                               # Contexto incierto: sin tag reutilizable
+
+
+def test_contexto_parcial_borra_el_anterior(llamadas, monkeypatch):
+    class _SesionPool:
+        tag = ''
+
+    sesion = _SesionPool()
+    monkeypatch.setattr(connection, 'connection', sesion)
+    middleware = OracleVPDMiddleware(lambda r: None)
+
+    middleware._set_oracle_context(5, 'MEDICO')
+    del llamadas[:]
+    middleware._set_oracle_context(None, 'MEDICO')         # Misma sesión, sin hospital
+    assert llamadas == [('HEALTHTECH_PKG.CLEAR_CONTEXT', None), ('HEALTHTECH_PKG.SET_USER_ROL', 'MEDICO')]
+    assert sesion.tag == session_tag(None, 'MEDICO')
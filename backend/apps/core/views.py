@@ -10,6 +10,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
 
+from apps.core.audit import audit_writer
+from config.oracle.pool import pool_stats
+from config.oracle.vpd import get_vpd_stats
+
 logger = logging.getLogger('healthtech.audit')
 
 
@@ -30,6 +34,9 @@ class HealthCheckView(APIView):
             'vpd_enabled': settings.VPD_ENABLED,
             'tde_enabled': settings.TDE_ENABLED,
             'database': self._check_database(),
+            'audit': audit_writer.metrics(),
+            'vpd_context': get_vpd_stats(),
+            'pools': pool_stats(),
         }
 
         overall_status = (
@@ -15,6 +15,8 @@ Máquina de estados:
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 # ============================================================
 # Catálogos / choices
@@ -138,6 +140,8 @@ class Emergencia(models.Model):
     )
     updated_at  = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'EMG_EMERGENCIAS'
         verbose_name        = 'Emergencia'
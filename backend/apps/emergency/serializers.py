@@ -11,6 +11,7 @@ HIPAA: data_minimization activo.
 from datetime import date
 from rest_framework import serializers
 
+from apps.core.serializers import NombreUsuarioField
 from apps.emergency.models import (
     Emergencia,
     ESTADOS_ACTIVOS, ESTADOS_ATENDIBLES,
@@ -24,7 +25,7 @@ from apps.emergency.models import (
 class EmergenciaListSerializer(serializers.ModelSerializer):
     paciente_nombre     = serializers.SerializerMethodField()
     paciente_expediente = serializers.SerializerMethodField()
-    medico_nombre       = serializers.SerializerMethodField()
+    medico_nombre       = NombreUsuarioField('medico', vacio='Sin asignar')
     nivel_triaje_display = serializers.CharField(source='get_nivel_triaje_display', read_only=True)
     estado_display      = serializers.CharField(source='get_estado_display', read_only=True)
     hora_ingreso_fmt    = serializers.SerializerMethodField()
@@ -50,9 +51,6 @@ class EmergenciaListSerializer(serializers.ModelSerializer):
     def get_paciente_expediente(self, obj) -> str:
         return obj.paciente.no_expediente if obj.paciente_id else ''
 
-    def get_medico_nombre(self, obj) -> str:
-        return obj.medico.get_short_name() if obj.medico_id else 'Sin asignar'
-
     def get_hora_ingreso_fmt(self, obj) -> str:
         return obj.hora_ingreso.strftime('%H:%M') if obj.hora_ingreso else ''
 
@@ -64,7 +62,7 @@ class EmergenciaListSerializer(serializers.ModelSerializer):
 # EMERGENCIA — Ficha completa
 # ============================================================
 class EmergenciaDetailSerializer(EmergenciaListSerializer):
-    enfermero_nombre    = serializers.SerializerMethodField()
+    enfermero_nombre    = NombreUsuarioField('enfermero', vacio='Sin asignar')
     tipo_alta_display   = serializers.CharField(source='get_tipo_alta_display', read_only=True)
     hora_alta_fmt       = serializers.SerializerMethodField()
 
@@ -81,9 +79,6 @@ class EmergenciaDetailSerializer(EmergenciaListSerializer):
             'created_at', 'updated_at',
         ]
 
-    def get_enfermero_nombre(self, obj) -> str:
-        return obj.enfermero.get_short_name() if obj.enfermero_id else 'Sin asignar'
-
     def get_hora_alta_fmt(self, obj) -> str:
         return obj.hora_alta.strftime('%H:%M') if obj.hora_alta else ''
 
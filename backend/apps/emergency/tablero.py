@@ -0,0 +1,167 @@
+"""
+HealthTech Solutions — Tablero en vivo de Emergencias (M04)
+Un tablero en memoria por hospital con las emergencias activas
+(ESPERA / EN_ATENCION / OBSERVACION), ordenadas por nivel de triaje y por
+tiempo de espera (la más antigua primero dentro del mismo nivel).
+
+Antes cada pantalla del servicio hacía polling a
+GET /api/v1/emergency/?activos=1 (consulta filtrada, ordenada, paginada y
+con tres joins) cada pocos segundos.
+
+Adaptación: el diseño pedido (push por SSE / long-polling, con el tablero
+actualizado en memoria por cada acción) retenía workers síncronos de
+gunicorn durante 25–55 s y cada worker solo veía sus propias escrituras.
+Se sustituye por polling corto (EMERGENCIA_TABLERO_SONDEO) con versión:
+
+  - Huella = COUNT + MAX(UPDATED_AT) de las emergencias activas del
+    hospital, por IDX_EMG_TABLERO (DDL 35). Una fila que sale del tablero
+    cambia el conteo; UPDATED_AT lo mantiene TRG_EMG_EMERGENCIAS_UPD.
+  - La huella vive en el cache compartido con TTL corto
+    (EMERGENCIA_TABLERO_HUELLA_TTL): N pantallas en W workers cuestan una
+    consulta de huella por intervalo y hospital, no N. create / update /
+    atender / observacion / alta / destroy la descartan tras el commit
+    (cambio()), así que los cambios de la API se ven en el siguiente sondeo;
+    escrituras fuera de la API, al vencer el TTL.
+  - Cada worker relee las filas (con sus joins) solo cuando la huella
+    cambió; el cliente manda la última versión y, si no cambió, recibe 304.
+
+Versión = resumen del contenido: dos procesos con el mismo tablero dan la
+misma versión, de modo que un cliente que cambia de worker no recibe una
+respuesta espuria. Ninguna petición queda retenida esperando cambios.
+"""
+
+import hashlib
+import json
+import threading
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.emergency.models import ESTADOS_ACTIVOS, Emergencia
+
+# Prioridad de atención (Manchester): menor = más urgente
+ORDEN_TRIAJE = {'ROJO': 0, 'NARANJA': 1, 'AMARILLO': 2, 'VERDE': 3, 'AZUL': 4}
+
+CACHE_PREFIX = 'emergencia:tablero:huella:'
+
+
+def _ingreso(emergencia) -> datetime:
+    return timezone.make_aware(datetime.combine(emergencia.fecha_ingreso, emergencia.hora_ingreso))
+
+
+class TableroEmergencias:
+    """Emergencias activas de un hospital; thread-safe, relee solo si cambia la huella de la BD."""
+
+    def __init__(self, hospital_id: int):
+        self.hospital_id = hospital_id
+        self.version     = None                  # None = aún no cargado
+        self._huella     = None
+        self._orden      = []                    # (clave de orden, ingreso, fila serializada)
+        self._recarga    = threading.Lock()
+
+    def _activas(self):
+        return (Emergencia.objects.sin_tenant().del_hospital(self.hospital_id).activos()
+                .filter(estado__in=ESTADOS_ACTIVOS))
+
+    def huella(self) -> tuple:
+        """
+        (conteo, última UPDATED_AT) de las emergencias activas, compartida
+        entre workers: una consulta por índice cada EMERGENCIA_TABLERO_HUELLA_TTL.
+        """
+        huella = cache.get(_clave(self.hospital_id))
+        if huella is None:
+            agregado = self._activas().order_by().aggregate(n=Count('pk'), ultima=Max('updated_at'))
+            huella = (agregado['n'], agregado['ultima'])
+            cache.set(_clave(self.hospital_id), huella, settings.EMERGENCIA_TABLERO_HUELLA_TTL)
+        return huella
+
+    # ---------- carga ----------
+    def recargar(self, huella: tuple | None = None) -> None:
+        """
+        Relee las emergencias activas del hospital (una consulta + nombres de usuario).
+        La huella se toma antes que las filas: un cambio concurrente deja una
+        huella vieja y el siguiente sondeo vuelve a leer.
+        """
+        from apps.emergency.serializers import EmergenciaListSerializer
+        huella = huella if huella is not None else self.huella()
+        emergencias = list(self._activas().select_related('paciente', 'medico'))
+        filas = EmergenciaListSerializer(emergencias, many=True).data
+        orden = sorted((self._entrada(e, f) for e, f in zip(emergencias, filas)), key=lambda e: e[0])
+        contenido = json.dumps([fila for _, _, fila in orden], cls=JSONEncoder, sort_keys=True)
+        self._orden   = orden
+        self.version  = hashlib.blake2b(contenido.encode(), digest_size=8).hexdigest()
+        self._huella  = huella
+
+    @staticmethod
+    def _entrada(emergencia, fila) -> tuple:
+        ingreso = _ingreso(emergencia)
+        clave   = (ORDEN_TRIAJE.get(emergencia.nivel_triaje, len(ORDEN_TRIAJE)), ingreso, emergencia.emg_id)
+        return clave, ingreso, dict(fila)
+
+    def vigente(self) -> None:
+        """Compara la huella de la BD con la cargada; si difiere, relee (un solo hilo)."""
+        huella = self.huella()
+        if huella == self._huella:
+            return
+        with self._recarga:
+            if huella != self._huella:
+                self.recargar(huella)
+
+    # ---------- lectura ----------
+    def instantanea(self, version: str | None = None) -> dict | None:
+        """
+        Tablero actual: versión, conteos por triaje y filas con minutos de espera.
+        None si `version` (la que ya tiene el cliente) sigue vigente.
+        """
+        self.vigente()
+        with self._recarga:
+            actual, orden = self.version, self._orden
+        if version is not None and version == actual:
+            return None
+        ahora = timezone.now()
+        por_triaje = dict.fromkeys(ORDEN_TRIAJE, 0)
+        resultados = []
+        for _, ingreso, fila in orden:
+            por_triaje[fila['nivel_triaje']] = por_triaje.get(fila['nivel_triaje'], 0) + 1
+            resultados.append({**fila, 'minutos_espera': max(0, int((ahora - ingreso).total_seconds() // 60))})
+        return {
+            'version':    actual,
+            'generado':   ahora,
+            'total':      len(resultados),
+            'por_triaje': por_triaje,
+            'resultados': resultados,
+        }
+
+
+def _clave(hospital_id) -> str:
+    return f'{CACHE_PREFIX}{hospital_id}'
+
+
+def cambio(emergencia: Emergencia) -> None:
+    """Descarta la huella compartida del hospital tras el commit: el siguiente sondeo relee."""
+    transaction.on_commit(lambda h=emergencia.hospital_id: cache.delete(_clave(h)))
+
+
+# ============================================================
+# Registro por proceso
+# ============================================================
+_tableros: dict[int, TableroEmergencias] = {}
+_tableros_lock = threading.Lock()
+
+
+def tablero_de(hospital_id: int) -> TableroEmergencias:
+    with _tableros_lock:
+        if hospital_id not in _tableros:
+            _tableros[hospital_id] = TableroEmergencias(hospital_id)
+        return _tableros[hospital_id]
+
+
+def reiniciar_tableros() -> None:
+    """Descarta todos los tableros del proceso (tests)."""
+    with _tableros_lock:
+        _tableros.clear()
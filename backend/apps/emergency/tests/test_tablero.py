@@ -0,0 +1,110 @@
+"""
+HealthTech Solutions — Tests: Tablero en vivo de Emergencias (apps/emergency/tablero.py)
+Cobertura:
+  - Orden por triaje y tiempo de espera; solo emergencias activas
+  - Polling corto: 304 con la versión vigente (query o If-None-Match), sin releer las filas;
+    N sondeos dentro del TTL cuestan una sola consulta de huella (cache compartido)
+  - Dos workers: un cambio de la API hecho en uno se ve en el otro en el siguiente sondeo;
+    uno fuera de la API, al vencer la huella
+"""
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.emergency import tablero
+from apps.emergency.models import Emergencia
+from apps.emergency.tablero import TableroEmergencias, reiniciar_tableros, tablero_de
+from apps.patients.models import Paciente
+
+URL = '/api/v1/emergency/tablero/'
+HOY = datetime.date.today()
+
+
+@pytest.fixture(autouse=True)
+def _tableros_limpios():
+    reiniciar_tableros()
+    cache.clear()
+    yield
+    reiniciar_tableros()
+    cache.clear()
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+@pytest.fixture
+def paciente(usuario_medico):
+    return Paciente.objects.create(
+        hospital_id=usuario_medico.hospital_id, no_expediente='EXP-T1', primer_nombre='Ana',
+        primer_apellido='Prueba', tipo_documento='DPI', no_documento='0000000000001',
+        fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+def _emergencia(paciente, triaje, hora, **extra):
+    return Emergencia.objects.create(
+        hospital_id=paciente.hospital_id, paciente=paciente, fecha_ingreso=HOY,
+        hora_ingreso=datetime.time(hora), motivo_consulta='Dolor', nivel_triaje=triaje, **extra,
+    )
+
+
+def test_orden_por_triaje_y_espera(cliente, paciente):
+    verde      = _emergencia(paciente, 'VERDE', 1)
+    rojo_nuevo = _emergencia(paciente, 'ROJO', 3)
+    rojo_viejo = _emergencia(paciente, 'ROJO', 2)
+    _emergencia(paciente, 'ROJO', 0, estado='ALTA')
+    _emergencia(paciente, 'ROJO', 0, activo=False)
+
+    datos = cliente.get(URL).json()
+    assert [f['emg_id'] for f in datos['resultados']] == [rojo_viejo.emg_id, rojo_nuevo.emg_id, verde.emg_id]
+    assert datos['por_triaje']['ROJO'] == 2 and datos['total'] == 3
+    assert all('minutos_espera' in f for f in datos['resultados'])
+
+
+def test_sondeo_con_version_vigente(cliente, paciente):
+    _emergencia(paciente, 'AMARILLO', 1)
+    r = cliente.get(URL)
+    version = r.json()['version']
+    assert r['ETag'] == f'"{version}"' and r['Cache-Control'] == 'no-cache'
+    assert r.json()['sondeo_segundos'] > 0
+
+    with CaptureQueriesContext(connection) as consultas:
+        for _ in range(5):                                            # 5 pantallas dentro del TTL
+            r = cliente.get(URL, {'version': version})
+            assert r.status_code == 304 and not r.content
+    assert not any('EMG_EMERGENCIAS' in q['sql'] for q in consultas.captured_queries)   # Huella en cache
+    assert cliente.get(URL, HTTP_IF_NONE_MATCH=f'"{version}"').status_code == 304
+    assert cliente.get(URL, {'version': 'otra'}).status_code == 200
+
+
+def test_cambio_en_otro_worker(cliente, paciente, usuario_medico, django_capture_on_commit_callbacks):
+    """Dos tableros del mismo hospital = dos workers de gunicorn con su propia memoria."""
+    emergencia = _emergencia(paciente, 'AMARILLO', 1)
+    worker_a = tablero_de(usuario_medico.hospital_id)
+    worker_b = TableroEmergencias(usuario_medico.hospital_id)
+    version = worker_b.instantanea()['version']
+    assert worker_a.instantanea()['version'] == version               # Versión por contenido
+
+    with django_capture_on_commit_callbacks(execute=True):
+        r = cliente.post(f'/api/v1/emergency/{emergencia.emg_id}/atender/',
+                         {'medico_id': usuario_medico.pk}, format='json')
+    assert r.status_code == 200                                       # Atendida vía worker A
+    datos = worker_b.instantanea(version)
+    assert datos is not None and datos['resultados'][0]['estado'] == 'EN_ATENCION'
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cliente.post(f'/api/v1/emergency/{emergencia.emg_id}/alta/',
+                     {'tipo_alta': 'MEDICA', 'diagnostico': 'Gastritis'}, format='json')
+    datos = worker_b.instantanea(datos['version'])
+    assert datos['total'] == 0                                        # Sale del tablero: cambia el conteo
+
+    _emergencia(paciente, 'ROJO', 2)                                  # Fuera de la API: sin cambio()
+    assert worker_b.instantanea(datos['version']) is None             # Huella aún vigente
+    cache.delete(tablero._clave(usuario_medico.hospital_id))          # Vence el TTL
+    assert worker_b.instantanea(datos['version'])['total'] == 1
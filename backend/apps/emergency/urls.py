@@ -10,6 +10,9 @@ Acciones de máquina de estados:
   POST  /api/v1/emergency/{id}/atender/       ESPERA → EN_ATENCION
   POST  /api/v1/emergency/{id}/observacion/   EN_ATENCION → OBSERVACION
   POST  /api/v1/emergency/{id}/alta/          EN_ATENCION|OBSERVACION → ALTA/TRANSFERIDO/FALLECIDO
+
+Tablero en vivo:
+  GET   /api/v1/emergency/tablero/            Polling corto por versión (304 sin cambios)
 """
 
 from django.urls import path, include
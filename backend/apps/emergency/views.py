@@ -1,7 +1,7 @@
 """
 HealthTech Solutions — Views: Módulo Emergencias (M04)
 HIPAA: Auditoría PHI_ACCESS en TODOS los accesos.
-VPD:   En DEV se filtra manualmente por hospital_id del usuario autenticado.
+VPD:   En DEV filtra TenantManager (hospital del request, apps.core.managers).
        En PROD Oracle VPD aplica el filtro a nivel de sesión de BD.
 
 Máquina de estados:
@@ -9,9 +9,11 @@ Máquina de estados:
   EN_ATENCION  → observacion()        → OBSERVACION
   EN_ATENCION
   | OBSERVACION → dar_alta()          → ALTA | TRANSFERIDO | FALLECIDO
+
+Tablero en vivo (apps.emergency.tablero): polling corto por versión; toda
+escritura descarta tras el commit la huella compartida del tablero.
 """
 
-import logging
 from datetime import date, time
 
 from django.conf import settings
@@ -21,6 +23,8 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.audit import audit_phi_for
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
 from apps.emergency.models import (
     Emergencia,
@@ -32,37 +36,24 @@ from apps.emergency.serializers import (
     EmergenciaCreateSerializer, EmergenciaAtenderSerializer,
     EmergenciaAltaSerializer, EmergenciaObservacionSerializer,
 )
-from apps.security.models import AuditoriaAcceso
-
-logger = logging.getLogger('healthtech.audit')
+from apps.emergency.tablero import cambio, tablero_de
 
 
 # ============================================================
 # Helpers internos
 # ============================================================
-def _get_ip(request) -> str:
-    x_fwd = request.META.get('HTTP_X_FORWARDED_FOR')
-    return x_fwd.split(',')[0].strip() if x_fwd else request.META.get('REMOTE_ADDR', '0.0.0.0')
-
-
-def _audit_phi(request, accion: str, emg_id: str, descripcion: str = '') -> None:
-    """Registra evento PHI_ACCESS en SEC_AUDITORIA_ACCESOS. Cumplimiento HIPAA."""
-    try:
-        AuditoriaAcceso.objects.create(
-            hospital_id=request.user.hospital_id,
-            usuario=request.user,
-            tipo_evento='PHI_ACCESS',
-            modulo='emergency',
-            accion=accion,
-            tabla_afectada='EMG_EMERGENCIAS',
-            registro_id=emg_id,
-            ip_origen=_get_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
-            descripcion=descripcion or f'{accion} emergencia #{emg_id}',
-            exitoso=True,
-        )
-    except Exception as exc:
-        logger.warning('Fallo al registrar auditoría PHI (emergency): %s', exc)
+# Auditoría HIPAA: pipeline asíncrono por lotes (apps.core.audit)
+_audit_phi = audit_phi_for('emergency', 'EMG_EMERGENCIAS', 'emergencia')
+
+
+def _hospital_tablero(request) -> int | None:
+    """Hospital del usuario; SUPER_ADMIN elige con ?hospital_id=."""
+    if request.user.rol_codigo == 'SUPER_ADMIN' and request.query_params.get('hospital_id'):
+        try:
+            return int(request.query_params['hospital_id'])
+        except ValueError:
+            return None
+    return request.user.hospital_id
 
 
 # ============================================================
@@ -83,6 +74,10 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
     POST   /api/v1/emergency/{id}/atender/       ESPERA → EN_ATENCION
     POST   /api/v1/emergency/{id}/observacion/   EN_ATENCION → OBSERVACION
     POST   /api/v1/emergency/{id}/alta/          EN_ATENCION|OBSERVACION → ALTA/TRANSFERIDO/FALLECIDO
+
+    Tablero en vivo (polling corto):
+    GET    /api/v1/emergency/tablero/            Activas por triaje; con ?version= o If-None-Match
+                                                 vigente → 304 al instante (sondeo cada sondeo_segundos)
     """
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     filter_backends    = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -95,18 +90,14 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
         'medico__primer_apellido',   'medico__primer_nombre',
     ]
     ordering_fields    = ['fecha_ingreso', 'hora_ingreso', 'nivel_triaje', 'estado', 'created_at']
-    ordering           = ['-fecha_ingreso', '-hora_ingreso']
+    ordering           = ['-created_at']
+    pagination_class   = KeysetPagination       # cursor sobre (created_at, emg_id)
 
     def get_queryset(self):
-        qs   = Emergencia.objects.select_related(
+        # Filtro de hospital: TenantManager
+        qs = Emergencia.objects.activos().select_related(
             'paciente', 'medico', 'enfermero'
-        ).filter(activo=True)
-        user = self.request.user
-
-        # VPD manual en DEV
-        if not settings.VPD_ENABLED:
-            if getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-                qs = qs.filter(hospital_id=user.hospital_id)
+        )
 
         # Filtro por rango de fechas
         fecha_desde = self.request.query_params.get('fecha_desde')
@@ -155,6 +146,7 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
         serializer = EmergenciaCreateSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         emergencia = serializer.save()
+        cambio(emergencia)
         _audit_phi(
             request, 'create', str(emergencia.emg_id),
             f'Emergencia registrada: {emergencia.paciente} — triaje {emergencia.nivel_triaje}'
@@ -173,6 +165,7 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
         )
         serializer.is_valid(raise_exception=True)
         emergencia = serializer.save()
+        cambio(emergencia)
         _audit_phi(
             request, 'edit', str(emergencia.emg_id),
             f'Emergencia actualizada: #{emergencia.emg_id}'
@@ -185,6 +178,7 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
         emergencia.activo     = False
         emergencia.updated_by = request.user
         emergencia.save(update_fields=['activo', 'updated_by', 'updated_at'])
+        cambio(emergencia)
         _audit_phi(
             request, 'delete', str(emergencia.emg_id),
             f'Emergencia desactivada (soft-delete): #{emergencia.emg_id}'
@@ -194,6 +188,35 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK,
         )
 
+    # ============================================================
+    # Tablero en vivo
+    # ============================================================
+
+    @action(detail=False, methods=['get'], url_path='tablero')
+    def tablero(self, request):
+        """
+        GET /api/v1/emergency/tablero/?version=<v>
+        Emergencias activas del hospital ordenadas por triaje y tiempo de espera.
+
+        Polling corto (cada `sondeo_segundos`): con `version` (la última
+        recibida) o If-None-Match y sin cambios → 304 sin cuerpo al
+        instante. Ninguna petición queda retenida esperando cambios.
+        """
+        hospital_id = _hospital_tablero(request)
+        if not hospital_id:
+            return Response({'detail': 'Debe indicar hospital_id.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cliente = request.query_params.get('version') or request.headers.get('If-None-Match', '').strip('"') or None
+        datos = tablero_de(hospital_id).instantanea(cliente)
+        if datos is None:
+            respuesta = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            _audit_phi(request, 'view', 'tablero', f'Tablero de emergencias: {datos["total"]} pacientes activos')
+            respuesta = Response({**datos, 'sondeo_segundos': settings.EMERGENCIA_TABLERO_SONDEO})
+        respuesta['ETag'] = f'"{cliente if datos is None else datos["version"]}"'
+        respuesta['Cache-Control'] = 'no-cache'
+        return respuesta
+
     # ============================================================
     # Acciones de máquina de estados
     # ============================================================
@@ -223,6 +246,7 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
         emergencia.medico     = medico
         emergencia.updated_by = request.user
         emergencia.save(update_fields=['estado', 'medico', 'updated_by', 'updated_at'])
+        cambio(emergencia)
 
         _audit_phi(
             request, 'edit', str(emergencia.emg_id),
@@ -261,6 +285,7 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
             update_fields.append('notas_medico')
 
         emergencia.save(update_fields=update_fields)
+        cambio(emergencia)
 
         _audit_phi(
             request, 'edit', str(emergencia.emg_id),
@@ -332,6 +357,7 @@ class EmergenciaViewSet(viewsets.ModelViewSet):
             update_fields.append('notas_medico')
 
         emergencia.save(update_fields=update_fields)
+        cambio(emergencia)
 
         _audit_phi(
             request, 'edit', str(emergencia.emg_id),
@@ -0,0 +1,85 @@
+"""
+HealthTech Solutions — Asignación de camas (M05)
+Antes validate_cama comprobaba cama.estado en Python y create() guardaba la
+cama como OCUPADA sin bloqueo: dos ingresos simultáneos podían tomar la misma
+cama, y cada reintento del cliente costaba otro round trip.
+
+  - ocupar(): reclama la cama con un único UPDATE condicional
+        UPDATE ENC_CAMAS SET ESTADO = 'OCUPADA'
+         WHERE CAMA_ID = :id AND ACTIVO = 1 AND ESTADO IN ('DISPONIBLE','RESERVADA')
+    dentro de la transacción del ingreso: 1 fila = cama nuestra; 0 filas = la
+    tomó otro ingreso (el bloqueo de fila dura hasta el commit).
+  - candidatas(): "mejor cama" en una consulta sobre el índice de camas libres
+    (IDX_ENC_CAMA_LIBRES): tipo_cama y equipamiento requerido, ordenadas por
+    cercanía a la sala/piso pedidos y por menor equipamiento sobrante (no
+    gastar un ventilador en quien no lo necesita).
+  - asignar(): recorre las candidatas reclamando hasta conseguir una, sin
+    volver al cliente.
+"""
+
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from apps.hospitalization.models import ESTADOS_ASIGNABLES, Cama
+
+# Criterio de equipamiento → columna
+EQUIPAMIENTO = {
+    'oxigeno':    'tiene_oxigeno',
+    'monitor':    'tiene_monitor',
+    'ventilador': 'tiene_ventilador',
+}
+
+
+def ocupar(cama: Cama) -> bool:
+    """Reclama la cama (UPDATE condicional). Llamar dentro de transaction.atomic()."""
+    filas = (
+        Cama.objects.sin_tenant()
+        .filter(pk=cama.pk, activo=True, estado__in=ESTADOS_ASIGNABLES)
+        .update(estado='OCUPADA', updated_at=timezone.now())
+    )
+    if filas:
+        cama.estado = 'OCUPADA'
+    return bool(filas)
+
+
+def candidatas(hospital_id: int, tipo_cama: str, equipos=(), sala: str = '', piso: str = '',
+               limite: int = 5) -> list[Cama]:
+    """
+    Camas DISPONIBLE del tipo pedido con todo el equipamiento de `equipos`,
+    mejor candidata primero:
+      1. misma sala y piso > misma sala > mismo piso > resto
+      2. menos equipamiento no solicitado
+      3. sala, piso, número de cama (orden estable)
+    """
+    requeridas = {EQUIPAMIENTO[e] for e in equipos}
+    sobrante = sum(
+        (Case(When(**{columna: True}, then=Value(1)), default=Value(0), output_field=IntegerField())
+         for columna in EQUIPAMIENTO.values() if columna not in requeridas),
+        Value(0),
+    )
+    cercania = [When(sala=sala, piso=piso, then=Value(0))] if sala and piso else []
+    if sala:
+        cercania.append(When(sala=sala, then=Value(1)))
+    if piso:
+        cercania.append(When(piso=piso, then=Value(2)))
+    distancia = Case(*cercania, default=Value(3), output_field=IntegerField()) if cercania else Value(3)
+
+    return list(
+        Cama.objects.sin_tenant().del_hospital(hospital_id).activos()
+        .filter(estado='DISPONIBLE', tipo_cama=tipo_cama, **{c: True for c in requeridas})
+        .annotate(distancia=distancia, sobrante=sobrante)
+        .order_by('distancia', 'sobrante', 'sala', 'piso', 'numero_cama')[:limite]
+    )
+
+
+def asignar(hospital_id: int, tipo_cama: str, equipos=(), sala: str = '', piso: str = '',
+            limite: int = 5) -> Cama | None:
+    """
+    Reclama la mejor cama libre que cumpla los criterios. Si otro ingreso gana
+    una candidata, prueba la siguiente. Devuelve None si no quedó ninguna.
+    Llamar dentro de transaction.atomic().
+    """
+    for cama in candidatas(hospital_id, tipo_cama, equipos, sala, piso, limite):
+        if ocupar(cama):
+            return cama
+    return None
@@ -0,0 +1,240 @@
+"""
+HealthTech Solutions — Censo de camas (M05)
+Conteos por (sala, piso, tipo_cama, estado) con el equipamiento disponible
+en cada grupo (oxígeno, monitor, ventilador), servidos desde el cache
+compartido entre workers (Redis o DatabaseCache, core.E001) con un contador
+de versión por hospital.
+
+  - Se calcula una vez (un GROUP BY sobre ENC_CAMAS) y se mantiene con deltas:
+    EncamamientoCreateSerializer.create (→ OCUPADA), egreso y destroy
+    (→ DISPONIBLE) mueven la cama de grupo tras el commit, sin releer la tabla.
+  - Alta / edición / baja de camas (CamaViewSet) invalidan el censo: son poco
+    frecuentes y pueden cambiar sala, piso, tipo o equipamiento.
+  - Guardia de deriva: cada entrada guarda la huella de ENC_CAMAS
+    (COUNT + MAX(UPDATED_AT) de las camas activas, por IDX_ENC_CAMA_ETAG).
+    Un delta solo se aplica si, desde la huella guardada, la única cama
+    modificada es la suya; si no (escrituras fuera de la API, deltas
+    concurrentes) descarta la entrada. Cada lectura compara la huella y
+    recalcula si difiere. UPDATED_AT lo mantienen save(), los .update() de
+    asignacion y TRG_ENC_CAMAS_UPD.
+  - Versión: contador monotónico en el cache compartido; al crearse (o tras
+    perderlo) arranca en la hora en milisegundos, así nunca retrocede.
+  - Reconciliación (lo que la huella no distingue): al vencer
+    CAMAS_CENSO_RECONCILIAR cada lectura recalcula y compara;
+    manage.py reconciliar_censo_camas hace lo mismo sobre el cache compartido
+    (con un cache por proceso no alcanza a los workers y falla).
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from apps.core.checks import CACHES_POR_PROCESO
+from apps.hospitalization.models import ESTADO_CAMA_CHOICES, Cama
+
+logger = logging.getLogger('healthtech.audit')
+
+CACHE_PREFIX = 'camas:censo:'
+EQUIPOS      = ('con_oxigeno', 'con_monitor', 'con_ventilador')
+ESTADOS_CAMA = tuple(c[0] for c in ESTADO_CAMA_CHOICES)
+
+# Serializa recálculos y read-modify-write del cache dentro del proceso
+_lock = threading.Lock()
+
+
+def _clave(hospital_id) -> str:
+    return f'{CACHE_PREFIX}{hospital_id}'
+
+
+def _clave_version(hospital_id) -> str:
+    return f'{CACHE_PREFIX}{hospital_id}:version'
+
+
+def _grupo(cama) -> tuple:
+    return (cama.sala or '', cama.piso or '', cama.tipo_cama)
+
+
+def _siguiente_version(hospital_id) -> int:
+    # Sin expiración; si el cache lo descarta, reinicia por encima de cualquier valor anterior
+    cache.add(_clave_version(hospital_id), int(time.time() * 1000), None)
+    return cache.incr(_clave_version(hospital_id))
+
+
+def cache_compartida() -> bool:
+    """False con un cache por proceso (LocMemCache): lo que escribe un proceso no lo ven los demás."""
+    return settings.CACHES.get('default', {}).get('BACKEND', '') not in CACHES_POR_PROCESO
+
+
+# ============================================================
+# Cálculo desde ENC_CAMAS
+# ============================================================
+def _camas(hospital_id: int):
+    return Cama.objects.sin_tenant().del_hospital(hospital_id).activos()
+
+
+def huella(hospital_id: int) -> tuple:
+    """(conteo, última UPDATED_AT) de las camas activas del hospital."""
+    agregado = _camas(hospital_id).order_by().aggregate(n=Count('pk'), ultima=Max('updated_at'))
+    return agregado['n'], agregado['ultima']
+
+
+def calcular(hospital_id: int) -> dict:
+    """Conteos actuales desde la BD: {(sala, piso, tipo_cama, estado): {camas, con_*}}."""
+    filas = (
+        _camas(hospital_id)
+        .values('sala', 'piso', 'tipo_cama', 'estado')
+        .annotate(
+            camas=Count('pk'),
+            con_oxigeno=Count('pk', filter=Q(tiene_oxigeno=True)),
+            con_monitor=Count('pk', filter=Q(tiene_monitor=True)),
+            con_ventilador=Count('pk', filter=Q(tiene_ventilador=True)),
+        )
+        .order_by()
+    )
+    return {
+        (f['sala'] or '', f['piso'] or '', f['tipo_cama'], f['estado']):
+            {'camas': f['camas'], **{e: f[e] for e in EQUIPOS}}
+        for f in filas
+    }
+
+
+def _guardar(hospital_id, conteos, huella_bd) -> dict:
+    entrada = {
+        'version':      _siguiente_version(hospital_id),
+        'huella':       huella_bd,
+        'generado':     timezone.now(),
+        'reconciliado': time.time(),
+        'conteos':      conteos,
+    }
+    cache.set(_clave(hospital_id), entrada, None)
+    return entrada
+
+
+# ============================================================
+# Lectura
+# ============================================================
+def censo(hospital_id: int) -> dict:
+    """Entrada cacheada del hospital (la calcula o reconcilia si hace falta)."""
+    entrada = cache.get(_clave(hospital_id))
+    if entrada is None or entrada['huella'] != huella(hospital_id):
+        with _lock:
+            # Otro hilo pudo recalcular mientras se esperaba el lock
+            entrada, actual = cache.get(_clave(hospital_id)), huella(hospital_id)
+            if entrada is None or entrada['huella'] != actual:
+                entrada = _guardar(hospital_id, calcular(hospital_id), actual)
+    elif time.time() - entrada['reconciliado'] >= settings.CAMAS_CENSO_RECONCILIAR:
+        entrada = reconciliar(hospital_id)[0]
+    return entrada
+
+
+def resumen(hospital_id: int, sala=None, piso=None, tipo_cama=None) -> dict:
+    """Censo serializable: grupos (opcionalmente filtrados) y totales por estado."""
+    entrada = censo(hospital_id)
+    grupos, totales = [], dict.fromkeys(ESTADOS_CAMA, 0)
+    for (g_sala, g_piso, g_tipo, estado), conteo in sorted(entrada['conteos'].items()):
+        if (sala and g_sala != sala) or (piso and g_piso != piso) or (tipo_cama and g_tipo != tipo_cama):
+            continue
+        grupos.append({'sala': g_sala, 'piso': g_piso, 'tipo_cama': g_tipo, 'estado': estado, **conteo})
+        totales[estado] = totales.get(estado, 0) + conteo['camas']
+    total = sum(totales.values())
+    return {
+        'version':    entrada['version'],
+        'generado':   entrada['generado'],
+        'total':      total,
+        'por_estado': totales,
+        'ocupacion':  round(100 * totales.get('OCUPADA', 0) / total, 1) if total else 0.0,
+        'grupos':     grupos,
+    }
+
+
+# ============================================================
+# Mantenimiento incremental
+# ============================================================
+def _solo_esta_cama(hospital_id, cama_id, anterior: tuple) -> tuple | None:
+    """
+    Huella actual si, desde la huella `anterior`, la única cama activa
+    modificada es `cama_id` (y el conteo no cambió); si no, None.
+    """
+    n, ultima = anterior
+    nuevas = Q(updated_at__gt=ultima) if ultima is not None else Q()
+    agregado = _camas(hospital_id).order_by().aggregate(
+        n=Count('pk'), ultima=Max('updated_at'),
+        nuevas=Count('pk', filter=nuevas), propia=Count('pk', filter=nuevas & Q(pk=cama_id)),
+    )
+    if agregado['n'] != n or agregado['nuevas'] != 1 or agregado['propia'] != 1:
+        return None
+    return agregado['n'], agregado['ultima']
+
+
+def _mover(hospital_id, cama_id, grupo, equipos, anterior, nuevo) -> None:
+    with _lock:
+        entrada = cache.get(_clave(hospital_id))
+        if entrada is None:
+            return                               # Se calculará completo en la próxima lectura
+        actual = _solo_esta_cama(hospital_id, cama_id, entrada['huella'])
+        if actual is None:
+            cache.delete(_clave(hospital_id))    # Hubo otras escrituras: recalcular en la próxima lectura
+            return
+        conteos = entrada['conteos']
+        for estado, signo in ((anterior, -1), (nuevo, 1)):
+            conteo = conteos.setdefault((*grupo, estado), {'camas': 0, **dict.fromkeys(EQUIPOS, 0)})
+            conteo['camas'] += signo
+            for equipo in equipos:
+                conteo[equipo] += signo
+            if not conteo['camas']:
+                del conteos[(*grupo, estado)]    # Mismo formato que calcular(): sin grupos vacíos
+        entrada['version'] = _siguiente_version(hospital_id)
+        entrada['huella'] = actual
+        entrada['generado'] = timezone.now()
+        cache.set(_clave(hospital_id), entrada, None)
+
+
+def registrar_cambio(cama: Cama, anterior: str) -> None:
+    """Mueve la cama de `anterior` a su estado actual en el censo, tras el commit."""
+    if anterior == cama.estado or not cama.activo:
+        return
+    equipos = [e for e, tiene in zip(EQUIPOS, (cama.tiene_oxigeno, cama.tiene_monitor, cama.tiene_ventilador))
+               if tiene]
+    transaction.on_commit(lambda h=cama.hospital_id, c=cama.pk, g=_grupo(cama), n=cama.estado:
+                          _mover(h, c, g, equipos, anterior, n))
+
+
+def invalidar(hospital_id: int) -> None:
+    """Descarta el censo del hospital tras el commit (se recalcula en la próxima lectura)."""
+    transaction.on_commit(lambda: cache.delete(_clave(hospital_id)))
+
+
+# ============================================================
+# Reconciliación
+# ============================================================
+def reconciliar(hospital_id: int) -> tuple[dict, list]:
+    """
+    Recalcula el censo desde ENC_CAMAS y lo compara con el cacheado.
+    Devuelve (entrada vigente, deriva) con deriva = [(grupo, cacheado, real)].
+    Solo publica una versión nueva si hubo deriva.
+    """
+    with _lock:                                  # Sin deltas intercalados entre lectura y comparación
+        actual  = huella(hospital_id)
+        real    = calcular(hospital_id)
+        entrada = cache.get(_clave(hospital_id))
+        if entrada is None:
+            return _guardar(hospital_id, real, actual), []
+        vacio = {'camas': 0, **dict.fromkeys(EQUIPOS, 0)}
+        deriva = [
+            (grupo, entrada['conteos'].get(grupo, vacio), real.get(grupo, vacio))
+            for grupo in sorted(set(entrada['conteos']) | set(real))
+            if entrada['conteos'].get(grupo, vacio) != real.get(grupo, vacio)
+        ]
+        if deriva:
+            logger.warning('Censo de camas con deriva (hospital %s): %s grupos corregidos',
+                           hospital_id, len(deriva))
+            return _guardar(hospital_id, real, actual), deriva
+        entrada['huella'], entrada['reconciliado'] = actual, time.time()
+        cache.set(_clave(hospital_id), entrada, None)
+        return entrada, deriva
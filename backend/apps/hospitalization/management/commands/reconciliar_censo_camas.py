@@ -0,0 +1,62 @@
+"""
+manage.py reconciliar_censo_camas
+=================================
+Recalcula el censo de camas (apps.hospitalization.censo) desde ENC_CAMAS,
+reporta la deriva frente al censo cacheado y lo corrige. Pensado para cron
+y para después de cargas o correcciones que no pasan por la API
+(queryset.update, scripts SQL).
+
+Solo tiene sentido con el cache compartido entre workers (Redis o
+DatabaseCache, ver config/settings/prod.py): con un cache por proceso
+(LocMemCache) este proceso arranca con el cache vacío y no puede ver ni
+corregir el de los workers, así que el comando falla en lugar de reportar
+"sin deriva". Cada worker igualmente valida su censo contra la huella de
+ENC_CAMAS en cada lectura y reconcilia al vencer CAMAS_CENSO_RECONCILIAR.
+
+Uso:
+    python manage.py reconciliar_censo_camas
+    python manage.py reconciliar_censo_camas --hospital 3
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.hospitalization import censo
+from apps.hospitalization.models import Cama
+
+
+class Command(BaseCommand):
+    help = 'Recalcula el censo de camas desde ENC_CAMAS y corrige la deriva del cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hospital', type=int, help='Solo este hospital_id.')
+
+    def handle(self, *args, **options):
+        if not censo.cache_compartida():
+            raise CommandError(
+                'El cache "default" es por proceso: la reconciliación no alcanzaría a los workers. '
+                'Configure un cache compartido (REDIS_URL o DatabaseCache).'
+            )
+        if options['hospital']:
+            hospitales = [options['hospital']]
+        else:
+            hospitales = list(Cama.objects.sin_tenant().activos()
+                              .order_by('hospital_id').values_list('hospital_id', flat=True).distinct())
+
+        corregidos = 0
+        for hospital_id in hospitales:
+            entrada, deriva = censo.reconciliar(hospital_id)
+            if not deriva:
+                continue
+            corregidos += 1
+            self.stdout.write(self.style.WARNING(
+                f'  Hospital {hospital_id}: {len(deriva)} grupos con deriva (versión {entrada["version"]})'
+            ))
+            for (sala, piso, tipo_cama, estado), cacheado, real in deriva:
+                self.stdout.write(
+                    f'    {sala or "-"} / {piso or "-"} / {tipo_cama} / {estado}: '
+                    f'{cacheado["camas"]} → {real["camas"]}'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Censo reconciliado: {len(hospitales)} hospitales, {corregidos} con deriva corregida.'
+        ))
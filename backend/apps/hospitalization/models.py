@@ -14,6 +14,8 @@ Máquina de estados (Encamamiento):
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 # ============================================================
 # Catálogos / choices
@@ -55,6 +57,7 @@ TIPO_EGRESO_CHOICES = [
 ESTADOS_TRATABLES    = ('INGRESADO',)
 ESTADOS_EGRESABLES   = ('INGRESADO', 'EN_TRATAMIENTO')
 ESTADOS_ACTIVOS_ENC  = ('INGRESADO', 'EN_TRATAMIENTO')
+ESTADOS_ASIGNABLES   = ('DISPONIBLE', 'RESERVADA')        # Cama que un ingreso puede ocupar
 
 
 # ============================================================
@@ -84,6 +87,8 @@ class Cama(models.Model):
     created_at = models.DateTimeField(db_column='CREATED_AT', auto_now_add=True)
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'ENC_CAMAS'
         verbose_name        = 'Cama'
@@ -184,6 +189,8 @@ class Encamamiento(models.Model):
     )
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'ENC_ENCAMAMIENTOS'
         verbose_name        = 'Encamamiento'
@@ -4,17 +4,21 @@ HIPAA: data_minimization activo.
   - CamaSerializer:              ficha de cama (estado, tipo, ubicación)
   - EncamamientoListSerializer:  listado sin notas clínicas
   - EncamamientoDetailSerializer: ficha completa
-  - EncamamientoCreateSerializer: validación (cama disponible, fecha)
+  - EncamamientoCreateSerializer: validación (cama disponible, fecha) y asignación atómica
   - EncamamientoEgresoSerializer: tipo_egreso + diagnóstico de egreso
   - EncamamientoEvolucionSerializer: actualizar notas de evolución
 """
 
 from datetime import date
+
+from django.db import transaction
 from rest_framework import serializers
 
+from apps.core.serializers import NombreUsuarioField
+from apps.hospitalization import asignacion, censo
 from apps.hospitalization.models import (
     Cama, Encamamiento,
-    ESTADOS_ACTIVOS_ENC, ESTADOS_EGRESABLES,
+    ESTADOS_ACTIVOS_ENC, ESTADOS_ASIGNABLES, ESTADOS_EGRESABLES, TIPO_CAMA_CHOICES,
 )
 
 
@@ -54,7 +58,7 @@ class CamaSerializer(serializers.ModelSerializer):
 class EncamamientoListSerializer(serializers.ModelSerializer):
     paciente_nombre     = serializers.SerializerMethodField()
     paciente_expediente = serializers.SerializerMethodField()
-    medico_nombre       = serializers.SerializerMethodField()
+    medico_nombre       = NombreUsuarioField('medico', vacio='')
     cama_info           = serializers.SerializerMethodField()
     estado_display      = serializers.CharField(source='get_estado_display', read_only=True)
     hora_ingreso_fmt    = serializers.SerializerMethodField()
@@ -76,9 +80,6 @@ class EncamamientoListSerializer(serializers.ModelSerializer):
     def get_paciente_expediente(self, obj) -> str:
         return obj.paciente.no_expediente if obj.paciente_id else ''
 
-    def get_medico_nombre(self, obj) -> str:
-        return obj.medico.get_short_name() if obj.medico_id else ''
-
     def get_cama_info(self, obj) -> dict:
         if not obj.cama_id:
             return {}
@@ -100,7 +101,7 @@ class EncamamientoListSerializer(serializers.ModelSerializer):
 # ENCAMAMIENTO — Ficha completa
 # ============================================================
 class EncamamientoDetailSerializer(EncamamientoListSerializer):
-    enfermero_nombre   = serializers.SerializerMethodField()
+    enfermero_nombre   = NombreUsuarioField('enfermero', vacio='Sin asignar')
     tipo_egreso_display = serializers.CharField(source='get_tipo_egreso_display', read_only=True)
     hora_egreso_fmt    = serializers.SerializerMethodField()
 
@@ -117,9 +118,6 @@ class EncamamientoDetailSerializer(EncamamientoListSerializer):
             'created_at', 'updated_at',
         ]
 
-    def get_enfermero_nombre(self, obj) -> str:
-        return obj.enfermero.get_short_name() if obj.enfermero_id else 'Sin asignar'
-
     def get_hora_egreso_fmt(self, obj) -> str:
         return obj.hora_egreso.strftime('%H:%M') if obj.hora_egreso else ''
 
@@ -128,6 +126,21 @@ class EncamamientoDetailSerializer(EncamamientoListSerializer):
 # ENCAMAMIENTO — Creación
 # ============================================================
 class EncamamientoCreateSerializer(serializers.ModelSerializer):
+    """
+    Ingreso con cama explícita (`cama`) o asignada por criterios (`tipo_cama`
+    + `requiere_*`, opcionalmente cerca de `sala`/`piso`): la cama se reclama
+    con un UPDATE condicional en la misma transacción (apps.hospitalization.asignacion).
+    """
+    cama                = serializers.PrimaryKeyRelatedField(queryset=Cama.objects, required=False)
+    tipo_cama           = serializers.ChoiceField(choices=TIPO_CAMA_CHOICES, required=False, write_only=True)
+    requiere_oxigeno    = serializers.BooleanField(required=False, default=False, write_only=True)
+    requiere_monitor    = serializers.BooleanField(required=False, default=False, write_only=True)
+    requiere_ventilador = serializers.BooleanField(required=False, default=False, write_only=True)
+    sala                = serializers.CharField(required=False, allow_blank=True, default='', write_only=True)
+    piso                = serializers.CharField(required=False, allow_blank=True, default='', write_only=True)
+
+    CRITERIOS = ('tipo_cama', 'requiere_oxigeno', 'requiere_monitor', 'requiere_ventilador', 'sala', 'piso')
+
     class Meta:
         model  = Encamamiento
         fields = [
@@ -136,11 +149,12 @@ class EncamamientoCreateSerializer(serializers.ModelSerializer):
             'fecha_ingreso', 'hora_ingreso',
             'motivo_ingreso', 'diagnostico_ingreso', 'cie10_ingreso',
             'notas_ingreso', 'indicaciones',
+            'tipo_cama', 'requiere_oxigeno', 'requiere_monitor', 'requiere_ventilador', 'sala', 'piso',
         ]
 
     def validate_cama(self, cama):
-        """La cama debe estar DISPONIBLE o RESERVADA."""
-        if cama.estado not in ('DISPONIBLE', 'RESERVADA'):
+        """La cama debe estar DISPONIBLE o RESERVADA (se confirma al reclamarla en create)."""
+        if cama.estado not in ESTADOS_ASIGNABLES:
             raise serializers.ValidationError(
                 f'La cama {cama.numero_cama} no está disponible (estado: {cama.get_estado_display()}).'
             )
@@ -151,22 +165,49 @@ class EncamamientoCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('La fecha de ingreso no puede ser futura.')
         return value
 
-    def create(self, validated_data):
-        request = self.context['request']
-        cama    = validated_data['cama']
+    def validate(self, attrs):
+        if self.instance is None and not attrs.get('cama') and not attrs.get('tipo_cama'):
+            raise serializers.ValidationError({'cama': 'Indique la cama o el tipo_cama a asignar.'})
+        return attrs
 
-        enc = Encamamiento.objects.create(
-            hospital_id=request.user.hospital_id,
-            created_by=request.user,
-            updated_by=request.user,
-            **validated_data,
-        )
-        # Marcar cama como OCUPADA
-        cama.estado = 'OCUPADA'
-        cama.save(update_fields=['estado', 'updated_at'])
+    def create(self, validated_data):
+        request   = self.context['request']
+        criterios = {c: validated_data.pop(c, None) for c in self.CRITERIOS}
+        cama      = validated_data.get('cama')
+
+        with transaction.atomic():
+            # Reclamar la cama (OCUPADA) antes de insertar el ingreso
+            if cama is not None:
+                anterior = cama.estado
+                if not asignacion.ocupar(cama):
+                    raise serializers.ValidationError(
+                        {'cama': f'La cama {cama.numero_cama} acaba de ser asignada a otro ingreso.'}
+                    )
+            else:
+                anterior = 'DISPONIBLE'
+                equipos  = [e for e in asignacion.EQUIPAMIENTO if criterios[f'requiere_{e}']]
+                cama = asignacion.asignar(
+                    request.user.hospital_id, criterios['tipo_cama'], equipos,
+                    sala=criterios['sala'] or '', piso=criterios['piso'] or '',
+                )
+                if cama is None:
+                    raise serializers.ValidationError(
+                        {'cama': 'No hay camas disponibles con el tipo y equipamiento solicitados.'}
+                    )
+                validated_data['cama'] = cama
+
+            enc = Encamamiento.objects.create(
+                hospital_id=request.user.hospital_id,
+                created_by=request.user,
+                updated_by=request.user,
+                **validated_data,
+            )
+            censo.registrar_cambio(cama, anterior)
         return enc
 
     def update(self, instance, validated_data):
+        for criterio in self.CRITERIOS:
+            validated_data.pop(criterio, None)
         validated_data['updated_by'] = self.context['request'].user
         return super().update(instance, validated_data)
 
@@ -0,0 +1,121 @@
+"""
+HealthTech Solutions — Tests: Asignación de camas (apps/hospitalization/asignacion.py)
+Cobertura:
+  - Mejor cama: tipo y equipamiento requerido, cercanía y menor equipamiento sobrante
+  - Ingreso por criterios: reclama la mejor candidata libre
+  - Ingresos simultáneos a la misma cama: exactamente uno la ocupa
+"""
+import datetime
+import threading
+from types import SimpleNamespace
+
+import pytest
+from django.db import connections
+from rest_framework.exceptions import ValidationError
+
+from apps.hospitalization.models import Cama, Encamamiento
+from apps.hospitalization.serializers import EncamamientoCreateSerializer
+from apps.patients.models import Paciente
+
+URL = '/api/v1/hospitalization/'
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+def _cama(hospital, numero, tipo='UCI', sala='UCI', piso='3', **extra):
+    return Cama.objects.create(hospital_id=hospital.pk, numero_cama=numero, sala=sala, piso=piso,
+                               tipo_cama=tipo, **extra)
+
+
+def _paciente(hospital, numero):
+    return Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente=f'EXP-A{numero}', primer_nombre='Ana',
+        primer_apellido='Prueba', tipo_documento='DPI', no_documento=f'{numero:013d}',
+        fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+def _ingreso(paciente, medico, **cama):
+    return {
+        'paciente': paciente.pk, 'medico': medico.pk, 'fecha_ingreso': str(datetime.date.today()),
+        'hora_ingreso': '08:00', 'motivo_ingreso': 'Neumonía', **cama,
+    }
+
+
+def test_mejor_cama(cliente, hospital):
+    completa = _cama(hospital, 'U-1', tiene_oxigeno=True, tiene_monitor=True, tiene_ventilador=True)
+    justa    = _cama(hospital, 'U-2', tiene_oxigeno=True)
+    otra     = _cama(hospital, 'U-3', sala='UCI-B', piso='4', tiene_oxigeno=True)
+    _cama(hospital, 'U-4', tiene_oxigeno=True, estado='OCUPADA')
+    _cama(hospital, 'G-1', tipo='GENERAL', tiene_oxigeno=True)
+
+    r = cliente.get(f'{URL}camas/mejor/', {'tipo_cama': 'UCI', 'oxigeno': '1'})
+    assert [c['cama_id'] for c in r.json()] == [justa.pk, otra.pk, completa.pk]   # Sobrante, luego orden
+
+    r = cliente.get(f'{URL}camas/mejor/', {'tipo_cama': 'UCI', 'oxigeno': '1', 'sala': 'UCI-B', 'piso': '4'})
+    assert r.json()[0]['cama_id'] == otra.pk                                       # Cercanía primero
+    r = cliente.get(f'{URL}camas/mejor/', {'tipo_cama': 'UCI', 'ventilador': 'true'})
+    assert [c['cama_id'] for c in r.json()] == [completa.pk]
+    assert cliente.get(f'{URL}camas/mejor/', {'tipo_cama': 'CAMILLA'}).status_code == 400
+
+
+def test_ingreso_por_criterios(cliente, hospital, usuario_medico):
+    _cama(hospital, 'U-1', tiene_oxigeno=True, tiene_ventilador=True)
+    justa = _cama(hospital, 'U-2', tiene_oxigeno=True)
+
+    r = cliente.post(URL, _ingreso(_paciente(hospital, 1), usuario_medico,
+                                   tipo_cama='UCI', requiere_oxigeno=True), format='json')
+    assert r.status_code == 201, r.content
+    assert Encamamiento.objects.get(pk=r.json()['enc_id']).cama_id == justa.pk
+    justa.refresh_from_db()
+    assert justa.estado == 'OCUPADA'
+
+    r = cliente.post(URL, _ingreso(_paciente(hospital, 2), usuario_medico,
+                                   tipo_cama='UCI', requiere_monitor=True), format='json')
+    assert r.status_code == 400 and 'cama' in r.json()
+    assert cliente.post(URL, _ingreso(_paciente(hospital, 3), usuario_medico), format='json').status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ingresos_simultaneos_misma_cama(hospital, usuario_medico):
+    """
+    Todos los ingresos validan la cama libre antes de que ninguno la reclame
+    (la ventana de carrera de validate_cama). SQLite no admite escritores
+    concurrentes, así que las transacciones se serializan con un lock; en
+    Oracle lo hace el bloqueo de fila del UPDATE condicional.
+    """
+    cama      = _cama(hospital, 'U-1')
+    pacientes = [_paciente(hospital, n) for n in range(1, 5)]
+    barrera   = threading.Barrier(len(pacientes))
+    escritura = threading.Lock()
+    request   = SimpleNamespace(user=usuario_medico)
+    ganadores, rechazados = [], []
+
+    def ingresar(paciente):
+        try:
+            serializer = EncamamientoCreateSerializer(
+                data=_ingreso(paciente, usuario_medico, cama=cama.pk), context={'request': request},
+            )
+            assert serializer.is_valid(), serializer.errors                # Todos ven la cama libre
+            barrera.wait()
+            with escritura:
+                try:
+                    ganadores.append(serializer.save())
+                except ValidationError as exc:
+                    rechazados.append(exc.detail)
+        finally:
+            connections.close_all()
+
+    hilos = [threading.Thread(target=ingresar, args=(p,)) for p in pacientes]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(30)
+
+    assert len(ganadores) == 1 and len(rechazados) == 3
+    assert all('cama' in detalle for detalle in rechazados)
+    assert Encamamiento.objects.sin_tenant().filter(cama=cama).count() == 1
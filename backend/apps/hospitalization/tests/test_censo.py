@@ -0,0 +1,179 @@
+"""
+HealthTech Solutions — Tests: Censo de camas (apps/hospitalization/censo.py)
+Cobertura:
+  - Conteos por (sala, piso, tipo_cama, estado) con equipamiento y filtros
+  - Ingreso y egreso mueven la cama en el censo tras el commit (delta + versión nueva), sin GROUP BY
+  - Guardia de deriva: escritura fuera de la API antes de un delta → se descarta y recalcula;
+    dos workers con su propio cache ven el cambio por la huella
+  - Lectores concurrentes tras un cambio: un solo recálculo (relectura dentro del lock)
+  - Reconciliación: corrige la deriva sobre el cache compartido; falla con cache por proceso
+"""
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.hospitalization import asignacion, censo
+from apps.hospitalization.models import Cama
+from apps.patients.models import Paciente
+
+URL = '/api/v1/hospitalization/camas/censo/'
+
+
+@pytest.fixture(autouse=True)
+def _cache_limpio():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+@pytest.fixture
+def camas(hospital):
+    def cama(numero, sala, tipo, **extra):
+        return Cama.objects.create(hospital_id=hospital.pk, numero_cama=numero, piso='2', sala=sala,
+                                   tipo_cama=tipo, **extra)
+    return [
+        cama('A-1', 'A', 'GENERAL', tiene_oxigeno=True),
+        cama('A-2', 'A', 'GENERAL'),
+        cama('U-1', 'UCI', 'UCI', tiene_oxigeno=True, tiene_monitor=True, tiene_ventilador=True),
+        cama('U-2', 'UCI', 'UCI', estado='MANTENIMIENTO', tiene_monitor=True),
+        cama('U-3', 'UCI', 'UCI', activo=False),
+    ]
+
+
+def _grupo(datos, sala, estado):
+    return next((g for g in datos['grupos'] if g['sala'] == sala and g['estado'] == estado), None)
+
+
+def test_conteos_por_grupo_y_equipamiento(cliente, camas):
+    datos = cliente.get(URL).json()
+    assert datos['total'] == 4 and datos['por_estado']['DISPONIBLE'] == 3
+    uci = _grupo(datos, 'UCI', 'DISPONIBLE')
+    assert (uci['camas'], uci['con_oxigeno'], uci['con_monitor'], uci['con_ventilador']) == (1, 1, 1, 1)
+    assert _grupo(datos, 'A', 'DISPONIBLE')['con_oxigeno'] == 1
+
+    filtrado = cliente.get(URL, {'tipo_cama': 'UCI'}).json()
+    assert {g['sala'] for g in filtrado['grupos']} == {'UCI'} and filtrado['total'] == 2
+
+
+def _paciente(hospital_id):
+    return Paciente.objects.create(
+        hospital_id=hospital_id, no_expediente='EXP-C1', primer_nombre='Ana',
+        primer_apellido='Prueba', tipo_documento='DPI', no_documento='0000000000002',
+        fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+def _ingreso(cliente, cama, medico):
+    return cliente.post('/api/v1/hospitalization/', {
+        'paciente': _paciente(medico.hospital_id).pk, 'cama': cama.pk, 'medico': medico.pk,
+        'fecha_ingreso': str(datetime.date.today()), 'hora_ingreso': '08:00',
+        'motivo_ingreso': 'Neumonía',
+    }, format='json')
+
+
+def test_ingreso_y_egreso_actualizan_el_censo(cliente, camas, usuario_medico, django_capture_on_commit_callbacks):
+    version = cliente.get(URL).json()['version']
+    with django_capture_on_commit_callbacks(execute=True):
+        r = _ingreso(cliente, camas[2], usuario_medico)
+    assert r.status_code == 201, r.content
+
+    with CaptureQueriesContext(connection) as consultas:
+        entrada = censo.censo(usuario_medico.hospital_id)
+    assert len(consultas) == 1                                        # Solo la huella: el delta ya se aplicó
+    datos = censo.resumen(usuario_medico.hospital_id)
+    assert datos['version'] > version
+    assert _grupo(datos, 'UCI', 'DISPONIBLE') is None
+    assert _grupo(datos, 'UCI', 'OCUPADA')['con_ventilador'] == 1
+    assert entrada['conteos'] == censo.calcular(usuario_medico.hospital_id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        r = cliente.post(f'/api/v1/hospitalization/{r.json()["enc_id"]}/egreso/',
+                         {'tipo_egreso': 'ALTA_MEDICA', 'diagnostico_egreso': 'Neumonía resuelta'}, format='json')
+    assert r.status_code == 200
+    assert censo.resumen(usuario_medico.hospital_id)['version'] > datos['version']
+    assert censo.censo(usuario_medico.hospital_id)['conteos'] == censo.calcular(usuario_medico.hospital_id)
+
+
+def test_delta_tras_escritura_externa_recalcula(cliente, camas, usuario_medico, django_capture_on_commit_callbacks):
+    hospital_id = usuario_medico.hospital_id
+    censo.censo(hospital_id)
+    Cama.objects.sin_tenant().filter(pk=camas[1].pk).update(                       # Fuera de la API
+        estado='MANTENIMIENTO', updated_at=datetime.datetime.now(datetime.timezone.utc))
+    with django_capture_on_commit_callbacks(execute=True):
+        assert _ingreso(cliente, camas[0], usuario_medico).status_code == 201
+    assert cache.get(censo._clave(hospital_id)) is None                # El delta no tapa la otra escritura
+    assert censo.censo(hospital_id)['conteos'] == censo.calcular(hospital_id)
+
+
+def test_un_solo_recalculo_con_lectores_concurrentes(camas, hospital, monkeypatch):
+    calculos = []
+    original = censo.calcular
+
+    def _calcular(hospital_id):
+        calculos.append(hospital_id)
+        return original(hospital_id)
+
+    class _LockTrasOtroLector:
+        """Al obtener el lock, otro lector ya recalculó y guardó el censo."""
+        def __enter__(self):
+            censo._guardar(hospital.pk, _calcular(hospital.pk), censo.huella(hospital.pk))
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(censo, 'calcular', _calcular)
+    monkeypatch.setattr(censo, '_lock', _LockTrasOtroLector())
+    assert censo.censo(hospital.pk)['conteos'] == original(hospital.pk)
+    assert len(calculos) == 1
+
+
+def test_cambio_visible_en_otro_worker(camas, hospital, monkeypatch):
+    """Cada worker de gunicorn con su propia LocMemCache."""
+    worker_a, worker_b = LocMemCache('worker-a', {}), LocMemCache('worker-b', {})
+    for worker in (worker_a, worker_b):
+        monkeypatch.setattr(censo, 'cache', worker)
+        assert censo.censo(hospital.pk)['conteos'] == censo.calcular(hospital.pk)
+
+    monkeypatch.setattr(censo, 'cache', worker_a)
+    assert asignacion.ocupar(camas[0])                                # Ingreso atendido por el worker A
+    monkeypatch.setattr(censo, 'cache', worker_b)
+    datos = censo.resumen(hospital.pk)
+    assert _grupo(datos, 'A', 'OCUPADA')['camas'] == 1
+
+    Cama.objects.sin_tenant().filter(pk=camas[1].pk).delete()       # Borrado: MAX no cambia, el conteo sí
+    assert censo.resumen(hospital.pk)['total'] == datos['total'] - 1
+
+
+def test_reconciliacion_corrige_deriva(camas, hospital, settings):
+    with pytest.raises(CommandError):
+        call_command('reconciliar_censo_camas', stdout=StringIO())    # LocMemCache: no alcanza a los workers
+
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                                   'LOCATION': 'APP_CACHE'}}
+    call_command('createcachetable', verbosity=0)
+    version = censo.censo(hospital.pk)['version']
+    # Fuera de la API y sin tocar UPDATED_AT (sin el trigger de Oracle): la huella no cambia
+    Cama.objects.sin_tenant().filter(pk=camas[0].pk).update(estado='RESERVADA')
+    assert censo.censo(hospital.pk)['version'] == version
+
+    salida = StringIO()
+    call_command('reconciliar_censo_camas', stdout=salida)
+    assert 'A / 2 / GENERAL / RESERVADA: 0 → 1' in salida.getvalue()
+    entrada = censo.censo(hospital.pk)
+    assert entrada['version'] > version and entrada['conteos'] == censo.calcular(hospital.pk)
+
+    # Sin deriva: la reconciliación al leer conserva la versión
+    settings.CAMAS_CENSO_RECONCILIAR = 0
+    assert censo.censo(hospital.pk)['version'] == entrada['version']
@@ -5,6 +5,8 @@ Base: /api/v1/hospitalization/
 Rutas Camas:
   GET/POST                        /api/v1/hospitalization/camas/
   GET/PUT/PATCH/DELETE            /api/v1/hospitalization/camas/{id}/
+  GET   /api/v1/hospitalization/camas/censo/
+  GET   /api/v1/hospitalization/camas/mejor/
 
 Rutas Encamamientos:
   GET/POST                        /api/v1/hospitalization/
@@ -1,7 +1,7 @@
 """
 HealthTech Solutions — Views: Módulo Encamamiento (M05)
 HIPAA: Auditoría PHI_ACCESS en TODOS los accesos a encamamientos.
-VPD:   Filtro manual por hospital_id en DEV.
+VPD:   Filtro por hospital_id en DEV vía TenantManager (apps.core.managers).
 
 Máquina de estados (Encamamiento):
   INGRESADO → EN_TRATAMIENTO → EGRESADO
@@ -10,21 +10,23 @@ Máquina de estados (Encamamiento):
 
 Al crear encamamiento → cama pasa a OCUPADA.
 Al egresar           → cama pasa a DISPONIBLE.
+Ambos cambios se reflejan en el censo de camas (apps.hospitalization.censo).
 """
 
-import logging
 from datetime import date
 
-from django.conf import settings
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.audit import audit_phi_for
+from apps.core.conditional import ConditionalGetMixin
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
+from apps.hospitalization import asignacion, censo
 from apps.hospitalization.models import (
-    Cama, Encamamiento,
+    Cama, Encamamiento, TIPO_CAMA_CHOICES,
     ESTADOS_ACTIVOS_ENC, ESTADOS_EGRESABLES, ESTADOS_TRATABLES,
 )
 from apps.hospitalization.serializers import (
@@ -33,47 +35,29 @@ from apps.hospitalization.serializers import (
     EncamamientoCreateSerializer,
     EncamamientoEgresoSerializer, EncamamientoEvolucionSerializer,
 )
-from apps.security.models import AuditoriaAcceso
-
-logger = logging.getLogger('healthtech.audit')
-
-
-def _get_ip(request) -> str:
-    x_fwd = request.META.get('HTTP_X_FORWARDED_FOR')
-    return x_fwd.split(',')[0].strip() if x_fwd else request.META.get('REMOTE_ADDR', '0.0.0.0')
-
-
-def _audit_phi(request, accion: str, enc_id: str, descripcion: str = '') -> None:
-    try:
-        AuditoriaAcceso.objects.create(
-            hospital_id=request.user.hospital_id,
-            usuario=request.user,
-            tipo_evento='PHI_ACCESS',
-            modulo='hospitalization',
-            accion=accion,
-            tabla_afectada='ENC_ENCAMAMIENTOS',
-            registro_id=enc_id,
-            ip_origen=_get_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
-            descripcion=descripcion or f'{accion} encamamiento #{enc_id}',
-            exitoso=True,
-        )
-    except Exception as exc:
-        logger.warning('Fallo al registrar auditoría PHI (hospitalization): %s', exc)
+
+
+# Auditoría HIPAA: pipeline asíncrono por lotes (apps.core.audit)
+_audit_phi = audit_phi_for('hospitalization', 'ENC_ENCAMAMIENTOS', 'encamamiento')
 
 
 # ============================================================
 # CAMAS ViewSet
 # ============================================================
-class CamaViewSet(viewsets.ModelViewSet):
+class CamaViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     CRUD de camas hospitalarias.
     GET    /api/v1/hospitalization/camas/
     POST   /api/v1/hospitalization/camas/
     GET    /api/v1/hospitalization/camas/{id}/
     PUT/PATCH/DELETE ...
+    GET    /api/v1/hospitalization/camas/censo/   Ocupación por sala/piso/tipo_cama/estado
+    GET    /api/v1/hospitalization/camas/mejor/   Camas libres que mejor cumplen los criterios
+
+    Lista y detalle con ETag / Last-Modified: 304 sin serializar si no cambió.
     """
     serializer_class   = CamaSerializer
+    etag_lista         = True
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     filter_backends    = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields   = ['estado', 'tipo_cama', 'piso', 'sala']
@@ -82,11 +66,7 @@ class CamaViewSet(viewsets.ModelViewSet):
     ordering           = ['sala', 'piso', 'numero_cama']
 
     def get_queryset(self):
-        qs   = Cama.objects.filter(activo=True)
-        user = self.request.user
-        if not settings.VPD_ENABLED:
-            if getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-                qs = qs.filter(hospital_id=user.hospital_id)
+        qs = Cama.objects.activos()   # Filtro de hospital: TenantManager
 
         # Filtro rápido: solo disponibles
         solo_disp = self.request.query_params.get('disponibles')
@@ -95,6 +75,15 @@ class CamaViewSet(viewsets.ModelViewSet):
 
         return qs
 
+    # Alta y edición pueden cambiar grupo o equipamiento: el censo se recalcula
+    def perform_create(self, serializer):
+        cama = serializer.save()
+        censo.invalidar(cama.hospital_id)
+
+    def perform_update(self, serializer):
+        cama = serializer.save()
+        censo.invalidar(cama.hospital_id)
+
     def destroy(self, request, *args, **kwargs):
         cama = self.get_object()
         if cama.estado == 'OCUPADA':
@@ -104,8 +93,53 @@ class CamaViewSet(viewsets.ModelViewSet):
             )
         cama.activo = False
         cama.save(update_fields=['activo', 'updated_at'])
+        censo.invalidar(cama.hospital_id)
         return Response({'detail': f'Cama {cama.numero_cama} desactivada.'}, status=status.HTTP_200_OK)
 
+    # ── Acción: censo de camas ─────────────────────────────
+    @action(detail=False, methods=['get'], url_path='censo')
+    def censo_camas(self, request):
+        """
+        GET /api/v1/hospitalization/camas/censo/?sala=&piso=&tipo_cama=
+        Conteos por (sala, piso, tipo_cama, estado) con equipamiento, desde cache.
+        SUPER_ADMIN puede indicar ?hospital_id=.
+        """
+        hospital_id = request.user.hospital_id
+        if request.user.rol_codigo == 'SUPER_ADMIN' and request.query_params.get('hospital_id'):
+            try:
+                hospital_id = int(request.query_params['hospital_id'])
+            except ValueError:
+                return Response({'detail': 'hospital_id inválido.'}, status=status.HTTP_400_BAD_REQUEST)
+        if hospital_id is None:
+            return Response({'detail': 'Indique hospital_id.'}, status=status.HTTP_400_BAD_REQUEST)
+        params = request.query_params
+        return Response(censo.resumen(
+            hospital_id, sala=params.get('sala'), piso=params.get('piso'), tipo_cama=params.get('tipo_cama'),
+        ))
+
+    # ── Acción: mejor cama libre ───────────────────────────
+    @action(detail=False, methods=['get'], url_path='mejor')
+    def mejor(self, request):
+        """
+        GET /api/v1/hospitalization/camas/mejor/?tipo_cama=UCI&oxigeno=1&ventilador=1&sala=&piso=&limite=5
+        Candidatas DISPONIBLE, la mejor primero (una consulta). No reserva la
+        cama: el ingreso la reclama al crearse (o asigna por criterios).
+        """
+        params    = request.query_params
+        tipo_cama = params.get('tipo_cama')
+        if tipo_cama not in dict(TIPO_CAMA_CHOICES):
+            return Response({'detail': 'Indique un tipo_cama válido.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limite = min(max(int(params.get('limite', 5)), 1), 50)
+        except ValueError:
+            return Response({'detail': 'limite debe ser numérico.'}, status=status.HTTP_400_BAD_REQUEST)
+        equipos = [e for e in asignacion.EQUIPAMIENTO if params.get(e, '').lower() in ('1', 'true')]
+        camas = asignacion.candidatas(
+            request.user.hospital_id, tipo_cama, equipos,
+            sala=params.get('sala', ''), piso=params.get('piso', ''), limite=limite,
+        )
+        return Response(CamaSerializer(camas, many=True).data)
+
 
 # ============================================================
 # ENCAMAMIENTOS ViewSet
@@ -138,14 +172,9 @@ class EncamamientoViewSet(viewsets.ModelViewSet):
     ordering           = ['-fecha_ingreso', '-hora_ingreso']
 
     def get_queryset(self):
-        qs   = Encamamiento.objects.select_related(
+        qs = Encamamiento.objects.activos().select_related(
             'paciente', 'medico', 'enfermero', 'cama'
-        ).filter(activo=True)
-        user = self.request.user
-
-        if not settings.VPD_ENABLED:
-            if getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-                qs = qs.filter(hospital_id=user.hospital_id)
+        )
 
         fecha_desde = self.request.query_params.get('fecha_desde')
         fecha_hasta = self.request.query_params.get('fecha_hasta')
@@ -200,8 +229,10 @@ class EncamamientoViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         enc = self.get_object()
         if enc.estado in ESTADOS_ACTIVOS_ENC:
+            anterior        = enc.cama.estado
             enc.cama.estado = 'DISPONIBLE'
             enc.cama.save(update_fields=['estado', 'updated_at'])
+            censo.registrar_cambio(enc.cama, anterior)
         enc.activo     = False
         enc.updated_by = request.user
         enc.save(update_fields=['activo', 'updated_by', 'updated_at'])
@@ -302,8 +333,10 @@ class EncamamientoViewSet(viewsets.ModelViewSet):
         enc.save(update_fields=update_fields)
 
         # Liberar la cama
+        anterior        = enc.cama.estado
         enc.cama.estado = 'DISPONIBLE'
         enc.cama.save(update_fields=['estado', 'updated_at'])
+        censo.registrar_cambio(enc.cama, anterior)
 
         _audit_phi(request, 'edit', str(enc.enc_id),
                    f'Egreso: #{enc.enc_id} — {tipo_egreso} — {data["diagnostico_egreso"][:80]}')
@@ -0,0 +1,83 @@
+"""
+manage.py recalcular_resultados_lab
+===================================
+Llena las columnas numéricas de LAB_RESULTADOS (CODIGO_EXAMEN, VALOR_NUM,
+RANGO_*_NUM, UNIDAD_CODIGO) y las desnormalizadas de la orden (PAC_ID,
+FECHA_RESULTADO) en resultados cargados antes de apps.laboratory.resultados
+o por fuera de la acción completar, para que aparezcan en
+GET /api/v1/laboratory/tendencia/.
+
+ESTADO_RESULTADO se conserva salvo con --clasificar (lo recalcula en el
+servidor, igual que completar).
+
+Uso:
+    python manage.py recalcular_resultados_lab
+    python manage.py recalcular_resultados_lab --hospital 3 --todos --clasificar
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.laboratory import resultados
+from apps.laboratory.models import ResultadoLab
+
+CAMPOS = ['codigo_examen', 'valor_num', 'rango_min_num', 'rango_max_num', 'unidad_codigo',
+          'paciente_id', 'fecha_resultado']
+
+
+class Command(BaseCommand):
+    help = 'Llena las columnas numéricas y de tendencia de LAB_RESULTADOS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hospital', type=int, help='Solo este hospital_id.')
+        parser.add_argument('--lote', type=int, default=1000, help='Resultados por lote (default 1000).')
+        parser.add_argument('--todos', action='store_true',
+                            help='Recalcular también los que ya tienen CODIGO_EXAMEN.')
+        parser.add_argument('--clasificar', action='store_true',
+                            help='Recalcular además ESTADO_RESULTADO.')
+
+    def handle(self, *args, **options):
+        qs = ResultadoLab.objects.sin_tenant().select_related('orden').order_by('res_id')
+        if options['hospital']:
+            qs = qs.filter(hospital_id=options['hospital'])
+        if not options['todos']:
+            qs = qs.filter(codigo_examen='')
+        campos = CAMPOS + ['estado_resultado'] if options['clasificar'] else CAMPOS
+
+        total, ultimo = 0, 0
+        while True:
+            lote = list(qs.filter(res_id__gt=ultimo)[:options['lote']])   # Keyset por RES_ID
+            if not lote:
+                break
+            panel = [{
+                'nombre_examen': r.nombre_examen, 'valor': r.valor, 'unidad': r.unidad,
+                'rango_min': r.rango_min, 'rango_max': r.rango_max,
+                'valor_referencia': r.valor_referencia, 'estado_resultado': r.estado_resultado,
+            } for r in lote]
+            columnas = resultados.parsear(panel)
+            estados  = resultados.clasificar(panel, columnas)
+            for i, r in enumerate(lote):
+                r.codigo_examen, r.unidad_codigo = columnas['codigo'][i], columnas['unidad'][i]
+                r.valor_num, r.rango_min_num, r.rango_max_num = (
+                    columnas['valor'][i], columnas['bajo'][i], columnas['alto'][i])
+                r.paciente_id     = r.orden.paciente_id
+                r.fecha_resultado = self._fecha(r)
+                r.estado_resultado = estados[i]
+            with transaction.atomic():
+                ResultadoLab.objects.sin_tenant().bulk_update(lote, campos)
+            total += len(lote)
+            ultimo = lote[-1].res_id
+            self.stdout.write(f'  {total} resultados recalculados…')
+
+        self.stdout.write(self.style.SUCCESS(f'Resultados de laboratorio recalculados: {total}.'))
+
+    @staticmethod
+    def _fecha(resultado):
+        orden = resultado.orden
+        if orden.fecha_resultado:
+            return timezone.make_aware(datetime.datetime.combine(
+                orden.fecha_resultado, orden.hora_resultado or datetime.time.min))
+        return resultado.created_at
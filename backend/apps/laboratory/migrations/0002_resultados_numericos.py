@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-18 13:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('laboratory', '0001_initial'),
+        ('patients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resultadolab',
+            name='codigo_examen',
+            field=models.CharField(blank=True, db_column='CODIGO_EXAMEN', default='', max_length=60),
+        ),
+        migrations.AddField(
+            model_name='resultadolab',
+            name='valor_num',
+            field=models.FloatField(blank=True, db_column='VALOR_NUM', null=True),
+        ),
+        migrations.AddField(
+            model_name='resultadolab',
+            name='rango_min_num',
+            field=models.FloatField(blank=True, db_column='RANGO_MIN_NUM', null=True),
+        ),
+        migrations.AddField(
+            model_name='resultadolab',
+            name='rango_max_num',
+            field=models.FloatField(blank=True, db_column='RANGO_MAX_NUM', null=True),
+        ),
+        migrations.AddField(
+            model_name='resultadolab',
+            name='unidad_codigo',
+            field=models.CharField(blank=True, db_column='UNIDAD_CODIGO', default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='resultadolab',
+            name='paciente',
+            field=models.ForeignKey(blank=True, db_column='PAC_ID', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='resultados_lab', to='patients.paciente'),
+        ),
+        migrations.AddField(
+            model_name='resultadolab',
+            name='fecha_resultado',
+            field=models.DateTimeField(blank=True, db_column='FECHA_RESULTADO', null=True),
+        ),
+    ]
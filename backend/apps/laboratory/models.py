@@ -13,6 +13,8 @@ Máquina de estados (OrdenLab):
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 # ============================================================
 # Catálogos / choices
@@ -161,6 +163,8 @@ class OrdenLab(models.Model):
     )
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'LAB_ORDENES'
         verbose_name        = 'Orden de Laboratorio'
@@ -205,6 +209,20 @@ class ResultadoLab(models.Model):
         choices=ESTADO_RESULTADO_CHOICES, default='NORMAL',
     )
 
+    # Columnas numéricas (apps.laboratory.resultados) — se llenan al completar la orden
+    codigo_examen  = models.CharField(db_column='CODIGO_EXAMEN', max_length=60, blank=True, default='')
+    valor_num      = models.FloatField(db_column='VALOR_NUM',     null=True, blank=True)
+    rango_min_num  = models.FloatField(db_column='RANGO_MIN_NUM', null=True, blank=True)
+    rango_max_num  = models.FloatField(db_column='RANGO_MAX_NUM', null=True, blank=True)
+    unidad_codigo  = models.CharField(db_column='UNIDAD_CODIGO', max_length=20, blank=True, default='')
+
+    # Desnormalizados de la orden: serie por paciente y analito sin JOIN (IDX_RES_TENDENCIA)
+    paciente        = models.ForeignKey(
+        'patients.Paciente', db_column='PAC_ID', null=True, blank=True,
+        on_delete=models.PROTECT, related_name='resultados_lab',
+    )
+    fecha_resultado = models.DateTimeField(db_column='FECHA_RESULTADO', null=True, blank=True)
+
     # Auditoría
     activo     = models.BooleanField(db_column='ACTIVO', default=True)
     created_by = models.ForeignKey(
@@ -214,12 +232,14 @@ class ResultadoLab(models.Model):
     created_at = models.DateTimeField(db_column='CREATED_AT', auto_now_add=True)
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'LAB_RESULTADOS'
         verbose_name        = 'Resultado de Laboratorio'
         verbose_name_plural = 'Resultados de Laboratorio'
         ordering            = ['nombre_examen']
-        indexes             = []
+        indexes             = []   # IDX_RES_TENDENCIA (HOSPITAL_ID, PAC_ID, CODIGO_EXAMEN, FECHA_RESULTADO) en DDL
 
     def __str__(self):
         return (
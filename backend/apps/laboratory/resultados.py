@@ -0,0 +1,138 @@
+"""
+HealthTech Solutions — Resultados numéricos de laboratorio (M07)
+LAB_RESULTADOS guarda VALOR, RANGO_MIN y RANGO_MAX como texto libre y
+ESTADO_RESULTADO era lo que enviara el cliente. Al completar una orden:
+
+  - parsear(): columnas numéricas del panel (VALOR_NUM, RANGO_MIN_NUM,
+    RANGO_MAX_NUM), unidad normalizada (UNIDAD_CODIGO) y código de analito
+    (CODIGO_EXAMEN) para agrupar series aunque el nombre varíe en acentos,
+    mayúsculas o espacios ("Creatinina" = "CREATININA " = "creatinína").
+  - clasificar(): NORMAL / BAJO / ALTO / CRITICO en el servidor, en una sola
+    pasada por columnas sobre todo el panel (sin consultas por resultado).
+    Crítico = fuera de LIMITES_CRITICOS del analito y unidad; sin límites
+    catalogados, fuera del rango de referencia por más de LAB_CRITICO_FACTOR
+    (fracción del límite). Los resultados cualitativos o sin rango conservan
+    el estado enviado por el laboratorista.
+  - La serie de un analito (GET /api/v1/laboratory/tendencia/) se lee por
+    IDX_RES_TENDENCIA (HOSPITAL_ID, PAC_ID, CODIGO_EXAMEN, FECHA_RESULTADO).
+"""
+
+import re
+import unicodedata
+
+from django.conf import settings
+
+# Límites críticos (valores de pánico) por (CODIGO_EXAMEN, UNIDAD_CODIGO): (bajo, alto)
+LIMITES_CRITICOS = {
+    ('POTASIO',     'MEQ/L'):    (2.5, 6.5),
+    ('POTASIO',     'MMOL/L'):   (2.5, 6.5),
+    ('SODIO',       'MEQ/L'):    (120, 160),
+    ('SODIO',       'MMOL/L'):   (120, 160),
+    ('GLUCOSA',     'MG/DL'):    (40, 450),
+    ('GLUCOSA',     'MMOL/L'):   (2.2, 25.0),
+    ('HEMOGLOBINA', 'G/DL'):     (7.0, 20.0),
+    ('CREATININA',  'MG/DL'):    (None, 4.0),
+    ('LEUCOCITOS',  '10^3/UL'):  (2.0, 30.0),
+    ('PLAQUETAS',   '10^3/UL'):  (20, 1000),
+}
+
+_NUMERO = re.compile(r'^\s*(?:[<>]=?|[≤≥=])?\s*([-+]?\d+(?:[.,]\d+)*)\s*(.*)$')
+_RANGO  = re.compile(r'^\s*([-+]?\d+(?:[.,]\d+)?)\s*(?:-|–|a|al)\s*([-+]?\d+(?:[.,]\d+)?)')
+
+
+def _sin_acentos(texto: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def codigo_examen(nombre: str) -> str:
+    """Código estable del analito: sin acentos, mayúsculas, espacios simples."""
+    return ' '.join(_sin_acentos(nombre or '').upper().split())[:60]
+
+
+def codigo_unidad(unidad: str) -> str:
+    """'mg/dL' → 'MG/DL', 'µmol/L' → 'UMOL/L', 'x10^3/µL' → '10^3/UL'."""
+    codigo = _sin_acentos((unidad or '').replace('µ', 'u').replace('μ', 'u')).upper()
+    codigo = ''.join(codigo.split())
+    return (codigo[1:] if codigo.startswith('X10') else codigo)[:20]
+
+
+def numero(texto: str) -> float | None:
+    """Valor numérico de un resultado ('13,5', '<0.5', '1,200', '98 mg/dL'); None si es cualitativo."""
+    m = _NUMERO.match(texto or '')
+    if not m:
+        return None
+    digitos = m.group(1)
+    if ',' in digitos:
+        miles = re.search(r',\d{3}(?!\d)', digitos) and not digitos.lstrip('+-').startswith('0,')
+        if '.' in digitos or miles:
+            digitos = digitos.replace(',', '')           # Separador de miles
+        else:
+            digitos = digitos.replace(',', '.')          # Coma decimal
+    try:
+        return float(digitos)
+    except ValueError:
+        return None
+
+
+def rango(rango_min: str, rango_max: str, referencia: str = '') -> tuple:
+    """(bajo, alto) numéricos; si faltan ambos límites se intenta con VALOR_REFERENCIA ('3.5 - 5.1')."""
+    bajo, alto = numero(rango_min), numero(rango_max)
+    if bajo is None and alto is None and referencia:
+        m = _RANGO.match(referencia)
+        if m:
+            return numero(m.group(1)), numero(m.group(2))
+        ref = referencia.strip()
+        if ref[:1] in '<≤':
+            return None, numero(ref)
+        if ref[:1] in '>≥':
+            return numero(ref), None
+    return bajo, alto
+
+
+# ============================================================
+# Panel: parseo + clasificación por columnas
+# ============================================================
+def parsear(panel: list[dict]) -> dict:
+    """Columnas del panel: {codigo, unidad, valor, bajo, alto} (listas alineadas con `panel`)."""
+    unidades = [r.get('unidad', '') for r in panel]
+    rangos   = [rango(r.get('rango_min', ''), r.get('rango_max', ''), r.get('valor_referencia', ''))
+                for r in panel]
+    return {
+        'codigo': [codigo_examen(r['nombre_examen']) for r in panel],
+        'unidad': [codigo_unidad(u) for u in unidades],
+        'valor':  [numero(r['valor']) for r in panel],
+        'bajo':   [b for b, _ in rangos],
+        'alto':   [a for _, a in rangos],
+    }
+
+
+def _estado(valor, bajo, alto, critico_bajo, critico_alto, declarado) -> str:
+    if valor is None:
+        return declarado                                 # Cualitativo: lo que informa el laboratorio
+    if (critico_bajo is not None and valor <= critico_bajo) or \
+       (critico_alto is not None and valor >= critico_alto):
+        return 'CRITICO'
+    if bajo is None and alto is None:
+        return declarado                                 # Sin rango de referencia
+    if bajo is not None and valor < bajo:
+        return 'BAJO'
+    if alto is not None and valor > alto:
+        return 'ALTO'
+    return 'NORMAL'
+
+
+def clasificar(panel: list[dict], columnas: dict | None = None) -> list[str]:
+    """ESTADO_RESULTADO de cada resultado del panel, calculado en el servidor."""
+    columnas = columnas or parsear(panel)
+    factor = settings.LAB_CRITICO_FACTOR
+    criticos = [
+        LIMITES_CRITICOS.get((c, u)) or (
+            b * (1 - factor) if b is not None else None,
+            a * (1 + factor) if a is not None else None,
+        )
+        for c, u, b, a in zip(columnas['codigo'], columnas['unidad'], columnas['bajo'], columnas['alto'])
+    ]
+    return [
+        _estado(v, b, a, cb, ca, r.get('estado_resultado', 'NORMAL'))
+        for v, b, a, (cb, ca), r in zip(columnas['valor'], columnas['bajo'], columnas['alto'], criticos, panel)
+    ]
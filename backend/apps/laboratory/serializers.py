@@ -9,6 +9,7 @@ HIPAA Data Minimization:
 
 from rest_framework import serializers
 
+from apps.core.serializers import NombreUsuarioField
 from .models import OrdenLab, ResultadoLab, ESTADOS_ACTIVOS
 
 
@@ -28,9 +29,14 @@ class ResultadoSerializer(serializers.ModelSerializer):
             'rango_min', 'rango_max', 'valor_referencia',
             'interpretacion',
             'estado_resultado', 'estado_resultado_display',
+            # Columnas numéricas calculadas al completar
+            'codigo_examen', 'valor_num', 'rango_min_num', 'rango_max_num', 'unidad_codigo',
+            'created_at',
+        ]
+        read_only_fields = [
+            'res_id', 'codigo_examen', 'valor_num', 'rango_min_num', 'rango_max_num', 'unidad_codigo',
             'created_at',
         ]
-        read_only_fields = ['res_id', 'created_at']
 
 
 # ============================================================
@@ -39,7 +45,7 @@ class ResultadoSerializer(serializers.ModelSerializer):
 class OrdenLabListSerializer(serializers.ModelSerializer):
     paciente_nombre      = serializers.SerializerMethodField()
     paciente_expediente  = serializers.SerializerMethodField()
-    medico_nombre        = serializers.SerializerMethodField()
+    medico_nombre        = NombreUsuarioField('medico_solic', vacio='')
     estado_display       = serializers.CharField(source='get_estado_display',       read_only=True)
     prioridad_display    = serializers.CharField(source='get_prioridad_display',    read_only=True)
     tipo_muestra_display = serializers.CharField(source='get_tipo_muestra_display', read_only=True)
@@ -68,22 +74,20 @@ class OrdenLabListSerializer(serializers.ModelSerializer):
     def get_paciente_expediente(self, obj):
         return obj.paciente.no_expediente if obj.paciente else ''
 
-    def get_medico_nombre(self, obj):
-        u = obj.medico_solic
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() if u else ''
-
     def get_hora_solicitud_fmt(self, obj):
         return obj.hora_solicitud.strftime('%H:%M') if obj.hora_solicitud else ''
 
     def get_total_resultados(self, obj):
-        return obj.resultados.filter(activo=True).count()
+        # n_resultados: anotado en OrdenLabViewSet.get_queryset (sin N+1)
+        total = getattr(obj, 'n_resultados', None)
+        return total if total is not None else obj.resultados.filter(activo=True).count()
 
 
 # ============================================================
 # 3. OrdenLabDetailSerializer — Vista detalle con resultados
 # ============================================================
 class OrdenLabDetailSerializer(OrdenLabListSerializer):
-    laboratorista_nombre = serializers.SerializerMethodField()
+    laboratorista_nombre = NombreUsuarioField('laboratorista', vacio='No asignado')
     hora_muestra_fmt     = serializers.SerializerMethodField()
     hora_resultado_fmt   = serializers.SerializerMethodField()
     resultados           = serializers.SerializerMethodField()
@@ -106,10 +110,6 @@ class OrdenLabDetailSerializer(OrdenLabListSerializer):
             'created_at', 'updated_at',
         ]
 
-    def get_laboratorista_nombre(self, obj):
-        u = obj.laboratorista
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() if u else 'No asignado'
-
     def get_hora_muestra_fmt(self, obj):
         return obj.hora_muestra.strftime('%H:%M') if obj.hora_muestra else ''
 
@@ -184,6 +184,7 @@ class ResultadoInputSerializer(serializers.Serializer):
     estado_resultado = serializers.ChoiceField(
         choices=['NORMAL', 'ALTO', 'BAJO', 'CRITICO'],
         default='NORMAL',
+        help_text="Solo para resultados cualitativos o sin rango; los numéricos se clasifican en el servidor.",
     )
 
 
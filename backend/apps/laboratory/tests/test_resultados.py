@@ -0,0 +1,114 @@
+"""
+HealthTech Solutions — Tests: Resultados numéricos (apps/laboratory/resultados.py)
+Cobertura:
+  - Parseo de valores / rangos / unidades y clasificación del panel por columnas
+  - completar: columnas numéricas y estado calculados en el servidor
+  - GET /tendencia/: serie cronológica del analito por paciente, sin JOIN a órdenes
+"""
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.laboratory import resultados
+from apps.laboratory.models import OrdenLab, ResultadoLab
+from apps.patients.models import Paciente
+
+URL = '/api/v1/laboratory/'
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+@pytest.fixture
+def paciente(hospital):
+    return Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-L1', primer_nombre='Ana', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento='0000000000005', fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+def _orden(paciente, medico, estado='EN_PROCESO'):
+    return OrdenLab.objects.create(
+        hospital_id=paciente.hospital_id, paciente=paciente, medico_solic=medico,
+        fecha_solicitud=datetime.date.today(), hora_solicitud=datetime.time(8, 0),
+        examenes_solicitados='Química sanguínea', estado=estado,
+    )
+
+
+def test_parseo_y_clasificacion(settings):
+    settings.LAB_CRITICO_FACTOR = 0.5
+    assert resultados.numero('13,5') == 13.5 and resultados.numero('<0.5') == 0.5
+    assert resultados.numero('1,200') == 1200 and resultados.numero('98 mg/dL') == 98
+    assert resultados.numero('Positivo') is None
+    assert resultados.rango('', '', '3.5 - 5.1') == (3.5, 5.1) and resultados.rango('', '', '< 200') == (None, 200)
+    assert resultados.codigo_examen(' creatinína  sérica') == 'CREATININA SERICA'
+    assert resultados.codigo_unidad('x10^3/µL') == '10^3/UL'
+
+    panel = [
+        {'nombre_examen': 'Potasio',    'valor': '6.8',  'unidad': 'mEq/L', 'rango_min': '3.5', 'rango_max': '5.1'},
+        {'nombre_examen': 'Sodio',      'valor': '150',  'unidad': 'mEq/L', 'rango_min': '135', 'rango_max': '145'},
+        {'nombre_examen': 'Ferritina',  'valor': '5',    'unidad': 'ng/mL', 'rango_min': '12',  'rango_max': '150'},
+        {'nombre_examen': 'Ferritina',  'valor': '8',    'unidad': 'ng/mL', 'valor_referencia': '12 - 150'},
+        {'nombre_examen': 'VIH',        'valor': 'Negativo', 'estado_resultado': 'NORMAL'},
+        {'nombre_examen': 'Glucosa',    'valor': '92',   'unidad': 'mg/dL', 'estado_resultado': 'CRITICO'},
+        {'nombre_examen': 'Glucosa',    'valor': '30',   'unidad': 'mg/dL', 'estado_resultado': 'NORMAL'},
+    ]
+    # Catálogo (K 6.8 ≥ 6.5), rango, factor (5 ≤ 12·0.5), referencia, cualitativo,
+    # sin rango (se respeta lo declarado), catálogo sin rango (glucosa 30 ≤ 40)
+    assert resultados.clasificar(panel) == ['CRITICO', 'ALTO', 'CRITICO', 'BAJO', 'NORMAL', 'CRITICO', 'CRITICO']
+
+
+def test_completar_calcula_columnas_y_estado(cliente, paciente, usuario_medico):
+    orden = _orden(paciente, usuario_medico)
+    r = cliente.post(f'{URL}{orden.pk}/completar/', {'resultados': [
+        {'nombre_examen': 'Creatinina', 'valor': '1,8', 'unidad': 'mg/dL',
+         'rango_min': '0.6', 'rango_max': '1.3', 'estado_resultado': 'NORMAL'},
+        {'nombre_examen': 'Potasio', 'valor': '2.1', 'unidad': 'mmol/L', 'rango_min': '3.5', 'rango_max': '5.1'},
+        {'nombre_examen': 'Cultivo', 'valor': 'Sin crecimiento'},
+    ]}, format='json')
+    assert r.status_code == 200
+    assert {x['nombre_examen']: x['estado_resultado'] for x in r.json()['resultados']} == {
+        'Creatinina': 'ALTO', 'Potasio': 'CRITICO', 'Cultivo': 'NORMAL',
+    }
+
+    creat = ResultadoLab.objects.get(orden=orden, codigo_examen='CREATININA')
+    assert (creat.valor_num, creat.rango_min_num, creat.rango_max_num, creat.unidad_codigo) == (1.8, 0.6, 1.3, 'MG/DL')
+    assert creat.paciente_id == paciente.pk and creat.fecha_resultado is not None
+    assert ResultadoLab.objects.get(orden=orden, codigo_examen='CULTIVO').valor_num is None
+
+
+def test_tendencia(cliente, paciente, usuario_medico, hospital):
+    otro = Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-L2', primer_nombre='Luis', primer_apellido='Otro',
+        tipo_documento='DPI', no_documento='0000000000006', fecha_nacimiento=datetime.date(1980, 1, 1), sexo='M',
+    )
+    ahora = timezone.now()
+    for dias, valor, pac, nombre in ((3, '1.1', paciente, 'Creatinina'), (1, '2.4', paciente, 'CREATININA'),
+                                     (2, '1.6', paciente, 'creatinina '), (1, '0.9', otro, 'Creatinina'),
+                                     (1, '140', paciente, 'Sodio')):
+        orden = _orden(pac, usuario_medico, estado='COMPLETADA')
+        ResultadoLab.objects.create(
+            orden=orden, hospital_id=hospital.pk, paciente=pac, nombre_examen=nombre, valor=valor,
+            unidad='mg/dL', codigo_examen=resultados.codigo_examen(nombre), valor_num=float(valor),
+            unidad_codigo='MG/DL', fecha_resultado=ahora - datetime.timedelta(days=dias),
+        )
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = cliente.get(f'{URL}tendencia/', {'paciente': paciente.pk, 'examen': 'Creatinína'})
+    assert r.status_code == 200
+    datos = r.json()
+    assert [p['valor'] for p in datos['puntos']] == [1.1, 1.6, 2.4]            # Cronológico
+    assert (datos['examen'], datos['unidades'], datos['maximo']) == ('CREATININA', ['MG/DL'], 2.4)
+    assert sum('LAB_RESULTADOS' in q['sql'] for q in ctx.captured_queries) == 1
+    assert not any('LAB_ORDENES' in q['sql'] for q in ctx.captured_queries)
+
+    desde = (ahora - datetime.timedelta(days=2)).date().isoformat()
+    r = cliente.get(f'{URL}tendencia/', {'paciente': paciente.pk, 'examen': 'creatinina', 'fecha_desde': desde})
+    assert [p['valor'] for p in r.json()['puntos']] == [1.6, 2.4]
+    assert cliente.get(f'{URL}tendencia/', {'examen': 'creatinina'}).status_code == 400
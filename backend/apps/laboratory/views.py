@@ -4,7 +4,7 @@ ViewSet: OrdenLabViewSet
 
 HIPAA: _audit_phi() registra cada acceso a datos PHI.
 RBAC:  IsPersonalClinico + SameHospitalOnly.
-VPD:   Filtro manual por hospital_id en DEV (Oracle VPD en PROD).
+VPD:   Filtro por hospital_id en DEV vía TenantManager (Oracle VPD en PROD).
 
 Máquina de estados:
   procesar : PENDIENTE  → EN_PROCESO  (toma de muestra, captura hora real)
@@ -14,15 +14,18 @@ Máquina de estados:
 
 import datetime
 
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.audit import audit_phi_for
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
-from apps.security.models import AuditoriaAcceso
 
+from . import resultados
 from .models import (
     OrdenLab,
     ResultadoLab,
@@ -40,25 +43,12 @@ from .serializers import (
     OrdenCancelarSerializer,
 )
 
-VPD_ENABLED = False
-
-
 # ============================================================
 # Helper: Auditoría HIPAA
 # ============================================================
-def _audit_phi(request, resource_id, accion, detalle=''):
-    try:
-        AuditoriaAcceso.objects.create(
-            usuario_id=request.user.pk,
-            hospital_id=getattr(request.user, 'hospital_id', 1),
-            tabla_accedida='LAB_ORDENES',
-            registro_id=resource_id,
-            accion=accion,
-            detalle=detalle,
-            ip_origen=request.META.get('REMOTE_ADDR', ''),
-        )
-    except Exception:
-        pass
+# Pipeline asíncrono por lotes (apps.core.audit)
+_audit_phi = audit_phi_for('laboratory', 'LAB_ORDENES', 'orden')
+_audit_resultados = audit_phi_for('laboratory', 'LAB_RESULTADOS', 'paciente')
 
 
 # ============================================================
@@ -72,27 +62,27 @@ class OrdenLabViewSet(viewsets.ModelViewSet):
       POST /{id}/procesar/  — PENDIENTE  → EN_PROCESO  (toma de muestra)
       POST /{id}/completar/ — EN_PROCESO → COMPLETADA  (ingreso de resultados)
       POST /{id}/cancelar/  — activos    → CANCELADA
+      GET  /tendencia/      — serie de un analito por paciente
     """
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     serializer_class   = OrdenLabListSerializer
 
     # --------------------------------------------------------
-    # QuerySet con VPD manual + filtros
+    # QuerySet con filtro de hospital (TenantManager) + filtros
     # --------------------------------------------------------
     def get_queryset(self):
-        user   = self.request.user
-        rol    = getattr(user, 'rol_codigo', '')
         params = self.request.query_params
 
-        qs = OrdenLab.objects.filter(activo=True).select_related(
-            'paciente', 'medico_solic', 'laboratorista',
+        # Resultados activos por orden en la misma consulta (total_resultados)
+        resultados = (
+            ResultadoLab.objects.filter(orden=OuterRef('pk'), activo=True)
+            .order_by().values('orden').annotate(n=Count('pk')).values('n')
         )
 
-        # VPD manual (DEV)
-        if not VPD_ENABLED and rol != 'SUPER_ADMIN':
-            hospital_id = getattr(user, 'hospital_id', None)
-            if hospital_id:
-                qs = qs.filter(hospital_id=hospital_id)
+        # Filtro de hospital: TenantManager
+        qs = OrdenLab.objects.activos().select_related(
+            'paciente', 'medico_solic', 'laboratorista',
+        ).annotate(n_resultados=Coalesce(Subquery(resultados), 0))
 
         # --- Filtros dinámicos ---
         if params.get('estado'):
@@ -137,7 +127,7 @@ class OrdenLabViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         _audit_phi(
-            request, instance.lab_id, 'READ_DETAIL',
+            request, 'READ_DETAIL', instance.lab_id,
             f'Orden LAB-{instance.lab_id} — Paciente {instance.paciente_id}',
         )
         serializer = OrdenLabDetailSerializer(instance, context={'request': request})
@@ -187,7 +177,7 @@ class OrdenLabViewSet(viewsets.ModelViewSet):
         orden.save()
 
         _audit_phi(
-            request, orden.lab_id, 'LAB_PROCESO',
+            request, 'LAB_PROCESO', orden.lab_id,
             f'Muestra tomada: {orden.examenes_solicitados[:80]}',
         )
         return Response(OrdenLabDetailSerializer(orden, context={'request': request}).data)
@@ -219,32 +209,47 @@ class OrdenLabViewSet(viewsets.ModelViewSet):
         orden.updated_by_id = request.user.pk
         orden.save()
 
-        # Crear ResultadoLab para cada examen
+        # Crear ResultadoLab para cada examen: columnas numéricas y estado
+        # calculados en el servidor sobre todo el panel (apps.laboratory.resultados)
         hospital_id = getattr(request.user, 'hospital_id', 1)
-        bulk = []
-        for res in d['resultados']:
-            bulk.append(ResultadoLab(
+        panel    = d['resultados']
+        columnas = resultados.parsear(panel)
+        estados  = resultados.clasificar(panel, columnas)
+        bulk = [
+            ResultadoLab(
                 orden_id         = orden.lab_id,
                 hospital_id      = hospital_id,
+                paciente_id      = orden.paciente_id,
+                fecha_resultado  = now,
                 nombre_examen    = res['nombre_examen'],
+                codigo_examen    = codigo,
                 valor            = res['valor'],
+                valor_num        = valor,
                 unidad           = res.get('unidad', ''),
+                unidad_codigo    = unidad,
                 rango_min        = res.get('rango_min', ''),
                 rango_max        = res.get('rango_max', ''),
+                rango_min_num    = bajo,
+                rango_max_num    = alto,
                 valor_referencia = res.get('valor_referencia', ''),
                 interpretacion   = res.get('interpretacion', ''),
-                estado_resultado = res.get('estado_resultado', 'NORMAL'),
+                estado_resultado = estado,
                 created_by_id    = request.user.pk,
-            ))
+            )
+            for res, codigo, unidad, valor, bajo, alto, estado in zip(
+                panel, columnas['codigo'], columnas['unidad'], columnas['valor'],
+                columnas['bajo'], columnas['alto'], estados,
+            )
+        ]
         ResultadoLab.objects.bulk_create(bulk)
 
         # Auditoría: marcar si hay resultados críticos
-        criticos = sum(1 for r in d['resultados'] if r.get('estado_resultado') == 'CRITICO')
+        criticos = estados.count('CRITICO')
         detalle  = f'Completada con {len(bulk)} resultados'
         if criticos:
             detalle += f' — {criticos} CRÍTICO(S)'
 
-        _audit_phi(request, orden.lab_id, 'LAB_COMPLETADA', detalle)
+        _audit_phi(request, 'LAB_COMPLETADA', orden.lab_id, detalle)
 
         # Reload para incluir resultados en la respuesta
         orden.refresh_from_db()
@@ -273,7 +278,77 @@ class OrdenLabViewSet(viewsets.ModelViewSet):
         orden.save()
 
         _audit_phi(
-            request, orden.lab_id, 'LAB_CANCELADA',
+            request, 'LAB_CANCELADA', orden.lab_id,
             f'Cancelada: {serializer.validated_data["motivo"][:80]}',
         )
         return Response(OrdenLabDetailSerializer(orden, context={'request': request}).data)
+
+    # ============================================================
+    # Tendencia de un analito
+    # ============================================================
+
+    @action(detail=False, methods=['get'])
+    def tendencia(self, request):
+        """
+        GET /api/v1/laboratory/tendencia/?paciente=12&examen=Creatinina&fecha_desde=&fecha_hasta=
+        Serie temporal de un analito del paciente (valores numéricos y
+        cualitativos), en orden cronológico, leída de LAB_RESULTADOS por
+        IDX_RES_TENDENCIA sin recorrer las órdenes. Devuelve como máximo los
+        LAB_TENDENCIA_MAX_PUNTOS resultados más recientes del rango.
+        """
+        params = request.query_params
+        codigo = resultados.codigo_examen(params.get('examen', ''))
+        try:
+            paciente_id = int(params['paciente'])
+            fecha_desde = datetime.date.fromisoformat(params['fecha_desde']) if params.get('fecha_desde') else None
+            fecha_hasta = datetime.date.fromisoformat(params['fecha_hasta']) if params.get('fecha_hasta') else None
+        except (KeyError, ValueError):
+            return Response({'detail': 'Parámetros inválidos (paciente numérico, fechas ISO).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not codigo:
+            return Response({'detail': 'Debe indicar el examen.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = ResultadoLab.objects.activos().filter(
+            paciente_id=paciente_id, codigo_examen=codigo, fecha_resultado__isnull=False,
+        )
+        if fecha_desde:
+            qs = qs.filter(fecha_resultado__gte=timezone.make_aware(
+                datetime.datetime.combine(fecha_desde, datetime.time.min)))
+        if fecha_hasta:
+            qs = qs.filter(fecha_resultado__lt=timezone.make_aware(
+                datetime.datetime.combine(fecha_hasta + datetime.timedelta(days=1), datetime.time.min)))
+
+        limite = settings.LAB_TENDENCIA_MAX_PUNTOS
+        filas = list(
+            qs.order_by('-fecha_resultado', '-res_id')
+            .values('res_id', 'orden_id', 'fecha_resultado', 'valor', 'valor_num', 'unidad', 'unidad_codigo',
+                    'rango_min_num', 'rango_max_num', 'estado_resultado')[:limite + 1]
+        )
+        truncada = len(filas) > limite
+        puntos = [{
+            'fecha':       f['fecha_resultado'],
+            'orden':       f['orden_id'],
+            'resultado':   f['res_id'],
+            'valor':       f['valor_num'],
+            'valor_texto': f['valor'],
+            'unidad':      f['unidad'],
+            'rango_min':   f['rango_min_num'],
+            'rango_max':   f['rango_max_num'],
+            'estado':      f['estado_resultado'],
+        } for f in reversed(filas[:limite])]
+
+        _audit_resultados(
+            request, 'READ_TENDENCIA', paciente_id,
+            f'Tendencia {codigo} — Paciente {paciente_id} ({len(puntos)} resultados)',
+        )
+        numericos = [p['valor'] for p in puntos if p['valor'] is not None]
+        return Response({
+            'paciente':  paciente_id,
+            'examen':    codigo,
+            'unidades':  sorted({f['unidad_codigo'] for f in filas[:limite] if f['unidad_codigo']}),
+            'total':     len(puntos),
+            'truncada':  truncada,
+            'minimo':    min(numericos, default=None),
+            'maximo':    max(numericos, default=None),
+            'puntos':    puntos,
+        })
@@ -0,0 +1,115 @@
+"""
+HealthTech Solutions — Alerta temprana de deterioro (M10)
+Puntaje NEWS2 (Royal College of Physicians, 2017) de todos los pacientes
+encamados del hospital, para la estación de enfermería.
+
+  - Dos consultas: encamamientos activos (ENC_ENCAMAMIENTOS) y signos de
+    esos pacientes dentro de NEWS2_VENTANA_HORAS por IDX_ENF_SIG_PACIENTE;
+    de cada paciente se toma el valor más reciente de cada parámetro.
+  - Cálculo por columnas: un arreglo por parámetro para todos los pacientes
+    y una tabla de cortes por parámetro (bisect), en lugar de evaluar
+    paciente por paciente con if/elif.
+  - Conciencia (ACVPU) se aproxima con Glasgow: 15 = alerta, < 15 = 3 puntos.
+    ENF_SIGNOS_VITALES no registra O2 suplementario: se puntúa aire
+    ambiente (escala SpO2 1) y se informa en `supuestos`.
+  - Riesgo: ALTO >= 7, MEDIO 5–6, BAJO_MEDIO si algún parámetro vale 3,
+    BAJO en otro caso. Orden: puntaje, parámetro extremo, toma más antigua.
+"""
+
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.hospitalization.models import ESTADOS_ACTIVOS_ENC, Encamamiento
+from apps.nursing.models import SignoVital
+
+# Parámetro → (cortes superiores inclusivos, puntos por tramo)
+TABLAS = {
+    'frecuencia_respiratoria': ((8, 11, 20, 24),            (3, 1, 0, 2, 3)),
+    'saturacion_o2':           ((91, 93, 95),                (3, 2, 1, 0)),
+    'presion_sistolica':       ((90, 100, 110, 219),         (3, 2, 1, 0, 3)),
+    'frecuencia_cardiaca':     ((40, 50, 90, 110, 130),      (3, 1, 0, 1, 2, 3)),
+    'glasgow':                 ((14,),                       (3, 0)),
+    'temperatura':             ((35.0, 36.0, 38.0, 39.0),    (3, 1, 0, 1, 2)),
+}
+PARAMETROS = tuple(TABLAS)
+SUPUESTOS  = ['Sin registro de O2 suplementario: se puntúa aire ambiente (escala SpO2 1).',
+              'Conciencia ACVPU aproximada con Glasgow (< 15 = 3 puntos).']
+
+
+def puntuar(columna: list, parametro: str) -> list:
+    """Puntos NEWS2 de una columna de valores (None = sin dato)."""
+    cortes, puntos = TABLAS[parametro]
+    return [None if v is None else puntos[bisect_left(cortes, float(v))] for v in columna]
+
+
+def riesgo(total: int, maximo: int) -> str:
+    if total >= 7:
+        return 'ALTO'
+    if total >= 5:
+        return 'MEDIO'
+    return 'BAJO_MEDIO' if maximo >= 3 else 'BAJO'
+
+
+def _ultimos(hospital_id, pacientes, desde) -> dict:
+    """{paciente_id: {'ultima_toma': dt, parámetro: valor más reciente}}."""
+    filas = (
+        SignoVital.objects.sin_tenant()
+        .filter(hospital_id=hospital_id, paciente_id__in=pacientes, created_at__gte=desde)
+        .order_by('paciente_id', '-created_at', '-sig_id')
+        .values_list('paciente_id', 'created_at', *PARAMETROS)
+    )
+    ultimos = {}
+    for paciente_id, creado, *valores in filas:
+        actual = ultimos.setdefault(paciente_id, {'ultima_toma': creado})
+        for parametro, valor in zip(PARAMETROS, valores):
+            if valor is not None and parametro not in actual:
+                actual[parametro] = valor
+    return ultimos
+
+
+def deterioro(hospital_id: int, sala: str | None = None, ahora=None) -> list[dict]:
+    """Pacientes encamados con su NEWS2, del más grave al menos grave."""
+    ahora = ahora or timezone.now()
+    encamados = Encamamiento.objects.sin_tenant().del_hospital(hospital_id).activos().filter(
+        estado__in=ESTADOS_ACTIVOS_ENC,
+    )
+    if sala:
+        encamados = encamados.filter(cama__sala=sala)
+    encamados = list(encamados.values(
+        'enc_id', 'paciente_id', 'paciente__no_expediente', 'paciente__primer_nombre',
+        'paciente__primer_apellido', 'cama__numero_cama', 'cama__sala',
+    ))
+    if not encamados:
+        return []
+
+    ultimos = _ultimos(hospital_id, {e['paciente_id'] for e in encamados},
+                       ahora - timedelta(hours=settings.NEWS2_VENTANA_HORAS))
+    datos = [ultimos.get(e['paciente_id'], {}) for e in encamados]
+
+    # Una columna por parámetro para todos los pacientes
+    columnas = {p: puntuar([d.get(p) for d in datos], p) for p in PARAMETROS}
+    filas_puntos = list(zip(*columnas.values()))
+    totales = [sum(x for x in fila if x is not None) for fila in filas_puntos]
+    maximos = [max((x for x in fila if x is not None), default=0) for fila in filas_puntos]
+
+    lista, claves = [], []
+    for enc, dato, fila, total, maximo in zip(encamados, datos, filas_puntos, totales, maximos):
+        faltantes = [p for p, x in zip(PARAMETROS, fila) if x is None]
+        lista.append({
+            'encamamiento':        enc['enc_id'],
+            'paciente':            enc['paciente_id'],
+            'paciente_expediente': enc['paciente__no_expediente'],
+            'paciente_nombre':     f"{enc['paciente__primer_nombre']} {enc['paciente__primer_apellido']}",
+            'cama':                enc['cama__numero_cama'],
+            'sala':                enc['cama__sala'],
+            'puntaje':             total,
+            'riesgo':              riesgo(total, maximo) if len(faltantes) < len(PARAMETROS) else 'SIN_DATOS',
+            'componentes':         {p: x for p, x in zip(PARAMETROS, fila) if x is not None},
+            'faltantes':           faltantes,
+            'ultima_toma':         dato.get('ultima_toma'),
+        })
+        claves.append((-total, -maximo, dato.get('ultima_toma') or ahora))
+    return [fila for _, fila in sorted(zip(claves, lista), key=lambda par: par[0])]
@@ -10,6 +10,8 @@ Notas y signos vitales son registros de auditoría clínica (append-only).
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 TIPO_NOTA_CHOICES = [
     ('EVOLUCION',    'Evolución de Enfermería'),
@@ -87,6 +89,8 @@ class SignoVital(models.Model):
     )
     created_at  = models.DateTimeField(db_column='CREATED_AT', auto_now_add=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'ENF_SIGNOS_VITALES'
         verbose_name        = 'Signo Vital'
@@ -143,6 +147,8 @@ class NotaEnfermeria(models.Model):
     )
     created_at  = models.DateTimeField(db_column='CREATED_AT', auto_now_add=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'ENF_NOTAS'
         verbose_name        = 'Nota de Enfermería'
@@ -3,6 +3,7 @@ HealthTech Solutions — Serializers: Módulo Enfermería (M10)
 """
 
 from rest_framework import serializers
+from apps.core.serializers import NombreUsuarioField
 from .models import SignoVital, NotaEnfermeria
 
 
@@ -11,7 +12,7 @@ from .models import SignoVital, NotaEnfermeria
 # ============================================================
 
 class SignoVitalListSerializer(serializers.ModelSerializer):
-    enfermera    = serializers.SerializerMethodField()
+    enfermera    = NombreUsuarioField('created_by', vacio='Sistema', usar_username=True)
     presion_arterial = serializers.CharField(read_only=True)
     imc          = serializers.FloatField(read_only=True)
 
@@ -26,12 +27,6 @@ class SignoVitalListSerializer(serializers.ModelSerializer):
             'enfermera', 'created_at',
         ]
 
-    def get_enfermera(self, obj):
-        u = obj.created_by
-        if not u:
-            return 'Sistema'
-        return f'{u.primer_nombre} {u.primer_apellido}'.strip() or u.username
-
 
 class SignoVitalCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -87,7 +82,7 @@ class SignoVitalCreateSerializer(serializers.ModelSerializer):
 
 class NotaEnfermeriaListSerializer(serializers.ModelSerializer):
     tipo_nota_display = serializers.CharField(source='get_tipo_nota_display', read_only=True)
-    enfermera         = serializers.SerializerMethodField()
+    enfermera         = NombreUsuarioField('created_by', vacio='Sistema', usar_username=True)
 
     class Meta:
         model  = NotaEnfermeria
@@ -98,12 +93,6 @@ class NotaEnfermeriaListSerializer(serializers.ModelSerializer):
             'enfermera', 'created_at',
         ]
 
-    def get_enfermera(self, obj):
-        u = obj.created_by
-        if not u:
-            return 'Sistema'
-        return f'{u.primer_nombre} {u.primer_apellido}'.strip() or u.username
-
 
 class NotaEnfermeriaCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,72 @@
+"""
+HealthTech Solutions — Series de signos vitales (M10)
+Un paciente de UCI acumula miles de filas en ENF_SIGNOS_VITALES; graficar
+una semana paginando GET /signos-vitales/ (más reciente primero) traía
+todas las filas al cliente.
+
+  - Una consulta por rango, solo las columnas pedidas, por
+    IDX_ENF_SIG_PACIENTE (HOSPITAL_ID, PAC_ID, CREATED_AT) o
+    IDX_ENF_SIG_ENC_FECHA (HOSPITAL_ID, ENC_ID, CREATED_AT).
+  - Respuesta columnar: por signo, arreglos paralelos t[] y v[] (sin nulos).
+  - Reducción en el servidor con LTTB (Largest-Triangle-Three-Buckets) al
+    número de puntos pedido: conserva picos y valles visibles en la gráfica,
+    a diferencia de un promedio por ventana. O(n) por signo.
+"""
+
+from django.conf import settings
+
+from apps.nursing.models import SignoVital
+
+# Signos numéricos graficables
+SIGNOS_SERIE = (
+    'temperatura', 'presion_sistolica', 'presion_diastolica', 'frecuencia_cardiaca',
+    'frecuencia_respiratoria', 'saturacion_o2', 'glucemia', 'glasgow', 'peso',
+)
+
+
+def lttb(xs: list, ys: list, puntos: int) -> list[int]:
+    """Índices de los `puntos` elementos elegidos por LTTB (incluye primero y último)."""
+    n = len(xs)
+    if puntos >= n or puntos < 3:
+        return list(range(n))
+    cubo = (n - 2) / (puntos - 2)
+    elegidos, a = [0], 0
+    for i in range(puntos - 2):
+        ini, fin = int(i * cubo) + 1, int((i + 1) * cubo) + 1
+        sig_ini, sig_fin = fin, min(int((i + 2) * cubo) + 1, n)
+        # Vértice C: promedio del cubo siguiente (el último punto al final)
+        cx = sum(xs[sig_ini:sig_fin]) / (sig_fin - sig_ini)
+        cy = sum(ys[sig_ini:sig_fin]) / (sig_fin - sig_ini)
+        ax, ay = xs[a], ys[a]
+        # Punto del cubo que forma el triángulo de mayor área con A y C
+        a = max(range(ini, fin), key=lambda j: abs((ax - cx) * (ys[j] - ay) - (ax - xs[j]) * (cy - ay)))
+        elegidos.append(a)
+    elegidos.append(n - 1)
+    return elegidos
+
+
+def serie(hospital_id: int, desde, hasta, puntos: int, signos=SIGNOS_SERIE,
+          paciente_id: int | None = None, encamamiento_id: int | None = None) -> dict:
+    """{signo: {'t': [...], 'v': [...], 'total': n}} de [desde, hasta], reducido a `puntos` por signo."""
+    qs = SignoVital.objects.sin_tenant().filter(hospital_id=hospital_id, created_at__gte=desde, created_at__lt=hasta)
+    if encamamiento_id is not None:
+        qs = qs.filter(encamamiento_id=encamamiento_id)
+    if paciente_id is not None:
+        qs = qs.filter(paciente_id=paciente_id)
+    filas = list(qs.order_by('created_at', 'sig_id').values_list('created_at', *signos)[:settings.SIGNOS_SERIE_FILAS_MAX])
+
+    resultado = {}
+    for col, signo in enumerate(signos, start=1):
+        tiempos, valores = [], []
+        for fila in filas:
+            if fila[col] is not None:
+                tiempos.append(fila[0])
+                valores.append(float(fila[col]))
+        xs = [t.timestamp() for t in tiempos]
+        indices = lttb(xs, valores, puntos)
+        resultado[signo] = {
+            'total': len(valores),
+            't':     [tiempos[i] for i in indices],
+            'v':     [valores[i] for i in indices],
+        }
+    return {'filas': len(filas), 'truncada': len(filas) == settings.SIGNOS_SERIE_FILAS_MAX, 'signos': resultado}
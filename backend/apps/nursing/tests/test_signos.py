@@ -0,0 +1,101 @@
+"""
+HealthTech Solutions — Tests: Series de signos y NEWS2 (apps/nursing/series.py, alerta_temprana.py)
+Cobertura:
+  - LTTB: conserva extremos y el número de puntos pedido
+  - GET /serie/: arreglos columnares por signo, reducidos, en una consulta
+  - GET /deterioro/: NEWS2 por columnas sobre los encamados, más grave primero
+"""
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.hospitalization.models import Cama, Encamamiento
+from apps.nursing.models import SignoVital
+from apps.nursing.series import lttb
+from apps.patients.models import Paciente
+
+URL = '/api/v1/nursing/signos-vitales/'
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+def _encamado(hospital, medico, n, estado='EN_TRATAMIENTO'):
+    paciente = Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente=f'EXP-N{n}', primer_nombre=f'Paciente{n}', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento=f'00000000001{n:02d}', fecha_nacimiento=datetime.date(1970, 1, 1), sexo='F',
+    )
+    cama = Cama.objects.create(hospital_id=hospital.pk, numero_cama=f'N-{n}', piso='3', sala='Medicina',
+                               tipo_cama='GENERAL', estado='OCUPADA')
+    return Encamamiento.objects.create(
+        hospital_id=hospital.pk, paciente=paciente, cama=cama, medico=medico, estado=estado,
+        fecha_ingreso=datetime.date.today(), hora_ingreso=datetime.time(8), motivo_ingreso='Neumonía',
+    )
+
+
+def _signo(enc, hace_horas, **valores):
+    signo = SignoVital.objects.create(hospital_id=enc.hospital_id, paciente_id=enc.paciente_id,
+                                      encamamiento=enc, **valores)
+    SignoVital.objects.filter(pk=signo.pk).update(created_at=timezone.now() - datetime.timedelta(hours=hace_horas))
+
+
+def test_lttb_conserva_extremos():
+    xs = list(range(1000))
+    ys = [0.0] * 1000
+    ys[137], ys[612] = 50.0, -40.0                           # Picos aislados
+    indices = lttb(xs, ys, 20)
+    assert len(indices) == 20 and indices[0] == 0 and indices[-1] == 999
+    assert 137 in indices and 612 in indices
+    assert lttb(xs[:10], ys[:10], 20) == list(range(10))     # Menos filas que puntos: sin reducir
+
+
+def test_serie_columnar_reducida(cliente, hospital, usuario_medico):
+    enc = _encamado(hospital, usuario_medico, 1)
+    for i in range(120):
+        _signo(enc, i * 0.5, frecuencia_cardiaca=80 + (i % 7), saturacion_o2=95 if i % 2 else None)
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = cliente.get(f'{URL}serie/', {'encamamiento': enc.pk, 'puntos': 25,
+                                         'signos': 'frecuencia_cardiaca,saturacion_o2'})
+    assert r.status_code == 200
+    datos = r.json()
+    fc, sat = datos['signos']['frecuencia_cardiaca'], datos['signos']['saturacion_o2']
+    assert datos['filas'] == 120 and fc['total'] == 120 and sat['total'] == 60
+    assert len(fc['t']) == len(fc['v']) == 25 and len(sat['v']) == 25
+    assert fc['t'] == sorted(fc['t'])                                  # Cronológico
+    assert sum('ENF_SIGNOS_VITALES' in q['sql'] for q in ctx.captured_queries) == 1
+
+    assert cliente.get(f'{URL}serie/', {'puntos': 25}).status_code == 400
+    assert cliente.get(f'{URL}serie/', {'paciente': enc.paciente_id, 'signos': 'observaciones'}).status_code == 400
+
+
+def test_deterioro_ordenado_por_news2(cliente, hospital, usuario_medico):
+    estable  = _encamado(hospital, usuario_medico, 1)
+    grave    = _encamado(hospital, usuario_medico, 2)
+    un_tres  = _encamado(hospital, usuario_medico, 3)
+    sin_toma = _encamado(hospital, usuario_medico, 4)
+    egresado = _encamado(hospital, usuario_medico, 5, estado='EGRESADO')
+    normales = dict(frecuencia_respiratoria=16, saturacion_o2=98, presion_sistolica=120,
+                    frecuencia_cardiaca=75, glasgow=15, temperatura=36.8)
+    _signo(estable, 2, **normales)
+    _signo(grave, 6, **normales)
+    # Más reciente: FR 26 (3), SpO2 92 (2), PAS 95 (2), FC 115 (2); temperatura de la toma anterior
+    _signo(grave, 1, frecuencia_respiratoria=26, saturacion_o2=92, presion_sistolica=95, frecuencia_cardiaca=115)
+    _signo(un_tres, 1, **{**normales, 'glasgow': 13})
+    _signo(sin_toma, 30, **normales)                                   # Fuera de la ventana de 24 h
+    _signo(egresado, 1, frecuencia_respiratoria=30)
+
+    r = cliente.get(f'{URL}deterioro/')
+    assert r.status_code == 200
+    pacientes = r.json()['pacientes']
+    assert [p['encamamiento'] for p in pacientes] == [grave.pk, un_tres.pk, estable.pk, sin_toma.pk]
+    assert (pacientes[0]['puntaje'], pacientes[0]['riesgo']) == (9, 'ALTO')
+    assert pacientes[0]['componentes']['temperatura'] == 0
+    assert (pacientes[1]['puntaje'], pacientes[1]['riesgo']) == (3, 'BAJO_MEDIO')
+    assert pacientes[2]['riesgo'] == 'BAJO' and pacientes[3]['riesgo'] == 'SIN_DATOS'
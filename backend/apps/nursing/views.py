@@ -2,14 +2,20 @@
 HealthTech Solutions — Views: Módulo Enfermería (M10)
 """
 
+import datetime
+
 from django.conf import settings
+from django.utils import timezone
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
 
+from . import alerta_temprana, series
 from .models import SignoVital, NotaEnfermeria
 from .serializers import (
     SignoVitalListSerializer, SignoVitalCreateSerializer,
@@ -22,6 +28,10 @@ class SignoVitalViewSet(viewsets.ModelViewSet):
     Registro de signos vitales por enfermería.
     Endpoint: /api/v1/nursing/signos-vitales/
     Append-only: no se permite PUT/PATCH/DELETE.
+
+    Endpoints adicionales:
+      GET /serie/     — series columnares reducidas (LTTB) para graficar
+      GET /deterioro/ — pacientes encamados ordenados por NEWS2
     """
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     filter_backends    = [SearchFilter, OrderingFilter, DjangoFilterBackend]
@@ -30,14 +40,12 @@ class SignoVitalViewSet(viewsets.ModelViewSet):
     filterset_fields   = ['paciente', 'encamamiento']
     ordering_fields    = ['created_at']
     ordering           = ['-created_at']
+    pagination_class   = KeysetPagination
     http_method_names  = ['get', 'post', 'head', 'options']  # Append-only
 
     def get_queryset(self):
-        user = self.request.user
-        qs   = SignoVital.objects.select_related('paciente', 'created_by')
-        if not settings.VPD_ENABLED and getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-            qs = qs.filter(hospital_id=user.hospital_id)
-        return qs
+        # Filtro de hospital: TenantManager
+        return SignoVital.objects.select_related('paciente', 'created_by')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -53,6 +61,77 @@ class SignoVitalViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @action(detail=False, methods=['get'])
+    def serie(self, request):
+        """
+        GET /api/v1/nursing/signos-vitales/serie/?paciente=|encamamiento=&desde=&hasta=&puntos=300&signos=
+        Series columnares por signo (t[], v[]) de [desde, hasta], reducidas
+        con LTTB a `puntos` por signo. Por defecto los últimos
+        SIGNOS_SERIE_DIAS_DEFECTO días y todos los signos numéricos.
+        """
+        params = request.query_params
+        signos = [s for s in params.get('signos', '').split(',') if s] or list(series.SIGNOS_SERIE)
+        try:
+            paciente_id     = int(params['paciente']) if params.get('paciente') else None
+            encamamiento_id = int(params['encamamiento']) if params.get('encamamiento') else None
+            hasta = datetime.datetime.fromisoformat(params['hasta']) if params.get('hasta') else timezone.now()
+            desde = (datetime.datetime.fromisoformat(params['desde']) if params.get('desde')
+                     else hasta - datetime.timedelta(days=settings.SIGNOS_SERIE_DIAS_DEFECTO))
+            puntos = int(params.get('puntos', settings.SIGNOS_SERIE_PUNTOS))
+        except ValueError:
+            return Response({'detail': 'Parámetros inválidos (ids y puntos numéricos, fechas ISO).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if paciente_id is None and encamamiento_id is None:
+            return Response({'detail': 'Indique paciente o encamamiento.'}, status=status.HTTP_400_BAD_REQUEST)
+        if set(signos) - set(series.SIGNOS_SERIE):
+            return Response({'detail': f'Signos válidos: {", ".join(series.SIGNOS_SERIE)}.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not 3 <= puntos <= settings.SIGNOS_SERIE_PUNTOS_MAX:
+            return Response({'detail': f'puntos debe estar entre 3 y {settings.SIGNOS_SERIE_PUNTOS_MAX}.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        desde, hasta = (timezone.make_aware(d) if timezone.is_naive(d) else d for d in (desde, hasta))
+        if hasta <= desde or hasta - desde > datetime.timedelta(days=settings.SIGNOS_SERIE_DIAS_MAX):
+            return Response({'detail': f'Rango inválido (máximo {settings.SIGNOS_SERIE_DIAS_MAX} días).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        datos = series.serie(request.user.hospital_id, desde, hasta, puntos, signos,
+                             paciente_id=paciente_id, encamamiento_id=encamamiento_id)
+        return Response({
+            'paciente':     paciente_id,
+            'encamamiento': encamamiento_id,
+            'desde':        desde,
+            'hasta':        hasta,
+            'puntos':       puntos,
+            'metodo':       'LTTB',
+            **datos,
+        })
+
+    @action(detail=False, methods=['get'])
+    def deterioro(self, request):
+        """
+        GET /api/v1/nursing/signos-vitales/deterioro/?sala=
+        Pacientes encamados ordenados por NEWS2 (más grave primero), con el
+        puntaje por parámetro y los parámetros sin toma en la ventana.
+        SUPER_ADMIN puede indicar ?hospital_id=.
+        """
+        hospital_id = request.user.hospital_id
+        if request.user.rol_codigo == 'SUPER_ADMIN' and request.query_params.get('hospital_id'):
+            try:
+                hospital_id = int(request.query_params['hospital_id'])
+            except ValueError:
+                return Response({'detail': 'hospital_id inválido.'}, status=status.HTTP_400_BAD_REQUEST)
+        if hospital_id is None:
+            return Response({'detail': 'Indique hospital_id.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        pacientes = alerta_temprana.deterioro(hospital_id, sala=request.query_params.get('sala'))
+        return Response({
+            'generado':      timezone.now(),
+            'ventana_horas': settings.NEWS2_VENTANA_HORAS,
+            'supuestos':     alerta_temprana.SUPUESTOS,
+            'total':         len(pacientes),
+            'pacientes':     pacientes,
+        })
+
 
 class NotaEnfermeriaViewSet(viewsets.ModelViewSet):
     """
@@ -70,11 +149,8 @@ class NotaEnfermeriaViewSet(viewsets.ModelViewSet):
     http_method_names  = ['get', 'post', 'head', 'options']  # Append-only
 
     def get_queryset(self):
-        user = self.request.user
-        qs   = NotaEnfermeria.objects.select_related('paciente', 'created_by')
-        if not settings.VPD_ENABLED and getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-            qs = qs.filter(hospital_id=user.hospital_id)
-        return qs
+        # Filtro de hospital: TenantManager
+        return NotaEnfermeria.objects.select_related('paciente', 'created_by')
 
     def get_serializer_class(self):
         if self.action == 'create':
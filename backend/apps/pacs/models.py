@@ -10,6 +10,8 @@ Soft-delete: columna ACTIVO.
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 MODALIDAD_CHOICES = [
     ('XRAY',           'Rayos X'),
@@ -148,6 +150,8 @@ class EstudioImagen(models.Model):
     )
     updated_at          = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'IMG_ESTUDIOS'
         verbose_name        = 'Estudio de Imagen'
@@ -5,6 +5,7 @@ DetailSerializer devuelve ficha completa.
 """
 
 from rest_framework import serializers
+from apps.core.serializers import NombreUsuarioField
 from .models import EstudioImagen
 
 
@@ -12,7 +13,7 @@ class EstudioListSerializer(serializers.ModelSerializer):
     """Serializer ligero para listas — data-minimization HIPAA."""
     paciente_nombre    = serializers.SerializerMethodField()
     paciente_expediente = serializers.SerializerMethodField()
-    medico_nombre      = serializers.SerializerMethodField()
+    medico_nombre      = NombreUsuarioField('medico_sol', prefijo='Dr. ')
     modalidad_display  = serializers.CharField(source='get_modalidad_display',  read_only=True)
     estado_display     = serializers.CharField(source='get_estado_display',     read_only=True)
     prioridad_display  = serializers.CharField(source='get_prioridad_display',  read_only=True)
@@ -37,18 +38,14 @@ class EstudioListSerializer(serializers.ModelSerializer):
     def get_paciente_expediente(self, obj):
         return obj.paciente.no_expediente if obj.paciente else None
 
-    def get_medico_nombre(self, obj):
-        m = obj.medico_sol
-        return f'Dr. {m.primer_nombre} {m.primer_apellido}' if m else None
-
 
 class EstudioDetailSerializer(serializers.ModelSerializer):
     """Serializer completo para la vista de detalle."""
     paciente_nombre     = serializers.SerializerMethodField()
     paciente_expediente  = serializers.SerializerMethodField()
-    medico_nombre        = serializers.SerializerMethodField()
-    tecnico_nombre       = serializers.SerializerMethodField()
-    radiologo_nombre     = serializers.SerializerMethodField()
+    medico_nombre        = NombreUsuarioField('medico_sol', prefijo='Dr. ')
+    tecnico_nombre       = NombreUsuarioField('tecnico')
+    radiologo_nombre     = NombreUsuarioField('radiologo', prefijo='Dr. ')
     modalidad_display    = serializers.CharField(source='get_modalidad_display',       read_only=True)
     estado_display       = serializers.CharField(source='get_estado_display',          read_only=True)
     prioridad_display    = serializers.CharField(source='get_prioridad_display',       read_only=True)
@@ -78,18 +75,6 @@ class EstudioDetailSerializer(serializers.ModelSerializer):
     def get_paciente_expediente(self, obj):
         return obj.paciente.no_expediente if obj.paciente else None
 
-    def get_medico_nombre(self, obj):
-        m = obj.medico_sol
-        return f'Dr. {m.primer_nombre} {m.primer_apellido}' if m else None
-
-    def get_tecnico_nombre(self, obj):
-        t = obj.tecnico
-        return f'{t.primer_nombre} {t.primer_apellido}' if t else None
-
-    def get_radiologo_nombre(self, obj):
-        r = obj.radiologo
-        return f'Dr. {r.primer_nombre} {r.primer_apellido}' if r else None
-
 
 class EstudioCreateSerializer(serializers.ModelSerializer):
     """Serializer para creación y edición de estudios."""
@@ -3,7 +3,6 @@ HealthTech Solutions — Views: PACS Module (Imagen Médica)
 Endpoint: /api/v1/imaging/estudios/
 """
 
-from django.conf import settings
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -39,13 +38,10 @@ class EstudioImagenViewSet(viewsets.ModelViewSet):
     ordering           = ['-fecha_solicitud']
 
     def get_queryset(self):
-        user = self.request.user
-        qs   = EstudioImagen.objects.select_related(
+        # Filtro de hospital: TenantManager
+        return EstudioImagen.objects.activos().select_related(
             'paciente', 'medico_sol', 'tecnico', 'radiologo',
-        ).filter(activo=True)
-        if not settings.VPD_ENABLED and getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-            qs = qs.filter(hospital_id=user.hospital_id)
-        return qs
+        )
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -0,0 +1,111 @@
+"""
+manage.py bench_expedientes
+===========================
+Benchmark de concurrencia del generador de expedientes
+(apps.patients.utils.generar_no_expediente).
+
+Lanza N hilos que generan expedientes en paralelo para el mismo hospital
+(cada hilo con su propia conexión, como workers de gunicorn) y verifica:
+  - Sin duplicados: todos los números emitidos son distintos.
+  - Sin convoy de bloqueos: la latencia p95/máx. se mantiene acotada y no
+    crece con el número de hilos (el bloqueo del contador dura una sentencia).
+
+Falla (exit 1) si hay duplicados o errores. Usar contra Oracle (DEV/Staging);
+SQLite serializa escrituras a nivel de archivo y no es representativo.
+
+Uso:
+    python manage.py bench_expedientes
+    python manage.py bench_expedientes --hilos 32 --registros 20 --bloque 10
+"""
+
+import statistics
+import threading
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.patients.models import ContadorExpediente
+from apps.patients.utils import MAX_CORRELATIVO, generar_no_expediente
+
+
+class Command(BaseCommand):
+    help = 'Benchmark: N registros concurrentes sin expedientes duplicados ni convoy de bloqueos.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=16, help='Hilos concurrentes (default 16).')
+        parser.add_argument('--registros', type=int, default=25, help='Expedientes por hilo (default 25).')
+        parser.add_argument('--hospital', type=int, default=999_999,
+                            help='hospital_id de prueba (default 999999, no colisiona con datos reales).')
+        parser.add_argument('--bloque', type=int, default=None,
+                            help='Sobrescribe EXPEDIENTE_BLOQUE para la corrida.')
+
+    def handle(self, *args, **options):
+        hilos       = options['hilos']
+        registros   = options['registros']
+        hospital_id = options['hospital']
+        total       = hilos * registros
+
+        if total > MAX_CORRELATIVO:
+            raise CommandError(f'hilos × registros = {total} supera el límite diario ({MAX_CORRELATIVO}).')
+        if options['bloque'] is not None:
+            settings.EXPEDIENTE_BLOQUE = options['bloque']
+
+        hoy = date.today()
+        ContadorExpediente.objects.filter(hospital_id=hospital_id, fecha=hoy).delete()
+
+        emitidos, latencias, errores = [], [], []
+        lock    = threading.Lock()
+        barrera = threading.Barrier(hilos)
+
+        def worker():
+            locales, tiempos = [], []
+            try:
+                barrera.wait()
+                for _ in range(registros):
+                    inicio = time.perf_counter()
+                    locales.append(generar_no_expediente(hospital_id))
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+            except Exception as exc:
+                with lock:
+                    errores.append(str(exc))
+            finally:
+                connection.close()
+                with lock:
+                    emitidos.extend(locales)
+                    latencias.extend(tiempos)
+
+        self.stdout.write(
+            f'Generando {total} expedientes: {hilos} hilos × {registros} '
+            f'(EXPEDIENTE_BLOQUE={settings.EXPEDIENTE_BLOQUE}, vendor={connection.vendor})…'
+        )
+        inicio = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(hilos)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracion = time.perf_counter() - inicio
+
+        ContadorExpediente.objects.filter(hospital_id=hospital_id, fecha=hoy).delete()
+
+        duplicados = len(emitidos) - len(set(emitidos))
+        if latencias:
+            ordenadas = sorted(latencias)
+            p95 = ordenadas[max(0, int(len(ordenadas) * 0.95) - 1)]
+            self.stdout.write(
+                f'  emitidos:      {len(emitidos)} / {total}\n'
+                f'  duplicados:    {duplicados}\n'
+                f'  throughput:    {len(emitidos) / duracion:.1f} expedientes/s\n'
+                f'  latencia p50:  {statistics.median(latencias):.2f} ms\n'
+                f'  latencia p95:  {p95:.2f} ms\n'
+                f'  latencia máx.: {ordenadas[-1]:.2f} ms'
+            )
+
+        if errores:
+            raise CommandError(f'{len(errores)} errores: {errores[0]}')
+        if duplicados or len(emitidos) != total:
+            raise CommandError('Se detectaron expedientes duplicados o faltantes.')
+        self.stdout.write(self.style.SUCCESS('OK — sin duplicados.'))
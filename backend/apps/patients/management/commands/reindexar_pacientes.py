@@ -0,0 +1,41 @@
+"""
+manage.py reindexar_pacientes
+=============================
+Reconstruye el índice de búsqueda de pacientes (apps.patients.search) para
+la carga inicial o tras cargas masivas que no pasan por save()
+(bulk_create, queryset.update, imports SQL*Loader).
+
+Uso:
+    python manage.py reindexar_pacientes
+    python manage.py reindexar_pacientes --hospital 3 --lote 1000
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.patients.models import Paciente
+from apps.patients.search import get_search_engine
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de pacientes (PAC_BUSQUEDA / PAC_BUSQUEDA_TERMINOS).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hospital', type=int, help='Solo pacientes de este hospital_id.')
+        parser.add_argument('--lote', type=int, default=500, help='Filas por fetch (default 500).')
+
+    def handle(self, *args, **options):
+        engine = get_search_engine()
+        qs = Paciente.objects.order_by('pac_id')
+        if options['hospital']:
+            qs = qs.filter(hospital_id=options['hospital'])
+
+        total = 0
+        for paciente in qs.iterator(chunk_size=options['lote']):
+            engine.indexar(paciente)
+            total += 1
+            if total % options['lote'] == 0:
+                self.stdout.write(f'  {total} pacientes indexados…')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Índice de búsqueda reconstruido: {total} pacientes ({type(engine).__name__}).'
+        ))
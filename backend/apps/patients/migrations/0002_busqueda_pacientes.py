@@ -0,0 +1,46 @@
+# Generated by Django 5.0.6 on 2026-10-18 12:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PacienteBusqueda',
+            fields=[
+                ('paciente', models.OneToOneField(db_column='PAC_ID', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='busqueda', serialize=False, to='patients.paciente')),
+                ('hospital_id', models.IntegerField(db_column='HOSPITAL_ID')),
+                ('documento', models.CharField(db_column='DOCUMENTO', max_length=4000)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='UPDATED_AT')),
+            ],
+            options={
+                'verbose_name': 'Documento de búsqueda',
+                'verbose_name_plural': 'Documentos de búsqueda',
+                'db_table': 'PAC_BUSQUEDA',
+                'indexes': [],
+            },
+        ),
+        migrations.CreateModel(
+            name='PacienteTermino',
+            fields=[
+                ('termino_id', models.AutoField(db_column='TERMINO_ID', primary_key=True, serialize=False)),
+                ('hospital_id', models.IntegerField(db_column='HOSPITAL_ID')),
+                ('tipo', models.CharField(choices=[('ID', 'Identificador (expediente / documento / teléfono)'), ('NOM', 'Token de nombre normalizado'), ('FON', 'Clave fonética'), ('TRI', 'Trigrama')], db_column='TIPO', max_length=3)),
+                ('termino', models.CharField(db_column='TERMINO', max_length=100)),
+                ('peso', models.PositiveSmallIntegerField(db_column='PESO', default=1)),
+                ('paciente', models.ForeignKey(db_column='PAC_ID', on_delete=django.db.models.deletion.CASCADE, related_name='terminos_busqueda', to='patients.paciente')),
+            ],
+            options={
+                'verbose_name': 'Término de búsqueda',
+                'verbose_name_plural': 'Términos de búsqueda',
+                'db_table': 'PAC_BUSQUEDA_TERMINOS',
+                'indexes': [],
+            },
+        ),
+    ]
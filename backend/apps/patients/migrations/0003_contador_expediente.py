@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0002_busqueda_pacientes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorExpediente',
+            fields=[
+                ('contador_id', models.AutoField(db_column='CONTADOR_ID', primary_key=True, serialize=False)),
+                ('hospital_id', models.IntegerField(db_column='HOSPITAL_ID')),
+                ('fecha', models.DateField(db_column='FECHA')),
+                ('ultimo', models.IntegerField(db_column='ULTIMO', default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_column='UPDATED_AT')),
+            ],
+            options={
+                'verbose_name': 'Contador de expedientes',
+                'verbose_name_plural': 'Contadores de expedientes',
+                'db_table': 'PAC_EXPEDIENTE_CONTADORES',
+                'indexes': [],
+                'unique_together': {('hospital_id', 'fecha')},
+            },
+        ),
+    ]
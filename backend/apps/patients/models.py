@@ -15,6 +15,8 @@ Convenciones Oracle 19c:
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 # ============================================================
 # Catálogos / choices
@@ -149,6 +151,8 @@ class Paciente(models.Model):
     )
     updated_at           = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table      = 'PAC_PACIENTES'
         verbose_name  = 'Paciente'
@@ -172,6 +176,32 @@ class Paciente(models.Model):
         return ' '.join(p for p in partes if p).strip()
 
 
+# ============================================================
+# CONTADOR DE EXPEDIENTES — correlativo diario por hospital
+# ============================================================
+class ContadorExpediente(models.Model):
+    """
+    Último correlativo de expediente asignado por (hospital, día).
+    Se incrementa con un único UPDATE … RETURNING (apps.patients.utils):
+    el bloqueo de fila dura solo esa sentencia, no el registro completo.
+    """
+    contador_id = models.AutoField(db_column='CONTADOR_ID', primary_key=True)
+    hospital_id = models.IntegerField(db_column='HOSPITAL_ID')
+    fecha       = models.DateField(db_column='FECHA')
+    ultimo      = models.IntegerField(db_column='ULTIMO', default=0)
+    updated_at  = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
+
+    class Meta:
+        db_table        = 'PAC_EXPEDIENTE_CONTADORES'
+        verbose_name    = 'Contador de expedientes'
+        verbose_name_plural = 'Contadores de expedientes'
+        unique_together = [['hospital_id', 'fecha']]
+        indexes         = []
+
+    def __str__(self):
+        return f'Hospital {self.hospital_id} — {self.fecha}: {self.ultimo}'
+
+
 # ============================================================
 # ALERGIA — Catálogo de alergias del paciente (PHI)
 # ============================================================
@@ -203,6 +233,8 @@ class Alergia(models.Model):
 
     SEVERIDAD_ORDEN = {'ANAFILACTICA': 0, 'SEVERA': 1, 'MODERADA': 2, 'LEVE': 3}
 
+    objects = TenantManager()
+
     class Meta:
         db_table     = 'PAC_ALERGIAS'
         verbose_name = 'Alergia'
@@ -235,6 +267,8 @@ class ContactoEmergencia(models.Model):
     created_at      = models.DateTimeField(db_column='CREATED_AT', auto_now_add=True)
     updated_at      = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table     = 'PAC_CONTACTOS_EMERGENCIA'
         verbose_name = 'Contacto de Emergencia'
@@ -279,6 +313,8 @@ class HistorialClinico(models.Model):
     )
     updated_at        = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table     = 'PAC_HISTORIAL_CLINICO'
         verbose_name = 'Historial Clinico'
@@ -288,3 +324,64 @@ class HistorialClinico(models.Model):
 
     def __str__(self):
         return f'[{self.get_tipo_entrada_display()}] {self.titulo} ({self.fecha_evento})'
+
+
+# ============================================================
+# ÍNDICE DE BÚSQUEDA DE PACIENTES (apps.patients.search)
+# Mantenido por signals.py en cada save() de Paciente.
+# ============================================================
+TIPO_TERMINO_CHOICES = [
+    ('ID',  'Identificador (expediente / documento / teléfono)'),
+    ('NOM', 'Token de nombre normalizado'),
+    ('FON', 'Clave fonética'),
+    ('TRI', 'Trigrama'),
+]
+
+
+class PacienteBusqueda(models.Model):
+    """
+    Documento de búsqueda por paciente (motor Oracle Text).
+    DOCUMENTO lleva tokens normalizados, claves fonéticas e identificadores;
+    el índice CONTEXT IDX_PAC_BUSQUEDA_CTX se sincroniza ON COMMIT.
+    """
+    paciente    = models.OneToOneField(
+        Paciente, db_column='PAC_ID', primary_key=True,
+        on_delete=models.CASCADE, related_name='busqueda',
+    )
+    hospital_id = models.IntegerField(db_column='HOSPITAL_ID')
+    documento   = models.CharField(db_column='DOCUMENTO', max_length=4000)
+    updated_at  = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
+
+    class Meta:
+        db_table     = 'PAC_BUSQUEDA'
+        verbose_name = 'Documento de búsqueda'
+        verbose_name_plural = 'Documentos de búsqueda'
+        indexes      = []   # IDX_PAC_BUSQUEDA_CTX (CTXSYS.CONTEXT) en DDL
+
+    def __str__(self):
+        return f'Búsqueda PAC #{self.paciente_id}'
+
+
+class PacienteTermino(models.Model):
+    """
+    Términos de búsqueda por paciente (motor de trigramas, BD sin Oracle Text).
+    Cada fila aporta PESO al ranking cuando coincide con la consulta.
+    """
+    termino_id  = models.AutoField(db_column='TERMINO_ID', primary_key=True)
+    hospital_id = models.IntegerField(db_column='HOSPITAL_ID')
+    paciente    = models.ForeignKey(
+        Paciente, db_column='PAC_ID', on_delete=models.CASCADE,
+        related_name='terminos_busqueda',
+    )
+    tipo        = models.CharField(db_column='TIPO',    max_length=3, choices=TIPO_TERMINO_CHOICES)
+    termino     = models.CharField(db_column='TERMINO', max_length=100)
+    peso        = models.PositiveSmallIntegerField(db_column='PESO', default=1)
+
+    class Meta:
+        db_table     = 'PAC_BUSQUEDA_TERMINOS'
+        verbose_name = 'Término de búsqueda'
+        verbose_name_plural = 'Términos de búsqueda'
+        indexes      = []   # IDX_PAC_TER_BUSQUEDA (HOSPITAL_ID, TIPO, TERMINO) en DDL
+
+    def __str__(self):
+        return f'{self.tipo}:{self.termino} → PAC #{self.paciente_id}'
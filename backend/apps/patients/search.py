@@ -0,0 +1,313 @@
+"""
+HealthTech Solutions — Motor de búsqueda de pacientes (M02)
+
+Sustituye SearchFilter (UPPER(col) LIKE '%x%' en seis columnas → full scan de
+PAC_PACIENTES por cada tecla en admisión) por un índice dedicado:
+
+  - Tokens de nombre normalizados: sin tildes, mayúsculas, sin partículas
+    (DE, LA, DEL…) → coincidencia por prefijo.
+  - Claves fonéticas para apellidos en español (Z/S/CE/CI, B/V, LL/Y, H muda,
+    QU/K/C…) → 'Gonzales' encuentra 'González'.
+  - Identificadores (no_expediente, no_documento, teléfono) sin separadores
+    → coincidencia exacta por prefijo.
+  - Trigramas → tolerancia a errores de digitación.
+
+Motores (settings.PATIENT_SEARCH_ENGINE):
+  oracle_text → PAC_BUSQUEDA + índice CTXSYS.CONTEXT (DEV/Staging/PROD)
+  trigramas   → PAC_BUSQUEDA_TERMINOS con índice B-tree (SQLite en tests)
+
+Ambos se mantienen al día desde signals.py (post_save de Paciente) y
+responden con una sola consulta que anota busqueda_score para el ranking.
+"""
+
+import math
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+from apps.core.managers import tenant_hospital_id
+
+# Partículas de apellidos/nombres compuestos que no aportan a la búsqueda
+PARTICULAS = {'DE', 'DEL', 'LA', 'LAS', 'LOS', 'Y', 'VDA', 'VIUDA'}
+
+# Campos de Paciente que alimentan el índice (signals.py reindexa solo si cambian)
+CAMPOS_INDEXADOS = {
+    'hospital_id', 'no_expediente', 'no_documento', 'telefono_principal',
+    'primer_nombre', 'segundo_nombre', 'primer_apellido', 'segundo_apellido',
+    'nombre_casada',
+}
+
+# Peso de cada tipo de término en el ranking
+PESO_ID  = 100
+PESO_NOM = 10
+PESO_FON = 6
+PESO_TRI = 1
+
+# Fracción mínima de los trigramas de cada token que debe coincidir
+UMBRAL_TRIGRAMAS = 0.4
+
+
+# ============================================================
+# Normalización
+# ============================================================
+def normalizar(texto: str) -> str:
+    """'José  Pérez-Ñuñez' → 'JOSE PEREZ NUNEZ' (sin tildes, A-Z0-9 y espacios)."""
+    sin_tildes = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode()
+    return ' '.join(re.sub(r'[^A-Z0-9]+', ' ', sin_tildes.upper()).split())
+
+
+def tokens(texto: str) -> list[str]:
+    """Tokens normalizados sin partículas, en orden y sin repetir."""
+    vistos = []
+    for tok in normalizar(texto).split():
+        if tok not in PARTICULAS and tok not in vistos:
+            vistos.append(tok)
+    return vistos
+
+
+def identificador(texto: str) -> str:
+    """'EXP-2026-0001' → 'EXP20260001' (solo A-Z0-9)."""
+    return normalizar(texto).replace(' ', '')
+
+
+# Reglas aplicadas en orden sobre el token normalizado
+_REGLAS_FONETICAS = [
+    (re.compile(r'^X(?=[AEIOU])'),  'J'),    # Ximena / Jimena
+    (re.compile(r'CH'),             '#'),    # Preserva CH antes de quitar la H
+    (re.compile(r'(?<!#)H'),        ''),     # H muda
+    (re.compile(r'QU(?=[EI])'),     'K'),
+    (re.compile(r'GU(?=[EI])'),     '%'),    # Guerra: G fuerte
+    (re.compile(r'G(?=[EI])'),      'J'),
+    (re.compile(r'C(?=[EI])'),      'S'),
+    (re.compile(r'C'),              'K'),
+    (re.compile(r'Q'),              'K'),
+    (re.compile(r'Z'),              'S'),
+    (re.compile(r'V|W'),            'B'),
+    (re.compile(r'LL'),             'Y'),
+    (re.compile(r'Y(?![AEIOU])'),   'I'),    # Y vocálica (Godoy → GODOI)
+    (re.compile(r'X'),              'KS'),
+    (re.compile(r'#'),              'CH'),
+    (re.compile(r'%'),              'G'),
+]
+
+
+def clave_fonetica(token: str) -> str:
+    """
+    Clave fonética para español de Guatemala (seseo, b/v, yeísmo, h muda).
+    'GONZALEZ' y 'GONSALES' → 'GONSALES'; 'VILLATORO' y 'BIYATORO' → 'BIYATORO'.
+    """
+    clave = token
+    for patron, reemplazo in _REGLAS_FONETICAS:
+        clave = patron.sub(reemplazo, clave)
+    # Letras dobles (RR, SS, NN…) colapsan
+    return re.sub(r'(.)\1+', r'\1', clave)
+
+
+def trigramas(token: str) -> set[str]:
+    """Trigramas del token con bordes (' RA', 'RAM', …, 'EZ ')."""
+    padded = f' {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def terminos_paciente(paciente) -> list[tuple[str, str, int]]:
+    """(tipo, término, peso) que representan a un paciente en el índice."""
+    nombres = tokens(' '.join([
+        paciente.primer_nombre, paciente.segundo_nombre,
+        paciente.primer_apellido, paciente.segundo_apellido,
+        paciente.nombre_casada,
+    ]))
+
+    ids = {identificador(paciente.no_expediente), identificador(paciente.no_documento)}
+    telefono = re.sub(r'\D', '', paciente.telefono_principal or '')
+    if telefono:
+        ids.update({telefono, telefono[-8:]})     # Con y sin código de país
+
+    terminos = [('ID', i, PESO_ID) for i in sorted(ids) if i]
+    terminos += [('NOM', tok, PESO_NOM) for tok in nombres]
+    terminos += [('FON', k, PESO_FON) for k in sorted({clave_fonetica(t) for t in nombres})]
+    terminos += [('TRI', t, PESO_TRI) for t in sorted(set().union(*map(trigramas, nombres)))]
+    return terminos
+
+
+# ============================================================
+# Motor: trigramas (PAC_BUSQUEDA_TERMINOS)
+# ============================================================
+class TrigramSearchEngine:
+    """Índice propio en tabla: portable (SQLite/Oracle), LIKE 'x%' indexable."""
+
+    def indexar(self, paciente) -> None:
+        from apps.patients.models import PacienteTermino
+
+        with transaction.atomic():
+            PacienteTermino.objects.filter(paciente_id=paciente.pk).delete()
+            PacienteTermino.objects.bulk_create([
+                PacienteTermino(
+                    hospital_id=paciente.hospital_id, paciente_id=paciente.pk,
+                    tipo=tipo, termino=termino[:100], peso=peso,
+                )
+                for tipo, termino, peso in terminos_paciente(paciente)
+            ])
+
+    def buscar(self, queryset, texto: str, hospital_id: int | None = None):
+        """
+        Cada token de la consulta debe coincidir (AND, igual que Oracle Text):
+        por prefijo de nombre o identificador, por clave fonética, o con al
+        menos UMBRAL_TRIGRAMAS de sus trigramas. Con varios tokens basta
+        también el identificador completo por prefijo ('EXP-2026-0001').
+        """
+        from apps.patients.models import PacienteTermino
+
+        consulta = tokens(texto) or normalizar(texto).split()
+        if not consulta:
+            return queryset
+
+        alguno, todos, conteos = Q(), Q(), {}
+        for i, tok in enumerate(consulta):
+            tri = trigramas(tok)
+            directo = (
+                Q(tipo='NOM', termino__startswith=tok)
+                | Q(tipo='ID', termino__startswith=tok)
+                | Q(tipo='FON', termino=clave_fonetica(tok))
+            )
+            similar = Q(tipo='TRI', termino__in=tri)
+            conteos[f'directo_{i}'] = Count('pk', filter=directo)
+            conteos[f'similar_{i}'] = Count('pk', filter=similar)
+            minimo = max(1, math.ceil(len(tri) * UMBRAL_TRIGRAMAS))
+            todos &= Q(**{f'directo_{i}__gt': 0}) | Q(**{f'similar_{i}__gte': minimo})
+            alguno |= directo | similar
+        if len(consulta) > 1:
+            completo = Q(tipo='ID', termino__startswith=identificador(texto))
+            conteos['completo'] = Count('pk', filter=completo)
+            alguno |= completo
+            todos = Q(completo__gt=0) | todos
+
+        terminos = PacienteTermino.objects.filter(alguno)
+        if hospital_id is not None:
+            terminos = terminos.filter(hospital_id=hospital_id)
+        coincidentes = (
+            terminos.order_by().values('paciente')
+            .annotate(total=Sum('peso'), **conteos)
+            .filter(todos)
+        )
+        score = coincidentes.filter(paciente=OuterRef('pk')).values('total')
+        return (
+            queryset
+            .filter(pk__in=coincidentes.values('paciente'))
+            .annotate(busqueda_score=Subquery(score, output_field=IntegerField()))
+        )
+
+
+# ============================================================
+# Motor: Oracle Text (PAC_BUSQUEDA + CTXSYS.CONTEXT)
+# ============================================================
+class OracleTextSearchEngine:
+    """
+    Un documento por paciente: 'JUAN PEREZ FONJUAN FONPERES EXP20260001 …'.
+    Las claves fonéticas llevan prefijo FON para no mezclarse con los nombres.
+    """
+
+    # Palabras reservadas de CONTAINS: se buscan literales ({…}), sin comodín
+    RESERVADAS = {
+        'ABOUT', 'ACCUM', 'AND', 'BT', 'BTG', 'BTI', 'BTP', 'EQUIV', 'FUZZY',
+        'HASPATH', 'INPATH', 'MDATA', 'MINUS', 'NEAR', 'NOT', 'NT', 'NTG',
+        'NTI', 'NTP', 'OR', 'PT', 'RT', 'SQE', 'SYN', 'TR', 'TRSYN', 'TT',
+        'WITHIN',
+    }
+
+    def documento(self, paciente) -> str:
+        partes = []
+        for tipo, termino, _peso in terminos_paciente(paciente):
+            if tipo in ('ID', 'NOM'):
+                partes.append(termino)
+            elif tipo == 'FON':
+                partes.append(f'FON{termino}')
+        return ' '.join(partes)[:4000]
+
+    def indexar(self, paciente) -> None:
+        from apps.patients.models import PacienteBusqueda
+
+        PacienteBusqueda.objects.update_or_create(
+            paciente_id=paciente.pk,
+            defaults={'hospital_id': paciente.hospital_id, 'documento': self.documento(paciente)},
+        )
+
+    def _termino(self, tok: str) -> str:
+        if tok in self.RESERVADAS:
+            return f'({{{tok}}} * 3 ACCUM {{FON{clave_fonetica(tok)}}} * 2)'
+        return (
+            f'({tok}% * 3 ACCUM FUZZY({tok}, 60, 100, W) '
+            f'ACCUM FON{clave_fonetica(tok)} * 2)'
+        )
+
+    def consulta(self, texto: str) -> str:
+        """
+        Expresión CONTAINS: cada token debe coincidir (AND). Si el texto trae
+        separadores ('EXP-2026-0001') se acepta también el identificador
+        completo por prefijo.
+        """
+        consulta = tokens(texto) or normalizar(texto).split()
+        if not consulta:
+            return ''
+        expresion = ' AND '.join(self._termino(tok) for tok in consulta)
+        ident = identificador(texto)
+        if len(consulta) > 1 and ident not in self.RESERVADAS:
+            expresion = f'({ident}% * 10) OR ({expresion})'
+        return expresion
+
+    def buscar(self, queryset, texto: str, hospital_id: int | None = None):
+        expresion = self.consulta(texto)
+        if not expresion:
+            return queryset
+        qs = queryset.filter(busqueda__isnull=False)
+        if hospital_id is not None:
+            qs = qs.filter(busqueda__hospital_id=hospital_id)
+        return qs.extra(
+            where=['CONTAINS("PAC_BUSQUEDA"."DOCUMENTO", %s, 1) > 0'],
+            params=[expresion],
+        ).annotate(busqueda_score=RawSQL('SCORE(1)', ()))
+
+
+# ============================================================
+# API del módulo
+# ============================================================
+_ENGINES = {
+    'oracle_text': OracleTextSearchEngine,
+    'trigramas':   TrigramSearchEngine,
+}
+
+
+def get_search_engine():
+    return _ENGINES[getattr(settings, 'PATIENT_SEARCH_ENGINE', 'oracle_text')]()
+
+
+def indexar_paciente(paciente) -> None:
+    """Actualiza el índice de búsqueda de un paciente (llamado desde signals.py)."""
+    get_search_engine().indexar(paciente)
+
+
+def buscar_pacientes(queryset, texto: str, hospital_id: int | None = None):
+    """Filtra el queryset por texto y lo ordena por relevancia (busqueda_score)."""
+    qs = get_search_engine().buscar(queryset, texto, hospital_id)
+    if qs is queryset:
+        return qs
+    return qs.order_by('-busqueda_score', *(queryset.query.order_by or queryset.model._meta.ordering))
+
+
+class PacienteSearchFilter(BaseFilterBackend):
+    """
+    Reemplazo de SearchFilter para PacienteViewSet (mismo parámetro ?search=).
+    Debe ir después de OrderingFilter: el orden por relevancia se antepone
+    al orden solicitado.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        texto = request.query_params.get(self.search_param, '').strip()
+        if not texto:
+            return queryset
+        return buscar_pacientes(queryset, texto, tenant_hospital_id())
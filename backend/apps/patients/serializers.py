@@ -7,7 +7,9 @@ HIPAA: data_minimization activo.
 """
 
 from datetime import date
+from django.utils import timezone
 from rest_framework import serializers
+from apps.core.serializers import NombreUsuarioField
 from apps.patients.models import (
     Paciente, Alergia, ContactoEmergencia, HistorialClinico,
 )
@@ -36,6 +38,15 @@ class AlergiaSerializer(serializers.ModelSerializer):
         read_only_fields = ['alergia_id', 'created_at']
 
 
+def tocar_paciente(paciente):
+    """
+    La ficha (PacienteDetailSerializer) anida alergias y contactos: un cambio
+    en ellos renueva UPDATED_AT del paciente, del que sale su ETag
+    (apps.core.conditional) sin consultar las tablas hijas en cada GET.
+    """
+    Paciente.objects.sin_tenant().filter(pk=paciente.pk).update(updated_at=timezone.now())
+
+
 class AlergiaCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model  = Alergia
@@ -47,13 +58,15 @@ class AlergiaCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request  = self.context['request']
         paciente = self.context['paciente']
-        return Alergia.objects.create(
+        alergia = Alergia.objects.create(
             hospital_id=request.user.hospital_id,
             paciente=paciente,
             created_by=request.user,
             updated_by=request.user,
             **validated_data,
         )
+        tocar_paciente(paciente)
+        return alergia
 
 
 # ============================================================
@@ -81,11 +94,13 @@ class ContactoCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request  = self.context['request']
         paciente = self.context['paciente']
-        return ContactoEmergencia.objects.create(
+        contacto = ContactoEmergencia.objects.create(
             hospital_id=request.user.hospital_id,
             paciente=paciente,
             **validated_data,
         )
+        tocar_paciente(paciente)
+        return contacto
 
 
 # ============================================================
@@ -95,7 +110,7 @@ class HistorialSerializer(serializers.ModelSerializer):
     tipo_entrada_display = serializers.CharField(
         source='get_tipo_entrada_display', read_only=True
     )
-    medico_nombre = serializers.SerializerMethodField()
+    medico_nombre = NombreUsuarioField('medico')
 
     class Meta:
         model  = HistorialClinico
@@ -107,9 +122,6 @@ class HistorialSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['historial_id', 'created_at']
 
-    def get_medico_nombre(self, obj) -> str | None:
-        return obj.medico.get_short_name() if obj.medico else None
-
 
 class HistorialCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -184,7 +196,7 @@ class PacienteListSerializer(serializers.ModelSerializer):
 class PacienteDetailSerializer(serializers.ModelSerializer):
     nombre_completo       = serializers.SerializerMethodField()
     edad                  = serializers.SerializerMethodField()
-    medico_nombre         = serializers.SerializerMethodField()
+    medico_nombre         = NombreUsuarioField('medico')
     alergias              = AlergiaSerializer(many=True, read_only=True)
     contactos_emergencia  = ContactoEmergenciaSerializer(many=True, read_only=True)
     tipo_paciente_display = serializers.CharField(
@@ -229,9 +241,6 @@ class PacienteDetailSerializer(serializers.ModelSerializer):
             - ((hoy.month, hoy.day) < (obj.fecha_nacimiento.month, obj.fecha_nacimiento.day))
         )
 
-    def get_medico_nombre(self, obj) -> str | None:
-        return obj.medico.get_short_name() if obj.medico else None
-
     def get_sexo_display(self, obj) -> str:
         return 'Masculino' if obj.sexo == 'M' else 'Femenino'
 
@@ -0,0 +1,22 @@
+"""
+HealthTech Solutions — Signals: Índice de búsqueda de pacientes (M02)
+Mantiene PAC_BUSQUEDA / PAC_BUSQUEDA_TERMINOS (apps.patients.search) en la
+misma transacción que el save() del paciente.
+Cargas masivas (bulk_create / update) → manage.py reindexar_pacientes.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.patients.models import Paciente
+from apps.patients.search import CAMPOS_INDEXADOS, indexar_paciente
+
+
+@receiver(post_save, sender=Paciente)
+def sincronizar_busqueda_paciente(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Reindexa solo si cambió algún campo buscable (p.ej. no en soft-delete)."""
+    if raw:
+        return
+    if update_fields is not None and not CAMPOS_INDEXADOS.intersection(update_fields):
+        return
+    indexar_paciente(instance)
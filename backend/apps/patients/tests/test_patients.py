@@ -6,11 +6,15 @@ Cobertura:
   - Crear paciente con datos faltantes retorna 400
   - Obtener detalle de paciente
   - Buscar por nombre/expediente
+  - Índice de búsqueda: fonética, errores de digitación, ranking, sincronía
+  - Mismos resultados con ambos motores (todos los tokens deben coincidir)
+  - Generador de expedientes: contador atómico, bloques por proceso, límite diario
   - Soft-delete (activo=False, no DELETE físico)
   - Aislamiento por hospital (VPD simulado)
 """
 import pytest
 from rest_framework import status
+from django.db import connection
 from django.utils import timezone
 import datetime
 
@@ -254,3 +258,154 @@ class TestPacienteSoftDelete:
 
         ids = [p.get('pac_id') for p in data['results']]
         assert paciente.pac_id not in ids
+
+
+# ============================================================
+# Tests — Índice de búsqueda (apps.patients.search)
+# ============================================================
+class TestBusquedaPacientes:
+    """Motor de trigramas (settings de test): normalización, fonética y ranking."""
+
+    @pytest.fixture
+    def otro_paciente(self, hospital, usuario_medico):
+        from apps.patients.models import Paciente
+        return Paciente.objects.create(
+            hospital_id=hospital.hospital_id,
+            primer_nombre='Ramiro',
+            primer_apellido='Gómez',
+            tipo_documento='DPI',
+            no_documento='1111222233334',
+            fecha_nacimiento=datetime.date(1970, 1, 1),
+            sexo='M',
+            no_expediente='EXP-2026-0002',
+            telefono_principal='+502 4444-9999',
+            created_by=usuario_medico,
+        )
+
+    def _buscar(self, client, texto):
+        resp = client.get('/api/v1/patients/', {'search': texto})
+        assert resp.status_code == status.HTTP_200_OK
+        return [p['pac_id'] for p in resp.json()['results']]
+
+    def test_clave_fonetica_espanol(self):
+        from apps.patients.search import clave_fonetica
+        assert clave_fonetica('GONZALEZ') == clave_fonetica('GONSALES')
+        assert clave_fonetica('VILLATORO') == clave_fonetica('BIYATORO')
+        assert clave_fonetica('HERNANDEZ') == clave_fonetica('ERNANDES')
+        assert clave_fonetica('GUERRA') != clave_fonetica('JERRA')
+
+    def test_busqueda_fonetica_y_sin_tildes(self, auth_client_medico, paciente, otro_paciente):
+        assert self._buscar(auth_client_medico, 'ramires')[0] == paciente.pac_id
+        assert self._buscar(auth_client_medico, 'carlos RAMIREZ') == [paciente.pac_id]
+
+    def test_error_de_digitacion(self, auth_client_medico, paciente, otro_paciente):
+        assert paciente.pac_id in self._buscar(auth_client_medico, 'Ramriez')
+
+    def test_identificadores_por_prefijo(self, auth_client_medico, paciente, otro_paciente):
+        assert self._buscar(auth_client_medico, 'EXP-2026-0002') == [otro_paciente.pac_id]
+        assert self._buscar(auth_client_medico, '98765') == [paciente.pac_id]
+        assert self._buscar(auth_client_medico, '4444') == [otro_paciente.pac_id]
+
+    def test_ranking_prefijo_antes_que_similar(self, auth_client_medico, paciente, otro_paciente):
+        """'Rami' es prefijo de Ramírez y de Ramiro; 'Ramire' solo de Ramírez."""
+        assert set(self._buscar(auth_client_medico, 'Rami')) == {paciente.pac_id, otro_paciente.pac_id}
+        assert self._buscar(auth_client_medico, 'Ramire')[0] == paciente.pac_id
+
+    def test_indice_se_actualiza_al_guardar(self, auth_client_medico, paciente):
+        paciente.primer_apellido = 'Villatoro'
+        paciente.save()
+        assert self._buscar(auth_client_medico, 'Biyatoro') == [paciente.pac_id]
+        assert self._buscar(auth_client_medico, 'Ramirez') == []
+
+
+# ============================================================
+# Tests — Mismo comportamiento con ambos motores de búsqueda
+# ============================================================
+@pytest.mark.django_db(transaction=True)      # Oracle Text sincroniza el índice ON COMMIT
+@pytest.mark.parametrize('motor', [
+    'trigramas',
+    pytest.param('oracle_text', marks=pytest.mark.skipif(
+        connection.vendor != 'oracle', reason='CONTAINS requiere Oracle Text')),
+])
+class TestMotoresBusqueda:
+    """PATIENT_SEARCH_ENGINE no cambia qué pacientes devuelve una consulta."""
+
+    @pytest.fixture
+    def pacientes(self, motor, settings, hospital, usuario_medico):
+        from apps.patients.models import Paciente
+        settings.PATIENT_SEARCH_ENGINE = motor
+        datos = [('Carlos', 'Ramírez', 'EXP-2026-0001'), ('Ramiro', 'Gómez', 'EXP-2026-0002'),
+                 ('Carlos', 'Gómez', 'EXP-2026-0003')]
+        return [
+            Paciente.objects.create(
+                hospital_id=hospital.hospital_id, primer_nombre=nombre, primer_apellido=apellido,
+                tipo_documento='DPI', no_documento=f'55500000000{i}', fecha_nacimiento=datetime.date(1980, 1, 1),
+                sexo='M', no_expediente=expediente, created_by=usuario_medico,
+            ).pac_id
+            for i, (nombre, apellido, expediente) in enumerate(datos)
+        ]
+
+    @staticmethod
+    def _buscar(texto, hospital):
+        from apps.patients.models import Paciente
+        from apps.patients.search import buscar_pacientes
+        qs = buscar_pacientes(Paciente.objects.sin_tenant(), texto, hospital.hospital_id)
+        return set(qs.values_list('pac_id', flat=True))
+
+    def test_todos_los_tokens_deben_coincidir(self, pacientes, hospital):
+        ramirez, ramiro, gomez = pacientes
+        assert self._buscar('Juan Ramirez', hospital) == set()
+        assert self._buscar('Carlos Ramirez', hospital) == {ramirez}
+        assert self._buscar('gomez carlos', hospital) == {gomez}
+        assert self._buscar('Carlos', hospital) == {ramirez, gomez}
+        assert self._buscar('carlos ramires', hospital) == {ramirez}          # Fonética
+        assert self._buscar('Carlos Ramriez', hospital) == {ramirez}          # Error de digitación
+        assert self._buscar('EXP-2026-0002', hospital) == {ramiro}            # Identificador completo
+
+
+# ============================================================
+# Tests — Generador de expedientes (apps.patients.utils)
+# ============================================================
+class TestGeneradorExpediente:
+    """Correlativo diario por hospital desde PAC_EXPEDIENTE_CONTADORES."""
+
+    @pytest.fixture(autouse=True)
+    def _sin_bloques(self, monkeypatch):
+        from apps.patients import utils
+        monkeypatch.setattr(utils, '_bloques', {})
+
+    def test_correlativos_consecutivos(self, hospital):
+        from apps.patients.utils import generar_no_expediente
+        hoy = datetime.date.today().strftime('%Y%m%d')
+        assert generar_no_expediente(hospital.hospital_id) == f'{hoy}001'
+        assert generar_no_expediente(hospital.hospital_id) == f'{hoy}002'
+        assert generar_no_expediente(hospital.hospital_id + 1) == f'{hoy}001'
+
+    def test_continua_desde_expedientes_existentes(self, paciente, hospital):
+        """Al crear el contador del día parte del mayor YYYYMMDDXXX ya emitido."""
+        from apps.patients.utils import generar_no_expediente
+        hoy = datetime.date.today().strftime('%Y%m%d')
+        paciente.no_expediente = f'{hoy}041'
+        paciente.save(update_fields=['no_expediente'])
+        assert generar_no_expediente(hospital.hospital_id) == f'{hoy}042'
+
+    def test_bloques_por_proceso(self, hospital, settings, django_assert_num_queries):
+        from apps.patients.models import ContadorExpediente
+        from apps.patients.utils import generar_no_expediente
+        settings.EXPEDIENTE_BLOQUE = 5
+        hoy = datetime.date.today().strftime('%Y%m%d')
+
+        emitidos = [generar_no_expediente(hospital.hospital_id) for _ in range(3)]
+        assert emitidos == [f'{hoy}001', f'{hoy}002', f'{hoy}003']
+        assert ContadorExpediente.objects.get(hospital_id=hospital.hospital_id).ultimo == 5
+        with django_assert_num_queries(0):       # Servido desde el bloque en memoria
+            assert generar_no_expediente(hospital.hospital_id) == f'{hoy}004'
+
+    def test_limite_diario(self, hospital):
+        from apps.patients.models import ContadorExpediente
+        from apps.patients.utils import generar_no_expediente
+        ContadorExpediente.objects.create(
+            hospital_id=hospital.hospital_id, fecha=datetime.date.today(), ultimo=999,
+        )
+        with pytest.raises(ValueError):
+            generar_no_expediente(hospital.hospital_id)
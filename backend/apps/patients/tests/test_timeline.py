@@ -0,0 +1,121 @@
+"""
+HealthTech Solutions — Tests: Línea de tiempo del paciente (apps/patients/timeline.py)
+Cobertura:
+  - Mezcla de fuentes por momento y paginación por cursor sin repetir ni saltar eventos (empates incluidos)
+  - GET /patients/{id}/timeline/: una sola fila PHI_ACCESS, filtro por tipos, cursor inválido
+  - Entradas privadas del historial y contexto VPD copiado a hilos auxiliares
+"""
+import datetime
+import threading
+
+import pytest
+from django.utils import timezone
+
+from apps.appointments.models import Cita
+from apps.emergency.models import Emergencia
+from apps.laboratory.models import OrdenLab
+from apps.nursing.models import NotaEnfermeria, SignoVital
+from apps.patients import timeline
+from apps.patients.models import HistorialClinico, Paciente
+from apps.security.models import AuditoriaAcceso
+from config.oracle.vpd import get_current_tenant, tenant_en_hilo
+
+pytestmark = pytest.mark.django_db
+
+DIA  = datetime.date(2026, 3, 10)
+HORA = datetime.time(8, 0)
+CONTEXTO = (None, None)
+
+
+@pytest.fixture
+def paciente(hospital, usuario_medico):
+    return Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-T1', primer_nombre='Ana', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento='0000000000021', fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+@pytest.fixture
+def eventos(paciente, usuario_medico):
+    """Eventos de varias fuentes, varios con el mismo momento (DIA 08:00)."""
+    h, u = paciente.hospital_id, usuario_medico
+    for hora in (HORA, datetime.time(9, 30)):
+        Cita.objects.create(hospital_id=h, paciente=paciente, medico=u, fecha_cita=DIA, hora_inicio=hora,
+                            hora_fin=datetime.time(10, 0), tipo_cita='CONSULTA', motivo='Control')
+    Emergencia.objects.create(hospital_id=h, paciente=paciente, medico=u, fecha_ingreso=DIA, hora_ingreso=HORA,
+                              motivo_consulta='Dolor', nivel_triaje='AMARILLO')
+    OrdenLab.objects.create(hospital_id=h, paciente=paciente, medico_solic=u, fecha_solicitud=DIA,
+                            hora_solicitud=HORA, examenes_solicitados='Hematología')
+    for dias in (0, 1):
+        HistorialClinico.objects.create(hospital_id=h, paciente=paciente, medico=u, tipo_entrada='NOTA',
+                                        titulo=f'Nota {dias}', fecha_evento=DIA - datetime.timedelta(days=dias))
+    for _ in range(2):
+        signo = SignoVital.objects.create(hospital_id=h, paciente=paciente, presion_sistolica=120,
+                                          presion_diastolica=80, created_by=u)
+        SignoVital.objects.filter(pk=signo.pk).update(
+            created_at=timezone.make_aware(datetime.datetime.combine(DIA, HORA)))
+    NotaEnfermeria.objects.create(hospital_id=h, paciente=paciente, contenido='Estable', created_by=u)
+    Cita.objects.create(hospital_id=h, paciente=paciente, medico=u, fecha_cita=DIA, hora_inicio=datetime.time(7, 0),
+                        hora_fin=HORA, tipo_cita='CONSULTA', motivo='Anulada', activo=False)
+
+
+def test_paginacion_sin_repetir_ni_saltar(paciente, usuario_medico, eventos):
+    todo = timeline.eventos(paciente, usuario_medico, CONTEXTO, limite=100)
+    assert todo['next_cursor'] is None
+    claves = [(e['momento'], timeline.POSICION[e['tipo']], e['id']) for e in todo['results']]
+    assert len(claves) == 9 and claves == sorted(claves, reverse=True)
+    assert todo['results'][0]['tipo'] == 'NOTA_ENFERMERIA'                    # Hoy, por CREATED_AT
+    assert [e['tipo'] for e in todo['results'][-2:]] == ['HISTORIAL', 'HISTORIAL']
+
+    for limite in (1, 2, 3):
+        vistos, cursor = [], None
+        while True:
+            pagina = timeline.eventos(paciente, usuario_medico, CONTEXTO, cursor=cursor, limite=limite)
+            vistos += [(e['tipo'], e['id']) for e in pagina['results']]
+            cursor = pagina['next_cursor']
+            if cursor is None:
+                break
+        assert vistos == [(e['tipo'], e['id']) for e in todo['results']]
+
+    with pytest.raises(timeline.CursorInvalido):
+        timeline.eventos(paciente, usuario_medico, CONTEXTO, cursor='no-es-un-cursor')
+
+
+def test_endpoint_una_sola_auditoria(api_client, usuario_medico, paciente, eventos):
+    api_client.force_authenticate(usuario_medico)
+    url = f'/api/v1/patients/{paciente.pk}/timeline/'
+    AuditoriaAcceso.objects.all().delete()
+
+    r = api_client.get(url, {'limite': 4})
+    assert r.status_code == 200
+    datos = r.json()
+    assert len(datos['results']) == 4 and datos['next']
+    assert AuditoriaAcceso.objects.filter(tipo_evento='PHI_ACCESS').count() == 1
+
+    siguiente = api_client.get(datos['next']).json()
+    assert {e['id'] for e in siguiente['results']}.isdisjoint(
+        {e['id'] for e in datos['results'] if e['tipo'] in {s['tipo'] for s in siguiente['results']}})
+
+    citas = api_client.get(url, {'tipos': 'cita,laboratorio'}).json()['results']
+    assert sorted(e['tipo'] for e in citas) == ['CITA', 'CITA', 'LABORATORIO']
+    assert api_client.get(url, {'tipos': 'FACTURA'}).status_code == 400
+    assert api_client.get(url, {'cursor': 'xyz'}).status_code == 404
+
+
+def test_historial_privado_y_contexto_en_hilo(paciente, usuario_medico, usuario_admin):
+    HistorialClinico.objects.create(hospital_id=paciente.hospital_id, paciente=paciente, medico=usuario_admin,
+                                    tipo_entrada='NOTA', titulo='Privada', fecha_evento=DIA, es_privado=True)
+    assert timeline.eventos(paciente, usuario_medico, CONTEXTO)['results'] == []
+    assert len(timeline.eventos(paciente, usuario_admin, CONTEXTO)['results']) == 1
+
+    vistos = []
+
+    def _hilo():
+        with tenant_en_hilo(7, 'MEDICO'):
+            vistos.append(get_current_tenant())
+        vistos.append(get_current_tenant())
+
+    hilo = threading.Thread(target=_hilo)
+    hilo.start()
+    hilo.join()
+    assert vistos == [(7, 'MEDICO'), None]
@@ -0,0 +1,243 @@
+"""
+HealthTech Solutions — Línea de tiempo del paciente (M02)
+Abrir la ficha en el frontend disparaba una petición por módulo (citas,
+emergencias, encamamiento, cirugía, laboratorio, farmacia, enfermería,
+imágenes, historial), cada una con su autenticación JWT, su fila de
+auditoría PHI y su paginación.
+
+  - Una consulta por fuente, por el índice (HOSPITAL_ID, PAC_ID, ...) de
+    cada tabla, ordenada por su fecha/hora de evento descendente y limitada
+    a límite + 1 filas (keyset: sin OFFSET ni COUNT).
+  - Las fuentes se consultan en paralelo con TIMELINE_HILOS hilos; cada
+    hilo copia el contexto VPD del request (config.oracle.vpd.tenant_en_hilo)
+    y usa su propia sesión Oracle. SQLite o TIMELINE_HILOS <= 1: en serie.
+  - Las listas ya ordenadas se mezclan con heapq.merge por
+    (momento, fuente, id) descendente; el cursor opaco guarda esa clave del
+    último evento devuelto y cada fuente aplica el predicado keyset
+    equivalente, así que la página siguiente no repite ni salta eventos.
+  - La vista registra una sola fila PHI_ACCESS por petición.
+
+momento es la hora local del evento: fecha + hora clínica cuando la tabla
+las separa, solo la fecha (00:00) cuando no hay hora, o CREATED_AT.
+"""
+
+import base64
+import datetime
+import heapq
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.appointments.models import Cita
+from apps.emergency.models import Emergencia
+from apps.hospitalization.models import Encamamiento
+from apps.laboratory.models import OrdenLab
+from apps.nursing.models import NotaEnfermeria, SignoVital
+from apps.pacs.models import EstudioImagen
+from apps.patients.models import HistorialClinico
+from apps.pharmacy.models import Dispensacion
+from apps.surgery.models import Cirugia
+from config.oracle.vpd import tenant_en_hilo
+
+NINGUNO = Q(pk__in=[])
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Fuente:
+    tipo:   str
+    modelo: type
+    fecha:  str                          # DateField, o DateTimeField (CREATED_AT)
+    hora:   str | None                   # TimeField de la hora clínica
+    campos: tuple
+    titulo: Callable[[dict], str]
+    estado: str | None = None
+    activo: bool = True                  # La tabla tiene borrado lógico (ACTIVO)
+
+    @property
+    def es_instante(self) -> bool:
+        """La fecha es un DateTimeField (CREATED_AT): el momento sale de la hora local."""
+        return self.modelo._meta.get_field(self.fecha).get_internal_type() == 'DateTimeField'
+
+    def orden(self) -> list:
+        campos = [self.fecha] + ([self.hora] if self.hora else [])
+        return [f'-{c}' for c in campos] + ['-pk']
+
+    def momento(self, fila: dict) -> datetime.datetime:
+        valor = fila[self.fecha]
+        if self.es_instante:
+            return timezone.localtime(valor).replace(tzinfo=None)
+        return datetime.datetime.combine(valor, fila[self.hora] if self.hora else datetime.time.min)
+
+    def antes(self, momento: datetime.datetime) -> Q:
+        """Eventos con momento < `momento`."""
+        if self.es_instante:
+            return Q(**{f'{self.fecha}__lt': timezone.make_aware(momento)})
+        dia, hora = momento.date(), momento.time()
+        if self.hora:
+            return Q(**{f'{self.fecha}__lt': dia}) | Q(**{self.fecha: dia, f'{self.hora}__lt': hora})
+        return Q(**{f'{self.fecha}__lt': dia}) | (Q(**{self.fecha: dia}) if hora > datetime.time.min else NINGUNO)
+
+    def igual(self, momento: datetime.datetime) -> Q:
+        """Eventos con momento == `momento`."""
+        if self.es_instante:
+            return Q(**{self.fecha: timezone.make_aware(momento)})
+        if self.hora:
+            return Q(**{self.fecha: momento.date(), self.hora: momento.time()})
+        return Q(**{self.fecha: momento.date()}) if momento.time() == datetime.time.min else NINGUNO
+
+
+def _signos(f: dict) -> str:
+    partes = []
+    if f['presion_sistolica'] is not None:
+        partes.append(f"PA {f['presion_sistolica']}/{f['presion_diastolica']}")
+    if f['frecuencia_cardiaca'] is not None:
+        partes.append(f"FC {f['frecuencia_cardiaca']}")
+    if f['temperatura'] is not None:
+        partes.append(f"T {f['temperatura']}")
+    return 'Signos vitales' + (': ' + ' · '.join(partes) if partes else '')
+
+
+# Posición = desempate entre fuentes con el mismo momento
+FUENTES = (
+    Fuente('CITA', Cita, 'fecha_cita', 'hora_inicio', ('tipo_cita', 'motivo'),
+           lambda f: f"{f['tipo_cita']}: {f['motivo']}", estado='estado'),
+    Fuente('EMERGENCIA', Emergencia, 'fecha_ingreso', 'hora_ingreso', ('nivel_triaje', 'motivo_consulta'),
+           lambda f: f"Emergencia {f['nivel_triaje']}: {f['motivo_consulta']}", estado='estado'),
+    Fuente('ENCAMAMIENTO', Encamamiento, 'fecha_ingreso', 'hora_ingreso', ('motivo_ingreso',),
+           lambda f: f"Ingreso: {f['motivo_ingreso']}", estado='estado'),
+    Fuente('CIRUGIA', Cirugia, 'fecha_programada', 'hora_ini_prog', ('tipo_cirugia', 'quirofano'),
+           lambda f: f"{f['tipo_cirugia']} ({f['quirofano']})", estado='estado'),
+    Fuente('LABORATORIO', OrdenLab, 'fecha_solicitud', 'hora_solicitud', ('grupo_examen', 'examenes_solicitados'),
+           lambda f: f"{f['grupo_examen']}: {f['examenes_solicitados']}", estado='estado'),
+    Fuente('DISPENSACION', Dispensacion, 'fecha_prescripcion', None, ('medicamento__nombre_generico', 'dosis'),
+           lambda f: ' '.join(filter(None, (f['medicamento__nombre_generico'], f['dosis']))), estado='estado'),
+    Fuente('SIGNOS_VITALES', SignoVital, 'created_at', None,
+           ('presion_sistolica', 'presion_diastolica', 'frecuencia_cardiaca', 'temperatura'), _signos, activo=False),
+    Fuente('NOTA_ENFERMERIA', NotaEnfermeria, 'created_at', None, ('tipo_nota', 'es_urgente'),
+           lambda f: f"Nota de enfermería {f['tipo_nota']}" + (' (urgente)' if f['es_urgente'] else ''),
+           activo=False),
+    Fuente('IMAGEN', EstudioImagen, 'fecha_solicitud', None, ('modalidad', 'region_anatomica'),
+           lambda f: f"{f['modalidad']} {f['region_anatomica']}", estado='estado'),
+    Fuente('HISTORIAL', HistorialClinico, 'fecha_evento', None, ('tipo_entrada', 'titulo'),
+           lambda f: f"[{f['tipo_entrada']}] {f['titulo']}"),
+)
+POSICION = {f.tipo: i for i, f in enumerate(FUENTES)}
+TIPOS    = tuple(POSICION)
+
+
+# ============================================================
+# Cursor opaco: base64(JSON {m: momento, t: fuente, k: pk})
+# ============================================================
+def codificar_cursor(evento: dict) -> str:
+    payload = json.dumps({'m': evento['momento'].isoformat(), 't': evento['tipo'], 'k': evento['id']},
+                         separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(token: str) -> tuple:
+    try:
+        datos = json.loads(base64.urlsafe_b64decode((token + '=' * (-len(token) % 4)).encode()).decode())
+        if datos['t'] not in POSICION:
+            raise ValueError
+        return datetime.datetime.fromisoformat(datos['m']), datos['t'], int(datos['k'])
+    except (ValueError, KeyError, TypeError):
+        raise CursorInvalido('Cursor de línea de tiempo inválido.')
+
+
+# ============================================================
+# Consulta por fuente
+# ============================================================
+def _despues(fuente: Fuente, cursor) -> Q:
+    """Predicado keyset: eventos posteriores al cursor en el orden (momento, fuente, id) descendente."""
+    momento, tipo, pk = cursor
+    posicion, del_cursor = POSICION[fuente.tipo], POSICION[tipo]
+    if posicion < del_cursor:
+        return fuente.antes(momento) | fuente.igual(momento)
+    if posicion > del_cursor:
+        return fuente.antes(momento)
+    return fuente.antes(momento) | (fuente.igual(momento) & Q(pk__lt=pk))
+
+
+def _consultar(fuente: Fuente, hospital_id: int, paciente_id: int, autor_id: int | None, cursor, n: int) -> list:
+    qs = fuente.modelo.objects.sin_tenant().del_hospital(hospital_id).filter(paciente_id=paciente_id)
+    if fuente.activo:
+        qs = qs.activos()
+    if fuente.modelo is HistorialClinico and autor_id is not None:
+        # Entradas privadas solo para el médico autor o admin (igual que /historial/)
+        qs = qs.filter(Q(es_privado=False) | Q(es_privado=True, medico_id=autor_id))
+    if cursor is not None:
+        qs = qs.filter(_despues(fuente, cursor))
+    campos = ('pk', fuente.fecha) + ((fuente.hora,) if fuente.hora else ()) + fuente.campos
+    campos += (fuente.estado,) if fuente.estado else ()
+    posicion = POSICION[fuente.tipo]
+    return [
+        {
+            'momento': fuente.momento(f),
+            'tipo':    fuente.tipo,
+            'id':      f['pk'],
+            'titulo':  fuente.titulo(f)[:300],
+            'estado':  f[fuente.estado] if fuente.estado else None,
+            '_orden':  posicion,
+        }
+        for f in qs.order_by(*fuente.orden()).values(*campos)[:n]
+    ]
+
+
+# ============================================================
+# Fan-out: un hilo por fuente con el contexto VPD del request
+# ============================================================
+_pool      = None
+_pool_lock = Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.TIMELINE_HILOS, thread_name_prefix='timeline')
+        return _pool
+
+
+def _en_hilo(contexto: tuple, *args) -> list:
+    with tenant_en_hilo(*contexto):
+        return _consultar(*args)
+
+
+def eventos(paciente, usuario, contexto: tuple, cursor: str | None = None, limite: int | None = None,
+            tipos=None) -> dict:
+    """
+    Página de la línea de tiempo de `paciente`, del evento más reciente al más antiguo:
+      {'results': [{momento, tipo, id, titulo, estado}], 'next_cursor': str | None}
+    contexto: (hospital_id, rol) del request para los hilos auxiliares.
+    """
+    limite  = max(1, min(limite or settings.TIMELINE_LIMITE, settings.TIMELINE_LIMITE_MAX))
+    actual  = decodificar_cursor(cursor) if cursor else None
+    autor   = None if getattr(usuario, 'rol_codigo', '') in ('SUPER_ADMIN', 'ADMIN_HOSPITAL') else usuario.pk
+    fuentes = [f for f in FUENTES if not tipos or f.tipo in tipos]
+    args    = [(f, paciente.hospital_id, paciente.pk, autor, actual, limite + 1) for f in fuentes]
+
+    if settings.TIMELINE_HILOS > 1 and len(args) > 1 and connection.vendor != 'sqlite':
+        listas = list(_executor().map(_en_hilo, [contexto] * len(args), *zip(*args)))
+    else:
+        listas = [_consultar(*a) for a in args]
+
+    mezcla = heapq.merge(*listas, key=lambda e: (e['momento'], e['_orden'], e['id']), reverse=True)
+    pagina = [e for _, e in zip(range(limite + 1), mezcla)]
+    hay_mas, pagina = len(pagina) > limite, pagina[:limite]
+    for e in pagina:
+        del e['_orden']
+    return {
+        'results':     pagina,
+        'next_cursor': codificar_cursor(pagina[-1]) if hay_mas else None,
+    }
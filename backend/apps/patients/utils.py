@@ -7,9 +7,15 @@ generar_no_expediente:
     - XXX      : correlativo de 3 dígitos (001–999), reinicia cada día por hospital.
 
   Garantías:
-    - Unicidad: usa SELECT FOR UPDATE para bloquear filas concurrentes.
-    - Transaccional: debe llamarse dentro de un bloque atomic() o dentro
-      de la transacción implícita de Paciente.objects.create().
+    - Unicidad: el correlativo sale de PAC_EXPEDIENTE_CONTADORES con un único
+      UPDATE … RETURNING atómico (sin leer expedientes ni SELECT FOR UPDATE).
+    - Sin convoy de bloqueos: el bloqueo de la fila contador dura solo esa
+      sentencia; se confirma en su propia transacción, antes del INSERT del
+      paciente (no llamar dentro de un atomic() largo).
+    - Bloques por proceso (EXPEDIENTE_BLOQUE > 1): cada worker reserva N
+      correlativos con un solo UPDATE y los entrega desde memoria. Un worker
+      que muere deja huecos en la numeración del día — igual que una secuencia
+      Oracle con CACHE.
     - Límite diario: 999 expedientes por hospital por día.
       Si se alcanza, eleva ValueError (nunca debe ocurrir en producción con
       volúmenes normales).
@@ -21,8 +27,120 @@ generar_no_expediente:
     '20260304002'   # Segunda llamada ese mismo día
 """
 
+import os
+import threading
 from datetime import date
-from django.db import transaction
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+
+MAX_CORRELATIVO = 999
+
+# Bloques reservados por este proceso: (hospital_id, fecha) → [siguiente, último]
+_bloques: dict = {}
+_bloques_lock = threading.Lock()
+_bloques_pid  = None
+
+
+def _incrementar_contador(hospital_id: int, fecha: date, cantidad: int) -> int | None:
+    """
+    UPDATE … SET ULTIMO = ULTIMO + :cantidad … RETURNING ULTIMO.
+    Devuelve el nuevo ULTIMO, o None si aún no existe la fila del día.
+    """
+    from apps.patients.models import ContadorExpediente
+
+    qn     = connection.ops.quote_name
+    tabla  = qn(ContadorExpediente._meta.db_table)
+    sql    = (
+        f'UPDATE {tabla} SET {qn("ULTIMO")} = {qn("ULTIMO")} + %s, '
+        f'{qn("UPDATED_AT")} = CURRENT_TIMESTAMP '
+        f'WHERE {qn("HOSPITAL_ID")} = %s AND {qn("FECHA")} = %s '
+    )
+    fecha_db = connection.ops.adapt_datefield_value(fecha)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'oracle':
+            import oracledb
+            ultimo = cursor.var(oracledb.DB_TYPE_NUMBER)
+            cursor.execute(sql + f'RETURNING {qn("ULTIMO")} INTO %s',
+                           [cantidad, hospital_id, fecha_db, ultimo])
+            valores = ultimo.getvalue()
+            return int(valores[0]) if valores else None
+        cursor.execute(sql + f'RETURNING {qn("ULTIMO")}', [cantidad, hospital_id, fecha_db])
+        row = cursor.fetchone()
+        return int(row[0]) if row else None
+
+
+def _crear_contador(hospital_id: int, fecha: date) -> None:
+    """
+    Crea la fila del día. ULTIMO arranca en el mayor correlativo ya emitido
+    con el formato YYYYMMDDXXX (expedientes generados antes del contador).
+    Si otro proceso la creó primero, la IntegrityError se ignora.
+    """
+    from apps.patients.models import ContadorExpediente, Paciente
+
+    prefijo = fecha.strftime('%Y%m%d')
+    existentes = (
+        Paciente.objects
+        .filter(hospital_id=hospital_id, no_expediente__startswith=prefijo)
+        .values_list('no_expediente', flat=True)
+    )
+    inicial = max(
+        (int(exp[-3:]) for exp in existentes if len(exp) == len(prefijo) + 3 and exp[-3:].isdigit()),
+        default=0,
+    )
+    try:
+        with transaction.atomic():
+            ContadorExpediente.objects.create(hospital_id=hospital_id, fecha=fecha, ultimo=inicial)
+    except IntegrityError:
+        pass
+
+
+def reservar_correlativos(hospital_id: int, fecha: date, cantidad: int = 1) -> tuple[int, int]:
+    """
+    Reserva `cantidad` correlativos consecutivos para (hospital, fecha) en su
+    propia transacción y devuelve (primero, último).
+
+    Raises:
+        ValueError: Si el día ya superó los 999 expedientes del hospital.
+    """
+    with transaction.atomic():
+        ultimo = _incrementar_contador(hospital_id, fecha, cantidad)
+    if ultimo is None:
+        _crear_contador(hospital_id, fecha)
+        with transaction.atomic():
+            ultimo = _incrementar_contador(hospital_id, fecha, cantidad)
+
+    primero = ultimo - cantidad + 1
+    if primero > MAX_CORRELATIVO:
+        raise ValueError(
+            f'Se alcanzó el límite diario de {MAX_CORRELATIVO} expedientes '
+            f'para hospital_id={hospital_id} en fecha {fecha:%Y%m%d}.'
+        )
+    return primero, min(ultimo, MAX_CORRELATIVO)
+
+
+def _siguiente_correlativo(hospital_id: int, fecha: date) -> int:
+    """Correlativo desde el bloque del proceso; reserva otro bloque si se agotó."""
+    global _bloques_pid
+    bloque = max(1, getattr(settings, 'EXPEDIENTE_BLOQUE', 1))
+    if bloque == 1:
+        return reservar_correlativos(hospital_id, fecha)[0]
+
+    clave = (hospital_id, fecha)
+    with _bloques_lock:
+        if _bloques_pid != os.getpid():          # Fork de gunicorn: no heredar bloques
+            _bloques.clear()
+            _bloques_pid = os.getpid()
+        actual = _bloques.get(clave)
+        if actual is None or actual[0] > actual[1]:
+            # Los bloques de días anteriores ya no sirven
+            for vieja in [k for k in _bloques if k[1] != fecha]:
+                del _bloques[vieja]
+            actual = list(reservar_correlativos(hospital_id, fecha, bloque))
+            _bloques[clave] = actual
+        correlativo = actual[0]
+        actual[0] += 1
+    return correlativo
 
 
 def generar_no_expediente(hospital_id: int) -> str:
@@ -39,43 +157,6 @@ def generar_no_expediente(hospital_id: int) -> str:
     Raises:
         ValueError: Si se superan los 999 expedientes diarios para el hospital.
     """
-    from apps.patients.models import Paciente   # Import local → evita circular
-
-    hoy    = date.today()
-    prefijo = hoy.strftime('%Y%m%d')   # Ej.: '20260304'
-
-    with transaction.atomic():
-        # Oracle: select_for_update() no soporta LIMIT/OFFSET.
-        # Recuperamos TODOS los expedientes del día para el hospital
-        # (sin .first()) y calculamos el máximo en Python.
-        # El bloqueo SELECT FOR UPDATE evita inserciones concurrentes
-        # con el mismo correlativo.
-        expedientes = list(
-            Paciente.objects
-            .filter(
-                hospital_id=hospital_id,
-                no_expediente__startswith=prefijo,
-            )
-            .select_for_update()           # Bloqueo a nivel Oracle
-            .values_list('no_expediente', flat=True)
-        )
-
-        if expedientes:
-            # Extrae correlativos numéricos válidos y toma el máximo
-            correlativos = []
-            for exp in expedientes:
-                try:
-                    correlativos.append(int(exp[-3:]))
-                except (ValueError, IndexError):
-                    pass
-            correlativo = (max(correlativos) + 1) if correlativos else 1
-        else:
-            correlativo = 1
-
-        if correlativo > 999:
-            raise ValueError(
-                f'Se alcanzó el límite diario de 999 expedientes '
-                f'para hospital_id={hospital_id} en fecha {prefijo}.'
-            )
-
-        return f'{prefijo}{correlativo:03d}'
+    hoy = date.today()
+    correlativo = _siguiente_correlativo(hospital_id, hoy)
+    return f'{hoy:%Y%m%d}{correlativo:03d}'
@@ -1,72 +1,55 @@
 """
 HealthTech Solutions — Views: Modulo Pacientes (M02)
 HIPAA: Auditoria PHI_ACCESS en TODOS los accesos a datos de pacientes.
-VPD:   En DEV se filtra manualmente por hospital_id del usuario autenticado.
+VPD:   En DEV filtra TenantManager (hospital del request, apps.core.managers).
        En PROD Oracle VPD aplica el filtro a nivel de sesion de BD.
 """
 
-import logging
-from django.conf import settings
+import datetime
+
 from django.db.models import Q
+from django.utils import timezone
 from rest_framework import viewsets, status, filters
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
 
+from apps.core.audit import audit_phi_for
+from apps.core.conditional import ConditionalGetMixin
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
+from apps.patients import timeline as linea_de_tiempo
 from apps.patients.models import Paciente, Alergia, ContactoEmergencia, HistorialClinico
+from apps.patients.search import PacienteSearchFilter
 from apps.patients.serializers import (
     PacienteListSerializer, PacienteDetailSerializer, PacienteCreateSerializer,
     AlergiaSerializer, AlergiaCreateSerializer,
     ContactoEmergenciaSerializer, ContactoCreateSerializer,
     HistorialSerializer, HistorialCreateSerializer,
 )
-from apps.security.models import AuditoriaAcceso
-
-logger = logging.getLogger('healthtech.audit')
+from config.oracle.vpd import get_current_tenant
 
 
 # ============================================================
 # Helpers internos
 # ============================================================
-def _get_ip(request) -> str:
-    x_fwd = request.META.get('HTTP_X_FORWARDED_FOR')
-    return x_fwd.split(',')[0].strip() if x_fwd else request.META.get('REMOTE_ADDR', '0.0.0.0')
-
-
-def _audit_phi(request, accion: str, pac_id: str, descripcion: str = '') -> None:
-    """
-    Registra un evento PHI_ACCESS en SEC_AUDITORIA_ACCESOS.
-    Cumplimiento HIPAA: cada acceso a datos de paciente debe quedar registrado.
-    """
-    try:
-        AuditoriaAcceso.objects.create(
-            hospital_id=request.user.hospital_id,
-            usuario=request.user,
-            tipo_evento='PHI_ACCESS',
-            modulo='patients',
-            accion=accion,
-            tabla_afectada='PAC_PACIENTES',
-            registro_id=pac_id,
-            ip_origen=_get_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
-            descripcion=descripcion or f'{accion} paciente #{pac_id}',
-            exitoso=True,
-        )
-    except Exception as exc:
-        logger.warning('Fallo al registrar auditoria PHI: %s', exc)
+# Auditoría HIPAA: pipeline asíncrono por lotes (apps.core.audit)
+_audit_phi = audit_phi_for('patients', 'PAC_PACIENTES', 'paciente')
 
 
 # ============================================================
 # PACIENTES ViewSet
 # ============================================================
-class PacienteViewSet(viewsets.ModelViewSet):
+class PacienteViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     CRUD de pacientes con aislamiento VPD por hospital.
 
     GET    /api/v1/patients/               Lista paginada (search/filter/order)
+                                           ?search= → índice de búsqueda (search.py),
+                                           resultados ordenados por relevancia
     POST   /api/v1/patients/               Registrar nuevo paciente
-    GET    /api/v1/patients/{id}/          Ficha clinica completa
+    GET    /api/v1/patients/{id}/          Ficha clinica completa (ETag / 304)
     PUT    /api/v1/patients/{id}/          Actualizar datos
     PATCH  /api/v1/patients/{id}/          Actualizar parcial
     DELETE /api/v1/patients/{id}/          Soft-delete (HIPAA: no borrar PHI)
@@ -75,24 +58,16 @@ class PacienteViewSet(viewsets.ModelViewSet):
     GET/POST /api/v1/patients/{id}/alergias/
     GET/POST /api/v1/patients/{id}/contactos/
     GET/POST /api/v1/patients/{id}/historial/
+    GET      /api/v1/patients/{id}/timeline/   Eventos de todos los módulos (timeline.py)
     """
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
-    filter_backends    = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields      = [
-        'no_expediente', 'primer_nombre', 'primer_apellido',
-        'segundo_apellido', 'no_documento', 'telefono_principal',
-    ]
+    filter_backends    = [filters.OrderingFilter, PacienteSearchFilter]
     ordering_fields    = ['primer_apellido', 'primer_nombre', 'created_at', 'fecha_nacimiento']
     ordering           = ['primer_apellido', 'primer_nombre']
 
     def get_queryset(self):
-        qs   = Paciente.objects.select_related('medico').filter(activo=True)
-        user = self.request.user
-
-        # VPD manual en DEV (en PROD lo aplica Oracle a nivel de sesion)
-        if not settings.VPD_ENABLED:
-            if getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-                qs = qs.filter(hospital_id=user.hospital_id)
+        # Filtro de hospital: TenantManager (VPD en PROD lo aplica Oracle)
+        qs = Paciente.objects.activos().select_related('medico')
 
         # Filtros opcionales via query params
         tipo_paciente = self.request.query_params.get('tipo_paciente')
@@ -112,15 +87,19 @@ class PacienteViewSet(viewsets.ModelViewSet):
             return PacienteCreateSerializer
         return PacienteListSerializer
 
-    # ---- Override retrieve: auditoria HIPAA ----
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
+    # ---- GET condicional (apps.core.conditional): auditoria HIPAA también en 304 ----
+    def auditar_detalle(self, instance):
         _audit_phi(
-            request, 'view', str(instance.pac_id),
+            self.request, 'view', str(instance.pac_id),
             f'Consulta ficha: {instance.get_nombre_completo()}'
         )
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+
+    def validadores_detalle(self, instance):
+        # Alergias y contactos renuevan UPDATED_AT (serializers.tocar_paciente);
+        # la fecha del día cubre la edad calculada
+        hoy    = timezone.localdate()
+        inicio = timezone.make_aware(datetime.datetime.combine(hoy, datetime.time.min))
+        return (instance.pk, instance.updated_at, hoy), max(instance.updated_at, inicio)
 
     # ---- Override create: asigna hospital_id ----
     def create(self, request, *args, **kwargs):
@@ -255,3 +234,37 @@ class PacienteViewSet(viewsets.ModelViewSet):
             HistorialSerializer(entrada).data,
             status=status.HTTP_201_CREATED,
         )
+
+    @action(detail=True, methods=['get'], url_path='timeline')
+    def timeline(self, request, pk=None):
+        """
+        GET /api/v1/patients/{id}/timeline/?cursor=&limite=&tipos=CITA,LABORATORIO
+        Citas, emergencias, encamamientos, cirugías, laboratorio, farmacia,
+        enfermería, imágenes e historial en una sola lista, del más reciente
+        al más antiguo. Una sola fila de auditoría PHI por petición.
+        """
+        paciente = self.get_object()
+        params   = request.query_params
+        tipos    = [t for t in params.get('tipos', '').upper().split(',') if t]
+        if any(t not in linea_de_tiempo.TIPOS for t in tipos):
+            raise ValidationError({'tipos': [f'Valores permitidos: {", ".join(linea_de_tiempo.TIPOS)}.']})
+        try:
+            limite = int(params['limite']) if params.get('limite') else None
+        except ValueError:
+            raise ValidationError({'limite': ['Debe ser un entero.']})
+
+        try:
+            datos = linea_de_tiempo.eventos(
+                paciente, request.user, get_current_tenant() or (None, None),
+                cursor=params.get('cursor'), limite=limite, tipos=tipos,
+            )
+        except linea_de_tiempo.CursorInvalido as exc:
+            raise NotFound(str(exc))
+        _audit_phi(
+            request, 'view', str(paciente.pac_id),
+            f'Consulta línea de tiempo ({len(datos["results"])} eventos)'
+        )
+        siguiente = None
+        if datos['next_cursor']:
+            siguiente = replace_query_param(request.build_absolute_uri(), 'cursor', datos['next_cursor'])
+        return Response({'next': siguiente, 'results': datos['results']})
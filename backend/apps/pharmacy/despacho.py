@@ -0,0 +1,103 @@
+"""
+HealthTech Solutions — Despacho de farmacia (M08)
+Antes DispensacionViewSet.dispensar comprobaba med.stock_actual en Python y
+luego descontaba con un F() incondicional: dos dispensaciones simultáneas
+podían dejar el stock negativo, y la misma receta podía dispensarse dos
+veces. Cada receta de la ronda de un servicio era además un POST aparte.
+
+  - descontar(): UPDATE condicional
+        UPDATE FAR_MEDICAMENTOS SET STOCK_ACTUAL = STOCK_ACTUAL - :qty
+         WHERE MED_ID = :id AND ACTIVO = 1 AND STOCK_ACTUAL >= :qty
+    1 fila = stock descontado; 0 filas = insuficiente (o inactivo).
+  - dispensar(): un lote de dispensaciones PENDIENTE en una transacción.
+    Bloquea las filas (SELECT … FOR UPDATE) para que otra dispensación
+    concurrente no las tome, agrega las cantidades por medicamento y hace
+    un único descuento condicional por medicamento (en orden de MED_ID,
+    sin interbloqueos entre lotes). Si el stock no alcanza para el grupo de
+    un medicamento, ese grupo se rechaza completo y el resto se dispensa
+    (o se revierte todo con todo_o_nada).
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.pharmacy.models import ESTADOS_DISPENSABLES, Dispensacion, Medicamento
+
+
+class LoteRechazado(Exception):
+    """todo_o_nada: alguna dispensación del lote no pudo despacharse (se revierte todo)."""
+
+    def __init__(self, resultado):
+        super().__init__('Lote rechazado')
+        self.resultado = resultado
+
+
+def descontar(med_id: int, cantidad) -> bool:
+    """Descuenta `cantidad` si hay stock suficiente. Llamar dentro de transaction.atomic()."""
+    return bool(
+        Medicamento.objects.sin_tenant()
+        .filter(pk=med_id, activo=True, stock_actual__gte=cantidad)
+        .update(stock_actual=F('stock_actual') - cantidad, updated_at=timezone.now())
+    )
+
+
+def dispensar(hospital_id: int, ids, usuario_id: int, notas_farmacia: str | None = None,
+              todo_o_nada: bool = False, ahora=None) -> dict:
+    """
+    Dispensa las dispensaciones `ids` del hospital. Devuelve
+      {'dispensadas': [dis_id], 'rechazadas': [{dispensacion, motivo, …}],
+       'medicamentos': [{medicamento, descontado, stock_actual}]}
+    Lanza LoteRechazado (sin cambios) si todo_o_nada y hubo rechazos.
+    """
+    ids = list(dict.fromkeys(ids))
+    with transaction.atomic():
+        pendientes = list(
+            Dispensacion.objects.sin_tenant().del_hospital(hospital_id).activos()
+            .select_for_update()
+            .filter(pk__in=ids, estado__in=ESTADOS_DISPENSABLES)
+            .order_by('pk')
+            .values_list('dis_id', 'medicamento_id', 'cantidad')
+        )
+        encontradas = {dis_id for dis_id, _, _ in pendientes}
+        rechazadas = [{'dispensacion': i, 'motivo': 'NO_PENDIENTE'} for i in ids if i not in encontradas]
+
+        # Cantidades agregadas por medicamento → un UPDATE condicional cada uno
+        por_medicamento, totales = defaultdict(list), defaultdict(Decimal)
+        for dis_id, med_id, cantidad in pendientes:
+            por_medicamento[med_id].append(dis_id)
+            totales[med_id] += cantidad
+        descontados = [m for m in sorted(totales) if descontar(m, totales[m])]
+
+        fallidos = set(totales) - set(descontados)
+        if fallidos:
+            stock = dict(Medicamento.objects.sin_tenant().filter(pk__in=fallidos)
+                         .values_list('med_id', 'stock_actual'))
+            for med_id in sorted(fallidos):
+                rechazadas += [{'dispensacion': d, 'motivo': 'STOCK_INSUFICIENTE', 'medicamento': med_id,
+                                'requerido': totales[med_id], 'disponible': stock.get(med_id)}
+                               for d in por_medicamento[med_id]]
+
+        dispensadas = sorted(d for m in descontados for d in por_medicamento[m])
+        resultado = {'dispensadas': dispensadas, 'rechazadas': rechazadas, 'medicamentos': []}
+        if todo_o_nada and rechazadas:
+            raise LoteRechazado(resultado)           # Revierte los descuentos ya hechos
+
+        if dispensadas:
+            now = ahora or timezone.localtime()
+            cambios = dict(
+                estado='DISPENSADA', dispensado_por_id=usuario_id, fecha_dispensacion=now.date(),
+                hora_dispensacion=now.time(), updated_by_id=usuario_id, updated_at=timezone.now(),
+            )
+            if notas_farmacia is not None:
+                cambios['notas_farmacia'] = notas_farmacia
+            Dispensacion.objects.sin_tenant().filter(pk__in=dispensadas).update(**cambios)
+
+            stock = dict(Medicamento.objects.sin_tenant().filter(pk__in=descontados)
+                         .values_list('med_id', 'stock_actual'))
+            resultado['medicamentos'] = [{'medicamento': m, 'descontado': totales[m], 'stock_actual': stock[m]}
+                                         for m in descontados]
+    return resultado
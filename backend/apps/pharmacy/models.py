@@ -13,6 +13,8 @@ Máquina de estados (Dispensacion):
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 # ============================================================
 # Catálogos / choices
@@ -120,6 +122,8 @@ class Medicamento(models.Model):
     )
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'FAR_MEDICAMENTOS'
         verbose_name        = 'Medicamento'
@@ -221,6 +225,8 @@ class Dispensacion(models.Model):
     )
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'FAR_DISPENSACIONES'
         verbose_name        = 'Dispensación'
@@ -3,7 +3,9 @@ HealthTech Solutions — Serializers: Módulo Farmacia (M08)
 HIPAA data-minimization: List < Detail < Create
 """
 
+from django.conf import settings
 from rest_framework import serializers
+from apps.core.serializers import NombreUsuarioField
 from .models import Medicamento, Dispensacion
 
 
@@ -128,8 +130,8 @@ class DispensacionListSerializer(serializers.ModelSerializer):
 
 class DispensacionDetailSerializer(DispensacionListSerializer):
     """Ficha completa de dispensación."""
-    medico_nombre      = serializers.SerializerMethodField()
-    dispensado_por_nombre = serializers.SerializerMethodField()
+    medico_nombre      = NombreUsuarioField('medico_prescribe', vacio='No asignado', usar_username=True)
+    dispensado_por_nombre = NombreUsuarioField('dispensado_por', vacio='No asignado', usar_username=True)
     medicamento_categoria = serializers.SerializerMethodField()
     medicamento_unidad = serializers.SerializerMethodField()
     hora_dispensacion_fmt = serializers.SerializerMethodField()
@@ -144,17 +146,6 @@ class DispensacionDetailSerializer(DispensacionListSerializer):
             'hospital_id', 'created_at', 'updated_at',
         ]
 
-    def _nombre_usuario(self, u):
-        if not u:
-            return 'No asignado'
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() or u.username
-
-    def get_medico_nombre(self, obj):
-        return self._nombre_usuario(obj.medico_prescribe)
-
-    def get_dispensado_por_nombre(self, obj):
-        return self._nombre_usuario(obj.dispensado_por)
-
     def get_medicamento_categoria(self, obj):
         return obj.medicamento.get_categoria_display() if obj.medicamento else ''
 
@@ -210,6 +201,16 @@ class DispensacionDispensarSerializer(serializers.Serializer):
     notas_farmacia = serializers.CharField(max_length=1000, required=False, allow_blank=True)
 
 
+class DispensacionLoteSerializer(serializers.Serializer):
+    """Dispensar varias dispensaciones PENDIENTE en una transacción."""
+    dispensaciones = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1, max_length=settings.FARMACIA_LOTE_MAX,
+    )
+    notas_farmacia = serializers.CharField(max_length=1000, required=False, allow_blank=True)
+    todo_o_nada    = serializers.BooleanField(default=False)
+
+
 class DispensacionCancelarSerializer(serializers.Serializer):
     """Cancelar dispensación pendiente."""
     motivo_cancelacion = serializers.CharField(min_length=5, max_length=500)
@@ -0,0 +1,94 @@
+"""
+HealthTech Solutions — Tests: Despacho de farmacia (apps/pharmacy/despacho.py)
+Cobertura:
+  - Descuento condicional: nunca deja stock negativo aunque la lectura previa esté vieja
+  - dispensar/: stock insuficiente y receta ya dispensada → 400 sin tocar el stock
+  - dispensar-lote/: un descuento por medicamento, grupos rechazados y todo_o_nada
+"""
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.patients.models import Paciente
+from apps.pharmacy import despacho
+from apps.pharmacy.models import Dispensacion, Medicamento
+
+URL = '/api/v1/pharmacy/dispensaciones/'
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+@pytest.fixture
+def paciente(hospital):
+    return Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-F1', primer_nombre='Ana', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento='0000000000007', fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+def _medicamento(hospital, nombre, stock):
+    return Medicamento.objects.create(hospital_id=hospital.pk, nombre_generico=nombre, stock_actual=stock)
+
+
+def _receta(med, paciente, cantidad):
+    return Dispensacion.objects.create(hospital_id=med.hospital_id, medicamento=med, paciente=paciente,
+                                       cantidad=cantidad, fecha_prescripcion=datetime.date.today())
+
+
+def _stock(med):
+    return Medicamento.objects.sin_tenant().values_list('stock_actual', flat=True).get(pk=med.pk)
+
+
+def test_descuento_condicional(hospital):
+    med = _medicamento(hospital, 'Paracetamol', 5)
+    leido = Medicamento.objects.get(pk=med.pk)               # Lectura que otro proceso deja vieja
+    assert despacho.descontar(med.pk, 4)
+    assert leido.stock_actual >= 4                           # El chequeo en Python habría pasado…
+    assert not despacho.descontar(med.pk, 4)                 # …el UPDATE condicional no
+    assert _stock(med) == 1
+
+
+def test_dispensar_individual(cliente, hospital, paciente):
+    med = _medicamento(hospital, 'Amoxicilina', 5)
+    a, b = _receta(med, paciente, 4), _receta(med, paciente, 4)
+
+    r = cliente.post(f'{URL}{a.pk}/dispensar/', {'notas_farmacia': 'Entregado en ventanilla'}, format='json')
+    assert r.status_code == 200 and r.json()['estado'] == 'DISPENSADA'
+    assert Dispensacion.objects.get(pk=a.pk).notas_farmacia == 'Entregado en ventanilla'
+
+    r = cliente.post(f'{URL}{b.pk}/dispensar/', {}, format='json')
+    assert r.status_code == 400 and 'Disponible: 1' in r.json()['detail']
+    assert cliente.post(f'{URL}{a.pk}/dispensar/', {}, format='json').status_code == 400
+    assert _stock(med) == 1 and Dispensacion.objects.get(pk=b.pk).estado == 'PENDIENTE'
+
+
+def test_dispensar_lote(cliente, hospital, paciente):
+    para = _medicamento(hospital, 'Paracetamol', 10)
+    cefa = _medicamento(hospital, 'Ceftriaxona', 3)
+    recetas_para = [_receta(para, paciente, 2) for _ in range(4)]
+    recetas_cefa = [_receta(cefa, paciente, 2) for _ in range(2)]            # 4 > 3 en stock
+    cancelada = _receta(para, paciente, 1)
+    Dispensacion.objects.filter(pk=cancelada.pk).update(estado='CANCELADA')
+    ids = [d.pk for d in recetas_para + recetas_cefa] + [cancelada.pk]
+
+    # todo_o_nada: se revierte todo
+    r = cliente.post(f'{URL}dispensar-lote/', {'dispensaciones': ids, 'todo_o_nada': True}, format='json')
+    assert r.status_code == 409 and _stock(para) == 10
+    assert not Dispensacion.objects.filter(estado='DISPENSADA').exists()
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = cliente.post(f'{URL}dispensar-lote/', {'dispensaciones': ids}, format='json')
+    assert r.status_code == 200
+    datos = r.json()
+    assert datos['dispensadas'] == sorted(d.pk for d in recetas_para)
+    motivos = {x['dispensacion']: x['motivo'] for x in datos['rechazadas']}
+    assert motivos == {**{d.pk: 'STOCK_INSUFICIENTE' for d in recetas_cefa}, cancelada.pk: 'NO_PENDIENTE'}
+    assert datos['medicamentos'][0]['stock_actual'] == 2 and _stock(para) == 2 and _stock(cefa) == 3
+    # Un UPDATE condicional por medicamento, no uno por receta
+    assert sum(q['sql'].startswith('UPDATE "FAR_MEDICAMENTOS"') for q in ctx.captured_queries) == 2
@@ -3,17 +3,19 @@ HealthTech Solutions — Views: Módulo Farmacia (M08)
 ViewSets: MedicamentoViewSet, DispensacionViewSet
 """
 
-import datetime
 from django.db.models import F
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from django.conf import settings
+from apps.core.audit import audit_phi_for
+from apps.core.conditional import ConditionalGetMixin
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
 
+from . import despacho
 from .models import (
     Medicamento, Dispensacion,
     ESTADOS_DISPENSABLES, ESTADOS_CANCELABLES,
@@ -22,36 +24,26 @@ from .serializers import (
     MedicamentoListSerializer, MedicamentoDetailSerializer, MedicamentoCreateSerializer,
     MedicamentoReponerSerializer,
     DispensacionListSerializer, DispensacionDetailSerializer, DispensacionCreateSerializer,
-    DispensacionDispensarSerializer, DispensacionCancelarSerializer,
+    DispensacionDispensarSerializer, DispensacionLoteSerializer, DispensacionCancelarSerializer,
 )
 
 
-def _audit_phi(request, modulo, accion, objeto_id, descripcion=''):
-    """Registra evento en SEC_AUDITORIA_ACCESOS (best-effort)."""
-    try:
-        from apps.security.models import AuditoriaAcceso
-        AuditoriaAcceso.objects.create(
-            usuario_id  = request.user.pk,
-            hospital_id = request.user.hospital_id,
-            modulo      = modulo,
-            accion      = accion,
-            objeto_id   = str(objeto_id),
-            descripcion = descripcion[:500],
-            ip_address  = request.META.get('REMOTE_ADDR', ''),
-        )
-    except Exception:
-        pass
+# Auditoría HIPAA: pipeline asíncrono por lotes (apps.core.audit)
+_audit_phi         = audit_phi_for('pharmacy', 'FAR_DISPENSACIONES', 'dispensación')
+_audit_medicamento = audit_phi_for('pharmacy', 'FAR_MEDICAMENTOS', 'medicamento')
 
 
 # ============================================================
 # MEDICAMENTO — Catálogo
 # ============================================================
 
-class MedicamentoViewSet(viewsets.ModelViewSet):
+class MedicamentoViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     CRUD del catálogo de medicamentos del hospital.
     Endpoint: /api/v1/pharmacy/medicamentos/
+    GET de lista y detalle con ETag / Last-Modified (304 sin serializar).
     """
+    etag_lista         = True
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     filter_backends    = [SearchFilter, OrderingFilter, DjangoFilterBackend]
     search_fields      = ['nombre_generico', 'nombre_comercial', 'principio_activo', 'concentracion']
@@ -60,11 +52,7 @@ class MedicamentoViewSet(viewsets.ModelViewSet):
     ordering           = ['nombre_generico']
 
     def get_queryset(self):
-        user = self.request.user
-        qs   = Medicamento.objects.filter(activo=True)
-        if not settings.VPD_ENABLED and getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-            qs = qs.filter(hospital_id=user.hospital_id)
-        return qs
+        return Medicamento.objects.activos()   # Filtro de hospital: TenantManager
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -96,11 +84,12 @@ class MedicamentoViewSet(viewsets.ModelViewSet):
         Medicamento.objects.filter(pk=medicamento.pk).update(
             stock_actual=F('stock_actual') + d['cantidad'],
             updated_by_id=request.user.pk,
+            updated_at=timezone.now(),        # .update() no aplica auto_now (ETag del catálogo)
         )
         medicamento.refresh_from_db()
 
-        _audit_phi(
-            request, 'pharmacy', 'REPONER_STOCK', medicamento.med_id,
+        _audit_medicamento(
+            request, 'REPONER_STOCK', medicamento.med_id,
             f"{medicamento.nombre_generico}: {cantidad_anterior} → {medicamento.stock_actual} "
             f"(+{d['cantidad']}). {d.get('notas', '')}",
         )
@@ -115,6 +104,7 @@ class DispensacionViewSet(viewsets.ModelViewSet):
     """
     CRUD de dispensaciones + acciones de flujo de estado.
     Endpoint: /api/v1/pharmacy/dispensaciones/
+    Lote (ronda de un servicio): POST /dispensar-lote/
     """
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     filter_backends    = [SearchFilter, OrderingFilter, DjangoFilterBackend]
@@ -128,13 +118,10 @@ class DispensacionViewSet(viewsets.ModelViewSet):
     ordering           = ['-fecha_prescripcion', '-created_at']
 
     def get_queryset(self):
-        user = self.request.user
-        qs   = Dispensacion.objects.select_related(
+        # Filtro de hospital: TenantManager
+        return Dispensacion.objects.activos().select_related(
             'paciente', 'medicamento', 'medico_prescribe', 'dispensado_por'
-        ).filter(activo=True)
-        if not settings.VPD_ENABLED and getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-            qs = qs.filter(hospital_id=user.hospital_id)
-        return qs
+        )
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -143,6 +130,8 @@ class DispensacionViewSet(viewsets.ModelViewSet):
             return DispensacionCreateSerializer
         if self.action == 'dispensar':
             return DispensacionDispensarSerializer
+        if self.action == 'dispensar_lote':
+            return DispensacionLoteSerializer
         if self.action == 'cancelar':
             return DispensacionCancelarSerializer
         return DispensacionListSerializer
@@ -150,14 +139,14 @@ class DispensacionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         instance = serializer.save()
         _audit_phi(
-            self.request, 'pharmacy', 'CREAR_DISPENSACION', instance.dis_id,
+            self.request, 'CREAR_DISPENSACION', instance.dis_id,
             f"Dispensación creada: {instance.medicamento.nombre_generico} x{instance.cantidad} "
             f"→ {instance.paciente}",
         )
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        _audit_phi(request, 'pharmacy', 'VER_DISPENSACION', instance.dis_id,
+        _audit_phi(request, 'VER_DISPENSACION', instance.dis_id,
                    f"Detalle dispensación DIS-{instance.dis_id}")
         ser = self.get_serializer(instance)
         return Response(ser.data)
@@ -189,36 +178,63 @@ class DispensacionViewSet(viewsets.ModelViewSet):
         ser.is_valid(raise_exception=True)
         d = ser.validated_data
 
-        # Verificar stock suficiente (doble check en el momento de dispensar)
-        med = dispensacion.medicamento
-        if med.stock_actual < dispensacion.cantidad:
-            return Response(
-                {'detail': f"Stock insuficiente. Disponible: {med.stock_actual} {med.unidad_medida}."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # Descontar stock (operación atómica con F())
-        Medicamento.objects.filter(pk=med.pk).update(
-            stock_actual=F('stock_actual') - dispensacion.cantidad
+        # Bloqueo de la fila + descuento condicional de stock (apps.pharmacy.despacho)
+        now = timezone.localtime()
+        resultado = despacho.dispensar(
+            dispensacion.hospital_id, [dispensacion.pk], request.user.pk, d.get('notas_farmacia'), ahora=now,
         )
-
-        # Actualizar dispensación
-        now = datetime.datetime.now()
+        if resultado['rechazadas']:
+            rechazo = resultado['rechazadas'][0]
+            med = dispensacion.medicamento
+            if rechazo['motivo'] == 'STOCK_INSUFICIENTE':
+                detalle = f"Stock insuficiente. Disponible: {rechazo['disponible']} {med.unidad_medida}."
+            else:
+                detalle = 'La dispensación ya no está pendiente.'
+            return Response({'detail': detalle}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Reflejar en memoria lo que escribió el UPDATE (sin releer la fila)
         dispensacion.estado             = 'DISPENSADA'
-        dispensacion.dispensado_por_id  = request.user.pk
+        dispensacion.dispensado_por     = request.user
         dispensacion.fecha_dispensacion = now.date()
         dispensacion.hora_dispensacion  = now.time()
-        dispensacion.notas_farmacia     = d.get('notas_farmacia', dispensacion.notas_farmacia)
-        dispensacion.updated_by_id      = request.user.pk
-        dispensacion.save()
-
+        if d.get('notas_farmacia') is not None:
+            dispensacion.notas_farmacia = d['notas_farmacia']
+        med = dispensacion.medicamento
+        med.stock_actual = resultado['medicamentos'][0]['stock_actual']
         _audit_phi(
-            request, 'pharmacy', 'DISPENSAR', dispensacion.dis_id,
+            request, 'DISPENSAR', dispensacion.dis_id,
             f"DIS-{dispensacion.dis_id}: {med.nombre_generico} x{dispensacion.cantidad} "
             f"dispensado a {dispensacion.paciente}",
         )
         return Response(DispensacionDetailSerializer(dispensacion).data)
 
+    @action(detail=False, methods=['post'], url_path='dispensar-lote')
+    def dispensar_lote(self, request):
+        """
+        POST /api/v1/pharmacy/dispensaciones/dispensar-lote/
+        Body: { "dispensaciones": [12, 13, …], "notas_farmacia": "...", "todo_o_nada": false }
+        Dispensa en una transacción todas las PENDIENTE indicadas (ronda de un
+        servicio), con un descuento condicional de stock por medicamento.
+        Los grupos sin stock suficiente se informan en `rechazadas`; con
+        todo_o_nada cualquier rechazo revierte el lote (409).
+        """
+        ser = DispensacionLoteSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        d = ser.validated_data
+
+        try:
+            resultado = despacho.dispensar(
+                request.user.hospital_id, d['dispensaciones'], request.user.pk,
+                d.get('notas_farmacia'), todo_o_nada=d['todo_o_nada'],
+            )
+        except despacho.LoteRechazado as exc:
+            return Response({'detail': 'Lote no dispensado: hay dispensaciones rechazadas.', **exc.resultado,
+                             'dispensadas': []}, status=status.HTTP_409_CONFLICT)
+
+        for dis_id in resultado['dispensadas']:
+            _audit_phi(request, 'DISPENSAR', dis_id, f'DIS-{dis_id} dispensada en lote')
+        return Response(resultado)
+
     @action(detail=True, methods=['post'], url_path='cancelar')
     def cancelar(self, request, pk=None):
         """
@@ -243,7 +259,7 @@ class DispensacionViewSet(viewsets.ModelViewSet):
         dispensacion.save()
 
         _audit_phi(
-            request, 'pharmacy', 'CANCELAR_DISPENSACION', dispensacion.dis_id,
+            request, 'CANCELAR_DISPENSACION', dispensacion.dis_id,
             f"DIS-{dispensacion.dis_id} cancelada. Motivo: {d['motivo_cancelacion']}",
         )
         return Response(DispensacionDetailSerializer(dispensacion).data)
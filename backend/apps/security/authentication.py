@@ -0,0 +1,148 @@
+"""
+HealthTech Solutions — Autenticación JWT con principal cacheado
+Referenciado en settings/base.py → REST_FRAMEWORK.DEFAULT_AUTHENTICATION_CLASSES
+
+JWTAuthentication estándar consulta SEC_USUARIOS en cada request y luego
+rol_codigo dispara otra consulta a SEC_ROLES (permisos, get_queryset, VPD).
+Aquí el user_id del token se resuelve contra un Principal inmutable guardado
+en cache (TTL = PRINCIPAL_CACHE_TTL) → 0 consultas de auth/RBAC por request.
+
+Invalidación: signals.py borra la entrada en post_save/post_delete de
+Usuario y Rol, y otra vez al confirmar la transacción (un request
+concurrente pudo recachear la fila anterior entre medio). Requiere una
+caché compartida por todos los workers (Redis / DatabaseCache en PROD,
+check core.E001): con LocMemCache solo se invalidaría el worker que
+hizo el cambio y los demás aceptarían al usuario bloqueado hasta el TTL.
+"""
+
+from dataclasses import asdict, dataclass
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+CACHE_PREFIX = 'healthtech:principal:'
+
+# Columnas de SEC_USUARIOS que viajan en el principal (nunca el hash de password)
+USUARIO_FIELDS = (
+    'usr_id', 'hospital_id', 'rol_id', 'username',
+    'primer_nombre', 'segundo_nombre', 'primer_apellido', 'segundo_apellido',
+    'email', 'tipo_personal', 'activo', 'cuenta_bloqueada',
+    'debe_cambiar_pass', 'is_active', 'is_staff', 'is_superuser',
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identidad mínima del usuario autenticado (inmutable, serializable en cache)."""
+    usr_id:            int
+    hospital_id:       int | None
+    rol_id:            int | None
+    rol_codigo:        str
+    rol_nombre:        str
+    username:          str
+    primer_nombre:     str
+    segundo_nombre:    str
+    primer_apellido:   str
+    segundo_apellido:  str
+    email:             str
+    tipo_personal:     str
+    activo:            bool
+    cuenta_bloqueada:  bool
+    debe_cambiar_pass: bool
+    is_active:         bool
+    is_staff:          bool
+    is_superuser:      bool
+
+    @classmethod
+    def from_usuario(cls, usuario) -> 'Principal':
+        rol = usuario.rol if usuario.rol_id else None
+        return cls(
+            rol_codigo=rol.codigo if rol else '',
+            rol_nombre=rol.nombre if rol else '',
+            **{f: getattr(usuario, f) for f in USUARIO_FIELDS},
+        )
+
+    def as_usuario(self):
+        """
+        Instancia de Usuario para request.user construida sin consultar la BD.
+        Los campos no incluidos quedan diferidos (carga perezosa), de modo que
+        save() y las asignaciones a FKs (created_by=request.user) siguen
+        funcionando igual que con el usuario cargado por simplejwt.
+        """
+        from apps.security.models import Rol, Usuario
+
+        data   = asdict(self)
+        fields = [f for f in Usuario._meta.concrete_fields if f.attname in data]
+        usuario = Usuario.from_db(
+            DEFAULT_DB_ALIAS,
+            [f.attname for f in fields],
+            [data[f.attname] for f in fields],
+        )
+        if self.rol_id:
+            usuario.rol = Rol.from_db(
+                DEFAULT_DB_ALIAS,
+                ['rol_id', 'codigo', 'nombre'],
+                [self.rol_id, self.rol_codigo, self.rol_nombre],
+            )
+        return usuario
+
+
+# ============================================================
+# Cache de principales
+# ============================================================
+def _cache_key(usr_id) -> str:
+    return f'{CACHE_PREFIX}{usr_id}'
+
+
+def get_principal(usr_id) -> Principal | None:
+    """Principal desde cache; en miss, 1 consulta (Usuario + Rol) y se cachea."""
+    from apps.security.models import Usuario
+
+    principal = cache.get(_cache_key(usr_id))
+    if principal is not None:
+        return principal
+    try:
+        usuario = Usuario.objects.select_related('rol').get(usr_id=usr_id)
+    except Usuario.DoesNotExist:
+        return None
+    principal = Principal.from_usuario(usuario)
+    cache.set(_cache_key(usr_id), principal, getattr(settings, 'PRINCIPAL_CACHE_TTL', 60))
+    return principal
+
+
+def invalidar_principal(*usr_ids) -> None:
+    """Elimina principales del cache ahora y tras el commit (llamado desde signals.py)."""
+    claves = [_cache_key(u) for u in usr_ids]
+    if not claves:
+        return
+    cache.delete_many(claves)
+    transaction.on_commit(partial(cache.delete_many, claves))
+
+
+# ============================================================
+# Backend de autenticación DRF
+# ============================================================
+class HealthTechJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication que resuelve request.user desde el principal cacheado."""
+
+    def get_user(self, validated_token):
+        try:
+            usr_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        principal = get_principal(usr_id)
+        if principal is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not principal.is_active or not principal.activo:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if principal.cuenta_bloqueada:
+            raise AuthenticationFailed('Cuenta bloqueada.', code='user_locked')
+
+        return principal.as_usuario()
@@ -6,6 +6,7 @@ HIPAA: campos PHI filtrados por defecto, hospital_id inyectado por backend.
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from apps.core.serializers import NombreUsuarioField
 from apps.security.models import (
     Hospital, Rol, Permiso, RolPermiso, Usuario, AuditoriaAcceso
 )
@@ -213,7 +214,7 @@ class DesbloquearUsuarioSerializer(serializers.Serializer):
 # AUDITORÍA (solo lectura)
 # ============================================================
 class AuditoriaAccesoSerializer(serializers.ModelSerializer):
-    usuario_nombre = serializers.SerializerMethodField()
+    usuario_nombre = NombreUsuarioField('usuario', formato='completo')
 
     class Meta:
         model  = AuditoriaAcceso
@@ -224,6 +225,3 @@ class AuditoriaAccesoSerializer(serializers.ModelSerializer):
             'descripcion', 'exitoso', 'duracion_ms', 'created_at',
         ]
         read_only_fields = fields
-
-    def get_usuario_nombre(self, obj) -> str | None:
-        return obj.usuario.get_full_name() if obj.usuario else None
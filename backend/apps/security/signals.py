@@ -1,12 +1,16 @@
 """
 HealthTech Solutions — Signals: Auditoría automática de cambios a SEC_USUARIOS
 HIPAA: cualquier modificación a datos de usuario queda registrada.
+Cache: invalida el principal de autenticación (authentication.py) al cambiar
+       un usuario o su rol, y su nombre para mostrar (core/serializers.py).
 """
 
 import logging
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from apps.security.models import Usuario, AuditoriaAcceso
+from apps.core.serializers import invalidar_nombres_usuario
+from apps.security.authentication import invalidar_principal
+from apps.security.models import Usuario, Rol, AuditoriaAcceso
 
 logger = logging.getLogger('healthtech.audit')
 
@@ -49,3 +53,19 @@ def auditar_cambio_usuario(sender, instance, created, **kwargs):
         )
     except Exception as e:
         logger.error(f'Error en signal auditar_cambio_usuario: {e}')
+
+
+@receiver(post_save, sender=Usuario)
+@receiver(post_delete, sender=Usuario)
+def invalidar_principal_usuario(sender, instance, **kwargs):
+    """Rol, hospital, activo o bloqueo cambiados → el próximo request recarga el principal."""
+    invalidar_principal(instance.usr_id)
+    invalidar_nombres_usuario(instance.usr_id)
+
+
+@receiver(post_save, sender=Rol)
+def invalidar_principal_rol(sender, instance, created, **kwargs):
+    """Cambio de código/nombre de rol → invalidar a todos sus usuarios."""
+    if created:
+        return
+    invalidar_principal(*instance.usuarios.values_list('usr_id', flat=True))
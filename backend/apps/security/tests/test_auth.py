@@ -211,3 +211,105 @@ class TestRolViewSet:
             'nivel': 4,
         }, format='json')
         assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+
+# ============================================================
+# Tests — Principal cacheado (HealthTechJWTAuthentication)
+# ============================================================
+class TestPrincipalCacheado:
+    """request.user se resuelve desde cache: 0 consultas de auth/RBAC."""
+
+    @pytest.fixture(autouse=True)
+    def _limpiar_cache(self):
+        from django.core.cache import cache
+        cache.clear()
+
+    @staticmethod
+    def _autenticar(usuario):
+        from django.test import RequestFactory
+        from rest_framework_simplejwt.tokens import AccessToken
+        from apps.security.authentication import HealthTechJWTAuthentication
+
+        token   = AccessToken.for_user(usuario)
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        user, _ = HealthTechJWTAuthentication().authenticate(request)
+        return user
+
+    def test_segundo_request_sin_consultas(self, usuario_medico, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            self._autenticar(usuario_medico)
+        with django_assert_num_queries(0):
+            user = self._autenticar(usuario_medico)
+            assert user.pk == usuario_medico.pk
+            assert user.hospital_id == usuario_medico.hospital_id
+            assert user.rol_codigo == 'MEDICO'
+            assert user.get_full_name() == 'Juan Pérez'
+
+    def test_cambio_de_rol_invalida_cache(self, usuario_medico, rol_admin):
+        assert self._autenticar(usuario_medico).rol_codigo == 'MEDICO'
+        usuario_medico.rol = rol_admin
+        usuario_medico.save()
+        assert self._autenticar(usuario_medico).rol_codigo == 'ADMIN_HOSPITAL'
+
+    def test_bloqueo_invalida_cache(self, usuario_medico):
+        from rest_framework.exceptions import AuthenticationFailed
+        self._autenticar(usuario_medico)
+        usuario_medico.cuenta_bloqueada = True
+        usuario_medico.save()
+        with pytest.raises(AuthenticationFailed):
+            self._autenticar(usuario_medico)
+
+    def test_request_user_asignable_a_fk(self, usuario_medico, hospital):
+        """El usuario del principal se puede asignar a created_by/updated_by."""
+        from apps.patients.models import Paciente
+        user = self._autenticar(usuario_medico)
+        paciente = Paciente.objects.create(
+            hospital_id=hospital.hospital_id, primer_nombre='Ana', primer_apellido='Soto',
+            tipo_documento='DPI', no_documento='111', fecha_nacimiento='1990-01-01',
+            sexo='F', no_expediente='EXP-1', created_by=user,
+        )
+        assert paciente.created_by_id == usuario_medico.pk
+
+
+# ============================================================
+# Tests — Reporte CSV de auditoría (streaming)
+# ============================================================
+class TestReporteAuditoria:
+    """Exportación HIPAA en streaming: BOM único, sin tope de filas, filtros del listado."""
+
+    @pytest.fixture
+    def client_super_admin(self, api_client, rol_super_admin, hospital):
+        from apps.security.models import Usuario
+        super_admin = Usuario.objects.create_user(
+            username='auditor.test', email='auditor@healthtech.gt',
+            password='Auditor2026!', hospital_id=hospital.hospital_id,
+            rol=rol_super_admin, primer_nombre='Eva', primer_apellido='Ruiz',
+            tipo_personal='ADMINISTRATIVO',
+        )
+        api_client.force_authenticate(user=super_admin)
+        return api_client
+
+    def test_reporte_csv_streaming(self, client_super_admin, hospital, usuario_medico):
+        from apps.security.models import AuditoriaAcceso
+        AuditoriaAcceso.objects.bulk_create([
+            AuditoriaAcceso(
+                hospital_id=hospital.pk, usuario=usuario_medico, tipo_evento='PHI_ACCESS',
+                modulo='patients', accion='READ', registro_id=str(i), ip_origen='10.0.0.1',
+            )
+            for i in range(5)
+        ] + [
+            AuditoriaAcceso(hospital_id=hospital.pk, tipo_evento='LOGIN_FAIL',
+                            username_intento='intruso', ip_origen='10.0.0.2', exitoso=False),
+        ])
+
+        resp = client_super_admin.get('/api/v1/auth/auditoria/reporte/', {'tipo_evento': 'PHI_ACCESS'})
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.streaming
+        contenido = b''.join(resp.streaming_content)
+        assert contenido.startswith(b'\xef\xbb\xbf"auditoria_id"')
+        assert contenido.count(b'\xef\xbb\xbf') == 1
+        lineas = contenido.decode('utf-8-sig').splitlines()
+        assert len(lineas) == 1 + 5              # Encabezado + PHI_ACCESS (filtro aplicado)
+        assert all('"dr.test"' in linea for linea in lineas[1:])
+        assert AuditoriaAcceso.objects.filter(tipo_evento='EXPORT').count() == 1
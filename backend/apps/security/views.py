@@ -4,9 +4,9 @@ Endpoints: Auth (login/logout/refresh), Usuarios, Roles, Auditoría
 """
 
 import csv
-import io
 import logging
-from django.http import HttpResponse
+from django.db import connections
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action
@@ -16,6 +16,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsSuperAdmin, IsAdminHospital, IsPersonalClinico
 from apps.security.models import (
     Hospital, Rol, Usuario, Sesion, AuditoriaAcceso
@@ -27,6 +28,7 @@ from apps.security.serializers import (
     DesbloquearUsuarioSerializer, AuditoriaAccesoSerializer,
 )
 from apps.security.tokens import CustomTokenObtainSerializer
+from config.oracle.router import reports_alias
 
 logger = logging.getLogger('healthtech.security')
 
@@ -299,6 +301,63 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         return Response({'detail': f'Usuario {usuario.username} desactivado.'})
 
 
+# ============================================================
+# Reporte CSV de auditoría (streaming)
+# ============================================================
+REPORTE_ENCABEZADO = [
+    'auditoria_id', 'timestamp', 'hospital_id',
+    'usuario', 'tipo_evento', 'modulo', 'accion',
+    'tabla_afectada', 'registro_id', 'ip_origen',
+    'exitoso', 'descripcion',
+]
+
+# Tuplas planas (values_list): sin instancias de modelo ni select_related
+REPORTE_COLUMNAS = (
+    'auditoria_id', 'created_at', 'hospital_id',
+    'usuario__username', 'username_intento', 'tipo_evento', 'modulo', 'accion',
+    'tabla_afectada', 'registro_id', 'ip_origen',
+    'exitoso', 'descripcion',
+)
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: writerow() devuelve la línea formateada."""
+    def write(self, value):
+        return value
+
+
+def _reporte_csv(rows, chunk_size: int):
+    """
+    Generador del CSV: BOM (Excel) + encabezado y luego bloques de
+    chunk_size filas. Memoria acotada por chunk_size, sin tope de filas.
+    """
+    writer = csv.writer(_Echo(), quoting=csv.QUOTE_ALL)
+    yield '\ufeff' + writer.writerow(REPORTE_ENCABEZADO)
+
+    bloque = []
+    for (aud_id, created_at, hospital_id, username, username_intento, tipo_evento,
+         modulo, accion, tabla, registro_id, ip, exitoso, descripcion) in rows.iterator(chunk_size=chunk_size):
+        bloque.append(writer.writerow([
+            aud_id,
+            created_at.strftime('%Y-%m-%d %H:%M:%S') if created_at else '',
+            hospital_id or '',
+            username or username_intento or 'anónimo',
+            tipo_evento,
+            modulo,
+            accion,
+            tabla or '',
+            registro_id or '',
+            ip or '',
+            'SÍ' if exitoso else 'NO',
+            descripcion or '',
+        ]))
+        if len(bloque) >= chunk_size:
+            yield ''.join(bloque)
+            bloque = []
+    if bloque:
+        yield ''.join(bloque)
+
+
 # ============================================================
 # AUDITORÍA (solo lectura — Auditores y Admin)
 # ============================================================
@@ -312,6 +371,8 @@ class AuditoriaAccesoViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields    = ['username_intento', 'ip_origen', 'descripcion']
     ordering_fields  = ['created_at']
     ordering         = ['-created_at']
+    pagination_class = KeysetPagination
+    reporte_chunk_size = 2000      # Filas por fetch y por bloque del CSV
 
     def get_permissions(self):
         from apps.core.permissions import IsAuditor
@@ -349,11 +410,14 @@ class AuditoriaAccesoViewSet(viewsets.ReadOnlyModelViewSet):
           usuario_id                — filtro por usuario (ID)
           format                    — 'csv' (por defecto) o 'json'
 
+        Respuesta en streaming (sin tope de filas): se recorre con iterator()
+        en bloques de reporte_chunk_size tuplas, memoria acotada.
         Registra el evento EXPORT en la propia tabla de auditoría.
         Requiere rol Auditor o Admin Hospital.
         """
-        # Usar el mismo queryset filtrado que el listado
-        qs = self.get_queryset().select_related('usuario', 'usuario__hospital')
+        # Mismo queryset y filtros (tipo_evento, modulo, exitoso…) que el listado,
+        # leído desde el servicio REPORTS (RAC Nodo 2) cuando existe.
+        qs = self.filter_queryset(self.get_queryset()).using(reports_alias())
 
         # Filtro adicional por usuario específico
         usuario_id = request.query_params.get('usuario_id')
@@ -375,49 +439,18 @@ class AuditoriaAccesoViewSet(viewsets.ReadOnlyModelViewSet):
             exitoso=True,
         )
 
-        # Limitar exportación a 50.000 registros para evitar timeouts
-        qs = qs[:50_000]
-
-        # ---- Generar CSV ----
-        output = io.StringIO()
-        writer = csv.writer(output, quoting=csv.QUOTE_ALL)
-
-        # Encabezado
-        writer.writerow([
-            'auditoria_id', 'timestamp', 'hospital_id',
-            'usuario', 'tipo_evento', 'modulo', 'accion',
-            'tabla_afectada', 'registro_id', 'ip_origen',
-            'exitoso', 'descripcion',
-        ])
-
-        for a in qs:
-            writer.writerow([
-                a.auditoria_id,
-                a.created_at.strftime('%Y-%m-%d %H:%M:%S') if a.created_at else '',
-                a.hospital_id or '',
-                a.usuario.username if a.usuario_id else (a.username_intento or 'anónimo'),
-                a.tipo_evento,
-                a.modulo,
-                a.accion,
-                a.tabla_afectada or '',
-                a.registro_id or '',
-                a.ip_origen or '',
-                'SÍ' if a.exitoso else 'NO',
-                a.descripcion or '',
-            ])
-
-        csv_content = output.getvalue()
+        # La sesión se obtiene aquí, con el contexto VPD del request todavía
+        # activo: el generador corre después de que el middleware lo limpia.
+        connections[qs.db].ensure_connection()
+
         filename = (
             f'healthtech_auditoria_hipaa_'
             f'{fecha_desde}_a_{fecha_hasta}.csv'
         ).replace(' ', '_')
 
-        response = HttpResponse(
-            csv_content,
+        response = StreamingHttpResponse(
+            _reporte_csv(qs.values_list(*REPORTE_COLUMNAS), self.reporte_chunk_size),
             content_type='text/csv; charset=utf-8',
         )
-        # UTF-8 BOM para compatibilidad con Excel
-        response.content = b'\xef\xbb\xbf' + csv_content.encode('utf-8')
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['X-Records-Exported'] = str(qs.count() if hasattr(qs, 'count') else 0)
         return response
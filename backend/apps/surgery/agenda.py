@@ -0,0 +1,225 @@
+"""
+HealthTech Solutions — Agenda de quirófanos (M06)
+Motor de programación sobre CIR_CIRUGIAS para un rango de fechas:
+
+  - Una sola lectura por rango (HOSPITAL_ID, FECHA_PROGRAMADA) →
+    IDX_CIR_TABLERO; solo columnas de agenda, sin PHI clínica.
+  - Índices de intervalos por quirófano y por personal (cirujano,
+    anestesiólogo): inicios ordenados + máximo acumulado de los fines.
+    Un solapamiento con [a, b) existe si max_fin[j-1] > a, con
+    j = bisect_left(inicios, b) → O(log n); listar los k conflictos es O(k).
+  - Tablero por quirófano y día, y métricas de utilización / huecos ociosos
+    dentro de la jornada (QUIROFANO_JORNADA_INICIO–FIN) a partir de la misma
+    lectura, en lugar de paginar GET /api/v1/surgery/.
+
+Intervalo de una cirugía: hora real si ya inició/terminó; si no, la
+programada. Fin programado = hora_fin_prog, o inicio + duracion_est_min, o
+inicio + CIRUGIA_DURACION_DEFECTO_MIN. Un fin <= inicio cruza la medianoche.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+
+from apps.surgery.models import ESTADOS_OCUPAN_QUIROFANO, Cirugia
+
+# Personal con agenda exclusiva durante la cirugía
+PERSONAL = ('cirujano', 'anestesiologo')
+
+CAMPOS_AGENDA = (
+    'cir_id', 'quirofano', 'cirujano_id', 'anestesiologo_id', 'estado', 'prioridad', 'tipo_cirugia',
+    'fecha_programada', 'hora_ini_prog', 'hora_fin_prog', 'duracion_est_min',
+    'fecha_inicio_real', 'hora_inicio_real', 'fecha_fin_real', 'hora_fin_real',
+    'paciente__no_expediente',
+)
+
+
+def intervalo(fecha: date, hora_ini: time, hora_fin: time | None, duracion_min: int | None) -> tuple:
+    """(inicio, fin) programados como datetimes naive."""
+    inicio = datetime.combine(fecha, hora_ini)
+    if hora_fin is not None:
+        fin = datetime.combine(fecha, hora_fin)
+        if fin <= inicio:
+            fin += timedelta(days=1)                   # Cruza la medianoche
+    else:
+        fin = inicio + timedelta(minutes=duracion_min or settings.CIRUGIA_DURACION_DEFECTO_MIN)
+    return inicio, fin
+
+
+def _intervalo_fila(fila: dict) -> tuple:
+    inicio, fin = intervalo(fila['fecha_programada'], fila['hora_ini_prog'],
+                            fila['hora_fin_prog'], fila['duracion_est_min'])
+    if fila['fecha_inicio_real'] and fila['hora_inicio_real']:
+        duracion = fin - inicio
+        inicio = datetime.combine(fila['fecha_inicio_real'], fila['hora_inicio_real'])
+        fin    = inicio + duracion
+    if fila['fecha_fin_real'] and fila['hora_fin_real']:
+        fin = max(inicio, datetime.combine(fila['fecha_fin_real'], fila['hora_fin_real']))
+    return inicio, fin
+
+
+# ============================================================
+# Índice de intervalos de un recurso
+# ============================================================
+class IndiceIntervalos:
+    """Intervalos [inicio, fin) de un recurso (quirófano o persona)."""
+
+    __slots__ = ('inicios', 'fines', 'max_fin', 'ids')
+
+    def __init__(self, intervalos):
+        ordenados = sorted(intervalos)
+        self.inicios = [i for i, _, _ in ordenados]
+        self.fines   = [f for _, f, _ in ordenados]
+        self.ids     = [c for _, _, c in ordenados]
+        self.max_fin, tope = [], None
+        for fin in self.fines:
+            tope = fin if tope is None or fin > tope else tope
+            self.max_fin.append(tope)
+
+    def solapa(self, inicio, fin) -> bool:
+        """¿Algún intervalo se cruza con [inicio, fin)? O(log n)."""
+        j = bisect_left(self.inicios, fin)
+        return j > 0 and self.max_fin[j - 1] > inicio
+
+    def conflictos(self, inicio, fin) -> list:
+        """ids de los intervalos que se cruzan con [inicio, fin)."""
+        j, encontrados = bisect_left(self.inicios, fin), []
+        for i in range(j - 1, -1, -1):
+            if self.max_fin[i] <= inicio:
+                break                                  # Ninguno anterior termina después de inicio
+            if self.fines[i] > inicio:
+                encontrados.append(self.ids[i])
+        return encontrados[::-1]
+
+
+# ============================================================
+# Agenda de un rango de fechas
+# ============================================================
+class AgendaQuirofanos:
+    """Cirugías que ocupan quirófano en [fecha_desde, fecha_hasta] con sus índices."""
+
+    def __init__(self, hospital_id: int, fecha_desde: date, fecha_hasta: date, excluir=None):
+        self.fecha_desde = fecha_desde
+        self.fecha_hasta = fecha_hasta
+        qs = (
+            Cirugia.objects.sin_tenant().del_hospital(hospital_id).activos()
+            # Un día antes: cirugías nocturnas que terminan dentro del rango
+            .filter(fecha_programada__range=(fecha_desde - timedelta(days=1), fecha_hasta),
+                    estado__in=ESTADOS_OCUPAN_QUIROFANO)
+        )
+        if excluir is not None:
+            qs = qs.exclude(pk=excluir)
+
+        self.cirugias = {}
+        por_quirofano, por_personal = defaultdict(list), defaultdict(list)
+        for fila in qs.values(*CAMPOS_AGENDA):
+            fila['inicio'], fila['fin'] = _intervalo_fila(fila)
+            self.cirugias[fila['cir_id']] = fila
+            por_quirofano[fila['quirofano']].append((fila['inicio'], fila['fin'], fila['cir_id']))
+            for rol in PERSONAL:
+                if fila[f'{rol}_id']:
+                    por_personal[fila[f'{rol}_id']].append((fila['inicio'], fila['fin'], fila['cir_id']))
+        self.quirofanos = {q: IndiceIntervalos(v) for q, v in por_quirofano.items()}
+        self.personal   = {u: IndiceIntervalos(v) for u, v in por_personal.items()}
+
+    # ---------- conflictos ----------
+    def conflictos(self, quirofano: str, inicio, fin, personal=()) -> dict:
+        """{recurso: [cir_id, …]} de las cirugías que chocan con la propuesta."""
+        choques = {}
+        if quirofano in self.quirofanos:
+            ids = self.quirofanos[quirofano].conflictos(inicio, fin)
+            if ids:
+                choques['quirofano'] = ids
+        for rol, usr_id in personal:
+            if usr_id in self.personal:
+                ids = self.personal[usr_id].conflictos(inicio, fin)
+                if ids:
+                    choques[rol] = ids
+        return choques
+
+    # ---------- tablero y utilización ----------
+    def _dias(self):
+        dia = self.fecha_desde
+        while dia <= self.fecha_hasta:
+            yield dia
+            dia += timedelta(days=1)
+
+    def _del_dia(self, quirofano: str, dia: date) -> list[dict]:
+        """Cirugías del quirófano que tocan el día, ordenadas por inicio."""
+        indice = self.quirofanos.get(quirofano)
+        if indice is None:
+            return []
+        desde, hasta = datetime.combine(dia, time.min), datetime.combine(dia + timedelta(days=1), time.min)
+        return [self.cirugias[c] for c in indice.conflictos(desde, hasta)]
+
+    def tablero(self, quirofano: str | None = None) -> list[dict]:
+        """Por día y quirófano: cirugías en orden de inicio (campos de agenda)."""
+        quirofanos = [quirofano] if quirofano else sorted(self.quirofanos)
+        resultado = []
+        for dia in self._dias():
+            for q in quirofanos:
+                cirugias = self._del_dia(q, dia)
+                if not cirugias:
+                    continue
+                resultado.append({
+                    'fecha':     dia,
+                    'quirofano': q,
+                    'cirugias':  [{
+                        'cir_id':              c['cir_id'],
+                        'inicio':              c['inicio'].strftime('%H:%M'),
+                        'fin':                 c['fin'].strftime('%H:%M'),
+                        'estado':              c['estado'],
+                        'prioridad':           c['prioridad'],
+                        'tipo_cirugia':        c['tipo_cirugia'],
+                        'cirujano':            c['cirujano_id'],
+                        'anestesiologo':       c['anestesiologo_id'],
+                        'paciente_expediente': c['paciente__no_expediente'],
+                    } for c in cirugias],
+                })
+        return resultado
+
+    def utilizacion(self, quirofano: str | None = None) -> list[dict]:
+        """
+        Por quirófano y día: minutos ocupados dentro de la jornada (unión de
+        intervalos), % de utilización y huecos ociosos >= QUIROFANO_HUECO_MIN.
+        """
+        ini_j = time.fromisoformat(settings.QUIROFANO_JORNADA_INICIO)
+        fin_j = time.fromisoformat(settings.QUIROFANO_JORNADA_FIN)
+        hueco_min = timedelta(minutes=max(1, settings.QUIROFANO_HUECO_MIN))
+        quirofanos = [quirofano] if quirofano else sorted(self.quirofanos)
+
+        resultado = []
+        for dia in self._dias():
+            jornada_ini, jornada_fin = datetime.combine(dia, ini_j), datetime.combine(dia, fin_j)
+            jornada = (jornada_fin - jornada_ini).total_seconds() / 60
+            for q in quirofanos:
+                cirugias = self._del_dia(q, dia)
+                ocupado, huecos, cursor = 0.0, [], jornada_ini
+                for c in cirugias:
+                    inicio, fin = max(c['inicio'], jornada_ini), min(c['fin'], jornada_fin)
+                    if fin <= cursor or fin <= inicio:
+                        continue                       # Ya cubierto o fuera de la jornada
+                    if inicio > cursor:
+                        if inicio - cursor >= hueco_min:
+                            huecos.append((cursor, inicio))
+                        ocupado += (fin - inicio).total_seconds() / 60
+                    else:
+                        ocupado += (fin - cursor).total_seconds() / 60
+                    cursor = fin
+                if jornada_fin - cursor >= hueco_min:
+                    huecos.append((cursor, jornada_fin))
+                resultado.append({
+                    'fecha':               dia,
+                    'quirofano':           q,
+                    'cirugias':            len(cirugias),
+                    'minutos_jornada':     int(jornada),
+                    'minutos_programados': int(ocupado),
+                    'minutos_libres':      int(jornada - ocupado),
+                    'utilizacion':         round(100 * ocupado / jornada, 1) if jornada else 0.0,
+                    'huecos':              [{'inicio': i.strftime('%H:%M'), 'fin': f.strftime('%H:%M'),
+                                             'minutos': int((f - i).total_seconds() // 60)} for i, f in huecos],
+                    'mayor_hueco':         max((int((f - i).total_seconds() // 60) for i, f in huecos), default=0),
+                })
+        return resultado
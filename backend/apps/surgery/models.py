@@ -14,6 +14,8 @@ Máquina de estados:
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 # ============================================================
 # Catálogos / choices
@@ -46,6 +48,8 @@ ESTADOS_COMPLETABLES = ('EN_CURSO',)
 ESTADOS_SUSPENDIBLES = ('EN_CURSO',)
 ESTADOS_CANCELABLES  = ('PROGRAMADA',)
 ESTADOS_ACTIVOS      = ('PROGRAMADA', 'EN_CURSO')
+# Estados que ocupan quirófano y personal (agenda, tablero, utilización)
+ESTADOS_OCUPAN_QUIROFANO = ('PROGRAMADA', 'EN_CURSO', 'COMPLETADA')
 
 
 # ============================================================
@@ -162,6 +166,8 @@ class Cirugia(models.Model):
     )
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'CIR_CIRUGIAS'
         verbose_name        = 'Cirugía'
@@ -3,12 +3,14 @@ HealthTech Solutions — Serializers: Módulo Cirugía (M06)
 HIPAA Data Minimization:
   - List: campos mínimos para tabla/agenda
   - Detail: campos completos con PHI
-  - Create: campos requeridos para programar
+  - Create: campos requeridos para programar + choques de agenda (agenda.py)
   - Actions: validaciones para transiciones de estado
 """
 
 from rest_framework import serializers
 
+from apps.core.serializers import NombreUsuarioField
+from .agenda import PERSONAL, AgendaQuirofanos, intervalo
 from .models import Cirugia, ESTADOS_ACTIVOS
 
 
@@ -18,7 +20,7 @@ from .models import Cirugia, ESTADOS_ACTIVOS
 class CirugiaListSerializer(serializers.ModelSerializer):
     paciente_nombre     = serializers.SerializerMethodField()
     paciente_expediente = serializers.SerializerMethodField()
-    cirujano_nombre     = serializers.SerializerMethodField()
+    cirujano_nombre     = NombreUsuarioField('cirujano', vacio='', usar_username=True)
     estado_display      = serializers.CharField(source='get_estado_display',       read_only=True)
     prioridad_display   = serializers.CharField(source='get_prioridad_display',    read_only=True)
     tipo_anestesia_display = serializers.CharField(source='get_tipo_anestesia_display', read_only=True)
@@ -51,12 +53,6 @@ class CirugiaListSerializer(serializers.ModelSerializer):
     def get_paciente_expediente(self, obj):
         return obj.paciente.no_expediente if obj.paciente else ''
 
-    def get_cirujano_nombre(self, obj):
-        u = obj.cirujano
-        if not u:
-            return ''
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() or u.username
-
     def get_hora_ini_fmt(self, obj):
         return obj.hora_ini_prog.strftime('%H:%M') if obj.hora_ini_prog else ''
 
@@ -68,9 +64,9 @@ class CirugiaListSerializer(serializers.ModelSerializer):
 # 2. CirugiaDetailSerializer — Vista detalle completa
 # ============================================================
 class CirugiaDetailSerializer(CirugiaListSerializer):
-    anestesiologo_nombre  = serializers.SerializerMethodField()
-    enfermero_inst_nombre = serializers.SerializerMethodField()
-    enfermero_circ_nombre = serializers.SerializerMethodField()
+    anestesiologo_nombre  = NombreUsuarioField('anestesiologo',  vacio='No asignado', usar_username=True)
+    enfermero_inst_nombre = NombreUsuarioField('enfermero_inst', vacio='No asignado', usar_username=True)
+    enfermero_circ_nombre = NombreUsuarioField('enfermero_circ', vacio='No asignado', usar_username=True)
     hora_inicio_real_fmt  = serializers.SerializerMethodField()
     hora_fin_real_fmt     = serializers.SerializerMethodField()
 
@@ -92,24 +88,6 @@ class CirugiaDetailSerializer(CirugiaListSerializer):
             'created_at', 'updated_at',
         ]
 
-    def get_anestesiologo_nombre(self, obj):
-        u = obj.anestesiologo
-        if not u:
-            return 'No asignado'
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() or u.username
-
-    def get_enfermero_inst_nombre(self, obj):
-        u = obj.enfermero_inst
-        if not u:
-            return 'No asignado'
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() or u.username
-
-    def get_enfermero_circ_nombre(self, obj):
-        u = obj.enfermero_circ
-        if not u:
-            return 'No asignado'
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() or u.username
-
     def get_hora_inicio_real_fmt(self, obj):
         return obj.hora_inicio_real.strftime('%H:%M') if obj.hora_inicio_real else ''
 
@@ -146,6 +124,29 @@ class CirugiaCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("El cirujano seleccionado no tiene una cuenta activa.")
         return value
 
+    def validate_quirofano(self, value):
+        return value.strip()
+
+    def validate(self, attrs):
+        """Rechaza choques de quirófano, cirujano o anestesiólogo (apps.surgery.agenda)."""
+        fecha = attrs['fecha_programada']
+        inicio, fin = intervalo(fecha, attrs['hora_ini_prog'], attrs.get('hora_fin_prog'),
+                                attrs.get('duracion_est_min'))
+        personal = [(rol, attrs[rol].pk) for rol in PERSONAL if attrs.get(rol)]
+        agenda = AgendaQuirofanos(self.context['request'].user.hospital_id, fecha, fin.date())
+        choques = agenda.conflictos(attrs['quirofano'], inicio, fin, personal)
+        if choques:
+            raise serializers.ValidationError({
+                recurso: [
+                    f'Choca con la cirugía #{c} '
+                    f'({agenda.cirugias[c]["inicio"]:%d/%m %H:%M}–{agenda.cirugias[c]["fin"]:%H:%M}, '
+                    f'quirófano {agenda.cirugias[c]["quirofano"]}).'
+                    for c in ids
+                ]
+                for recurso, ids in choques.items()
+            })
+        return attrs
+
     def create(self, validated_data):
         request = self.context['request']
         user    = request.user
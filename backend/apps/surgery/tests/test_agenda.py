@@ -0,0 +1,102 @@
+"""
+HealthTech Solutions — Tests: Agenda de quirófanos (apps/surgery/agenda.py)
+Cobertura:
+  - IndiceIntervalos: solapamiento O(log n) y conflictos con intervalos anidados
+  - Programar: rechaza choques de quirófano, cirujano y anestesiólogo
+  - Tablero y utilización / huecos ociosos por quirófano y día en una consulta
+"""
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.patients.models import Paciente
+from apps.security.models import Usuario
+from apps.surgery.agenda import IndiceIntervalos
+from apps.surgery.models import Cirugia
+
+URL    = '/api/v1/surgery/'
+MANANA = datetime.date.today() + datetime.timedelta(days=1)
+
+
+@pytest.fixture(autouse=True)
+def _jornada(settings):
+    settings.QUIROFANO_JORNADA_INICIO, settings.QUIROFANO_JORNADA_FIN = '07:00', '15:00'
+    settings.QUIROFANO_HUECO_MIN = 30
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+@pytest.fixture
+def paciente(hospital):
+    return Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-Q1', primer_nombre='Ana', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento='0000000000004', fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+
+
+@pytest.fixture
+def anestesiologo(usuario_medico):
+    return Usuario.objects.create_user(
+        username='dra.anest', email='dra.anest@healthtech.gt', password='TestPass2026!',
+        hospital_id=usuario_medico.hospital_id, rol=usuario_medico.rol,
+        primer_nombre='Lucía', primer_apellido='Ramos', tipo_personal='MEDICO',
+    )
+
+
+def _programar(cliente, paciente, cirujano, quirofano, inicio, fin, **extra):
+    return cliente.post(URL, {
+        'paciente': paciente.pk, 'cirujano': cirujano.pk, 'quirofano': quirofano,
+        'fecha_programada': str(MANANA), 'hora_ini_prog': inicio, 'hora_fin_prog': fin,
+        'tipo_cirugia': 'Apendicectomía laparoscópica', **extra,
+    }, format='json')
+
+
+def test_indice_intervalos():
+    def t(h):
+        return datetime.datetime(2026, 1, 1, h)
+
+    indice = IndiceIntervalos([(t(8), t(14), 1), (t(9), t(10), 2), (t(15), t(16), 3)])
+    assert indice.solapa(t(13), t(15)) and not indice.solapa(t(14), t(15))
+    assert indice.conflictos(t(9), t(16)) == [1, 2, 3]
+    assert indice.conflictos(t(11), t(12)) == [1]                   # Contenido en uno largo
+
+
+def test_programar_rechaza_choques(cliente, paciente, usuario_medico, anestesiologo):
+    assert _programar(cliente, paciente, usuario_medico, 'QX-1', '08:00', '10:00',
+                      anestesiologo=anestesiologo.pk).status_code == 201
+
+    r = _programar(cliente, paciente, anestesiologo, 'QX-1', '09:30', '11:00')
+    assert r.status_code == 400 and set(r.json()) == {'quirofano', 'cirujano'}   # Anestesióloga como cirujana
+    r = _programar(cliente, paciente, usuario_medico, 'QX-2', '09:00', '09:30')
+    assert r.status_code == 400 and set(r.json()) == {'cirujano'}
+    assert _programar(cliente, paciente, usuario_medico, 'QX-1', '10:00', '11:00').status_code == 201
+
+    # Sin hora de fin: duración estimada
+    r = _programar(cliente, paciente, usuario_medico, 'QX-2', '10:30', None, duracion_est_min=45)
+    assert r.status_code == 400 and set(r.json()) == {'cirujano'}
+    assert _programar(cliente, paciente, anestesiologo, 'QX-2', '10:30', None, duracion_est_min=45).status_code == 201
+
+
+def test_tablero_y_utilizacion(cliente, paciente, usuario_medico, anestesiologo):
+    for quirofano, inicio, fin, cirujano in [('QX-1', '07:00', '09:00', usuario_medico),
+                                             ('QX-1', '10:00', '11:00', usuario_medico),
+                                             ('QX-2', '08:00', '09:00', anestesiologo)]:
+        assert _programar(cliente, paciente, cirujano, quirofano, inicio, fin).status_code == 201
+    Cirugia.objects.filter(hora_ini_prog=datetime.time(8)).update(estado='CANCELADA')
+
+    with CaptureQueriesContext(connection) as consultas:
+        datos = cliente.get(f'{URL}utilizacion/', {'fecha': str(MANANA)}).json()
+    assert len([q for q in consultas if 'CIR_CIRUGIAS' in q['sql']]) == 1
+    qx1, = datos['resultados']                                      # La cancelada (QX-2) no ocupa
+    assert (qx1['minutos_programados'], qx1['utilizacion'], qx1['mayor_hueco']) == (180, 37.5, 240)
+    assert [h['inicio'] for h in qx1['huecos']] == ['09:00', '11:00']
+
+    tablero = cliente.get(f'{URL}tablero/', {'fecha': str(MANANA), 'quirofano': 'QX-1'}).json()
+    assert [c['inicio'] for c in tablero['resultados'][0]['cirugias']] == ['07:00', '10:00']
+    assert cliente.get(f'{URL}tablero/', {'fecha_desde': '2026-01-01', 'fecha_hasta': '2026-12-31'}).status_code == 400
@@ -4,7 +4,7 @@ ViewSet: CirugiaViewSet
 
 HIPAA: _audit_phi() registra cada acceso a datos PHI.
 RBAC:  IsPersonalClinico + SameHospitalOnly.
-VPD:   Filtro manual por hospital_id en DEV (Oracle VPD en PROD).
+VPD:   Filtro por hospital_id en DEV vía TenantManager (Oracle VPD en PROD).
 
 Máquina de estados:
   iniciar  : PROGRAMADA → EN_CURSO   (captura fecha/hora reales)
@@ -15,15 +15,17 @@ Máquina de estados:
 
 import datetime
 
+from django.conf import settings
 from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.audit import audit_phi_for
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
-from apps.security.models import AuditoriaAcceso
 
+from .agenda import AgendaQuirofanos
 from .models import (
     Cirugia,
     ESTADOS_INICIABLES,
@@ -41,26 +43,11 @@ from .serializers import (
     CirugiaFinalizarSerializer,
 )
 
-# En DEV, VPD está desactivado; el filtro se aplica manualmente
-VPD_ENABLED = False
-
-
 # ============================================================
 # Helper: Auditoría HIPAA
 # ============================================================
-def _audit_phi(request, resource_id, accion, detalle=''):
-    try:
-        AuditoriaAcceso.objects.create(
-            usuario_id=request.user.pk,
-            hospital_id=getattr(request.user, 'hospital_id', 1),
-            tabla_accedida='CIR_CIRUGIAS',
-            registro_id=resource_id,
-            accion=accion,
-            detalle=detalle,
-            ip_origen=request.META.get('REMOTE_ADDR', ''),
-        )
-    except Exception:
-        pass   # No interrumpir flujo clínico por fallo de auditoría
+# Pipeline asíncrono por lotes (apps.core.audit)
+_audit_phi = audit_phi_for('surgery', 'CIR_CIRUGIAS', 'cirugía')
 
 
 # ============================================================
@@ -71,6 +58,8 @@ class CirugiaViewSet(viewsets.ModelViewSet):
     CRUD de cirugías + acciones de máquina de estados.
 
     Endpoints adicionales:
+      GET  /tablero/        — Cirugías por quirófano y día (agenda.py)
+      GET  /utilizacion/    — Utilización y huecos ociosos por quirófano y día
       POST /{id}/iniciar/   — PROGRAMADA → EN_CURSO
       POST /{id}/completar/ — EN_CURSO   → COMPLETADA
       POST /{id}/suspender/ — EN_CURSO   → SUSPENDIDA
@@ -80,24 +69,17 @@ class CirugiaViewSet(viewsets.ModelViewSet):
     serializer_class   = CirugiaListSerializer
 
     # --------------------------------------------------------
-    # QuerySet con filtros VPD + query params
+    # QuerySet con filtro de hospital (TenantManager) + query params
     # --------------------------------------------------------
     def get_queryset(self):
-        user      = self.request.user
-        rol       = getattr(user, 'rol_codigo', '')
-        params    = self.request.query_params
+        params = self.request.query_params
 
-        qs = Cirugia.objects.filter(activo=True).select_related(
+        # Filtro de hospital: TenantManager
+        qs = Cirugia.objects.activos().select_related(
             'paciente', 'cirujano', 'anestesiologo',
             'enfermero_inst', 'enfermero_circ',
         )
 
-        # VPD manual
-        if not VPD_ENABLED and rol != 'SUPER_ADMIN':
-            hospital_id = getattr(user, 'hospital_id', None)
-            if hospital_id:
-                qs = qs.filter(hospital_id=hospital_id)
-
         # --- Filtros dinámicos ---
         if params.get('estado'):
             qs = qs.filter(estado=params['estado'])
@@ -106,7 +88,8 @@ class CirugiaViewSet(viewsets.ModelViewSet):
         if params.get('cirujano'):
             qs = qs.filter(cirujano_id=params['cirujano'])
         if params.get('quirofano'):
-            qs = qs.filter(quirofano__icontains=params['quirofano'])
+            # Igualdad (no icontains): usa IDX_CIR_AGENDA (HOSPITAL_ID, QUIROFANO, FECHA_PROGRAMADA)
+            qs = qs.filter(quirofano=params['quirofano'].strip())
         if params.get('fecha'):
             qs = qs.filter(fecha_programada=params['fecha'])
         if params.get('fecha_desde'):
@@ -144,7 +127,7 @@ class CirugiaViewSet(viewsets.ModelViewSet):
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         _audit_phi(
-            request, instance.cir_id, 'READ_DETAIL',
+            request, 'READ_DETAIL', instance.cir_id,
             f'Cirugía {instance.tipo_cirugia} — Paciente {instance.paciente_id}',
         )
         serializer = CirugiaDetailSerializer(instance, context={'request': request})
@@ -158,6 +141,60 @@ class CirugiaViewSet(viewsets.ModelViewSet):
         instance.updated_by_id = self.request.user.pk
         instance.save()
 
+    # ============================================================
+    # Agenda de quirófanos (una lectura por rango de fechas)
+    # ============================================================
+    def _agenda(self, request):
+        """AgendaQuirofanos para ?fecha= o ?fecha_desde=&fecha_hasta= (hoy por defecto)."""
+        params = request.query_params
+        try:
+            fecha_desde = datetime.date.fromisoformat(
+                params.get('fecha_desde') or params.get('fecha') or datetime.date.today().isoformat()
+            )
+            fecha_hasta = datetime.date.fromisoformat(params['fecha_hasta']) if params.get('fecha_hasta') \
+                else fecha_desde
+        except ValueError:
+            return None, Response({'detail': 'Fechas inválidas (formato YYYY-MM-DD).'},
+                                  status=status.HTTP_400_BAD_REQUEST)
+        dias_max = settings.QUIROFANO_RANGO_DIAS_MAX
+        if fecha_hasta < fecha_desde or (fecha_hasta - fecha_desde).days >= dias_max:
+            return None, Response({'detail': f'Rango de fechas inválido (máximo {dias_max} días).'},
+                                  status=status.HTTP_400_BAD_REQUEST)
+        return AgendaQuirofanos(request.user.hospital_id, fecha_desde, fecha_hasta), None
+
+    @action(detail=False, methods=['get'])
+    def tablero(self, request):
+        """
+        GET /api/v1/surgery/tablero/?fecha=&fecha_desde=&fecha_hasta=&quirofano=
+        Cirugías (programadas, en curso, completadas) por quirófano y día.
+        """
+        agenda, error = self._agenda(request)
+        if error:
+            return error
+        quirofano = (request.query_params.get('quirofano') or '').strip() or None
+        return Response({
+            'fecha_desde': agenda.fecha_desde,
+            'fecha_hasta': agenda.fecha_hasta,
+            'resultados':  agenda.tablero(quirofano),
+        })
+
+    @action(detail=False, methods=['get'])
+    def utilizacion(self, request):
+        """
+        GET /api/v1/surgery/utilizacion/?fecha=&fecha_desde=&fecha_hasta=&quirofano=
+        Minutos programados, % de utilización y huecos ociosos dentro de la jornada.
+        """
+        agenda, error = self._agenda(request)
+        if error:
+            return error
+        quirofano = (request.query_params.get('quirofano') or '').strip() or None
+        return Response({
+            'fecha_desde': agenda.fecha_desde,
+            'fecha_hasta': agenda.fecha_hasta,
+            'jornada':     {'inicio': settings.QUIROFANO_JORNADA_INICIO, 'fin': settings.QUIROFANO_JORNADA_FIN},
+            'resultados':  agenda.utilizacion(quirofano),
+        })
+
     # ============================================================
     # Máquina de estados
     # ============================================================
@@ -195,7 +232,7 @@ class CirugiaViewSet(viewsets.ModelViewSet):
         cirugia.save()
 
         _audit_phi(
-            request, cirugia.cir_id, 'CIR_INICIO',
+            request, 'CIR_INICIO', cirugia.cir_id,
             f'Cirugía iniciada: {cirugia.tipo_cirugia} — Qx {cirugia.quirofano}',
         )
         return Response(CirugiaDetailSerializer(cirugia, context={'request': request}).data)
@@ -242,7 +279,7 @@ class CirugiaViewSet(viewsets.ModelViewSet):
         cirugia.save()
 
         _audit_phi(
-            request, cirugia.cir_id, 'CIR_COMPLETADA',
+            request, 'CIR_COMPLETADA', cirugia.cir_id,
             f'Completada: {cirugia.tipo_cirugia} — '
             f'Duración real: {cirugia.duracion_real_min} min',
         )
@@ -271,7 +308,7 @@ class CirugiaViewSet(viewsets.ModelViewSet):
         cirugia.save()
 
         _audit_phi(
-            request, cirugia.cir_id, 'CIR_SUSPENDIDA',
+            request, 'CIR_SUSPENDIDA', cirugia.cir_id,
             f'Suspendida: {serializer.validated_data["motivo"][:80]}',
         )
         return Response(CirugiaDetailSerializer(cirugia, context={'request': request}).data)
@@ -300,7 +337,7 @@ class CirugiaViewSet(viewsets.ModelViewSet):
         cirugia.save()
 
         _audit_phi(
-            request, cirugia.cir_id, 'CIR_CANCELADA',
+            request, 'CIR_CANCELADA', cirugia.cir_id,
             f'Cancelada: {serializer.validated_data["motivo"][:80]}',
         )
         return Response(CirugiaDetailSerializer(cirugia, context={'request': request}).data)
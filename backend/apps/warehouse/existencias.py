@@ -0,0 +1,146 @@
+"""
+HealthTech Solutions — Existencias a una fecha (M09)
+"¿Cuánto había del producto X el día D?" o la valorización de cierre de mes
+obligaban a recorrer BOD_MOVIMIENTOS desde el primer movimiento.
+
+  - BOD_CORTES_STOCK guarda el saldo, precio y valor de cada producto al
+    cierre de un día (manage.py cortar_stock, nocturno).
+  - existencias(): parte del punto conocido más cercano a D —el último corte
+    <= D o el stock actual— y aplica solo los movimientos entre ese punto y
+    D, agregados por producto en la base (una consulta por IDX_BOD_MOV_FECHA):
+        corte:   saldo = STOCK(corte) + Σ movimientos (fin del corte, fin de D)
+        actual:  saldo = STOCK_ACTUAL  − Σ movimientos [fin de D, ahora)
+    Cada consulta lee O(días desde el punto de partida), no el historial.
+  - Valorización al precio del corte; sin corte, al precio vigente.
+  - movimientos(): kardex de un producto en [desde, hasta] con saldo
+    inicial calculado igual (IDX_BOD_MOV_PRO_FECHA).
+"""
+
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Max, Sum, When
+from django.utils import timezone
+
+from apps.warehouse.models import TIPOS_POSITIVOS, CorteStock, Movimiento, Producto
+
+CAMPOS_PRODUCTO = ('pro_id', 'codigo', 'nombre', 'categoria', 'unidad_medida', 'stock_actual', 'precio_unitario')
+
+
+def fin_del_dia(fecha: datetime.date) -> datetime.datetime:
+    """Primer instante del día siguiente (hora local): límite exclusivo de `fecha`."""
+    return timezone.make_aware(datetime.datetime.combine(fecha + datetime.timedelta(days=1), datetime.time.min))
+
+
+def netos(hospital_id: int, desde=None, hasta=None, productos=None) -> dict:
+    """{pro_id: entradas − salidas} de los movimientos con created_at en [desde, hasta)."""
+    qs = Movimiento.objects.sin_tenant().filter(hospital_id=hospital_id)
+    if desde is not None:
+        qs = qs.filter(created_at__gte=desde)
+    if hasta is not None:
+        qs = qs.filter(created_at__lt=hasta)
+    if productos is not None:
+        qs = qs.filter(producto_id__in=productos)
+    signado = Case(When(tipo_movimiento__in=TIPOS_POSITIVOS, then=F('cantidad')), default=-F('cantidad'))
+    return dict(qs.order_by().values('producto_id').annotate(neto=Sum(signado)).values_list('producto_id', 'neto'))
+
+
+def ultimo_corte(hospital_id: int, fecha: datetime.date) -> datetime.date | None:
+    return (CorteStock.objects.sin_tenant().filter(hospital_id=hospital_id, fecha__lte=fecha)
+            .aggregate(m=Max('fecha'))['m'])
+
+
+def existencias(hospital_id: int, fecha: datetime.date, productos=None, categoria: str | None = None,
+                hoy: datetime.date | None = None) -> dict:
+    """
+    Saldo de cada producto al cierre de `fecha`:
+      {'fecha', 'corte', 'origen': 'CORTE'|'ACTUAL', 'valor_total',
+       'productos': [{producto, codigo, nombre, categoria, unidad_medida, stock, precio_unitario, valor}]}
+    """
+    hoy = hoy or timezone.localdate()
+    limite = fin_del_dia(fecha)
+    qs = Producto.objects.sin_tenant().del_hospital(hospital_id).filter(created_at__lt=limite)
+    if productos is not None:
+        qs = qs.filter(pk__in=productos)
+    if categoria:
+        qs = qs.filter(categoria=categoria)
+    filas = list(qs.order_by('nombre', 'pro_id').values_list(*CAMPOS_PRODUCTO))
+    ids = [f[0] for f in filas]
+
+    corte = ultimo_corte(hospital_id, fecha)
+    # Punto de partida más cercano: el corte hacia adelante o el stock actual hacia atrás
+    usar_corte = corte is not None and (fecha - corte) <= (hoy - fecha)
+    base, sin_corte = {}, ids
+    if usar_corte:
+        base = {p: (s, precio) for p, s, precio in CorteStock.objects.sin_tenant()
+                .filter(hospital_id=hospital_id, fecha=corte, producto_id__in=ids)
+                .values_list('producto_id', 'stock', 'precio_unitario')}
+        adelante = netos(hospital_id, fin_del_dia(corte), limite, list(base)) if base else {}
+        sin_corte = [p for p in ids if p not in base]
+    atras = netos(hospital_id, limite, None, sin_corte) if sin_corte and fecha < hoy else {}
+
+    lista, total = [], Decimal(0)
+    for pro_id, codigo, nombre, cat, unidad, stock_actual, precio in filas:
+        if pro_id in base:
+            stock, precio = base[pro_id]
+            stock += adelante.get(pro_id, 0)
+        else:
+            stock = stock_actual - atras.get(pro_id, 0)
+        valor = stock * precio
+        total += valor
+        lista.append({
+            'producto': pro_id, 'codigo': codigo, 'nombre': nombre, 'categoria': cat,
+            'unidad_medida': unidad, 'stock': stock, 'precio_unitario': precio, 'valor': valor,
+        })
+    return {
+        'fecha':       fecha,
+        'corte':       corte if usar_corte else None,
+        'origen':      'CORTE' if usar_corte else 'ACTUAL',
+        'valor_total': total,
+        'productos':   lista,
+    }
+
+
+def movimientos(hospital_id: int, producto_id: int, desde: datetime.date, hasta: datetime.date) -> dict:
+    """Kardex de [desde, hasta]: saldo inicial, movimientos (hasta el máximo configurado) y saldo final."""
+    inicial = existencias(hospital_id, desde - datetime.timedelta(days=1), productos=[producto_id])['productos']
+    saldo_inicial = inicial[0]['stock'] if inicial else Decimal(0)
+    filas = list(
+        Movimiento.objects.sin_tenant()
+        .filter(hospital_id=hospital_id, producto_id=producto_id,
+                created_at__gte=fin_del_dia(desde - datetime.timedelta(days=1)), created_at__lt=fin_del_dia(hasta))
+        .order_by('created_at', 'mov_id')
+        .values('mov_id', 'created_at', 'tipo_movimiento', 'cantidad', 'cantidad_anterior',
+                'cantidad_posterior', 'motivo', 'referencia', 'departamento')
+        [:settings.BODEGA_KARDEX_MAX_MOVIMIENTOS + 1]
+    )
+    truncado = len(filas) > settings.BODEGA_KARDEX_MAX_MOVIMIENTOS
+    filas = filas[:settings.BODEGA_KARDEX_MAX_MOVIMIENTOS]
+    saldo_final = saldo_inicial + sum(
+        (f['cantidad'] if f['tipo_movimiento'] in TIPOS_POSITIVOS else -f['cantidad'] for f in filas), Decimal(0),
+    )
+    return {
+        'producto':      producto_id,
+        'desde':         desde,
+        'hasta':         hasta,
+        'saldo_inicial': saldo_inicial,
+        'saldo_final':   None if truncado else saldo_final,
+        'truncado':      truncado,
+        'movimientos':   filas,
+    }
+
+
+def cortar(hospital_id: int, fecha: datetime.date) -> int:
+    """Escribe (o reescribe) el corte de `fecha` para todos los productos del hospital."""
+    with transaction.atomic():
+        # Borrar primero: al reescribir, el saldo se recalcula desde el corte anterior
+        CorteStock.objects.sin_tenant().filter(hospital_id=hospital_id, fecha=fecha).delete()
+        datos = existencias(hospital_id, fecha)
+        CorteStock.objects.bulk_create([
+            CorteStock(hospital_id=hospital_id, producto_id=p['producto'], fecha=fecha, stock=p['stock'],
+                       precio_unitario=p['precio_unitario'], valor=p['valor'])
+            for p in datos['productos']
+        ], batch_size=settings.BODEGA_LOTE_BATCH)
+    return len(datos['productos'])
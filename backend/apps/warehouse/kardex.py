@@ -0,0 +1,160 @@
+"""
+HealthTech Solutions — Kardex de bodega (M09)
+Antes MovimientoCreateSerializer guardaba como CANTIDAD_ANTERIOR el
+stock_actual leído al validar y luego aplicaba un F() incondicional: con
+dos movimientos simultáneos el kardex quedaba con anterior/posterior
+falsos y una salida podía dejar el stock negativo pese a validate().
+
+  - registrar(): un movimiento, UPDATE condicional
+        UPDATE BOD_PRODUCTOS SET STOCK_ACTUAL = STOCK_ACTUAL ± :qty
+         WHERE PRO_ID = :id [AND STOCK_ACTUAL >= :qty]
+    0 filas = stock insuficiente. La fila queda bloqueada por el UPDATE
+    hasta el commit, así que el saldo releído es el posterior real y el
+    anterior se deduce de él (Django no expone UPDATE … RETURNING).
+  - aplicar_lote(): cientos de movimientos (recepción de un proveedor,
+    conteo físico mensual) en una transacción. Bloquea los productos del
+    lote en orden de PRO_ID (SELECT … FOR UPDATE, sin interbloqueos entre
+    lotes), encadena anterior/posterior por producto en el orden recibido,
+    escribe los saldos con un solo executemany (array DML) y los
+    movimientos con bulk_create. Si un movimiento dejaría el stock negativo
+    se rechaza el grupo completo de ese producto (o todo el lote con
+    todo_o_nada).
+  - CONTEO: tipo solo de entrada; `cantidad` es el stock contado y se
+    convierte en AJUSTE_POSITIVO / AJUSTE_NEGATIVO por la diferencia con el
+    saldo del momento (sin movimiento si coincide).
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.warehouse.models import TIPOS_POSITIVOS, Movimiento, Producto
+
+CONTEO = 'CONTEO'
+CAMPOS_TEXTO = ('motivo', 'referencia', 'departamento', 'proveedor')
+
+
+class StockInsuficiente(Exception):
+    """La salida dejaría el stock negativo; `disponible` es el saldo actual."""
+
+    def __init__(self, disponible):
+        super().__init__('Stock insuficiente')
+        self.disponible = disponible
+
+
+class LoteRechazado(Exception):
+    """todo_o_nada: algún movimiento del lote no pudo aplicarse (se revierte todo)."""
+
+    def __init__(self, resultado):
+        super().__init__('Lote rechazado')
+        self.resultado = resultado
+
+
+def _saldo(producto_id: int):
+    return Producto.objects.sin_tenant().values_list('stock_actual', flat=True).get(pk=producto_id)
+
+
+def registrar(hospital_id: int, usuario_id: int, producto, tipo_movimiento: str, cantidad, **campos) -> Movimiento:
+    """Aplica un movimiento y lo registra con el saldo real. Lanza StockInsuficiente."""
+    delta = cantidad if tipo_movimiento in TIPOS_POSITIVOS else -cantidad
+    with transaction.atomic():
+        qs = Producto.objects.sin_tenant().filter(pk=producto.pk)
+        if delta < 0:
+            qs = qs.filter(stock_actual__gte=cantidad)
+        if not qs.update(stock_actual=F('stock_actual') + delta, updated_by_id=usuario_id,
+                         updated_at=timezone.now()):
+            raise StockInsuficiente(_saldo(producto.pk))
+        posterior = _saldo(producto.pk)
+        producto.stock_actual = posterior
+        return Movimiento.objects.create(
+            hospital_id=hospital_id, producto=producto, tipo_movimiento=tipo_movimiento, cantidad=cantidad,
+            cantidad_anterior=posterior - delta, cantidad_posterior=posterior, created_by_id=usuario_id,
+            **campos,
+        )
+
+
+def _resolver(tipo: str, cantidad, saldo):
+    """(tipo, cantidad) efectivos; CONTEO → ajuste por la diferencia (None si coincide)."""
+    if tipo != CONTEO:
+        return tipo, cantidad
+    diferencia = cantidad - saldo
+    if not diferencia:
+        return None
+    return ('AJUSTE_POSITIVO', diferencia) if diferencia > 0 else ('AJUSTE_NEGATIVO', -diferencia)
+
+
+def aplicar_lote(hospital_id: int, usuario_id: int, items: list[dict], todo_o_nada: bool = False) -> dict:
+    """
+    Aplica `items` ({producto, tipo_movimiento, cantidad, motivo, …}). Devuelve
+      {'aplicados': [índice], 'rechazados': [{indice, producto, motivo, …}],
+       'productos': [{producto, movimientos, stock_anterior, stock_actual}]}
+    Lanza LoteRechazado (sin cambios) si todo_o_nada y hubo rechazos.
+    """
+    grupos = defaultdict(list)
+    for indice, item in enumerate(items):
+        grupos[item['producto']].append((indice, item))
+
+    with transaction.atomic():
+        saldos = dict(
+            Producto.objects.sin_tenant().del_hospital(hospital_id)
+            .select_for_update()
+            .filter(pk__in=list(grupos))
+            .order_by('pk')
+            .values_list('pro_id', 'stock_actual')
+        )
+        aplicados, rechazados, resumen, movimientos = [], [], [], []
+        for pro_id in sorted(grupos):
+            grupo = grupos[pro_id]
+            if pro_id not in saldos:
+                rechazados += [{'indice': i, 'producto': pro_id, 'motivo': 'NO_ENCONTRADO'} for i, _ in grupo]
+                continue
+
+            inicial = saldo = saldos[pro_id]
+            nuevos, falla = [], None
+            for indice, item in grupo:
+                efectivo = _resolver(item['tipo_movimiento'], item['cantidad'], saldo)
+                if efectivo is None:
+                    continue
+                tipo, cantidad = efectivo
+                posterior = saldo + cantidad if tipo in TIPOS_POSITIVOS else saldo - cantidad
+                if posterior < 0:
+                    falla = {'indice': indice, 'requerido': cantidad, 'disponible': saldo}
+                    break
+                nuevos.append(Movimiento(
+                    hospital_id=hospital_id, producto_id=pro_id, tipo_movimiento=tipo, cantidad=cantidad,
+                    cantidad_anterior=saldo, cantidad_posterior=posterior, created_by_id=usuario_id,
+                    **{c: item.get(c, '') for c in CAMPOS_TEXTO},
+                ))
+                saldo = posterior
+
+            if falla:
+                rechazados += [{'indice': i, 'producto': pro_id, 'motivo': 'STOCK_INSUFICIENTE',
+                                **(falla if i == falla['indice'] else {})} for i, _ in grupo]
+                continue
+            aplicados += [i for i, _ in grupo]
+            movimientos += nuevos
+            saldos[pro_id] = saldo
+            resumen.append({'producto': pro_id, 'movimientos': len(nuevos),
+                            'stock_anterior': inicial, 'stock_actual': saldo})
+
+        resultado = {'aplicados': sorted(aplicados), 'rechazados': rechazados, 'productos': resumen}
+        if todo_o_nada and rechazados:
+            raise LoteRechazado(resultado)
+
+        cambiados = [r for r in resumen if r['movimientos']]
+        if cambiados:
+            ops, qn = connection.ops, connection.ops.quote_name
+            ahora = ops.adapt_datetimefield_value(timezone.now())
+            campo = Producto._meta.get_field('stock_actual')
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'UPDATE {qn(Producto._meta.db_table)} SET {qn(campo.column)} = %s, '
+                    f'{qn("UPDATED_BY")} = %s, {qn("UPDATED_AT")} = %s WHERE {qn(Producto._meta.pk.column)} = %s',
+                    [(ops.adapt_decimalfield_value(r['stock_actual'], campo.max_digits, campo.decimal_places),
+                      usuario_id, ahora, r['producto']) for r in cambiados],
+                )
+            Movimiento.objects.bulk_create(movimientos, batch_size=settings.BODEGA_LOTE_BATCH)
+    return resultado
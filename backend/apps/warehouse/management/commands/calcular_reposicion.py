@@ -0,0 +1,35 @@
+"""
+manage.py calcular_reposicion
+=============================
+Recalcula el pronóstico de consumo y los puntos de reorden de bodega y
+farmacia (apps.warehouse.reposicion) y los deja en BOD_PUNTOS_REORDEN para
+GET /api/v1/warehouse/alertas/. Pensado para cron nocturno, después de
+cortar_stock.
+
+Uso:
+    python manage.py calcular_reposicion
+    python manage.py calcular_reposicion --hospital 3 --hospital 5
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.warehouse import reposicion
+
+
+class Command(BaseCommand):
+    help = 'Recalcula consumo pronosticado y puntos de reorden (BOD_PUNTOS_REORDEN).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hospital', type=int, action='append', help='Solo este hospital_id (repetible).')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        conteos = reposicion.calcular(options['hospital'])
+        for hospital_id, n in sorted(conteos.items()):
+            self.stdout.write(f'  Hospital {hospital_id}: {n} ítems')
+        self.stdout.write(self.style.SUCCESS(
+            f'Puntos de reorden recalculados: {sum(conteos.values())} ítems '
+            f'en {time.perf_counter() - inicio:.1f}s.'
+        ))
@@ -0,0 +1,66 @@
+"""
+manage.py cortar_stock
+======================
+Escribe en BOD_CORTES_STOCK el saldo, precio y valor de cada producto al
+cierre de un día (por defecto ayer), a partir del corte anterior más los
+movimientos del intervalo (apps.warehouse.existencias). Pensado para cron
+nocturno: GET /productos/existencias/ y /productos/{id}/kardex/ parten del
+corte más cercano en lugar de recorrer todo BOD_MOVIMIENTOS.
+
+Reejecutar una fecha reescribe su corte. Con --desde se cortan todos los
+días de [desde, fecha] en orden (carga inicial o días sin cron).
+
+Uso:
+    python manage.py cortar_stock
+    python manage.py cortar_stock --fecha 2026-09-30 --hospital 3
+    python manage.py cortar_stock --desde 2026-01-31 --fecha 2026-09-30 --mensual
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.warehouse import existencias
+from apps.warehouse.models import Producto
+
+
+class Command(BaseCommand):
+    help = 'Escribe el corte de stock diario (BOD_CORTES_STOCK).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', type=datetime.date.fromisoformat,
+                            help='Día a cortar (YYYY-MM-DD, default ayer).')
+        parser.add_argument('--desde', type=datetime.date.fromisoformat,
+                            help='Cortar también los días desde esta fecha.')
+        parser.add_argument('--mensual', action='store_true',
+                            help='Con --desde, solo el último día de cada mes.')
+        parser.add_argument('--hospital', type=int, help='Solo este hospital_id.')
+
+    def handle(self, *args, **options):
+        hoy   = timezone.localdate()
+        fecha = options['fecha'] or hoy - datetime.timedelta(days=1)
+        if fecha >= hoy:
+            raise CommandError('Solo se cortan días cerrados (fecha anterior a hoy).')
+        desde = options['desde'] or fecha
+        if desde > fecha:
+            raise CommandError('--desde debe ser anterior o igual a --fecha.')
+
+        dias = [desde + datetime.timedelta(days=i) for i in range((fecha - desde).days + 1)]
+        if options['mensual']:
+            dias = [d for d in dias if (d + datetime.timedelta(days=1)).day == 1] or [fecha]
+
+        if options['hospital']:
+            hospitales = [options['hospital']]
+        else:
+            hospitales = list(Producto.objects.sin_tenant()
+                              .order_by('hospital_id').values_list('hospital_id', flat=True).distinct())
+
+        for hospital_id in hospitales:
+            for dia in dias:
+                n = existencias.cortar(hospital_id, dia)
+                self.stdout.write(f'  Hospital {hospital_id} — {dia}: {n} productos')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Cortes de stock escritos: {len(hospitales)} hospitales × {len(dias)} días.'
+        ))
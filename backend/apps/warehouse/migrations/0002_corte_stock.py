@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-18 13:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorteStock',
+            fields=[
+                ('cor_id', models.AutoField(db_column='COR_ID', primary_key=True, serialize=False)),
+                ('hospital_id', models.IntegerField(db_column='HOSPITAL_ID')),
+                ('fecha', models.DateField(db_column='FECHA')),
+                ('stock', models.DecimalField(db_column='STOCK', decimal_places=3, max_digits=12)),
+                ('precio_unitario', models.DecimalField(db_column='PRECIO_UNITARIO', decimal_places=4, max_digits=12)),
+                ('valor', models.DecimalField(db_column='VALOR', decimal_places=4, max_digits=18)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_column='CREATED_AT')),
+                ('producto', models.ForeignKey(db_column='PRO_ID', on_delete=django.db.models.deletion.PROTECT, related_name='cortes', to='warehouse.producto')),
+            ],
+            options={
+                'verbose_name': 'Corte de stock',
+                'verbose_name_plural': 'Cortes de stock',
+                'db_table': 'BOD_CORTES_STOCK',
+                'indexes': [],
+                'unique_together': {('hospital_id', 'fecha', 'producto')},
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouse', '0002_corte_stock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PuntoReorden',
+            fields=[
+                ('rep_id', models.AutoField(db_column='REP_ID', primary_key=True, serialize=False)),
+                ('hospital_id', models.IntegerField(db_column='HOSPITAL_ID')),
+                ('origen', models.CharField(choices=[('BODEGA', 'Bodega'), ('FARMACIA', 'Farmacia')], db_column='ORIGEN', max_length=10)),
+                ('item_id', models.IntegerField(db_column='ITEM_ID')),
+                ('nombre', models.CharField(db_column='NOMBRE', max_length=200)),
+                ('unidad_medida', models.CharField(blank=True, db_column='UNIDAD_MEDIDA', default='', max_length=30)),
+                ('stock_actual', models.DecimalField(db_column='STOCK_ACTUAL', decimal_places=3, max_digits=12)),
+                ('stock_minimo', models.DecimalField(db_column='STOCK_MINIMO', decimal_places=3, max_digits=12)),
+                ('consumo_diario', models.DecimalField(db_column='CONSUMO_DIARIO', decimal_places=3, max_digits=12)),
+                ('desviacion', models.DecimalField(db_column='DESVIACION', decimal_places=3, max_digits=12)),
+                ('dias_con_consumo', models.IntegerField(db_column='DIAS_CON_CONSUMO', default=0)),
+                ('dias_cobertura', models.DecimalField(blank=True, db_column='DIAS_COBERTURA', decimal_places=1, max_digits=8, null=True)),
+                ('stock_seguridad', models.DecimalField(db_column='STOCK_SEGURIDAD', decimal_places=3, max_digits=12)),
+                ('punto_reorden', models.DecimalField(db_column='PUNTO_REORDEN', decimal_places=3, max_digits=12)),
+                ('cantidad_sugerida', models.DecimalField(db_column='CANTIDAD_SUGERIDA', decimal_places=3, max_digits=12)),
+                ('nivel', models.CharField(choices=[('AGOTADO', 'Agotado'), ('CRITICO', 'Crítico — se agota antes de reponer'), ('REORDENAR', 'Bajo el punto de reorden'), ('OK', 'OK')], db_column='NIVEL', max_length=10)),
+                ('prioridad', models.IntegerField(db_column='PRIORIDAD')),
+                ('calculado_at', models.DateTimeField(db_column='CALCULADO_AT')),
+            ],
+            options={
+                'verbose_name': 'Punto de reorden',
+                'verbose_name_plural': 'Puntos de reorden',
+                'db_table': 'BOD_PUNTOS_REORDEN',
+                'ordering': ['prioridad'],
+                'indexes': [],
+                'unique_together': {('hospital_id', 'origen', 'item_id')},
+            },
+        ),
+    ]
@@ -1,6 +1,6 @@
 """
 HealthTech Solutions — Models: Módulo Bodega / Inventario (M09)
-Tablas: BOD_PRODUCTOS, BOD_MOVIMIENTOS
+Tablas: BOD_PRODUCTOS, BOD_MOVIMIENTOS, BOD_CORTES_STOCK, BOD_PUNTOS_REORDEN
 
 No contiene PHI (datos de pacientes).
 VPD: HOSPITAL_ID para multitenancy.
@@ -16,6 +16,8 @@ Movimientos de inventario:
 
 from django.db import models
 
+from apps.core.managers import TenantManager
+
 
 CATEGORIA_CHOICES = [
     ('MATERIAL_MEDICO',    'Material Médico'),
@@ -39,6 +41,22 @@ TIPO_MOV_CHOICES = [
 TIPOS_POSITIVOS = ('ENTRADA', 'AJUSTE_POSITIVO')
 # Movimientos que requieren stock suficiente
 TIPOS_NEGATIVOS = ('SALIDA', 'AJUSTE_NEGATIVO', 'BAJA')
+# Movimientos que cuentan como consumo (pronóstico de reposición)
+TIPOS_CONSUMO = ('SALIDA', 'BAJA')
+
+ORIGEN_REPOSICION_CHOICES = [
+    ('BODEGA',   'Bodega'),
+    ('FARMACIA', 'Farmacia'),
+]
+
+NIVEL_REPOSICION_CHOICES = [
+    ('AGOTADO',   'Agotado'),
+    ('CRITICO',   'Crítico — se agota antes de reponer'),
+    ('REORDENAR', 'Bajo el punto de reorden'),
+    ('OK',        'OK'),
+]
+# Niveles que aparecen en /alertas/, del más urgente al menos urgente
+NIVELES_ALERTA = ('AGOTADO', 'CRITICO', 'REORDENAR')
 
 
 class Producto(models.Model):
@@ -78,6 +96,8 @@ class Producto(models.Model):
     )
     updated_at = models.DateTimeField(db_column='UPDATED_AT', auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'BOD_PRODUCTOS'
         verbose_name        = 'Producto'
@@ -102,7 +122,8 @@ class Producto(models.Model):
 class Movimiento(models.Model):
     """
     Registro inmutable de cada movimiento de inventario.
-    Cada movimiento actualiza el stock_actual del Producto (con F()).
+    Cada movimiento actualiza el stock_actual del Producto con un UPDATE
+    condicional y guarda el saldo real anterior/posterior (apps.warehouse.kardex).
     """
     mov_id      = models.AutoField(db_column='MOV_ID', primary_key=True)
     hospital_id = models.IntegerField(db_column='HOSPITAL_ID')
@@ -131,6 +152,8 @@ class Movimiento(models.Model):
     )
     created_at  = models.DateTimeField(db_column='CREATED_AT', auto_now_add=True)
 
+    objects = TenantManager()
+
     class Meta:
         db_table            = 'BOD_MOVIMIENTOS'
         verbose_name        = 'Movimiento'
@@ -140,3 +163,81 @@ class Movimiento(models.Model):
 
     def __str__(self):
         return f'[MOV-{self.mov_id}] {self.tipo_movimiento} {self.cantidad} {self.producto.nombre}'
+
+
+class CorteStock(models.Model):
+    """
+    Saldo y valorización de un producto al cierre de un día.
+    Lo escribe `manage.py cortar_stock`; apps.warehouse.existencias parte del
+    corte más cercano y suma solo los movimientos posteriores.
+    """
+    cor_id      = models.AutoField(db_column='COR_ID', primary_key=True)
+    hospital_id = models.IntegerField(db_column='HOSPITAL_ID')
+
+    producto    = models.ForeignKey(
+        'warehouse.Producto',
+        db_column='PRO_ID', on_delete=models.PROTECT,
+        related_name='cortes',
+    )
+    fecha           = models.DateField(db_column='FECHA')
+    stock           = models.DecimalField(db_column='STOCK',           max_digits=12, decimal_places=3)
+    precio_unitario = models.DecimalField(db_column='PRECIO_UNITARIO', max_digits=12, decimal_places=4)
+    valor           = models.DecimalField(db_column='VALOR',           max_digits=18, decimal_places=4)
+
+    created_at  = models.DateTimeField(db_column='CREATED_AT', auto_now_add=True)
+
+    objects = TenantManager()
+
+    class Meta:
+        db_table            = 'BOD_CORTES_STOCK'
+        verbose_name        = 'Corte de stock'
+        verbose_name_plural = 'Cortes de stock'
+        unique_together     = [['hospital_id', 'fecha', 'producto']]
+        indexes             = []
+
+    def __str__(self):
+        return f'[COR-{self.cor_id}] PRO-{self.producto_id} {self.fecha}: {self.stock}'
+
+
+class PuntoReorden(models.Model):
+    """
+    Pronóstico de consumo y punto de reorden sugerido de un ítem de bodega
+    (PRO_ID) o farmacia (MED_ID). Lo recalcula cada noche
+    `manage.py calcular_reposicion` (apps.warehouse.reposicion); PRIORIDAD
+    ya trae el orden de GET /alertas/.
+    """
+    rep_id      = models.AutoField(db_column='REP_ID', primary_key=True)
+    hospital_id = models.IntegerField(db_column='HOSPITAL_ID')
+
+    origen  = models.CharField(db_column='ORIGEN', max_length=10, choices=ORIGEN_REPOSICION_CHOICES)
+    item_id = models.IntegerField(db_column='ITEM_ID')             # PRO_ID o MED_ID según ORIGEN
+    nombre        = models.CharField(db_column='NOMBRE',        max_length=200)
+    unidad_medida = models.CharField(db_column='UNIDAD_MEDIDA', max_length=30, blank=True, default='')
+
+    stock_actual      = models.DecimalField(db_column='STOCK_ACTUAL',      max_digits=12, decimal_places=3)
+    stock_minimo      = models.DecimalField(db_column='STOCK_MINIMO',      max_digits=12, decimal_places=3)
+    consumo_diario    = models.DecimalField(db_column='CONSUMO_DIARIO',    max_digits=12, decimal_places=3)
+    desviacion        = models.DecimalField(db_column='DESVIACION',        max_digits=12, decimal_places=3)
+    dias_con_consumo  = models.IntegerField(db_column='DIAS_CON_CONSUMO',  default=0)
+    dias_cobertura    = models.DecimalField(db_column='DIAS_COBERTURA',    max_digits=8,  decimal_places=1,
+                                            null=True, blank=True)      # NULL = sin consumo
+    stock_seguridad   = models.DecimalField(db_column='STOCK_SEGURIDAD',   max_digits=12, decimal_places=3)
+    punto_reorden     = models.DecimalField(db_column='PUNTO_REORDEN',     max_digits=12, decimal_places=3)
+    cantidad_sugerida = models.DecimalField(db_column='CANTIDAD_SUGERIDA', max_digits=12, decimal_places=3)
+    nivel     = models.CharField(db_column='NIVEL', max_length=10, choices=NIVEL_REPOSICION_CHOICES)
+    prioridad = models.IntegerField(db_column='PRIORIDAD')
+
+    calculado_at = models.DateTimeField(db_column='CALCULADO_AT')
+
+    objects = TenantManager()
+
+    class Meta:
+        db_table            = 'BOD_PUNTOS_REORDEN'
+        verbose_name        = 'Punto de reorden'
+        verbose_name_plural = 'Puntos de reorden'
+        ordering            = ['prioridad']
+        unique_together     = [['hospital_id', 'origen', 'item_id']]
+        indexes             = []
+
+    def __str__(self):
+        return f'[{self.origen}-{self.item_id}] {self.nombre}: {self.nivel}'
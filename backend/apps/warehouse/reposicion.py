@@ -0,0 +1,160 @@
+"""
+HealthTech Solutions — Pronóstico de consumo y puntos de reorden (M08/M09)
+STOCK_MINIMO de BOD_PRODUCTOS y FAR_MEDICAMENTOS es un número fijo escrito a
+mano y no había lista de faltantes más allá de filtrar el catálogo.
+
+  - Consumo diario de REPOSICION_VENTANA_DIAS días cerrados, agregado en la
+    base para todos los hospitales: BOD_MOVIMIENTOS (SALIDA, BAJA) por día
+    de CREATED_AT y FAR_DISPENSACIONES (DISPENSADA) por FECHA_DISPENSACION.
+    Cada ítem queda como un arreglo compacto array('d') de un valor por día.
+  - Pronóstico por ítem, una pasada por su arreglo: suavizado exponencial
+    simple o promedio móvil de los últimos REPOSICION_VENTANA_PROMEDIO días,
+    y suma / suma de cuadrados para la desviación. O(ítems × días); el costo
+    está en la agregación en la base, no aquí.
+  - Por ítem, con demanda d, desviación s y entrega L (REPOSICION_DIAS_ENTREGA):
+        stock de seguridad  SS  = z · s · √L
+        punto de reorden    ROP = d · L + SS
+        cobertura           stock / d  (días)
+        cantidad sugerida   d · (L + REPOSICION_DIAS_CICLO) + SS − stock
+    Sin consumo en la ventana se conserva STOCK_MINIMO como punto de reorden.
+  - Nivel: AGOTADO (stock <= 0), CRITICO (cobertura < L), REORDENAR
+    (stock <= ROP), OK. PRIORIDAD ordena nivel, cobertura y demanda.
+  - Resultado en BOD_PUNTOS_REORDEN, reescrito por hospital en una
+    transacción (también los hospitales que ya no tienen ítems activos:
+    sus filas se borran); GET /api/v1/warehouse/alertas/ solo lo lee.
+"""
+
+import math
+from array import array
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.pharmacy.models import Dispensacion, Medicamento
+from apps.warehouse.existencias import fin_del_dia
+from apps.warehouse.models import NIVELES_ALERTA, TIPOS_CONSUMO, Movimiento, Producto, PuntoReorden
+
+ORDEN_NIVEL = {nivel: i for i, nivel in enumerate(NIVELES_ALERTA + ('OK',))}
+MILESIMAS   = Decimal('0.001')
+
+
+def _decimal(valor: float, exp=MILESIMAS) -> Decimal:
+    return Decimal(repr(valor)).quantize(exp)
+
+
+def consumos(desde, hasta, hospitales=None) -> dict:
+    """{(hospital_id, origen, item_id): array('d') de consumo por día de [desde, hasta]}."""
+    dias  = (hasta - desde).days + 1
+    filas = {}
+
+    bodega = (Movimiento.objects.sin_tenant()
+              .filter(tipo_movimiento__in=TIPOS_CONSUMO, created_at__gte=fin_del_dia(desde - timedelta(days=1)),
+                      created_at__lt=fin_del_dia(hasta))
+              .annotate(dia=TruncDate('created_at')))
+    farmacia = Dispensacion.objects.sin_tenant().activos().filter(
+        estado='DISPENSADA', fecha_dispensacion__gte=desde, fecha_dispensacion__lte=hasta,
+    )
+    if hospitales is not None:
+        bodega, farmacia = bodega.filter(hospital_id__in=hospitales), farmacia.filter(hospital_id__in=hospitales)
+
+    for origen, qs, item, dia in (('BODEGA', bodega, 'producto_id', 'dia'),
+                                  ('FARMACIA', farmacia, 'medicamento_id', 'fecha_dispensacion')):
+        agregados = qs.order_by().values('hospital_id', item, dia).annotate(total=Sum('cantidad'))
+        for hospital_id, item_id, fecha, total in agregados.values_list('hospital_id', item, dia, 'total'):
+            serie = filas.get((hospital_id, origen, item_id))
+            if serie is None:
+                serie = filas[(hospital_id, origen, item_id)] = array('d', bytes(8 * dias))
+            serie[(fecha - desde).days] += float(total)
+    return filas
+
+
+def pronosticar(series: list, metodo: str, alfa: float, ventana_promedio: int) -> dict:
+    """Demanda diaria, desviación y días con consumo de cada serie (todas del mismo largo)."""
+    demanda, desviacion, con_consumo = [], [], []
+    for serie in series:
+        dias  = len(serie)
+        media = sum(serie) / dias
+        desviacion.append(math.sqrt(max(sum(x * x for x in serie) / dias - media * media, 0.0)))
+        con_consumo.append(sum(1 for x in serie if x > 0))
+        if metodo == 'PROMEDIO':
+            k = min(ventana_promedio, dias)
+            demanda.append(sum(serie[dias - k:]) / k)
+        else:                                 # SES: nivel inicial = media de la ventana
+            nivel = media
+            for x in serie:
+                nivel = alfa * x + (1 - alfa) * nivel
+            demanda.append(nivel)
+    return {'demanda': demanda, 'desviacion': desviacion, 'dias_con_consumo': con_consumo}
+
+
+def _items(hospitales=None):
+    """(hospital_id, origen, item_id, nombre, unidad, stock_actual, stock_minimo) de los ítems activos."""
+    productos    = Producto.objects.sin_tenant().activos()
+    medicamentos = Medicamento.objects.sin_tenant().activos()
+    if hospitales is not None:
+        productos    = productos.filter(hospital_id__in=hospitales)
+        medicamentos = medicamentos.filter(hospital_id__in=hospitales)
+    for hospital_id, *resto in productos.order_by().values_list(
+            'hospital_id', 'pro_id', 'nombre', 'unidad_medida', 'stock_actual', 'stock_minimo'):
+        yield (hospital_id, 'BODEGA', *resto)
+    for hospital_id, *resto in medicamentos.order_by().values_list(
+            'hospital_id', 'med_id', 'nombre_generico', 'unidad_medida', 'stock_actual', 'stock_minimo'):
+        yield (hospital_id, 'FARMACIA', *resto)
+
+
+def calcular(hospitales=None, hoy=None) -> dict:
+    """Recalcula BOD_PUNTOS_REORDEN de `hospitales` (None = todos). Devuelve {hospital_id: ítems}."""
+    hoy   = hoy or timezone.localdate()
+    hasta = hoy - timedelta(days=1)
+    desde = hoy - timedelta(days=settings.REPOSICION_VENTANA_DIAS)
+    items = list(_items(hospitales))
+    dias  = (hasta - desde).days + 1
+    vacia = array('d', bytes(8 * dias))
+    serie = consumos(desde, hasta, hospitales)
+    p = pronosticar([serie.get(i[:3], vacia) for i in items], settings.REPOSICION_METODO,
+                    settings.REPOSICION_ALFA, settings.REPOSICION_VENTANA_PROMEDIO)
+
+    entrega, ciclo, z = settings.REPOSICION_DIAS_ENTREGA, settings.REPOSICION_DIAS_CICLO, settings.REPOSICION_Z
+    ahora, por_hospital = timezone.now(), {}
+    for (hospital_id, origen, item_id, nombre, unidad, stock, minimo), d, s, n in zip(
+            items, p['demanda'], p['desviacion'], p['dias_con_consumo']):
+        stock, minimo = float(stock), float(minimo)
+        seguridad = z * s * math.sqrt(entrega)
+        punto     = d * entrega + seguridad if n else minimo
+        cobertura = stock / d if d > 1e-9 else None
+        sugerida  = max(d * (entrega + ciclo) + seguridad - stock, 0.0) if n else max(minimo - stock, 0.0)
+        if stock <= 0:
+            nivel = 'AGOTADO'
+        elif cobertura is not None and cobertura < entrega:
+            nivel = 'CRITICO'
+        elif stock <= punto:
+            nivel = 'REORDENAR'
+        else:
+            nivel = 'OK'
+        por_hospital.setdefault(hospital_id, []).append(PuntoReorden(
+            hospital_id=hospital_id, origen=origen, item_id=item_id, nombre=nombre, unidad_medida=unidad,
+            stock_actual=_decimal(stock), stock_minimo=_decimal(minimo), consumo_diario=_decimal(d),
+            desviacion=_decimal(s), dias_con_consumo=n, stock_seguridad=_decimal(seguridad),
+            dias_cobertura=None if cobertura is None else _decimal(min(cobertura, 9_999_999.0), Decimal('0.1')),
+            punto_reorden=_decimal(punto), cantidad_sugerida=_decimal(math.ceil(sugerida)),
+            nivel=nivel, prioridad=0, calculado_at=ahora,
+        ))
+
+    if hospitales is None:                                            # Hospitales con filas de un cálculo anterior
+        hospitales = PuntoReorden.objects.sin_tenant().order_by().values_list('hospital_id', flat=True).distinct()
+    for hospital_id in hospitales:
+        por_hospital.setdefault(hospital_id, [])                      # Sin ítems activos: se vacía
+    for hospital_id, filas in por_hospital.items():
+        filas.sort(key=lambda r: (ORDEN_NIVEL[r.nivel], r.dias_cobertura is None,
+                                  r.dias_cobertura or 0, -r.consumo_diario, r.nombre))
+        for prioridad, fila in enumerate(filas, start=1):
+            fila.prioridad = prioridad
+        with transaction.atomic():
+            PuntoReorden.objects.sin_tenant().filter(hospital_id=hospital_id).delete()
+            PuntoReorden.objects.bulk_create(filas, batch_size=settings.BODEGA_LOTE_BATCH)
+    return {h: len(f) for h, f in por_hospital.items()}
@@ -2,8 +2,13 @@
 HealthTech Solutions — Serializers: Módulo Bodega (M09)
 """
 
+from decimal import Decimal
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import Producto, Movimiento, TIPOS_NEGATIVOS
+from apps.core.serializers import NombreUsuarioField
+from . import kardex
+from .models import Producto, Movimiento, PuntoReorden, TIPO_MOV_CHOICES
 
 
 # ============================================================
@@ -72,7 +77,7 @@ class MovimientoListSerializer(serializers.ModelSerializer):
     tipo_display    = serializers.CharField(source='get_tipo_movimiento_display', read_only=True)
     producto_nombre = serializers.CharField(source='producto.nombre', read_only=True)
     producto_codigo = serializers.CharField(source='producto.codigo', read_only=True)
-    responsable     = serializers.SerializerMethodField()
+    responsable     = NombreUsuarioField('created_by', vacio='Sistema', usar_username=True)
 
     class Meta:
         model  = Movimiento
@@ -84,12 +89,6 @@ class MovimientoListSerializer(serializers.ModelSerializer):
             'responsable', 'created_at',
         ]
 
-    def get_responsable(self, obj):
-        u = obj.created_by
-        if not u:
-            return 'Sistema'
-        return f"{u.primer_nombre} {u.primer_apellido}".strip() or u.username
-
 
 class MovimientoCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -104,45 +103,64 @@ class MovimientoCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('La cantidad debe ser mayor que cero.')
         return value
 
+    def create(self, validated_data):
+        # Saldo y descuento en el mismo UPDATE condicional (ver apps.warehouse.kardex)
+        user     = self.context['request'].user
+        producto = validated_data.pop('producto')
+        try:
+            return kardex.registrar(user.hospital_id, user.pk, producto, **validated_data)
+        except kardex.StockInsuficiente as exc:
+            raise serializers.ValidationError({'non_field_errors': [
+                f"Stock insuficiente. Disponible: {exc.disponible} {producto.unidad_medida}."
+            ]})
+
+
+class MovimientoLoteItemSerializer(serializers.Serializer):
+    """Un movimiento del lote; CONTEO lleva en `cantidad` el stock contado."""
+    producto        = serializers.IntegerField(min_value=1)
+    tipo_movimiento = serializers.ChoiceField(
+        choices=TIPO_MOV_CHOICES + [(kardex.CONTEO, 'Conteo físico')],
+    )
+    cantidad        = serializers.DecimalField(max_digits=12, decimal_places=3, min_value=Decimal('0'))
+    motivo          = serializers.CharField(max_length=500, required=False, allow_blank=True)
+    referencia      = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    departamento    = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    proveedor       = serializers.CharField(max_length=200, required=False, allow_blank=True)
+
     def validate(self, data):
-        producto = data.get('producto')
-        cantidad = data.get('cantidad', 0)
-        tipo     = data.get('tipo_movimiento', '')
-
-        if tipo in TIPOS_NEGATIVOS and producto:
-            if producto.stock_actual < cantidad:
-                raise serializers.ValidationError(
-                    f"Stock insuficiente. Disponible: {producto.stock_actual} {producto.unidad_medida}."
-                )
+        if data['tipo_movimiento'] != kardex.CONTEO and data['cantidad'] <= 0:
+            raise serializers.ValidationError({'cantidad': 'La cantidad debe ser mayor que cero.'})
         return data
 
-    def create(self, validated_data):
-        from django.db.models import F
-        user     = self.context['request'].user
-        producto = validated_data['producto']
-        cantidad = validated_data['cantidad']
-        tipo     = validated_data['tipo_movimiento']
-
-        cantidad_anterior = producto.stock_actual
-
-        # Calcular stock posterior
-        if tipo in ('ENTRADA', 'AJUSTE_POSITIVO'):
-            cantidad_posterior = cantidad_anterior + cantidad
-            Producto.objects.filter(pk=producto.pk).update(
-                stock_actual=F('stock_actual') + cantidad,
-                updated_by_id=user.pk,
-            )
-        else:  # SALIDA, AJUSTE_NEGATIVO, BAJA
-            cantidad_posterior = cantidad_anterior - cantidad
-            Producto.objects.filter(pk=producto.pk).update(
-                stock_actual=F('stock_actual') - cantidad,
-                updated_by_id=user.pk,
-            )
-
-        return Movimiento.objects.create(
-            **validated_data,
-            hospital_id        = user.hospital_id,
-            cantidad_anterior  = cantidad_anterior,
-            cantidad_posterior = cantidad_posterior,
-            created_by_id      = user.pk,
-        )
+
+class MovimientoLoteSerializer(serializers.Serializer):
+    """Movimientos de varios productos en una transacción (recepción, conteo físico)."""
+    movimientos = serializers.ListField(
+        child=MovimientoLoteItemSerializer(),
+        min_length=1, max_length=settings.BODEGA_LOTE_MAX,
+    )
+    referencia  = serializers.CharField(max_length=200, required=False, allow_blank=True)
+    todo_o_nada = serializers.BooleanField(default=False)
+
+    def validate(self, data):
+        # La referencia del lote (no. de factura, acta de conteo) aplica a los ítems que no traen una
+        if data.get('referencia'):
+            for item in data['movimientos']:
+                item.setdefault('referencia', data['referencia'])
+        return data
+
+
+# ============================================================
+# ALERTAS DE REPOSICIÓN
+# ============================================================
+
+class PuntoReordenSerializer(serializers.ModelSerializer):
+    nivel_display = serializers.CharField(source='get_nivel_display', read_only=True)
+
+    class Meta:
+        model  = PuntoReorden
+        fields = [
+            'prioridad', 'nivel', 'nivel_display', 'origen', 'item_id', 'nombre', 'unidad_medida',
+            'stock_actual', 'stock_minimo', 'consumo_diario', 'desviacion', 'dias_con_consumo',
+            'dias_cobertura', 'stock_seguridad', 'punto_reorden', 'cantidad_sugerida', 'calculado_at',
+        ]
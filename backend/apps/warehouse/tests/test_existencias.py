@@ -0,0 +1,95 @@
+"""
+HealthTech Solutions — Tests: Existencias a una fecha (apps/warehouse/existencias.py)
+Cobertura:
+  - existencias(): mismo saldo desde el corte hacia adelante o desde el stock actual hacia atrás
+  - cortar_stock: corte de días cerrados, reescritura idempotente y rechazo de hoy
+  - GET /productos/existencias/ y /productos/{id}/kardex/: valorización y saldos del rango
+"""
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.warehouse import existencias, kardex
+from apps.warehouse.models import CorteStock, Movimiento, Producto
+
+URL = '/api/v1/warehouse/productos/'
+HOY = timezone.localdate()
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+@pytest.fixture
+def guantes(hospital, usuario_medico):
+    """Guantes con movimientos hace 40, 20 y 5 días (precio 2.5)."""
+    producto = Producto.objects.create(hospital_id=hospital.pk, nombre='Guantes', precio_unitario=Decimal('2.5'))
+    Producto.objects.filter(pk=producto.pk).update(created_at=timezone.now() - datetime.timedelta(days=60))
+    for dias, tipo, cantidad in [(40, 'ENTRADA', 100), (20, 'SALIDA', 30), (5, 'ENTRADA', 10)]:
+        mov = kardex.registrar(hospital.pk, usuario_medico.pk, producto, tipo, Decimal(cantidad))
+        Movimiento.objects.filter(pk=mov.pk).update(created_at=timezone.now() - datetime.timedelta(days=dias))
+    return producto
+
+
+def _stock(hospital, fecha):
+    return existencias.existencias(hospital.pk, fecha)['productos'][0]['stock']
+
+
+def test_existencias_corte_o_actual(hospital, guantes):
+    assert _stock(hospital, HOY - datetime.timedelta(days=30)) == 100                 # Sin corte: hacia atrás
+    existencias.cortar(hospital.pk, HOY - datetime.timedelta(days=35))
+    CorteStock.objects.filter(producto=guantes).update(stock=Decimal('90'))           # Delata el origen del saldo
+
+    with CaptureQueriesContext(connection) as ctx:
+        datos = existencias.existencias(hospital.pk, HOY - datetime.timedelta(days=30))
+    assert (datos['origen'], datos['productos'][0]['stock']) == ('CORTE', 90)
+    # Solo los movimientos entre el corte y la fecha, agregados en la base
+    movs = [q['sql'] for q in ctx.captured_queries if 'BOD_MOVIMIENTOS' in q['sql']]
+    assert len(movs) == 1 and 'SUM' in movs[0] and '"CREATED_AT" >=' in movs[0]
+
+    # Más cerca de hoy que del corte: parte del stock actual
+    cercano = existencias.existencias(hospital.pk, HOY - datetime.timedelta(days=10))
+    assert (cercano['origen'], cercano['productos'][0]['stock']) == ('ACTUAL', 70)
+
+
+def test_cortar_stock(hospital, guantes):
+    call_command('cortar_stock', '--desde', str(HOY - datetime.timedelta(days=50)), '--hospital', str(hospital.pk),
+                 '--fecha', str(HOY - datetime.timedelta(days=1)), stdout=io.StringIO())
+    cortes = dict(CorteStock.objects.filter(producto=guantes).values_list('fecha', 'stock'))
+    assert len(cortes) == 50
+    assert cortes[HOY - datetime.timedelta(days=41)] == 0
+    assert cortes[HOY - datetime.timedelta(days=21)] == 100
+    assert cortes[HOY - datetime.timedelta(days=1)] == 80
+
+    ayer = CorteStock.objects.get(producto=guantes, fecha=HOY - datetime.timedelta(days=1))
+    assert ayer.valor == Decimal('200')
+    call_command('cortar_stock', stdout=io.StringIO())                        # Ayer, otra vez
+    assert CorteStock.objects.filter(producto=guantes, fecha=ayer.fecha).count() == 1
+    with pytest.raises(CommandError):
+        call_command('cortar_stock', '--fecha', str(HOY))
+
+
+def test_endpoints_existencias_y_kardex(cliente, hospital, guantes):
+    existencias.cortar(hospital.pk, HOY - datetime.timedelta(days=45))
+    r = cliente.get(f'{URL}existencias/', {'fecha': str(HOY - datetime.timedelta(days=25))})
+    assert r.status_code == 200
+    datos = r.json()
+    assert datos['corte'] == str(HOY - datetime.timedelta(days=45))
+    assert Decimal(datos['productos'][0]['stock']) == 100 and Decimal(datos['valor_total']) == 250
+    assert cliente.get(f'{URL}existencias/', {'fecha': str(HOY + datetime.timedelta(days=1))}).status_code == 400
+
+    r = cliente.get(f'{URL}{guantes.pk}/kardex/', {'desde': str(HOY - datetime.timedelta(days=30))})
+    assert r.status_code == 200
+    datos = r.json()
+    assert (Decimal(datos['saldo_inicial']), Decimal(datos['saldo_final'])) == (100, 80)
+    assert [m['tipo_movimiento'] for m in datos['movimientos']] == ['SALIDA', 'ENTRADA']
+    assert cliente.get(f'{URL}{guantes.pk}/kardex/', {'desde': '2020-01-01'}).status_code == 400
@@ -0,0 +1,86 @@
+"""
+HealthTech Solutions — Tests: Kardex de bodega (apps/warehouse/kardex.py)
+Cobertura:
+  - POST /movimientos/: anterior/posterior reales aunque el producto leído esté viejo
+  - POST /movimientos/: salida sin stock → 400 sin tocar el stock
+  - POST /movimientos/lote/: agrupado por producto, conteo físico, rechazos y todo_o_nada
+"""
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.warehouse import kardex
+from apps.warehouse.models import Movimiento, Producto
+
+URL = '/api/v1/warehouse/movimientos/'
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+def _producto(hospital, nombre, stock):
+    return Producto.objects.create(hospital_id=hospital.pk, nombre=nombre, stock_actual=stock)
+
+
+def _stock(producto):
+    return Producto.objects.sin_tenant().values_list('stock_actual', flat=True).get(pk=producto.pk)
+
+
+def test_registrar_usa_saldo_real(hospital, usuario_medico):
+    guantes = _producto(hospital, 'Guantes', 10)
+    leido = Producto.objects.get(pk=guantes.pk)              # Lectura que otro proceso deja vieja
+    kardex.registrar(hospital.pk, usuario_medico.pk, guantes, 'SALIDA', Decimal('4'))
+
+    mov = kardex.registrar(hospital.pk, usuario_medico.pk, leido, 'SALIDA', Decimal('5'))
+    assert (mov.cantidad_anterior, mov.cantidad_posterior) == (10 - 4, 1)
+    with pytest.raises(kardex.StockInsuficiente) as exc:
+        kardex.registrar(hospital.pk, usuario_medico.pk, leido, 'BAJA', Decimal('2'))
+    assert exc.value.disponible == 1 and _stock(guantes) == 1
+
+
+def test_crear_movimiento(cliente, hospital):
+    gasas = _producto(hospital, 'Gasas', 3)
+    r = cliente.post(URL, {'producto': gasas.pk, 'tipo_movimiento': 'ENTRADA', 'cantidad': '7'}, format='json')
+    assert r.status_code == 201
+    assert (Decimal(r.json()['cantidad_anterior']), Decimal(r.json()['cantidad_posterior'])) == (3, 10)
+
+    r = cliente.post(URL, {'producto': gasas.pk, 'tipo_movimiento': 'SALIDA', 'cantidad': '11'}, format='json')
+    assert r.status_code == 400 and 'Disponible: 10' in r.json()['non_field_errors'][0]
+    assert _stock(gasas) == 10 and Movimiento.objects.count() == 1
+
+
+def test_lote_por_producto(cliente, hospital):
+    jeringas = _producto(hospital, 'Jeringas', 5)
+    alcohol  = _producto(hospital, 'Alcohol', 2)
+    cubrebocas = _producto(hospital, 'Cubrebocas', 40)
+    movimientos = (
+        [{'producto': jeringas.pk, 'tipo_movimiento': 'ENTRADA', 'cantidad': 10} for _ in range(3)]
+        + [{'producto': jeringas.pk, 'tipo_movimiento': 'SALIDA', 'cantidad': 20}]
+        + [{'producto': alcohol.pk, 'tipo_movimiento': 'SALIDA', 'cantidad': 3}]                # 3 > 2
+        + [{'producto': cubrebocas.pk, 'tipo_movimiento': 'CONTEO', 'cantidad': 37}]            # Conteo físico
+        + [{'producto': 999999, 'tipo_movimiento': 'ENTRADA', 'cantidad': 1}]
+    )
+    body = {'movimientos': movimientos, 'referencia': 'FAC-77'}
+
+    r = cliente.post(f'{URL}lote/', {**body, 'todo_o_nada': True}, format='json')
+    assert r.status_code == 409 and _stock(jeringas) == 5 and not Movimiento.objects.exists()
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = cliente.post(f'{URL}lote/', body, format='json')
+    assert r.status_code == 200
+    datos = r.json()
+    assert datos['aplicados'] == [0, 1, 2, 3, 5]
+    assert {x['indice']: x['motivo'] for x in datos['rechazados']} == {4: 'STOCK_INSUFICIENTE', 6: 'NO_ENCONTRADO'}
+    assert (_stock(jeringas), _stock(alcohol), _stock(cubrebocas)) == (15, 2, 37)
+
+    kardex_jeringas = Movimiento.objects.filter(producto=jeringas).order_by('mov_id')
+    assert [(m.cantidad_anterior, m.cantidad_posterior) for m in kardex_jeringas] == [(5, 15), (15, 25), (25, 35), (35, 15)]
+    ajuste = Movimiento.objects.get(producto=cubrebocas)
+    assert (ajuste.tipo_movimiento, ajuste.cantidad, ajuste.referencia) == ('AJUSTE_NEGATIVO', 3, 'FAC-77')
+    # Saldos en un solo executemany, no un UPDATE por producto
+    assert sum('UPDATE "BOD_PRODUCTOS"' in q['sql'] for q in ctx.captured_queries) == 1
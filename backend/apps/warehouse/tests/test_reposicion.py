@@ -0,0 +1,115 @@
+"""
+HealthTech Solutions — Tests: Pronóstico de consumo y reposición (apps/warehouse/reposicion.py)
+Cobertura:
+  - pronosticar(): suavizado exponencial / promedio móvil y desviación
+  - calcular_reposicion: consumo de bodega (SALIDA/BAJA) y farmacia (DISPENSADA), niveles y prioridad;
+    un hospital sin ítems activos queda sin filas
+  - GET /alertas/: lista precalculada, ordenada y filtrada por hospital (sin recalcular)
+"""
+import datetime
+import io
+from array import array
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.patients.models import Paciente
+from apps.pharmacy.models import Dispensacion, Medicamento
+from apps.warehouse import reposicion
+from apps.warehouse.models import Movimiento, Producto, PuntoReorden
+
+HOY = timezone.localdate()
+
+
+@pytest.fixture
+def cliente(api_client, usuario_medico):
+    api_client.force_authenticate(usuario_medico)
+    return api_client
+
+
+def _consumo_bodega(producto, diario, dias=30, tipo='SALIDA'):
+    for d in range(1, dias + 1):
+        mov = Movimiento.objects.create(
+            hospital_id=producto.hospital_id, producto=producto, tipo_movimiento=tipo, cantidad=diario,
+            cantidad_anterior=0, cantidad_posterior=0,
+        )
+        Movimiento.objects.filter(pk=mov.pk).update(created_at=timezone.now() - datetime.timedelta(days=d))
+
+
+def test_pronosticar():
+    constante = array('d', [4.0] * 10)
+    escalon   = array('d', [0.0] * 5 + [10.0] * 5)
+    p = reposicion.pronosticar([constante, escalon], 'SES', 0.5, 3)
+    assert p['demanda'][0] == pytest.approx(4.0) and p['desviacion'][0] == pytest.approx(0.0)
+    assert 5.0 < p['demanda'][1] < 10.0                       # Sigue el escalón sin saltar de golpe
+    assert p['desviacion'][1] == pytest.approx(5.0) and p['dias_con_consumo'] == [10, 5]
+
+    p = reposicion.pronosticar([constante, escalon], 'PROMEDIO', 0.5, 3)
+    assert p['demanda'] == [pytest.approx(4.0), pytest.approx(10.0)]
+
+
+def test_calcular_reposicion(hospital):
+    gasas   = Producto.objects.create(hospital_id=hospital.pk, nombre='Gasas', stock_actual=30)      # 3 días
+    jabon   = Producto.objects.create(hospital_id=hospital.pk, nombre='Jabón', stock_actual=0)
+    batas   = Producto.objects.create(hospital_id=hospital.pk, nombre='Batas', stock_actual=500, stock_minimo=10)
+    papel   = Producto.objects.create(hospital_id=hospital.pk, nombre='Papel', stock_actual=5, stock_minimo=20)
+    _consumo_bodega(gasas, 10)
+    _consumo_bodega(batas, 1, tipo='BAJA')
+    _consumo_bodega(batas, 50, dias=3, tipo='ENTRADA')                                      # No es consumo
+    med = Medicamento.objects.create(hospital_id=hospital.pk, nombre_generico='Omeprazol', stock_actual=50)
+    paciente = Paciente.objects.create(
+        hospital_id=hospital.pk, no_expediente='EXP-R1', primer_nombre='Ana', primer_apellido='Prueba',
+        tipo_documento='DPI', no_documento='0000000000011', fecha_nacimiento=datetime.date(1990, 1, 1), sexo='F',
+    )
+    for d in range(1, 31):
+        Dispensacion.objects.create(hospital_id=hospital.pk, medicamento=med, paciente=paciente, cantidad=6,
+                                    estado='DISPENSADA', fecha_prescripcion=HOY - datetime.timedelta(days=d),
+                                    fecha_dispensacion=HOY - datetime.timedelta(days=d))
+
+    call_command('calcular_reposicion', stdout=io.StringIO())
+    filas = {(r.origen, r.item_id): r for r in PuntoReorden.objects.all()}
+    g, b, m = filas[('BODEGA', gasas.pk)], filas[('BODEGA', batas.pk)], filas[('FARMACIA', med.pk)]
+    assert g.consumo_diario == pytest.approx(Decimal('10'), abs=1) and g.nivel == 'CRITICO'
+    assert filas[('BODEGA', jabon.pk)].nivel == 'AGOTADO' and b.nivel == 'OK'
+    assert b.dias_con_consumo == 30 and b.consumo_diario < 2
+    assert (m.nivel, m.dias_con_consumo) == ('REORDENAR', 30) and m.cantidad_sugerida > 0
+    # Sin consumo: se conserva el mínimo manual
+    assert (filas[('BODEGA', papel.pk)].nivel, filas[('BODEGA', papel.pk)].punto_reorden) == ('REORDENAR', 20)
+
+    orden = list(PuntoReorden.objects.order_by('prioridad').values_list('nivel', flat=True))
+    assert orden == ['AGOTADO', 'CRITICO', 'REORDENAR', 'REORDENAR', 'OK']
+
+    call_command('calcular_reposicion', stdout=io.StringIO())                 # Reescribe, no duplica
+    assert PuntoReorden.objects.count() == 5
+
+    Producto.objects.filter(hospital_id=hospital.pk).update(activo=False)
+    Medicamento.objects.filter(hospital_id=hospital.pk).update(activo=False)
+    call_command('calcular_reposicion', stdout=io.StringIO())                 # Sin ítems activos: se vacía
+    assert not PuntoReorden.objects.exists()
+
+
+def test_alertas_endpoint(cliente, hospital):
+    ahora = timezone.now()
+    base = dict(hospital_id=hospital.pk, unidad_medida='unidad', stock_minimo=0, consumo_diario=1, desviacion=0,
+                stock_seguridad=0, punto_reorden=5, cantidad_sugerida=10, calculado_at=ahora)
+    PuntoReorden.objects.bulk_create([
+        PuntoReorden(origen='BODEGA',   item_id=1, nombre='Guantes', stock_actual=3, nivel='CRITICO',   prioridad=2, **base),
+        PuntoReorden(origen='FARMACIA', item_id=1, nombre='Insulina', stock_actual=0, nivel='AGOTADO',  prioridad=1, **base),
+        PuntoReorden(origen='BODEGA',   item_id=2, nombre='Batas',   stock_actual=90, nivel='OK',       prioridad=3, **base),
+        PuntoReorden(**{**base, 'hospital_id': hospital.pk + 1000}, origen='BODEGA', item_id=9, nombre='Otro',
+                     stock_actual=0, nivel='AGOTADO', prioridad=1),
+    ])
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = cliente.get('/api/v1/warehouse/alertas/')
+    assert r.status_code == 200
+    assert [x['nombre'] for x in r.json()['results']] == ['Insulina', 'Guantes']
+    assert sum('BOD_PUNTOS_REORDEN' in q['sql'] for q in ctx.captured_queries) <= 2     # COUNT + página
+
+    bodega = cliente.get('/api/v1/warehouse/alertas/', {'origen': 'BODEGA'}).json()['results']
+    assert [x['nombre'] for x in bodega] == ['Guantes']
+    assert len(cliente.get('/api/v1/warehouse/alertas/', {'todos': '1'}).json()['results']) == 3
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProductoViewSet, MovimientoViewSet
+from .views import ProductoViewSet, MovimientoViewSet, AlertaReposicionViewSet
 
 router = DefaultRouter()
 router.register('productos',   ProductoViewSet,   basename='producto')
 router.register('movimientos', MovimientoViewSet, basename='movimiento')
+router.register('alertas',     AlertaReposicionViewSet, basename='alerta-reposicion')
 
 urlpatterns = [
     path('', include(router.urls)),
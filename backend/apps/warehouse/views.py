@@ -2,26 +2,36 @@
 HealthTech Solutions — Views: Módulo Bodega (M09)
 """
 
+import datetime
+
 from django.conf import settings
-from rest_framework import viewsets, status
+from django.utils import timezone
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter, OrderingFilter
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsPersonalClinico, SameHospitalOnly
 
-from .models import Producto, Movimiento
+from . import existencias, kardex
+from .models import NIVELES_ALERTA, Producto, Movimiento, PuntoReorden
 from .serializers import (
     ProductoListSerializer, ProductoDetailSerializer, ProductoCreateSerializer,
-    MovimientoListSerializer, MovimientoCreateSerializer,
+    MovimientoListSerializer, MovimientoCreateSerializer, MovimientoLoteSerializer,
+    PuntoReordenSerializer,
 )
 
 
-class ProductoViewSet(viewsets.ModelViewSet):
+class ProductoViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     CRUD del catálogo de productos del almacén.
     Endpoint: /api/v1/warehouse/productos/
+    GET de lista y detalle con ETag / Last-Modified (304 sin serializar).
     """
+    etag_lista         = True
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
     filter_backends    = [SearchFilter, OrderingFilter, DjangoFilterBackend]
     search_fields      = ['nombre', 'codigo', 'descripcion', 'proveedor']
@@ -30,11 +40,7 @@ class ProductoViewSet(viewsets.ModelViewSet):
     ordering           = ['nombre']
 
     def get_queryset(self):
-        user = self.request.user
-        qs   = Producto.objects.filter(activo=True)
-        if not settings.VPD_ENABLED and getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-            qs = qs.filter(hospital_id=user.hospital_id)
-        return qs
+        return Producto.objects.activos()   # Filtro de hospital: TenantManager
 
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -48,12 +54,58 @@ class ProductoViewSet(viewsets.ModelViewSet):
         instance.updated_by_id = self.request.user.pk
         instance.save()
 
+    @action(detail=False, methods=['get'])
+    def existencias(self, request):
+        """
+        GET /api/v1/warehouse/productos/existencias/?fecha=YYYY-MM-DD&categoria=
+        Stock y valorización de todos los productos al cierre de `fecha`
+        (por defecto hoy), desde el corte más cercano (BOD_CORTES_STOCK) más
+        los movimientos posteriores. SUPER_ADMIN puede indicar ?hospital_id=.
+        """
+        params = request.query_params
+        hospital_id = request.user.hospital_id
+        try:
+            fecha = datetime.date.fromisoformat(params['fecha']) if params.get('fecha') else timezone.localdate()
+            if request.user.rol_codigo == 'SUPER_ADMIN' and params.get('hospital_id'):
+                hospital_id = int(params['hospital_id'])
+        except ValueError:
+            return Response({'detail': 'Parámetros inválidos (fecha ISO, hospital_id numérico).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if hospital_id is None:
+            return Response({'detail': 'Indique hospital_id.'}, status=status.HTTP_400_BAD_REQUEST)
+        if fecha > timezone.localdate():
+            return Response({'detail': 'La fecha no puede ser futura.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(existencias.existencias(hospital_id, fecha, categoria=params.get('categoria')))
+
+    @action(detail=True, methods=['get'])
+    def kardex(self, request, pk=None):
+        """
+        GET /api/v1/warehouse/productos/{id}/kardex/?desde=&hasta=
+        Movimientos del producto en [desde, hasta] con saldo inicial y final.
+        Por defecto los últimos BODEGA_KARDEX_DIAS_DEFECTO días.
+        """
+        producto = self.get_object()
+        params   = request.query_params
+        try:
+            hasta = datetime.date.fromisoformat(params['hasta']) if params.get('hasta') else timezone.localdate()
+            desde = (datetime.date.fromisoformat(params['desde']) if params.get('desde')
+                     else hasta - datetime.timedelta(days=settings.BODEGA_KARDEX_DIAS_DEFECTO - 1))
+        except ValueError:
+            return Response({'detail': 'Fechas inválidas (formato YYYY-MM-DD).'}, status=status.HTTP_400_BAD_REQUEST)
+        if hasta < desde or (hasta - desde).days >= settings.BODEGA_KARDEX_DIAS_MAX:
+            return Response({'detail': f'Rango inválido (máximo {settings.BODEGA_KARDEX_DIAS_MAX} días).'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(existencias.movimientos(producto.hospital_id, producto.pk, desde, hasta))
+
 
 class MovimientoViewSet(viewsets.ModelViewSet):
     """
     Registro de movimientos de inventario.
     Endpoint: /api/v1/warehouse/movimientos/
     POST crea el movimiento y actualiza stock atomicamente.
+    POST lote/ aplica cientos de movimientos en una transacción.
     GET lista movimientos (filtrable por producto).
     """
     permission_classes = [IsPersonalClinico, SameHospitalOnly]
@@ -62,18 +114,18 @@ class MovimientoViewSet(viewsets.ModelViewSet):
     filterset_fields   = ['tipo_movimiento', 'producto']
     ordering_fields    = ['created_at', 'tipo_movimiento']
     ordering           = ['-created_at']
+    pagination_class   = KeysetPagination
     http_method_names  = ['get', 'post', 'head', 'options']  # Sin update/delete (log inmutable)
 
     def get_queryset(self):
-        user = self.request.user
-        qs   = Movimiento.objects.select_related('producto', 'created_by')
-        if not settings.VPD_ENABLED and getattr(user, 'rol_codigo', '') != 'SUPER_ADMIN':
-            qs = qs.filter(hospital_id=user.hospital_id)
-        return qs
+        # Filtro de hospital: TenantManager
+        return Movimiento.objects.select_related('producto', 'created_by')
 
     def get_serializer_class(self):
         if self.action == 'create':
             return MovimientoCreateSerializer
+        if self.action == 'lote':
+            return MovimientoLoteSerializer
         return MovimientoListSerializer
 
     def create(self, request, *args, **kwargs):
@@ -85,3 +137,47 @@ class MovimientoViewSet(viewsets.ModelViewSet):
             MovimientoListSerializer(movimiento).data,
             status=status.HTTP_201_CREATED,
         )
+
+    @action(detail=False, methods=['post'], url_path='lote')
+    def lote(self, request):
+        """
+        POST /api/v1/warehouse/movimientos/lote/
+        Body: { "movimientos": [{"producto": 7, "tipo_movimiento": "ENTRADA", "cantidad": 120, …}, …],
+                "referencia": "FAC-1234", "todo_o_nada": false }
+        Aplica el lote en una transacción, agrupado por producto (ver
+        apps.warehouse.kardex). tipo_movimiento CONTEO registra el stock
+        contado como ajuste por la diferencia. Los productos cuyo grupo
+        dejaría stock negativo se informan en `rechazados`; con todo_o_nada
+        cualquier rechazo revierte el lote (409).
+        """
+        ser = MovimientoLoteSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        d = ser.validated_data
+
+        try:
+            resultado = kardex.aplicar_lote(
+                request.user.hospital_id, request.user.pk, d['movimientos'], todo_o_nada=d['todo_o_nada'],
+            )
+        except kardex.LoteRechazado as exc:
+            return Response({'detail': 'Lote no aplicado: hay movimientos rechazados.', **exc.resultado,
+                             'aplicados': []}, status=status.HTTP_409_CONFLICT)
+        return Response(resultado)
+
+
+class AlertaReposicionViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Ítems de bodega y farmacia bajo su punto de reorden, del más urgente al
+    menos urgente. Endpoint: /api/v1/warehouse/alertas/?origen=&nivel=
+    Lee BOD_PUNTOS_REORDEN ya calculado (manage.py calcular_reposicion);
+    ?todos=1 incluye también los ítems en nivel OK.
+    """
+    permission_classes = [IsPersonalClinico, SameHospitalOnly]
+    serializer_class   = PuntoReordenSerializer
+    filter_backends    = [DjangoFilterBackend]
+    filterset_fields   = ['origen', 'nivel']
+
+    def get_queryset(self):
+        qs = PuntoReorden.objects.order_by('prioridad')   # Filtro de hospital: TenantManager
+        if self.request.query_params.get('todos') not in ('1', 'true'):
+            qs = qs.filter(nivel__in=NIVELES_ALERTA)
+        return qs
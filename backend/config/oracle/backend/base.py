@@ -0,0 +1,51 @@
+"""
+HealthTech Solutions — Backend Django sobre el pool oracledb
+ENGINE: 'config.oracle.backend'
+
+Igual al backend oracle de Django, pero las conexiones salen de
+config.oracle.pool.get_pool(alias) y se devuelven al pool al cerrarse:
+  - 'default' → pool OLTP, 'reports' → pool REPORTS (RAC Nodo 2)
+  - Con CONN_MAX_AGE = 0 Django cierra al final de cada request → la sesión
+    vuelve al pool (no se destruye) y el siguiente request la reutiliza.
+  - NLS y contexto VPD se aplican en el session_callback del pool, solo
+    cuando la sesión es nueva o su tag (HOSPITAL_ID/USER_ROL) no coincide.
+"""
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.oracle import base as oracle_base
+
+from config.oracle.pool import acquire, release
+
+
+class DatabaseWrapper(oracle_base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        return acquire(self.alias, self.settings_dict)
+
+    def init_connection_state(self):
+        # ALTER SESSION NLS_* lo ejecuta _set_app_context una vez por sesión
+        # física; aquí solo queda el estado propio del wrapper de Django.
+        BaseDatabaseWrapper.init_connection_state(self)
+        if 'operators' not in self.__dict__:
+            # Ticket #14149 de Django: LIKE vs LIKEC (una vez por wrapper/hilo)
+            cursor = self.create_cursor()
+            try:
+                cursor.execute(
+                    'SELECT 1 FROM DUAL WHERE DUMMY %s'
+                    % self._standard_operators['contains'],
+                    ['X'],
+                )
+            except oracle_base.Database.DatabaseError:
+                self.operators   = self._likec_operators
+                self.pattern_ops = self._likec_pattern_ops
+            else:
+                self.operators   = self._standard_operators
+                self.pattern_ops = self._standard_pattern_ops
+            cursor.close()
+        if not self.get_autocommit():
+            self.commit()
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                release(self.alias, self.connection, self.settings_dict)
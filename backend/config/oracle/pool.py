@@ -4,16 +4,52 @@ Maneja la diferencia entre:
   - DEV:     Oracle 21c XE (conexión simple)
   - STAGING: Oracle 19c single node
   - PROD:    Oracle 19c RAC con SCAN, Failover, Load Balance
+
+El ORM usa estos pools a través del backend config.oracle.backend:
+cada request adquiere una sesión (acquire) y la devuelve al cerrar la
+conexión Django (release), en lugar de abrir/mantener conexiones propias.
 """
 
 import oracledb
 import logging
+import threading
+import time
 from django.conf import settings
 
 logger = logging.getLogger('healthtech.audit')
 
 _pools: dict = {}
 
+# Marca si _set_app_context corrió durante el acquire() del hilo actual
+_callback_local = threading.local()
+
+# Estadísticas de uso por servicio (métricas /api/v1/health/)
+_stats_lock = threading.Lock()
+_stats: dict = {}
+
+
+def dsn(db_config: dict) -> str:
+    """DSN igual que el backend oracle de Django: NAME directo si no hay PORT."""
+    if db_config.get('PORT'):
+        host = db_config.get('HOST', '').strip() or 'localhost'
+        return oracledb.makedsn(host, int(db_config['PORT']), db_config['NAME'])
+    return db_config['NAME']
+
+
+def _init_session(connection):
+    """
+    Estado NLS que Django exige en cada sesión (equivalente a
+    DatabaseWrapper.init_connection_state del backend oracle).
+    Se ejecuta una sola vez por sesión física, no en cada acquire.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("ALTER SESSION SET NLS_TERRITORY = 'AMERICA'")
+        cursor.execute(
+            "ALTER SESSION SET NLS_DATE_FORMAT = 'YYYY-MM-DD HH24:MI:SS'"
+            " NLS_TIMESTAMP_FORMAT = 'YYYY-MM-DD HH24:MI:SS.FF'"
+            + (" TIME_ZONE = 'UTC'" if settings.USE_TZ else "")
+        )
+
 
 def _set_app_context(connection, requested_tag):
     """
@@ -21,45 +57,79 @@ def _set_app_context(connection, requested_tag):
     Establece el contexto de aplicación Oracle para VPD:
       - HOSPITAL_ID: filtra filas por tenant (hospital)
       - USER_ROL:    permite bypass a SUPER_ADMIN
-    Requiere que el hospital_id y user_rol estén en el thread local.
+
+    Con session tags (acquire()), el pool solo invoca este callback cuando
+    la sesión entregada no lleva ya el tag pedido; el contexto se toma del
+    tag y se marca la sesión con él para reutilizarla. Sin tag se usa el
+    hospital_id/user_rol del thread local. El tag se escribe solo después
+    de CLEAR_CONTEXT + SET_* (vpd.fijar_contexto).
+    Una sesión sin tag es una sesión física nueva: se inicializa NLS.
     """
-    from config.oracle.vpd import get_current_hospital_id, get_current_user_rol
-    hospital_id = get_current_hospital_id()
-    user_rol    = get_current_user_rol()
+    from config.oracle.vpd import (
+        fijar_contexto, get_current_hospital_id, get_current_user_rol,
+        parse_session_tag, record_context_switch, session_tag,
+    )
+    _callback_local.ejecutado = True
+    if not connection.tag:
+        _init_session(connection)
+
+    if requested_tag:
+        hospital_id, user_rol = parse_session_tag(requested_tag)
+    else:
+        hospital_id = get_current_hospital_id()
+        user_rol    = get_current_user_rol()
 
-    if settings.VPD_ENABLED and (hospital_id or user_rol):
+    if settings.VPD_ENABLED:
+        # La sesión puede traer el contexto de otro tenant (o uno a medias tras
+        # un fallo, ya sin tag): se borra siempre antes de fijar el pedido,
+        # también cuando este tiene partes vacías.
+        connection.tag = ''
         with connection.cursor() as cursor:
-            if hospital_id:
-                cursor.callproc('HEALTHTECH_PKG.SET_HOSPITAL', [hospital_id])
-            if user_rol:
-                cursor.callproc('HEALTHTECH_PKG.SET_USER_ROL', [user_rol])
+            fijar_contexto(cursor, hospital_id, user_rol)
+        record_context_switch(performed=True)
         logger.debug(
             f'Contexto VPD establecido: HOSPITAL_ID={hospital_id} | USER_ROL={user_rol}'
         )
+    connection.tag = session_tag(hospital_id, user_rol)
+
 
+def _pool_key(service: str, db_config: dict | None) -> str:
+    """Un pool por servicio y usuario Oracle (el esquema de test usa otro USER)."""
+    base_config = settings.DATABASES.get(service, settings.DATABASES['default'])
+    if db_config and db_config.get('USER') != base_config.get('USER'):
+        return f"{service}@{db_config['USER']}"
+    return service
 
-def get_pool(service: str = 'default') -> oracledb.ConnectionPool:
+
+def get_pool(service: str = 'default', db_config: dict | None = None) -> oracledb.ConnectionPool:
     """
     Retorna el pool de conexiones Oracle según el entorno.
-    service: 'default' (OLTP) | 'reports' (solo PROD RAC Nodo 2)
+    service:   'default' (OLTP) | 'reports' (solo PROD RAC Nodo 2)
+    db_config: settings_dict del DatabaseWrapper; si su USER difiere del de
+               settings (p.ej. esquema de test creado por Django) se usa un
+               pool aparte para no mezclar sesiones de distintos usuarios.
     """
     global _pools
 
+    db_config = db_config or settings.DATABASES.get(service, settings.DATABASES['default'])
+    service   = _pool_key(service, db_config)
+
     if service in _pools:
         return _pools[service]
 
     oracle_env = settings.ORACLE_ENV
-    db_config = settings.DATABASES.get(service, settings.DATABASES['default'])
 
     if oracle_env == 'dev':
-        # Oracle 21c XE — pool pequeño, sin session_callback
+        # Oracle 21c XE — pool pequeño
         pool = oracledb.create_pool(
             user=db_config['USER'],
             password=db_config['PASSWORD'],
-            dsn=f"{db_config['HOST']}:{db_config['PORT']}/{db_config['NAME']}",
+            dsn=dsn(db_config),                # NAME como DSN si HOST está vacío
             min=2,
             max=5,
             increment=1,
+            stmtcachesize=20,
+            session_callback=_set_app_context,
         )
         logger.info('Pool Oracle DEV (21c XE) inicializado')
 
@@ -68,11 +138,12 @@ def get_pool(service: str = 'default') -> oracledb.ConnectionPool:
         pool = oracledb.create_pool(
             user=db_config['USER'],
             password=db_config['PASSWORD'],
-            dsn=f"{db_config['HOST']}:{db_config['PORT']}/{db_config['NAME']}",
+            dsn=dsn(db_config),
             min=3,
             max=10,
             increment=2,
-            session_callback=_set_app_context if settings.VPD_ENABLED else None,
+            stmtcachesize=20,
+            session_callback=_set_app_context,
         )
         logger.info('Pool Oracle STAGING (19c single) inicializado')
 
@@ -82,11 +153,12 @@ def get_pool(service: str = 'default') -> oracledb.ConnectionPool:
         pool = oracledb.create_pool(
             user=db_config['USER'],
             password=db_config['PASSWORD'],
-            dsn=db_config['NAME'],             # TNS alias del tnsnames.ora
+            dsn=dsn(db_config),                # TNS alias del tnsnames.ora
             min=5,
             max=20,
             increment=2,
             getmode=oracledb.POOL_GETMODE_WAIT,
+            stmtcachesize=20,
             session_callback=_set_app_context,
         )
         logger.info(f'Pool Oracle PROD RAC (19c) inicializado — servicio: {service}')
@@ -95,6 +167,85 @@ def get_pool(service: str = 'default') -> oracledb.ConnectionPool:
     return pool
 
 
+def _service_stats(service: str) -> dict:
+    return _stats.setdefault(service, {
+        'adquisiciones':      0,
+        'liberaciones':       0,
+        'espera_total_ms':    0.0,
+        'espera_max_ms':      0.0,
+        'errores_liberacion': 0,
+    })
+
+
+def acquire(service: str = 'default', db_config: dict | None = None) -> oracledb.Connection:
+    """
+    Obtiene una sesión del pool etiquetada con el contexto VPD del request
+    actual (thread local). Si el pool tiene una sesión libre con el mismo
+    tag, se entrega sin round trip a HEALTHTECH_PKG (cambio evitado).
+    """
+    from config.oracle.vpd import (
+        get_current_hospital_id, get_current_user_rol,
+        record_context_switch, session_tag,
+    )
+    if settings.VPD_ENABLED:
+        tag = session_tag(get_current_hospital_id(), get_current_user_rol())
+    else:
+        tag = session_tag(None, None)      # Todas las sesiones son equivalentes
+    pool    = get_pool(service, db_config)
+    service = _pool_key(service, db_config)
+
+    _callback_local.ejecutado = False
+    inicio = time.monotonic()
+    conn = pool.acquire(tag=tag)
+    espera = (time.monotonic() - inicio) * 1000
+
+    if settings.VPD_ENABLED and not _callback_local.ejecutado:
+        record_context_switch(performed=False)
+    with _stats_lock:
+        s = _service_stats(service)
+        s['adquisiciones']   += 1
+        s['espera_total_ms'] += espera
+        s['espera_max_ms']    = max(s['espera_max_ms'], espera)
+    return conn
+
+
+def release(service: str, connection: oracledb.Connection, db_config: dict | None = None):
+    """Devuelve la sesión al pool conservando su tag (contexto VPD)."""
+    pool    = get_pool(service, db_config)
+    service = _pool_key(service, db_config)
+    try:
+        pool.release(connection)
+    except oracledb.Error:
+        with _stats_lock:
+            _service_stats(service)['errores_liberacion'] += 1
+        raise
+    with _stats_lock:
+        _service_stats(service)['liberaciones'] += 1
+
+
+def pool_stats() -> dict:
+    """Estado de cada pool (abiertas/ocupadas) + tiempos de espera del proceso."""
+    resultado = {}
+    with _stats_lock:
+        for service, pool in _pools.items():
+            s = _service_stats(service)
+            resultado[service] = {
+                'abiertas':           pool.opened,
+                'ocupadas':           pool.busy,
+                'min':                pool.min,
+                'max':                pool.max,
+                'adquisiciones':      s['adquisiciones'],
+                'liberaciones':       s['liberaciones'],
+                'errores_liberacion': s['errores_liberacion'],
+                'espera_promedio_ms': (
+                    round(s['espera_total_ms'] / s['adquisiciones'], 3)
+                    if s['adquisiciones'] else None
+                ),
+                'espera_max_ms':      round(s['espera_max_ms'], 3),
+            }
+    return resultado
+
+
 def close_all_pools():
     """Cierra todos los pools al apagar el servidor."""
     global _pools
@@ -105,3 +256,5 @@ def close_all_pools():
         except Exception as e:
             logger.error(f'Error cerrando pool {name}: {e}')
     _pools.clear()
+    with _stats_lock:
+        _stats.clear()
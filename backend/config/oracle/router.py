@@ -10,6 +10,14 @@ from django.conf import settings
 REPORTING_APPS = set()  # Se puebla dinámicamente según hints
 
 
+def reports_alias() -> str:
+    """
+    Alias para lecturas pesadas (exportaciones, reportes):
+    'reports' si está configurado (PROD RAC Nodo 2), si no 'default'.
+    """
+    return 'reports' if 'reports' in settings.DATABASES else 'default'
+
+
 class OracleRACRouter:
     """
     Enruta queries a la base de datos correcta según el tipo de operación:
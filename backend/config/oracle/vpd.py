@@ -2,7 +2,9 @@
 HealthTech Solutions — VPD Middleware
 Establece el contexto de hospital en Oracle para Virtual Private Database.
 En DEV (Oracle 21c XE): solo guarda el hospital_id en thread local, no llama a Oracle.
-En PROD (Oracle 19c RAC): llama a HEALTHTECH_PKG.SET_HOSPITAL y SET_USER_ROL por cada request.
+En PROD (Oracle 19c RAC): llama a HEALTHTECH_PKG.SET_HOSPITAL y SET_USER_ROL solo cuando
+el contexto (hospital_id, rol) de la conexión cambia — con CONN_MAX_AGE la sesión Oracle
+se reutiliza entre requests y normalmente ya lleva el contexto correcto.
 
 Contexto Oracle establecido:
   HEALTHTECH_CTX.HOSPITAL_ID — filtra filas por hospital (tenant)
@@ -11,8 +13,12 @@ Contexto Oracle establecido:
 
 import threading
 import logging
+from contextlib import contextmanager
 from django.conf import settings
 from django.db import connection
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.functional import LazyObject, empty
 
 logger = logging.getLogger('healthtech.audit')
 
@@ -20,14 +26,64 @@ logger = logging.getLogger('healthtech.audit')
 _thread_local = threading.local()
 
 
+def _request_user():
+    """
+    Usuario autenticado del request en curso, o None.
+    DRF autentica el JWT después de los middlewares y asigna request.user
+    también sobre el HttpRequest de Django, por eso se resuelve aquí en
+    diferido y no al entrar al middleware. Un usuario de sesión aún sin
+    evaluar (SimpleLazyObject) se ignora: resolverlo consultaría la BD.
+    """
+    request = getattr(_thread_local, 'request', None)
+    user    = getattr(request, 'user', None)
+    if isinstance(user, LazyObject) and user._wrapped is empty:
+        return None
+    return user if user is not None and user.is_authenticated else None
+
+
+def _rol_codigo(user, consultar: bool) -> str | None:
+    """rol_codigo del usuario; sin consultar la BD salvo consultar=True."""
+    if not consultar and user.rol_id and not user._meta.get_field('rol').is_cached(user):
+        return None
+    return getattr(user, 'rol_codigo', None)
+
+
 def get_current_hospital_id() -> int | None:
-    """Retorna el hospital_id del request actual desde el thread local."""
-    return getattr(_thread_local, 'hospital_id', None)
+    """
+    Retorna el hospital_id del request actual desde el thread local.
+    Nunca consulta la BD: el pool lo invoca mientras adquiere la conexión.
+    """
+    hospital_id = getattr(_thread_local, 'hospital_id', None)
+    if hospital_id is None:
+        hospital_id = getattr(_request_user(), 'hospital_id', None)
+    return hospital_id
 
 
 def get_current_user_rol() -> str | None:
-    """Retorna el rol del usuario del request actual desde el thread local."""
-    return getattr(_thread_local, 'user_rol', None)
+    """
+    Retorna el rol del usuario del request actual desde el thread local.
+    Nunca consulta la BD (ver get_current_hospital_id).
+    """
+    user_rol = getattr(_thread_local, 'user_rol', None)
+    if user_rol is None and (user := _request_user()) is not None:
+        user_rol = _rol_codigo(user, consultar=False)
+    return user_rol
+
+
+def get_current_tenant() -> tuple[int | None, str | None] | None:
+    """
+    (hospital_id, rol) del request actual, o None fuera de un request
+    autenticado (comandos de management, shell, tareas en segundo plano).
+    A diferencia de get_current_user_rol(), resuelve el rol aunque eso
+    requiera una consulta — usar solo desde código ORM (apps.core.managers).
+    """
+    user = _request_user()
+    hospital_id, user_rol = get_current_hospital_id(), get_current_user_rol()
+    if user_rol is None and user is not None:
+        user_rol = _rol_codigo(user, consultar=True)
+    if user is None and hospital_id is None and user_rol is None:
+        return None
+    return hospital_id, user_rol or ''
 
 
 def set_current_hospital_id(hospital_id: int | None):
@@ -40,6 +96,82 @@ def set_current_user_rol(user_rol: str | None):
     _thread_local.user_rol = user_rol
 
 
+def set_current_request(request):
+    """Registra el request en curso (resolución diferida del usuario DRF)."""
+    _thread_local.request = request
+
+
+@contextmanager
+def tenant_en_hilo(hospital_id: int | None, user_rol: str | None):
+    """
+    Contexto VPD de un hilo auxiliar que consulta por cuenta de un request
+    (p. ej. apps.patients.timeline): copia (hospital_id, rol) al thread
+    local, aplica el contexto Oracle a la conexión propia del hilo y al
+    salir la cierra (con pool, la sesión vuelve al pool con su tag).
+    """
+    set_current_hospital_id(hospital_id)
+    set_current_user_rol(user_rol)
+    try:
+        if settings.VPD_ENABLED and (hospital_id or user_rol):
+            aplicar_contexto_oracle(hospital_id, user_rol)
+        yield
+    finally:
+        set_current_hospital_id(None)
+        set_current_user_rol(None)
+        connection.close()
+
+
+# ============================================================
+# Métricas de cambios de contexto VPD
+# ============================================================
+_stats_lock = threading.Lock()
+_stats = {'realizados': 0, 'evitados': 0}
+
+
+def record_context_switch(performed: bool):
+    """Cuenta un cambio de contexto realizado (callproc) o evitado (ya vigente)."""
+    with _stats_lock:
+        _stats['realizados' if performed else 'evitados'] += 1
+
+
+def get_vpd_stats() -> dict:
+    """Contadores del proceso — expuestos en /api/v1/health/."""
+    with _stats_lock:
+        total = _stats['realizados'] + _stats['evitados']
+        return {
+            **_stats,
+            'tasa_evitados': round(_stats['evitados'] / total, 4) if total else None,
+        }
+
+
+def reset_vpd_stats():
+    with _stats_lock:
+        _stats['realizados'] = 0
+        _stats['evitados']   = 0
+
+
+def session_tag(hospital_id: int | None, user_rol: str | None) -> str:
+    """Tag de sesión del pool oracledb que identifica el contexto VPD aplicado."""
+    return f'HOSPITAL_ID={hospital_id or ""};USER_ROL={user_rol or ""}'
+
+
+def parse_session_tag(tag: str | None) -> tuple[int | None, str | None]:
+    """Inverso de session_tag(): 'HOSPITAL_ID=3;USER_ROL=MEDICO' → (3, 'MEDICO')."""
+    valores = dict(p.split('=', 1) for p in (tag or '').split(';') if '=' in p)
+    hospital_id = valores.get('HOSPITAL_ID') or None
+    return (int(hospital_id) if hospital_id else None), (valores.get('USER_ROL') or None)
+
+
+@receiver(connection_created)
+def _reset_vpd_context(sender, connection, **kwargs):
+    """
+    Conexión nueva → contexto desconocido, salvo que venga del pool
+    (config.oracle.backend): su tag indica el contexto ya aplicado.
+    """
+    tag = getattr(connection.connection, 'tag', None)
+    connection.vpd_context = parse_session_tag(tag) if tag else None
+
+
 class OracleVPDMiddleware:
     """
     Middleware que lee el hospital_id y el rol del JWT y los registra en Oracle
@@ -53,6 +185,10 @@ class OracleVPDMiddleware:
          - SUPER_ADMIN: sin predicado (acceso a todos los hospitales)
          - Otros roles: HOSPITAL_ID = <id_del_hospital>
       5. Al finalizar el request, se limpia el thread local
+
+    El request queda también en el thread local: con JWT el usuario lo
+    autentica DRF dentro de la vista, y get_current_hospital_id() /
+    get_current_user_rol() lo leen desde ahí (apps.core.managers).
     """
 
     def __init__(self, get_response):
@@ -63,6 +199,7 @@ class OracleVPDMiddleware:
         hospital_id = self._extract_hospital_id(user)
         user_rol = self._extract_user_rol(user)
 
+        set_current_request(request)
         set_current_hospital_id(hospital_id)
         set_current_user_rol(user_rol)
 
@@ -72,12 +209,13 @@ class OracleVPDMiddleware:
             except Exception as e:
                 logger.error(f'Error estableciendo contexto VPD: {e}')
 
-        response = self.get_response(request)
-
-        # Limpiar thread local al finalizar request
-        set_current_hospital_id(None)
-        set_current_user_rol(None)
-        return response
+        try:
+            return self.get_response(request)
+        finally:
+            # Limpiar thread local al finalizar request
+            set_current_request(None)
+            set_current_hospital_id(None)
+            set_current_user_rol(None)
 
     def _extract_hospital_id(self, user) -> int | None:
         """
@@ -100,15 +238,56 @@ class OracleVPDMiddleware:
         return None
 
     def _set_oracle_context(self, hospital_id: int | None, user_rol: str | None):
-        """
-        Llama al paquete PL/SQL para establecer HOSPITAL_ID y USER_ROL en Oracle.
-        Solo se ejecuta si VPD_ENABLED=True (staging y prod).
-        """
-        with connection.cursor() as cursor:
-            if hospital_id:
-                cursor.callproc('HEALTHTECH_PKG.SET_HOSPITAL', [hospital_id])
-            if user_rol:
-                cursor.callproc('HEALTHTECH_PKG.SET_USER_ROL', [user_rol])
-        logger.debug(
-            f'VPD context set: HOSPITAL_ID={hospital_id} | USER_ROL={user_rol}'
-        )
+        """Contexto Oracle de la conexión del request (ver aplicar_contexto_oracle)."""
+        aplicar_contexto_oracle(hospital_id, user_rol)
+
+
+def aplicar_contexto_oracle(hospital_id: int | None, user_rol: str | None):
+    """
+    Llama al paquete PL/SQL para establecer HOSPITAL_ID y USER_ROL en Oracle.
+    Solo se ejecuta si VPD_ENABLED=True (staging y prod) y si la sesión
+    Oracle actual no lleva ya ese mismo contexto (connection.vpd_context,
+    reiniciado por la señal connection_created al reconectar).
+    Con sesiones del pool el tag se actualiza junto con el contexto: la
+    sesión vuelve al pool etiquetada con el contexto que lleva de verdad
+    y el siguiente acquire(tag=...) no se salta el cambio. El contexto
+    anterior se borra antes (fijar_contexto): nada de él sobrevive aunque
+    el nuevo tenga partes vacías.
+    """
+    contexto = (hospital_id, user_rol)
+    connection.ensure_connection()
+    if getattr(connection, 'vpd_context', None) == contexto:
+        record_context_switch(performed=False)
+        return
+
+    sesion = connection.connection
+    connection.vpd_context = None      # Si falla a medias, no reutilizar
+    _etiquetar(sesion, '')             # ... ni por contexto ni por tag del pool
+    with connection.cursor() as cursor:
+        fijar_contexto(cursor, hospital_id, user_rol)
+    connection.vpd_context = contexto
+    _etiquetar(sesion, session_tag(hospital_id, user_rol))
+    record_context_switch(performed=True)
+    logger.debug(
+        f'VPD context set: HOSPITAL_ID={hospital_id} | USER_ROL={user_rol}'
+    )
+
+
+def fijar_contexto(cursor, hospital_id: int | None, user_rol: str | None):
+    """
+    Deja en la sesión exactamente (hospital_id, user_rol): CLEAR_CONTEXT y
+    luego SET_* de las partes presentes. Sin el CLEAR, una sesión que traía
+    el HOSPITAL_ID de otro tenant lo conservaría al pedir (None, rol) y
+    volvería al pool con un tag que no lo refleja.
+    """
+    cursor.callproc('HEALTHTECH_PKG.CLEAR_CONTEXT')
+    if hospital_id:
+        cursor.callproc('HEALTHTECH_PKG.SET_HOSPITAL', [hospital_id])
+    if user_rol:
+        cursor.callproc('HEALTHTECH_PKG.SET_USER_ROL', [user_rol])
+
+
+def _etiquetar(sesion, tag: str):
+    """Tag de la sesión oracledb (sin tag → el pool la reinicializa al entregarla)."""
+    if hasattr(sesion, 'tag'):
+        sesion.tag = tag
@@ -98,7 +98,8 @@ ASGI_APPLICATION = 'config.asgi.application'
 # ============================================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT + principal cacheado: sin consultas a SEC_USUARIOS/SEC_ROLES por request
+        'apps.security.authentication.HealthTechJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -144,6 +145,17 @@ SIMPLE_JWT = {
     'TOKEN_OBTAIN_SERIALIZER': 'apps.security.tokens.CustomTokenObtainSerializer',
 }
 
+# TTL (s) del principal cacheado por usr_id — apps/security/authentication.py.
+# Invalidado por signals en la caché compartida (CACHES de prod/staging):
+# el cambio lo ven todos los workers en el request siguiente.
+PRINCIPAL_CACHE_TTL = config('PRINCIPAL_CACHE_TTL', default=60, cast=int)
+
+# LRU de nombres para mostrar (created_by, medico, …) — apps/core/serializers.py
+# NombreUsuarioField. LRU por proceso: solo nombres para mostrar (no decide
+# acceso); el worker que edita lo invalida y los demás al vencer el TTL.
+USUARIO_NOMBRE_CACHE_TTL  = config('USUARIO_NOMBRE_CACHE_TTL', default=300, cast=int)
+USUARIO_NOMBRE_CACHE_SIZE = config('USUARIO_NOMBRE_CACHE_SIZE', default=5000, cast=int)
+
 # ============================================================
 # Internacionalización
 # ============================================================
@@ -264,3 +276,113 @@ AWS_QUERYSTRING_EXPIRE = 900                   # URLs pre-firmadas: 15 min
 ORACLE_ENV = config('ORACLE_ENV', default='dev')
 VPD_ENABLED = config('VPD_ENABLED', default=False, cast=bool)
 TDE_ENABLED = config('TDE_ENABLED', default=False, cast=bool)
+
+# ============================================================
+# Auditoría HIPAA — Pipeline asíncrono (apps.core.audit)
+# ============================================================
+AUDIT_ASYNC          = config('AUDIT_ASYNC', default=True, cast=bool)
+AUDIT_BATCH_SIZE     = config('AUDIT_BATCH_SIZE', default=200, cast=int)       # Filas por executemany
+AUDIT_FLUSH_INTERVAL = config('AUDIT_FLUSH_INTERVAL', default=2.0, cast=float) # Segundos máx. en cola
+AUDIT_QUEUE_MAXSIZE  = config('AUDIT_QUEUE_MAXSIZE', default=10000, cast=int)  # Excedente → solo spool
+AUDIT_SPOOL_DIR      = config('AUDIT_SPOOL_DIR', default=str(BASE_DIR / 'logs' / 'audit_spool'))
+
+# ============================================================
+# Pacientes — búsqueda (apps.patients.search) y expedientes (utils)
+# ============================================================
+# 'oracle_text' (PAC_BUSQUEDA + CTXSYS.CONTEXT) | 'trigramas' (PAC_BUSQUEDA_TERMINOS)
+PATIENT_SEARCH_ENGINE = config('PATIENT_SEARCH_ENGINE', default='oracle_text')
+
+# Correlativos de expediente reservados por proceso en cada UPDATE del contador
+# (1 = sin bloques; >1 reduce contención a costa de huecos si un worker muere)
+EXPEDIENTE_BLOQUE = config('EXPEDIENTE_BLOQUE', default=1, cast=int)
+
+# ============================================================
+# Citas — disponibilidad (apps.appointments.disponibilidad)
+# ============================================================
+CITAS_JORNADA_INICIO          = config('CITAS_JORNADA_INICIO', default='07:00')
+CITAS_JORNADA_FIN             = config('CITAS_JORNADA_FIN', default='19:00')
+CITAS_PASO_MIN                = config('CITAS_PASO_MIN', default=15, cast=int)            # Alineación de horarios
+CITAS_AGENDA_TTL              = config('CITAS_AGENDA_TTL', default=30, cast=int)          # Cache compartido por médico-día
+CITAS_DISPONIBILIDAD_DIAS_MAX = config('CITAS_DISPONIBILIDAD_DIAS_MAX', default=14, cast=int)
+
+# ============================================================
+# Cirugía — agenda de quirófanos (apps.surgery.agenda)
+# ============================================================
+QUIROFANO_JORNADA_INICIO     = config('QUIROFANO_JORNADA_INICIO', default='07:00')
+QUIROFANO_JORNADA_FIN        = config('QUIROFANO_JORNADA_FIN', default='19:00')
+QUIROFANO_HUECO_MIN          = config('QUIROFANO_HUECO_MIN', default=30, cast=int)          # Hueco ocioso reportable
+QUIROFANO_RANGO_DIAS_MAX     = config('QUIROFANO_RANGO_DIAS_MAX', default=31, cast=int)
+CIRUGIA_DURACION_DEFECTO_MIN = config('CIRUGIA_DURACION_DEFECTO_MIN', default=120, cast=int) # Sin fin ni duración
+
+# ============================================================
+# Laboratorio — resultados numéricos (apps.laboratory.resultados)
+# ============================================================
+# Sin límites críticos catalogados: crítico si excede el rango en esta fracción del límite
+LAB_CRITICO_FACTOR       = config('LAB_CRITICO_FACTOR', default=0.3, cast=float)
+LAB_TENDENCIA_MAX_PUNTOS = config('LAB_TENDENCIA_MAX_PUNTOS', default=500, cast=int)
+
+# ============================================================
+# Enfermería — series de signos vitales y NEWS2 (apps.nursing.series / alerta_temprana)
+# ============================================================
+SIGNOS_SERIE_PUNTOS       = config('SIGNOS_SERIE_PUNTOS', default=300, cast=int)        # Puntos por signo (LTTB)
+SIGNOS_SERIE_PUNTOS_MAX   = config('SIGNOS_SERIE_PUNTOS_MAX', default=2000, cast=int)
+SIGNOS_SERIE_DIAS_DEFECTO = config('SIGNOS_SERIE_DIAS_DEFECTO', default=7, cast=int)
+SIGNOS_SERIE_DIAS_MAX     = config('SIGNOS_SERIE_DIAS_MAX', default=31, cast=int)
+SIGNOS_SERIE_FILAS_MAX    = config('SIGNOS_SERIE_FILAS_MAX', default=50000, cast=int)   # Tope de filas leídas
+# Antigüedad máxima de una toma para entrar en el NEWS2 de la estación
+NEWS2_VENTANA_HORAS       = config('NEWS2_VENTANA_HORAS', default=24, cast=int)
+
+# ============================================================
+# Farmacia — despacho (apps.pharmacy.despacho)
+# ============================================================
+FARMACIA_LOTE_MAX = config('FARMACIA_LOTE_MAX', default=200, cast=int)   # Dispensaciones por POST /dispensar-lote/
+
+# ============================================================
+# Bodega — kardex (apps.warehouse.kardex)
+# ============================================================
+BODEGA_LOTE_MAX   = config('BODEGA_LOTE_MAX',   default=1000, cast=int)   # Movimientos por POST /movimientos/lote/
+BODEGA_LOTE_BATCH = config('BODEGA_LOTE_BATCH', default=500,  cast=int)   # Filas por INSERT de bulk_create
+
+# Existencias a una fecha y kardex por producto (apps.warehouse.existencias)
+BODEGA_KARDEX_DIAS_DEFECTO     = config('BODEGA_KARDEX_DIAS_DEFECTO',     default=30,   cast=int)
+BODEGA_KARDEX_DIAS_MAX         = config('BODEGA_KARDEX_DIAS_MAX',         default=366,  cast=int)
+BODEGA_KARDEX_MAX_MOVIMIENTOS  = config('BODEGA_KARDEX_MAX_MOVIMIENTOS',  default=5000, cast=int)
+
+# ============================================================
+# Reposición — pronóstico de consumo (apps.warehouse.reposicion)
+# ============================================================
+REPOSICION_VENTANA_DIAS     = config('REPOSICION_VENTANA_DIAS',     default=90,    cast=int)    # Historia de consumo
+REPOSICION_METODO           = config('REPOSICION_METODO',           default='SES')              # SES | PROMEDIO
+REPOSICION_ALFA             = config('REPOSICION_ALFA',             default=0.2,   cast=float)  # Suavizado exponencial
+REPOSICION_VENTANA_PROMEDIO = config('REPOSICION_VENTANA_PROMEDIO', default=28,    cast=int)    # Días del promedio móvil
+REPOSICION_DIAS_ENTREGA     = config('REPOSICION_DIAS_ENTREGA',     default=7,     cast=int)    # Tiempo de reposición
+REPOSICION_DIAS_CICLO       = config('REPOSICION_DIAS_CICLO',       default=14,    cast=int)    # Días que cubre un pedido
+REPOSICION_Z                = config('REPOSICION_Z',                default=1.65,  cast=float)  # Nivel de servicio ~95 %
+
+# ============================================================
+# Pacientes — línea de tiempo de la ficha (apps.patients.timeline)
+# ============================================================
+TIMELINE_HILOS      = config('TIMELINE_HILOS',      default=4,   cast=int)   # Fuentes consultadas en paralelo (<=1: en serie)
+TIMELINE_LIMITE     = config('TIMELINE_LIMITE',     default=50,  cast=int)   # Eventos por página
+TIMELINE_LIMITE_MAX = config('TIMELINE_LIMITE_MAX', default=200, cast=int)
+
+# ============================================================
+# Emergencias — tablero en vivo (apps.emergency.tablero)
+# ============================================================
+# Polling corto: segundos sugeridos al cliente entre sondeos (cada sondeo = una consulta de huella)
+EMERGENCIA_TABLERO_SONDEO = config('EMERGENCIA_TABLERO_SONDEO', default=5, cast=int)
+# Vida de la huella compartida (COUNT + MAX(UPDATED_AT)): una consulta por hospital y TTL, no por pantalla
+EMERGENCIA_TABLERO_HUELLA_TTL = config('EMERGENCIA_TABLERO_HUELLA_TTL', default=2, cast=int)
+
+# ============================================================
+# Encamamiento — censo de camas (apps.hospitalization.censo)
+# ============================================================
+# Segundos tras los cuales una lectura recalcula desde ENC_CAMAS aunque la huella no cambie (deriva)
+CAMAS_CENSO_RECONCILIAR = config('CAMAS_CENSO_RECONCILIAR', default=300.0, cast=float)
+
+# ============================================================
+# Benchmark de endpoints (manage.py bench_endpoints)
+# ============================================================
+BENCH_BASELINE              = config('BENCH_BASELINE', default=str(BASE_DIR / 'benchmarks' / 'endpoints.json'))
+BENCH_PRESUPUESTO_CONSULTAS = config('BENCH_PRESUPUESTO_CONSULTAS', default=0, cast=int)       # Consultas extra toleradas
+BENCH_PRESUPUESTO_LATENCIA  = config('BENCH_PRESUPUESTO_LATENCIA', default=0.25, cast=float)   # +25% sobre p50/p95
@@ -15,7 +15,7 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1', '0.0.0.0']
 # ============================================================
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.oracle',
+        'ENGINE': 'config.oracle.backend',          # Sesiones del pool oracledb (pool.py)
         # Easy Connect completo como NAME (sin HOST/PORT separados).
         # Cuando HOST está vacío, Django pasa NAME directamente como DSN,
         # lo que fuerza el modo service_name en oracledb thin (no SID).
@@ -30,7 +30,7 @@ DATABASES = {
         'HOST':     '',   # Vacío: Django pasa NAME como DSN directo
         'PORT':     '',
         'OPTIONS':  {},   # oracledb 3.x thin — sin parámetros extra
-        'CONN_MAX_AGE': 60,
+        'CONN_MAX_AGE': 0,       # Devolver la sesión al pool al final del request
         'TEST': {
             'NAME': 'healthtech_test',
         },
@@ -17,23 +17,23 @@ ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=lambda v: [s.strip() for s in v.spl
 DATABASES = {
     # Servicio OLTP — Escrituras y lecturas transaccionales
     'default': {
-        'ENGINE': 'django.db.backends.oracle',
+        'ENGINE': 'config.oracle.backend',          # Sesiones del pool oracledb (pool.py)
         'NAME': config('ORACLE_DSN', default=''),
         'USER': config('ORACLE_USER'),
         'PASSWORD': config('ORACLE_PASSWORD'),
         'HOST': '',
         'PORT': '',
-        'CONN_MAX_AGE': 300,
+        'CONN_MAX_AGE': 0,       # Devolver la sesión al pool al final del request
     },
     # Servicio REPORTS — Consultas pesadas (usa el mismo DSN si no se define uno separado)
     'reports': {
-        'ENGINE': 'django.db.backends.oracle',
+        'ENGINE': 'config.oracle.backend',          # Sesiones del pool oracledb (pool.py)
         'NAME': config('ORACLE_DSN_REPORTS', default=config('ORACLE_DSN', default='')),
         'USER': config('ORACLE_USER'),
         'PASSWORD': config('ORACLE_PASSWORD'),
         'HOST': '',
         'PORT': '',
-        'CONN_MAX_AGE': 300,
+        'CONN_MAX_AGE': 0,       # Devolver la sesión al pool al final del request
     },
 }
 
@@ -79,11 +79,22 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 
 # ============================================================
-# Caché — Para sesiones y rate limiting en prod
+# Caché — Sesiones, rate limiting y estado compartido entre workers
+# Lo que un worker invalida al escribir (principal de autenticación) debe
+# desaparecer para todos: nunca LocMemCache, que es una copia por proceso
+# (core.E001 en "manage.py check --deploy").
+#   REDIS_URL definido → Redis; si no → tabla APP_CACHE en Oracle
+#   (database/ddl/core/34_app_cache.sql).
 # ============================================================
+REDIS_URL = config('REDIS_URL', default='')
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'healthtech-cache',
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'healthtech',
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'APP_CACHE',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
     }
 }
@@ -15,7 +15,7 @@ ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=lambda v: [s.strip() for s in v.spl
 # ============================================================
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.oracle',
+        'ENGINE': 'config.oracle.backend',          # Sesiones del pool oracledb (pool.py)
         'NAME': config('ORACLE_SERVICE', default='HTPDB'),
         'USER': config('ORACLE_USER'),
         'PASSWORD': config('ORACLE_PASSWORD'),
@@ -24,7 +24,7 @@ DATABASES = {
         'OPTIONS': {
             'use_oracledb': True,
         },
-        'CONN_MAX_AGE': 120,
+        'CONN_MAX_AGE': 0,       # Devolver la sesión al pool al final del request
     }
 }
 
@@ -37,6 +37,27 @@ CORS_ALLOWED_ORIGINS = config(
 )
 CORS_ALLOW_CREDENTIALS = True
 
+# ============================================================
+# Caché — Compartida entre workers (igual que PROD)
+# Lo que un worker invalida al escribir (principal de autenticación) debe
+# desaparecer para todos: nunca LocMemCache, que es una copia por proceso
+# (core.E001 en "manage.py check --deploy").
+#   REDIS_URL definido → Redis; si no → tabla APP_CACHE en Oracle
+#   (database/ddl/core/34_app_cache.sql).
+# ============================================================
+REDIS_URL = config('REDIS_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'KEY_PREFIX': 'healthtech',
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'APP_CACHE',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    }
+}
+
 # ============================================================
 # Email — SMTP real en staging
 # ============================================================
@@ -33,9 +33,11 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Con VPD_ENABLED=False solo registra el contexto de tenant en thread local
+    # (apps.core.managers.TenantManager); no llama a HEALTHTECH_PKG
+    'config.oracle.vpd.OracleVPDMiddleware',
     # HIPAA audit middleware (funciona con cualquier BD)
     'apps.core.middleware.HIPAAAuditMiddleware',
-    # OracleVPDMiddleware omitido — no disponible con SQLite
 ]
 
 # ============================================================
@@ -90,3 +92,14 @@ SECRET_KEY = 'test-secret-key-hipaa-healthtech-2026-not-for-production'
 AWS_ACCESS_KEY_ID = 'test-access-key'
 AWS_SECRET_ACCESS_KEY = 'test-secret-key'
 AWS_STORAGE_BUCKET_NAME = 'healthtech-test-bucket'
+
+# ============================================================
+# Auditoría HIPAA síncrona — los tests verifican filas inmediatamente
+# ============================================================
+AUDIT_ASYNC     = False
+AUDIT_SPOOL_DIR = tempfile.mkdtemp()
+
+# ============================================================
+# Búsqueda de pacientes — SQLite no tiene Oracle Text
+# ============================================================
+PATIENT_SEARCH_ENGINE = 'trigramas'
@@ -0,0 +1,48 @@
+-- ============================================================
+-- HealthTech Solutions — DDL: Índices para paginación keyset
+-- apps.core.pagination.KeysetPagination ordena por (CREATED_AT, PK) DESC
+-- y filtra (CREATED_AT, PK) < cursor dentro del hospital → range scan
+-- sin OFFSET ni SORT sobre estos índices.
+-- Compatible: Oracle 19c RAC y Oracle 21c XE
+-- ============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_AUD_KEYSET ON SEC_AUDITORIA_ACCESOS (HOSPITAL_ID, CREATED_AT DESC, AUDITORIA_ID DESC)
+     TABLESPACE PHI_DATA';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_ENF_SIG_KEYSET ON ENF_SIGNOS_VITALES (HOSPITAL_ID, CREATED_AT DESC, SIG_ID DESC)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_BOD_MOV_KEYSET ON BOD_MOVIMIENTOS (HOSPITAL_ID, CREATED_AT DESC, MOV_ID DESC)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_EMG_KEYSET ON EMG_EMERGENCIAS (HOSPITAL_ID, CREATED_AT DESC, EMG_ID DESC)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+-- El conteo estimado (?conteo=estimado) usa la cardinalidad del optimizador:
+-- requiere estadísticas vigentes (DBMS_STATS en el job nocturno).
+
+PROMPT ✅ Índices de paginación keyset creados.
@@ -0,0 +1,108 @@
+-- =============================================================
+-- HealthTech Solutions — DDL: PAC_BUSQUEDA + PAC_BUSQUEDA_TERMINOS
+-- Módulo M02 — Índice de búsqueda de pacientes (apps.patients.search)
+-- Compatible: Oracle 19c RAC + Oracle 21c XE (Oracle Text incluido)
+-- PHI → tablespace PHI_DATA / PHI_IDX
+-- VPD: columna HOSPITAL_ID obligatoria
+--
+-- PAC_BUSQUEDA           → motor 'oracle_text' (PATIENT_SEARCH_ENGINE)
+-- PAC_BUSQUEDA_TERMINOS  → motor 'trigramas' (BD sin Oracle Text)
+-- Carga inicial: python manage.py reindexar_pacientes
+-- Requiere: GRANT CTXAPP TO HEALTHTECH;
+-- =============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE '
+    CREATE TABLE PAC_BUSQUEDA (
+      PAC_ID           NUMBER          NOT NULL
+                                       CONSTRAINT PK_PAC_BUSQUEDA PRIMARY KEY,
+      HOSPITAL_ID      NUMBER          NOT NULL,
+      -- Tokens normalizados + claves fonéticas (prefijo FON) + identificadores
+      DOCUMENTO        VARCHAR2(4000)  NOT NULL,
+      UPDATED_AT       TIMESTAMP       DEFAULT SYSTIMESTAMP NOT NULL,
+      CONSTRAINT FK_PAC_BUS_PACIENTE FOREIGN KEY (PAC_ID)
+        REFERENCES PAC_PACIENTES (PAC_ID) ON DELETE CASCADE
+    ) TABLESPACE PHI_DATA
+  ';
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE '
+    CREATE TABLE PAC_BUSQUEDA_TERMINOS (
+      TERMINO_ID       NUMBER          GENERATED BY DEFAULT ON NULL AS IDENTITY
+                                       CONSTRAINT PK_PAC_BUS_TERMINOS PRIMARY KEY,
+      HOSPITAL_ID      NUMBER          NOT NULL,
+      PAC_ID           NUMBER          NOT NULL,
+      TIPO             VARCHAR2(3)     NOT NULL,
+      TERMINO          VARCHAR2(100)   NOT NULL,
+      PESO             NUMBER(5)       DEFAULT 1 NOT NULL,
+      CONSTRAINT CHK_PAC_TER_TIPO CHECK (TIPO IN (''ID'', ''NOM'', ''FON'', ''TRI'')),
+      CONSTRAINT FK_PAC_TER_PACIENTE FOREIGN KEY (PAC_ID)
+        REFERENCES PAC_PACIENTES (PAC_ID) ON DELETE CASCADE
+    ) TABLESPACE PHI_DATA
+  ';
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+-- Búsqueda: TIPO = :t AND TERMINO LIKE 'x%' dentro del hospital → range scan
+BEGIN EXECUTE IMMEDIATE 'CREATE INDEX IDX_PAC_TER_BUSQUEDA ON PAC_BUSQUEDA_TERMINOS (HOSPITAL_ID, TIPO, TERMINO, PAC_ID, PESO) TABLESPACE PHI_IDX';
+EXCEPTION WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF; END;
+/
+
+-- Reindexación: DELETE WHERE PAC_ID = :id
+BEGIN EXECUTE IMMEDIATE 'CREATE INDEX IDX_PAC_TER_PACIENTE ON PAC_BUSQUEDA_TERMINOS (PAC_ID) TABLESPACE PHI_IDX';
+EXCEPTION WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF; END;
+/
+
+-- ---- Preferencias Oracle Text ----
+-- Lexer: sin tildes (base_letter) y sin distinguir mayúsculas
+BEGIN
+  CTX_DDL.CREATE_PREFERENCE('PAC_BUS_LEXER', 'BASIC_LEXER');
+  CTX_DDL.SET_ATTRIBUTE('PAC_BUS_LEXER', 'BASE_LETTER', 'YES');
+  CTX_DDL.SET_ATTRIBUTE('PAC_BUS_LEXER', 'MIXED_CASE',  'NO');
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -20000 THEN NULL; ELSE RAISE; END IF;   -- DRG-10700: ya existe
+END;
+/
+
+-- Wordlist: índice de prefijos para 'x%' por tecla y FUZZY en español
+BEGIN
+  CTX_DDL.CREATE_PREFERENCE('PAC_BUS_WORDLIST', 'BASIC_WORDLIST');
+  CTX_DDL.SET_ATTRIBUTE('PAC_BUS_WORDLIST', 'PREFIX_INDEX',      'TRUE');
+  CTX_DDL.SET_ATTRIBUTE('PAC_BUS_WORDLIST', 'PREFIX_MIN_LENGTH', '1');
+  CTX_DDL.SET_ATTRIBUTE('PAC_BUS_WORDLIST', 'PREFIX_MAX_LENGTH', '8');
+  CTX_DDL.SET_ATTRIBUTE('PAC_BUS_WORDLIST', 'WILDCARD_MAXTERMS', '15000');
+  CTX_DDL.SET_ATTRIBUTE('PAC_BUS_WORDLIST', 'FUZZY_MATCH',       'SPANISH');
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -20000 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+-- Índice CONTEXT sincronizado en cada COMMIT (signals.py escribe en la
+-- misma transacción que el save() del paciente)
+BEGIN
+  EXECUTE IMMEDIATE '
+    CREATE INDEX IDX_PAC_BUSQUEDA_CTX ON PAC_BUSQUEDA (DOCUMENTO)
+    INDEXTYPE IS CTXSYS.CONTEXT
+    PARAMETERS (''LEXER PAC_BUS_LEXER WORDLIST PAC_BUS_WORDLIST
+                 STOPLIST CTXSYS.EMPTY_STOPLIST SYNC (ON COMMIT)'')
+  ';
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+-- Optimización periódica (fragmentación por SYNC ON COMMIT):
+--   EXEC CTX_DDL.OPTIMIZE_INDEX('IDX_PAC_BUSQUEDA_CTX', 'FULL');
+
+PROMPT ✅ Índice de búsqueda de pacientes (PAC_BUSQUEDA) creado.
@@ -0,0 +1,33 @@
+-- =============================================================
+-- HealthTech Solutions — DDL: PAC_EXPEDIENTE_CONTADORES
+-- Módulo M02 — Correlativo diario de expedientes por hospital
+-- Compatible: Oracle 19c RAC + Oracle 21c XE
+-- VPD: columna HOSPITAL_ID obligatoria
+--
+-- apps.patients.utils.generar_no_expediente asigna correlativos con:
+--   UPDATE PAC_EXPEDIENTE_CONTADORES SET ULTIMO = ULTIMO + :n
+--    WHERE HOSPITAL_ID = :h AND FECHA = :f RETURNING ULTIMO INTO :u
+-- (una fila por hospital y día; el bloqueo dura solo esa sentencia)
+-- =============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE '
+    CREATE TABLE PAC_EXPEDIENTE_CONTADORES (
+      CONTADOR_ID      NUMBER         GENERATED BY DEFAULT ON NULL AS IDENTITY
+                                      CONSTRAINT PK_PAC_EXP_CONTADORES PRIMARY KEY,
+      HOSPITAL_ID      NUMBER         NOT NULL,
+      FECHA            DATE           NOT NULL,
+      ULTIMO           NUMBER(5)      DEFAULT 0 NOT NULL,
+      UPDATED_AT       TIMESTAMP      DEFAULT SYSTIMESTAMP NOT NULL,
+      CONSTRAINT UK_PAC_EXP_CONT_DIA UNIQUE (HOSPITAL_ID, FECHA),
+      CONSTRAINT CHK_PAC_EXP_ULTIMO  CHECK (ULTIMO >= 0)
+    ) TABLESPACE PHI_DATA
+      INITRANS 16
+  ';
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Tabla PAC_EXPEDIENTE_CONTADORES creada.
@@ -0,0 +1,23 @@
+-- ============================================================
+-- HealthTech Solutions — DDL: Índice de camas libres (M05)
+-- apps.hospitalization.asignacion.candidatas() busca la mejor cama con
+--   WHERE HOSPITAL_ID = :h AND TIPO_CAMA = :t AND ESTADO = 'DISPONIBLE'
+--     AND ACTIVO = 1 [AND TIENE_OXIGENO = 1 …]
+--   ORDER BY cercanía (SALA, PISO), equipamiento sobrante, NUMERO_CAMA
+-- El índice cubre filtro y orden: range scan sin acceso a la tabla.
+-- El UPDATE condicional de ocupar() usa la PK (PK_ENC_CAMAS).
+-- Compatible: Oracle 19c RAC y Oracle 21c XE
+-- ============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_ENC_CAMA_LIBRES ON ENC_CAMAS
+       (HOSPITAL_ID, TIPO_CAMA, ESTADO, ACTIVO,
+        TIENE_OXIGENO, TIENE_MONITOR, TIENE_VENTILADOR, SALA, PISO, NUMERO_CAMA)
+     TABLESPACE HT_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Índice IDX_ENC_CAMA_LIBRES creado.
@@ -0,0 +1,21 @@
+-- ============================================================
+-- HealthTech Solutions — DDL: Índice de agenda de quirófanos (M06)
+-- apps.surgery.agenda.AgendaQuirofanos lee un rango de fechas con
+--   WHERE HOSPITAL_ID = :h AND FECHA_PROGRAMADA BETWEEN :d AND :h2
+--     AND ACTIVO = 1 AND ESTADO IN ('PROGRAMADA','EN_CURSO','COMPLETADA')
+-- para la validación de choques al programar, el tablero y la utilización.
+-- IDX_CIR_AGENDA (HOSPITAL_ID, QUIROFANO, FECHA_PROGRAMADA) solo sirve
+-- cuando se filtra un quirófano; este cubre el rango de todo el hospital.
+-- Compatible: Oracle 19c RAC y Oracle 21c XE
+-- ============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_CIR_TABLERO ON CIR_CIRUGIAS (HOSPITAL_ID, FECHA_PROGRAMADA, ESTADO, ACTIVO)
+     TABLESPACE HT_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Índice IDX_CIR_TABLERO creado.
@@ -0,0 +1,56 @@
+-- ============================================================
+-- HealthTech Solutions — DDL: Resultados numéricos de laboratorio (M07)
+-- apps.laboratory.resultados llena al completar la orden:
+--   CODIGO_EXAMEN   analito normalizado (sin acentos, mayúsculas)
+--   VALOR_NUM / RANGO_MIN_NUM / RANGO_MAX_NUM  valores parseados de VALOR / RANGO_*
+--   UNIDAD_CODIGO   unidad normalizada ('MG/DL', 'MEQ/L', '10^3/UL')
+--   PAC_ID / FECHA_RESULTADO  desnormalizados de LAB_ORDENES
+-- GET /api/v1/laboratory/tendencia/ lee la serie de un analito con
+--   WHERE HOSPITAL_ID = :h AND PAC_ID = :p AND CODIGO_EXAMEN = :c AND ACTIVO = 1
+--   ORDER BY FECHA_RESULTADO DESC
+-- sin JOIN a LAB_ORDENES → IDX_RES_TENDENCIA.
+-- Carga de resultados anteriores: python manage.py recalcular_resultados_lab
+-- Compatible: Oracle 19c RAC y Oracle 21c XE
+-- ============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE '
+    ALTER TABLE LAB_RESULTADOS ADD (
+      CODIGO_EXAMEN    VARCHAR2(60),
+      VALOR_NUM        NUMBER,
+      RANGO_MIN_NUM    NUMBER,
+      RANGO_MAX_NUM    NUMBER,
+      UNIDAD_CODIGO    VARCHAR2(20),
+      PAC_ID           NUMBER,
+      FECHA_RESULTADO  TIMESTAMP
+    )
+  ';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -1430 THEN NULL; ELSE RAISE; END IF;   -- Columnas ya existen
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'ALTER TABLE LAB_RESULTADOS ADD CONSTRAINT FK_RES_PACIENTE
+     FOREIGN KEY (PAC_ID) REFERENCES PAC_PACIENTES (PAC_ID)';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE IN (-2275, -2264) THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_RES_TENDENCIA ON LAB_RESULTADOS (HOSPITAL_ID, PAC_ID, CODIGO_EXAMEN, FECHA_RESULTADO, ACTIVO)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+COMMENT ON COLUMN LAB_RESULTADOS.CODIGO_EXAMEN   IS 'Analito normalizado (apps.laboratory.resultados.codigo_examen)';
+COMMENT ON COLUMN LAB_RESULTADOS.VALOR_NUM       IS 'VALOR parseado; NULL si el resultado es cualitativo';
+COMMENT ON COLUMN LAB_RESULTADOS.UNIDAD_CODIGO   IS 'UNIDAD normalizada (MG/DL, MEQ/L, 10^3/UL)';
+COMMENT ON COLUMN LAB_RESULTADOS.FECHA_RESULTADO IS 'Momento de validación del resultado (copia de LAB_ORDENES)';
+
+PROMPT ✅ Columnas numéricas e índice IDX_RES_TENDENCIA en LAB_RESULTADOS.
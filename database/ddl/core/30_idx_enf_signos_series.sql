@@ -0,0 +1,22 @@
+-- ============================================================
+-- HealthTech Solutions — DDL: Índice de series de signos vitales (M10)
+-- apps.nursing.series lee un rango por encamamiento con
+--   WHERE HOSPITAL_ID = :h AND ENC_ID = :e AND CREATED_AT >= :d AND CREATED_AT < :h2
+--   ORDER BY CREATED_AT
+-- IDX_ENF_SIG_ENC (HOSPITAL_ID, ENC_ID) obliga a ordenar todas las filas del
+-- encamamiento; con CREATED_AT el rango sale ordenado del índice.
+-- Por paciente (y el NEWS2 de apps.nursing.alerta_temprana) ya sirve
+-- IDX_ENF_SIG_PACIENTE (HOSPITAL_ID, PAC_ID, CREATED_AT).
+-- Compatible: Oracle 19c RAC y Oracle 21c XE
+-- ============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_ENF_SIG_ENC_FECHA ON ENF_SIGNOS_VITALES (HOSPITAL_ID, ENC_ID, CREATED_AT)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Índice IDX_ENF_SIG_ENC_FECHA creado.
@@ -0,0 +1,50 @@
+-- =============================================================
+-- HealthTech Solutions — DDL: BOD_CORTES_STOCK (M09)
+-- Saldo, precio y valor de cada producto al cierre de un día
+-- Compatible: Oracle 19c RAC + Oracle 21c XE
+-- VPD: columna HOSPITAL_ID obligatoria
+--
+-- manage.py cortar_stock (cron nocturno) escribe una fila por producto y
+-- día. apps.warehouse.existencias responde "stock / valorización al día D"
+-- y el kardex por producto partiendo del corte más cercano:
+--   SELECT MAX(FECHA) FROM BOD_CORTES_STOCK WHERE HOSPITAL_ID = :h AND FECHA <= :d
+--   SELECT … FROM BOD_CORTES_STOCK WHERE HOSPITAL_ID = :h AND FECHA = :c       → UK_BOD_COR_DIA
+--   SELECT PRO_ID, SUM(±CANTIDAD) FROM BOD_MOVIMIENTOS
+--    WHERE HOSPITAL_ID = :h AND CREATED_AT >= :desde AND CREATED_AT < :hasta   → IDX_BOD_MOV_FECHA
+--    GROUP BY PRO_ID
+-- Kardex de un producto: (HOSPITAL_ID, PRO_ID, CREATED_AT)                    → IDX_BOD_MOV_PRO_FECHA
+-- =============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE '
+    CREATE TABLE BOD_CORTES_STOCK (
+      COR_ID           NUMBER         GENERATED BY DEFAULT ON NULL AS IDENTITY
+                                      CONSTRAINT PK_BOD_COR PRIMARY KEY,
+      HOSPITAL_ID      NUMBER(10)     NOT NULL,
+      PRO_ID           NUMBER         NOT NULL,
+      FECHA            DATE           NOT NULL,
+      STOCK            NUMBER(12,3)   NOT NULL,
+      PRECIO_UNITARIO  NUMBER(12,4)   NOT NULL,
+      VALOR            NUMBER(18,4)   NOT NULL,
+      CREATED_AT       TIMESTAMP      DEFAULT SYSTIMESTAMP NOT NULL,
+      CONSTRAINT UK_BOD_COR_DIA       UNIQUE (HOSPITAL_ID, FECHA, PRO_ID),
+      CONSTRAINT FK_BOD_COR_HOSPITAL  FOREIGN KEY (HOSPITAL_ID) REFERENCES SEC_HOSPITALES(HOSP_ID),
+      CONSTRAINT FK_BOD_COR_PRODUCTO  FOREIGN KEY (PRO_ID)      REFERENCES BOD_PRODUCTOS(PRO_ID)
+    ) TABLESPACE PHI_DATA
+  ';
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_BOD_MOV_PRO_FECHA ON BOD_MOVIMIENTOS (HOSPITAL_ID, PRO_ID, CREATED_AT)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Tabla BOD_CORTES_STOCK e índice IDX_BOD_MOV_PRO_FECHA creados.
@@ -0,0 +1,79 @@
+-- =============================================================
+-- HealthTech Solutions — DDL: BOD_PUNTOS_REORDEN (M08/M09)
+-- Pronóstico de consumo y punto de reorden sugerido por ítem
+-- Compatible: Oracle 19c RAC + Oracle 21c XE
+-- VPD: columna HOSPITAL_ID obligatoria
+--
+-- manage.py calcular_reposicion (cron nocturno) agrega el consumo diario de
+-- todos los hospitales en dos consultas:
+--   BOD_MOVIMIENTOS     WHERE TIPO_MOVIMIENTO IN ('SALIDA','BAJA') AND CREATED_AT en la ventana
+--                       → IDX_BOD_MOV_CONSUMO (cubre PRO_ID y CANTIDAD)
+--   FAR_DISPENSACIONES  WHERE ESTADO = 'DISPENSADA' AND FECHA_DISPENSACION en la ventana
+--                       → IDX_FAR_DIS_CONSUMO (cubre MED_ID y CANTIDAD)
+-- y reescribe las filas de cada hospital. GET /api/v1/warehouse/alertas/:
+--   WHERE HOSPITAL_ID = :h AND NIVEL IN (…) ORDER BY PRIORIDAD → IDX_BOD_REP_PRIORIDAD
+-- ITEM_ID es PRO_ID (ORIGEN = 'BODEGA') o MED_ID (ORIGEN = 'FARMACIA'): sin FK.
+-- =============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE '
+    CREATE TABLE BOD_PUNTOS_REORDEN (
+      REP_ID             NUMBER         GENERATED BY DEFAULT ON NULL AS IDENTITY
+                                        CONSTRAINT PK_BOD_REP PRIMARY KEY,
+      HOSPITAL_ID        NUMBER(10)     NOT NULL,
+      ORIGEN             VARCHAR2(10)   NOT NULL
+                         CONSTRAINT CK_BOD_REP_ORIGEN CHECK (ORIGEN IN (''BODEGA'',''FARMACIA'')),
+      ITEM_ID            NUMBER         NOT NULL,
+      NOMBRE             VARCHAR2(200)  NOT NULL,
+      UNIDAD_MEDIDA      VARCHAR2(30)   DEFAULT '''',
+      STOCK_ACTUAL       NUMBER(12,3)   NOT NULL,
+      STOCK_MINIMO       NUMBER(12,3)   NOT NULL,
+      CONSUMO_DIARIO     NUMBER(12,3)   NOT NULL,
+      DESVIACION         NUMBER(12,3)   NOT NULL,
+      DIAS_CON_CONSUMO   NUMBER(5)      DEFAULT 0 NOT NULL,
+      DIAS_COBERTURA     NUMBER(8,1),                            -- NULL = sin consumo
+      STOCK_SEGURIDAD    NUMBER(12,3)   NOT NULL,
+      PUNTO_REORDEN      NUMBER(12,3)   NOT NULL,
+      CANTIDAD_SUGERIDA  NUMBER(12,3)   NOT NULL,
+      NIVEL              VARCHAR2(10)   NOT NULL
+                         CONSTRAINT CK_BOD_REP_NIVEL CHECK (NIVEL IN (''AGOTADO'',''CRITICO'',''REORDENAR'',''OK'')),
+      PRIORIDAD          NUMBER(10)     NOT NULL,
+      CALCULADO_AT       TIMESTAMP      NOT NULL,
+      CONSTRAINT UK_BOD_REP_ITEM      UNIQUE (HOSPITAL_ID, ORIGEN, ITEM_ID),
+      CONSTRAINT FK_BOD_REP_HOSPITAL  FOREIGN KEY (HOSPITAL_ID) REFERENCES SEC_HOSPITALES(HOSP_ID)
+    ) TABLESPACE PHI_DATA
+  ';
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_BOD_REP_PRIORIDAD ON BOD_PUNTOS_REORDEN (HOSPITAL_ID, PRIORIDAD, NIVEL)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_BOD_MOV_CONSUMO ON BOD_MOVIMIENTOS (TIPO_MOVIMIENTO, CREATED_AT, HOSPITAL_ID, PRO_ID, CANTIDAD)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_FAR_DIS_CONSUMO ON FAR_DISPENSACIONES (ESTADO, FECHA_DISPENSACION, HOSPITAL_ID, MED_ID, CANTIDAD)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Tabla BOD_PUNTOS_REORDEN e índices de consumo creados.
@@ -0,0 +1,41 @@
+-- =============================================================
+-- HealthTech Solutions — DDL: índices para GET condicional de catálogos
+-- ETag / Last-Modified de las listas (apps.core.conditional)
+-- Compatible: Oracle 19c RAC + Oracle 21c XE
+--
+-- Cada GET de /pharmacy/medicamentos/, /warehouse/productos/ y
+-- /hospitalization/camas/ calcula primero, en una sola consulta,
+--   SELECT COUNT(*), MAX(UPDATED_AT) FROM <tabla> WHERE HOSPITAL_ID = :h AND ACTIVO = 1
+-- (el COUNT lo reutiliza la paginación). Con (HOSPITAL_ID, ACTIVO,
+-- UPDATED_AT) se resuelve solo con el índice, sin leer la tabla.
+-- UPDATED_AT lo mantienen los triggers BEFORE UPDATE de cada tabla.
+-- =============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_FAR_MED_ETAG ON FAR_MEDICAMENTOS (HOSPITAL_ID, ACTIVO, UPDATED_AT)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_BOD_PRO_ETAG ON BOD_PRODUCTOS (HOSPITAL_ID, ACTIVO, UPDATED_AT)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_ENC_CAMA_ETAG ON ENC_CAMAS (HOSPITAL_ID, ACTIVO, UPDATED_AT)
+     TABLESPACE HT_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Índices de ETag de catálogos creados.
@@ -0,0 +1,40 @@
+-- =============================================================
+-- HealthTech Solutions — DDL: APP_CACHE
+-- Caché compartida de Django (django.core.cache.backends.db.DatabaseCache)
+-- Compatible: Oracle 19c RAC + Oracle 21c XE
+--
+-- config/settings/prod.py y staging.py la usan cuando no se define
+-- REDIS_URL. Los workers de gunicorn invalidan entradas (principal de
+-- autenticación, etc.) desde el proceso que escribe: con una caché por
+-- proceso (LocMemCache) los demás workers seguirían sirviendo la copia
+-- vieja. Sin HOSPITAL_ID: las claves ya llevan el hospital cuando aplica.
+-- Columnas = las que crea "manage.py createcachetable" en Oracle.
+-- =============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE '
+    CREATE TABLE APP_CACHE (
+      CACHE_KEY        NVARCHAR2(255) NOT NULL
+                                      CONSTRAINT PK_APP_CACHE PRIMARY KEY,
+      VALUE            NCLOB          NOT NULL,
+      EXPIRES          TIMESTAMP      NOT NULL
+    ) TABLESPACE PHI_DATA
+      INITRANS 16
+  ';
+EXCEPTION
+  WHEN OTHERS THEN
+    IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+-- DatabaseCache purga por EXPIRES al superar MAX_ENTRIES (cull)
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_APP_CACHE_EXPIRES ON APP_CACHE (EXPIRES)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Tabla APP_CACHE creada.
@@ -0,0 +1,23 @@
+-- =============================================================
+-- HealthTech Solutions — DDL: índice de la huella del tablero de Emergencias
+-- Polling corto de GET /api/v1/emergency/tablero/ (apps.emergency.tablero)
+-- Compatible: Oracle 19c RAC + Oracle 21c XE
+--
+-- Cada sondeo de cada pantalla, en cada worker, calcula
+--   SELECT COUNT(*), MAX(UPDATED_AT) FROM EMG_EMERGENCIAS
+--    WHERE HOSPITAL_ID = :h AND ACTIVO = 1 AND ESTADO IN (...)
+-- y solo relee las filas si esa huella cambió. Con (HOSPITAL_ID, ACTIVO,
+-- ESTADO, UPDATED_AT) se resuelve solo con el índice, sin leer la tabla.
+-- UPDATED_AT lo mantiene TRG_EMG_EMERGENCIAS_UPD.
+-- =============================================================
+
+BEGIN
+  EXECUTE IMMEDIATE
+    'CREATE INDEX IDX_EMG_TABLERO ON EMG_EMERGENCIAS (HOSPITAL_ID, ACTIVO, ESTADO, UPDATED_AT)
+     TABLESPACE PHI_IDX';
+EXCEPTION
+  WHEN OTHERS THEN IF SQLCODE = -955 THEN NULL; ELSE RAISE; END IF;
+END;
+/
+
+PROMPT ✅ Índice del tablero de Emergencias creado.
@@ -177,6 +177,9 @@ echo " 1. Sube el código fuente al servidor a la ruta: $PROJECT_DIR"
 echo " 2. Revisa el archivo generado en $PROJECT_DIR/.env y valida tus contraseñas del RAC."
 echo " 3. Aplica las migraciones a la BD si es necesario:"
 echo "    cd $PROJECT_DIR/backend && ./venv/bin/python manage.py migrate"
+echo "    Caché compartida entre workers (APP_CACHE si no defines REDIS_URL en .env):"
+echo "    cd $PROJECT_DIR/backend && ./venv/bin/python manage.py createcachetable"
+echo "    cd $PROJECT_DIR/backend && ./venv/bin/python manage.py check --deploy --fail-level ERROR"
 echo " 4. Reinicia gunicorn:"
 echo "    sudo systemctl restart gunicorn_${PROJECT_NAME}"
 echo " 5. (Opcional) Configura SSL (HTTPS) con Let's Encrypt:"